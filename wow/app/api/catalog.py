@@ -0,0 +1,42 @@
+from typing import Any, Dict
+from fastapi import APIRouter, Depends
+
+from app.api.response_cache import ResponseCache
+from app.dependencies import get_catalog_store, get_response_cache
+from app.data.catalog import CatalogStore
+
+router = APIRouter(prefix="/catalog", tags=["catalog"])
+
+
+@router.get("/status", response_model=Dict[str, Any])
+async def get_catalog_status(
+    store: CatalogStore = Depends(get_catalog_store),
+    response_cache: ResponseCache = Depends(get_response_cache)
+):
+    """
+    Get the state of the loaded catalog.
+
+    Returns the version, epoch and content hash of the snapshot being served,
+    when it was loaded, whether it was read from the data file or a compiled
+    snapshot, and the error of the last failed reload (if any). A failed reload keeps
+    serving the last good snapshot. Also reports the hit and miss counters of
+    the encoded response cache.
+
+    After a reload that only re-read the changed teams, ``delta`` lists the
+    IDs of the teams added, removed and changed, and how many teams were
+    reused and re-indexed.
+    """
+    snapshot = store.current
+    return {
+        "version": snapshot.version,
+        "epoch": snapshot.epoch,
+        "content_hash": snapshot.content_hash,
+        "loaded_at": snapshot.loaded_at,
+        "data_file": store.file_path,
+        "source": snapshot.source,
+        "delta": snapshot.delta._asdict() if snapshot.delta is not None else None,
+        "reload_count": store.reload_count,
+        "last_error": store.last_error,
+        "last_error_at": store.last_error_at,
+        "response_cache": response_cache.stats(),
+    }
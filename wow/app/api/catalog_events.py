@@ -0,0 +1,159 @@
+import asyncio
+import json
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, NamedTuple, Optional, Tuple
+
+from app.data.catalog import CatalogSnapshot
+from app.data.change_log import ENTITY_KINDS, ChangeLog, ChangeSet
+
+# Comment line sent to idle streams, keeping proxies from closing them
+HEARTBEAT = b": heartbeat\n\n"
+
+
+class _Event(NamedTuple):
+    previous_version: int
+    version: int
+    epoch: str
+    body: bytes
+
+
+def _encode(event: str, epoch: str, version: int, data: dict) -> bytes:
+    return (f"id: {epoch}:{version}\nevent: {event}\n"
+            f"data: {json.dumps(data, separators=(',', ':'))}\n\n").encode()
+
+
+def _parse_event_id(event_id: str) -> Tuple[str, int]:
+    # An ID that is not one of ours resumes from no known version
+    epoch, _, version = event_id.rpartition(":")
+    try:
+        return epoch, int(version)
+    except ValueError:
+        return epoch, -1
+
+
+def _catalog_event(changes: ChangeSet) -> bytes:
+    data: Dict[str, Any] = {"version": changes.version, "epoch": changes.epoch, "previous_version": changes.since}
+    for kind in ENTITY_KINDS:
+        if not changes.complete:
+            data[kind] = None
+            continue
+        counts = {"added": 0, "removed": 0, "modified": 0}
+        for change in changes.changes[kind].values():
+            counts[change] += 1
+        data[kind] = counts
+    return _encode("catalog", changes.epoch, changes.version, data)
+
+
+class CatalogEvents:
+    """
+    Broadcasts catalog version changes to the clients of ``GET /watch`` as server-sent events.
+
+    Registered as a CatalogStore listener after the ChangeLog it reads the
+    change counts from. Each event is encoded once, in the thread that
+    published the snapshot, and handed to the event loop. There it is
+    appended to a short ring of recent events and every stream is woken at
+    once by resolving a single future that all idle streams wait on, so an
+    idle client costs one suspended coroutine and an event costs one
+    encoding whatever the number of clients.
+
+    Event IDs are catalog versions qualified by their epoch
+    (``<epoch>:<version>``). A stream resuming from an older version
+    (``Last-Event-ID``), or that fell behind the ring, gets one event
+    summing up the changes since then, or a ``resync`` event if the change
+    log no longer covers that version or it is of another epoch, as after a
+    restart or when reconnecting to another worker process.
+
+    Must be created on the event loop that serves the streams.
+    """
+    def __init__(self, change_log: ChangeLog, max_events: int = 100, heartbeat_interval: float = 15.0):
+        self.change_log = change_log
+        self.heartbeat_interval = heartbeat_interval
+        self.connections = 0
+        self._loop = asyncio.get_running_loop()
+        self._events: Deque[_Event] = deque(maxlen=max_events)
+        self._signal: asyncio.Future = self._loop.create_future()
+        self._closed = False
+        # Newest version handed to the loop, and seen on the loop; versions start at 1, so 0 is none yet
+        self._published_version: int = change_log.version or 0
+        self._published_epoch: str = change_log.epoch or ""
+        self._version = self._published_version
+        self._epoch = self._published_epoch
+
+    def publish(self, snapshot: CatalogSnapshot) -> None:
+        """
+        Broadcast the change from the previously published version to a new snapshot.
+
+        Called in the thread that published the snapshot, after the change log recorded it.
+        """
+        # Versions of another epoch are not comparable: the change from them is unknown
+        previous = self._published_version if snapshot.epoch == self._published_epoch else 0
+        if snapshot.version <= previous:
+            return
+        changes = self.change_log.changes_since(previous, snapshot.epoch)
+        event = _Event(previous, changes.version, changes.epoch, _catalog_event(changes))
+        self._published_version, self._published_epoch = changes.version, changes.epoch
+        self._loop.call_soon_threadsafe(self._append, event)
+
+    def close(self) -> None:
+        """
+        End every open stream. Must be called on the event loop.
+        """
+        self._closed = True
+        self._wake()
+
+    def _append(self, event: _Event) -> None:
+        self._events.append(event)
+        self._version, self._epoch = event.version, event.epoch
+        self._wake()
+
+    def _wake(self) -> None:
+        signal, self._signal = self._signal, self._loop.create_future()
+        signal.set_result(None)
+
+    def _caught_up(self, epoch: str, version: int) -> bool:
+        # A summary from the change log may be ahead of the events handed to the loop, even of a new epoch
+        if epoch == self._epoch:
+            return version >= self._version
+        return epoch == self.change_log.epoch
+
+    def _since(self, epoch: str, version: int) -> Tuple[bytes, str, int]:
+        # The events leading from a version to the newest one, or a summary of them if no longer in the
+        # ring, and the epoch and version they lead to
+        events = [event for event in self._events if event.epoch == epoch and event.version > version]
+        if events and events[0].previous_version == version and epoch == self._epoch:
+            return b"".join(event.body for event in events), epoch, events[-1].version
+        changes = self.change_log.changes_since(version, epoch)
+        if changes.complete:
+            return _catalog_event(changes), changes.epoch, changes.version
+        body = _encode("resync", changes.epoch, changes.version, {
+            "version": changes.version, "epoch": changes.epoch, "oldest_version": changes.oldest_version})
+        return body, changes.epoch, changes.version
+
+    async def stream(self, last_event_id: Optional[str] = None) -> AsyncIterator[bytes]:
+        """
+        Stream the events of a client until it disconnects or the events are closed.
+
+        Args:
+            last_event_id: The ``Last-Event-ID`` of a reconnecting client.
+
+        Yields:
+            Encoded events and heartbeat comments.
+        """
+        self.connections += 1
+        try:
+            epoch, version = self._epoch, self._version
+            if last_event_id is None:
+                yield _encode("ready", epoch, version, {"version": version, "epoch": epoch})
+            elif _parse_event_id(last_event_id) != (epoch, version):
+                body, epoch, version = self._since(*_parse_event_id(last_event_id))
+                yield body
+            while not self._closed:
+                if self._caught_up(epoch, version):
+                    done, _ = await asyncio.wait((self._signal,), timeout=self.heartbeat_interval)
+                    if not done:
+                        yield HEARTBEAT
+                    continue
+                body, epoch, version = self._since(epoch, version)
+                yield body
+        finally:
+            self.connections -= 1
@@ -0,0 +1,36 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import JSONResponse
+
+from app.data.change_log import ChangeLog
+from app.dependencies import get_change_log
+from app.models.changes import ChangeFeed
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+
+
+@router.get("/", response_model=ChangeFeed)
+async def get_changes(
+    since: int = Query(..., ge=0, description="Catalog version held by the client, from /catalog/status or a previous response"),
+    epoch: Optional[str] = Query(None, max_length=64, description="Epoch returned with that version"),
+    change_log: ChangeLog = Depends(get_change_log)
+):
+    """
+    Get the teams, services and runtime components that changed since a catalog version.
+    
+    - **since**: The catalog version the client last synchronized with
+    - **epoch**: The `epoch` returned with that version
+    
+    Returns the IDs of the teams and the names of the services and runtime
+    components added, removed and modified between that version and
+    `version`, the newest one; pass `version` and `epoch` as `since` and
+    `epoch` on the next call. Changed records can then be fetched with the
+    batch endpoints.
+    
+    Versions are counted by each server process from its start, and the
+    epoch tells their histories apart. If `epoch` is missing or is not the
+    one of the process answering (another worker, or before a restart), or
+    `since` is older than `oldest_version`, `resync_required` is true, the
+    lists are empty and the client has to reload the full catalog.
+    """
+    return JSONResponse(change_log.changes_since(since, epoch).as_dict())
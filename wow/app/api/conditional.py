@@ -0,0 +1,89 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Response headers carrying the catalog version a response was read from, and the epoch qualifying it
+CATALOG_VERSION_HEADER = "X-Catalog-Version"
+CATALOG_EPOCH_HEADER = "X-Catalog-Epoch"
+
+# Routes whose GET responses depend on nothing but the request and the catalog content
+CONDITIONAL_PATH_PREFIXES = ("/teams", "/services", "/runtime-components", "/search", "/facets", "/query")
+_CONDITIONAL_SUBPATH_PREFIXES = tuple(f"{prefix}/" for prefix in CONDITIONAL_PATH_PREFIXES)
+
+# Headers of a 200 response kept by the 304 answering it, besides the validators
+_NOT_MODIFIED_HEADERS = ("cache-control", "content-location", "date", "expires")
+
+
+def catalog_etag(content_hash: str) -> str:
+    """
+    Get the entity tag of every response read from the catalog with the given content hash.
+    """
+    return f'W/"{content_hash[:32]}"'
+
+
+def _is_conditional(path: str) -> bool:
+    # Whole path segments only, so "/teamsX" is not a catalog read
+    return path in CONDITIONAL_PATH_PREFIXES or path.startswith(_CONDITIONAL_SUBPATH_PREFIXES)
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison, as required for If-None-Match; only asked once the resource is known to exist
+    opaque = etag[2:]
+    return any(tag.strip() in (etag, opaque, "*") for tag in if_none_match.split(","))
+
+
+class ConditionalGetMiddleware:
+    """
+    Tags catalog responses with the version they were read from and answers conditional GETs.
+
+    A GET under one of ``CONDITIONAL_PATH_PREFIXES`` is pinned to the
+    snapshot current when it arrives (see ``get_catalog``). Its response
+    carries an ``ETag`` derived from the content hash of that snapshot, so
+    the tag of every resource changes exactly when the data file does, and
+    the snapshot version and epoch. When the endpoint answers 200 and the request's
+    ``If-None-Match`` holds that tag, the response is replaced by 304 Not
+    Modified and its body dropped; every other answer, such as a 404 for a
+    missing resource or a 422 for an invalid query, is sent as is.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (scope["type"] != "http"
+                or scope["method"] not in ("GET", "HEAD")
+                or not _is_conditional(scope["path"])):
+            await self.app(scope, receive, send)
+            return
+
+        snapshot = scope["app"].state.catalog_store.current
+        scope.setdefault("state", {})["catalog"] = snapshot
+        validators = {
+            "etag": catalog_etag(snapshot.content_hash),
+            CATALOG_VERSION_HEADER: str(snapshot.version),
+            CATALOG_EPOCH_HEADER: snapshot.epoch,
+            "vary": "Accept",
+        }
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        not_modified = False
+
+        async def send_with_validators(message: Message) -> None:
+            nonlocal not_modified
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = MutableHeaders(scope=message)
+                for name, value in validators.items():
+                    headers[name] = value
+                if if_none_match and _matches(if_none_match, validators["etag"]):
+                    not_modified = True
+                    kept = MutableHeaders()
+                    for name, value in headers.items():
+                        if name in _NOT_MODIFIED_HEADERS:
+                            kept.append(name, value)
+                    for name, value in validators.items():
+                        kept[name] = value
+                    message = {"type": "http.response.start", "status": 304, "headers": kept.raw}
+            elif message["type"] == "http.response.body" and not_modified:
+                if message.get("more_body", False):
+                    return
+                message = {"type": "http.response.body", "body": b""}
+            await send(message)
+
+        await self.app(scope, receive, send_with_validators)
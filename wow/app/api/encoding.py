@@ -0,0 +1,24 @@
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from app.services.views import view_to_dict
+
+# Encodes like JSONResponse, and record views as the dicts they stand for, one at a time as they are met.
+# Catalog content never refers to itself, so containers are not tracked for cycles.
+encode_json = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":"),
+                               check_circular=False, default=view_to_dict).encode
+
+
+class CatalogJSONResponse(JSONResponse):
+    """
+    A JSON response whose content may hold record views (see ``RecordView``).
+
+    The body is byte for byte what JSONResponse would render from the
+    dicts the views stand for, but no view is turned into a dict before
+    the encoder reaches it, and each dict can be freed as soon as it is
+    encoded.
+    """
+    def render(self, content: Any) -> bytes:
+        return encode_json(content).encode("utf-8")
@@ -0,0 +1,53 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+
+from app.dependencies import get_facet_service
+from app.models.facets import FacetCounts
+from app.services.facet_service import FacetService
+
+router = APIRouter(prefix="/facets", tags=["facets"])
+
+
+@router.get("/", response_model=FacetCounts)
+async def get_facets(
+    dims: str = Query(..., min_length=1, description="Comma-separated dimensions to count by, e.g. tech_stack,sla"),
+    entity: str = Query("services", pattern="^(teams|services)$", description="teams or services (default)"),
+    team_id: Optional[str] = Query(None, description="Count only services of this team"),
+    team_name: Optional[str] = Query(None, description="Count only services of teams with this name"),
+    business_segment: Optional[str] = Query(None, description="Count only teams or services in this business segment"),
+    value_stream_name: Optional[str] = Query(None, description="Count only teams or services in this value stream"),
+    sla: Optional[str] = Query(None, description="Count only services with this SLA"),
+    tech_stack: Optional[str] = Query(None, description="Count only services with this tech stack"),
+    team_type: Optional[str] = Query(None, description="Count only teams of this type"),
+    facet_service: FacetService = Depends(get_facet_service)
+):
+    """
+    Count teams or services per value of some of their attributes, instead of downloading and counting them.
+    
+    - **dims**: Dimensions to count by. Services: `tech_stack`, `sla`, `business_segment`, `team_id`, `value_stream`. Teams: `business_segment`, `team_type`, `value_stream`
+    - **entity**: Count `services` (default) or `teams`
+    - **team_id**, **team_name**, **sla**, **tech_stack**: Count only matching services
+    - **team_type**: Count only matching teams
+    - **business_segment**, **value_stream_name**: Count only matching teams or services
+    
+    Returns the number of entities matching the filters (`total`) and, for
+    each dimension, the count per value, largest first. A service counts
+    towards a value stream as it matches the `value_stream_name` filter of
+    `/services`; a team or service with several value streams counts
+    towards each.
+    """
+    dimensions = [dimension.strip() for dimension in dims.split(",") if dimension.strip()]
+    filters = {
+        "team_id": team_id,
+        "team_name": team_name,
+        "business_segment": business_segment,
+        "value_stream_name": value_stream_name,
+        "sla": sla,
+        "tech_stack": tech_stack,
+        "team_type": team_type,
+    }
+    try:
+        return JSONResponse(facet_service.get_facets(entity, dimensions, filters))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
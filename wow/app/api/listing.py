@@ -0,0 +1,94 @@
+from typing import Any, Callable, Collection, Iterable, Iterator, Mapping, Optional
+
+from fastapi import HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from app.api.encoding import CatalogJSONResponse, encode_json
+from app.services.pagination import Page
+from app.services.projection import FieldSpec, parse_fields
+
+# Response header carrying the cursor of the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Bytes of encoded lines collected before a chunk of a streamed response is sent
+NDJSON_CHUNK_SIZE = 64 * 1024
+
+def is_listing_request(fields: Optional[str], limit: Optional[int], cursor: Optional[str]) -> bool:
+    """
+    Check whether a list request asks for a page or a projection.
+    """
+    return bool(fields) or limit is not None or bool(cursor)
+
+
+def parse_fields_param(fields: Optional[str], allowed: Collection[str]) -> Optional[FieldSpec]:
+    """
+    Parse the ``fields`` query parameter.
+
+    Raises:
+        HTTPException: 400 if a field is unknown.
+    """
+    try:
+        return parse_fields(fields, allowed)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def page_response(get_page: Callable[[], Page]) -> CatalogJSONResponse:
+    """
+    Render a page as a JSON list, with the next cursor in a response header.
+
+    Raises:
+        HTTPException: 400 if the request cursor is invalid.
+    """
+    try:
+        page = get_page()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else None
+    return CatalogJSONResponse(page.items, headers=headers)
+
+
+def wants_ndjson(request: Request, response_format: Optional[str]) -> bool:
+    """
+    Check whether a list request asks for newline-delimited JSON, by ``format`` or ``Accept``.
+    """
+    if response_format:
+        return response_format == "ndjson"
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def _ndjson_chunks(items: Iterable[Mapping[str, Any]]) -> Iterator[bytes]:
+    # Encoded like CatalogJSONResponse, one item per line
+    lines = []
+    size = 0
+    for item in items:
+        line = encode_json(item).encode("utf-8") + b"\n"
+        lines.append(line)
+        size += len(line)
+        if size >= NDJSON_CHUNK_SIZE:
+            yield b"".join(lines)
+            lines = []
+            size = 0
+    if lines:
+        yield b"".join(lines)
+
+
+def ndjson_response(get_page: Callable[[], Page]) -> StreamingResponse:
+    """
+    Stream a page as newline-delimited JSON, one item per line.
+
+    Items are produced and encoded while the response is sent, so memory
+    use does not depend on the number of items. The next cursor, if any, is
+    returned in a response header.
+
+    Raises:
+        HTTPException: 400 if the request cursor is invalid.
+    """
+    try:
+        page = get_page()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else None
+    return StreamingResponse(_ndjson_chunks(page.items), media_type=NDJSON_MEDIA_TYPE, headers=headers)
@@ -0,0 +1,122 @@
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.data.catalog import CatalogStore
+from app.metrics import (CATALOG_AGE, CATALOG_ENTITIES, CATALOG_VERSION, HTTP_REQUEST_DURATION, HTTP_REQUESTS,
+                         HTTP_REQUESTS_IN_FLIGHT, HTTP_RESPONSE_SIZE, REGISTRY)
+
+# Content type of the Prometheus text exposition format; the response adds the charset
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+# Route label of requests that matched no route
+UNMATCHED_ROUTE = "unmatched"
+
+# Method labels; any other method is labelled OTHER_METHOD, so clients cannot create series
+METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"))
+OTHER_METHOD = "other"
+
+# Content type of responses left open to push events, whose duration is that of the client's connection
+EVENT_STREAM_CONTENT_TYPE = b"text/event-stream"
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Get the metrics of this process in the Prometheus text format.
+
+    Covers HTTP requests per route template (count by status, latency and
+    response size histograms, requests in flight), the duration of every
+    phase of catalog loads and of service methods, and the version, age and
+    entity counts of the catalog being served.
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def collect_catalog_metrics(store: CatalogStore) -> None:
+    """
+    Set the catalog gauges from the snapshot being served; registered as a collector while the app runs.
+    """
+    if not store.is_loaded():
+        return
+    snapshot = store.current
+    CATALOG_VERSION.set(snapshot.version)
+    CATALOG_AGE.set((datetime.now() - snapshot.loaded_at).total_seconds())
+    index = snapshot.get_index()
+    for entity in ("teams", "services", "components"):
+        CATALOG_ENTITIES.labels(entity).set(len(getattr(index, entity)))
+
+
+class MetricsMiddleware:
+    """
+    Records the latency, response size and status of every HTTP request, per route template.
+
+    Requests are labelled with the path template of the route that handled
+    them (``/teams/{team_id}``), so the number of series stays fixed
+    whatever the paths requested. The route is read from the endpoint the
+    router put in the scope, or matched against the routes when the request
+    was answered before routing (such as a CORS preflight), and methods
+    outside ``METHODS`` are labelled ``other``.
+    Latency runs until the last body chunk is sent, so it covers streamed
+    responses whole; event streams, which last as long as the client stays
+    connected, are counted but not timed. The values of a route are created
+    by its first request; later requests only find them and increment their
+    preallocated counts.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._in_flight = HTTP_REQUESTS_IN_FLIGHT.labels()
+        # Endpoint -> route template, built on the first request once every route is registered
+        self._templates: Optional[Dict[Any, str]] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        size = 0
+        event_stream = False
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status, size, event_stream
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                event_stream = any(name.lower() == b"content-type" and value.startswith(EVENT_STREAM_CONTENT_TYPE)
+                                   for name, value in message.get("headers", ()))
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        self._in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            self._in_flight.dec()
+            method = scope["method"] if scope["method"] in METHODS else OTHER_METHOD
+            route = self._route(scope)
+            if not event_stream:
+                HTTP_REQUEST_DURATION.labels(method, route).observe(time.perf_counter() - start)
+            HTTP_RESPONSE_SIZE.labels(method, route).observe(size)
+            HTTP_REQUESTS.labels(method, route, str(status)).inc()
+
+    def _route(self, scope: Scope) -> str:
+        routes = scope["app"].router.routes
+        if self._templates is None:
+            self._templates = {route.endpoint: route.path for route in routes if hasattr(route, "endpoint")}
+        template = self._templates.get(scope.get("endpoint"))
+        if template is not None:
+            return template
+        for route in routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+        return UNMATCHED_ROUTE
@@ -0,0 +1,55 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+
+from app.api.profiling import PROFILE_TOKEN_HEADER, ProfileStore, matches_token
+from app.dependencies import PROFILING_TOKEN, get_profile_store
+from app.models.profiles import ProfileInfo
+
+
+def verify_profile_token(request: Request) -> None:
+    if not matches_token(PROFILING_TOKEN, request.headers.get(PROFILE_TOKEN_HEADER)):
+        raise HTTPException(status_code=403, detail=f"Missing or invalid {PROFILE_TOKEN_HEADER} header")
+
+
+router = APIRouter(prefix="/profiles", tags=["profiles"], dependencies=[Depends(verify_profile_token)])
+
+
+@router.get("/", response_model=List[ProfileInfo])
+async def list_profiles(profile_store: ProfileStore = Depends(get_profile_store)):
+    """
+    List the profiles of the most recent profiled requests, most recent first.
+    
+    A request is profiled when it sends the `X-Profile` header (`pstats` or
+    `collapsed`) and profiling is enabled with `WOW_PROFILING`; its
+    response carries the profile ID in `X-Profile-Id`.
+    """
+    return JSONResponse(jsonable_encoder([profile.info() for profile in profile_store.list()]))
+
+
+@router.get("/{profile_id}")
+async def get_profile(
+    profile_id: str,
+    response_format: str = Query("raw", alias="format", pattern="^(raw|text)$",
+                                 description="raw (default) to download the profile, text to read it"),
+    limit: int = Query(50, ge=1, le=1000, description="Functions listed in the text of a pstats profile"),
+    profile_store: ProfileStore = Depends(get_profile_store)
+):
+    """
+    Download the profile of a request.
+    
+    - **profile_id**: The `X-Profile-Id` of the profiled response
+    - **format**: `raw` downloads the profile as a pstats file (open it with `python -m pstats` or snakeviz) or as collapsed stacks (for flamegraph.pl or speedscope); `text` lists the functions with the most cumulative time
+    - **limit**: Number of functions listed by `text`
+    """
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Profile with ID {profile_id} not found")
+    if response_format == "text":
+        return PlainTextResponse(profile.text(limit))
+    if profile.format == "collapsed":
+        return PlainTextResponse(profile.data, headers={
+            "Content-Disposition": f'attachment; filename="{profile.id}.collapsed"'})
+    return Response(profile.data, media_type="application/octet-stream", headers={
+        "Content-Disposition": f'attachment; filename="{profile.id}.pstats"'})
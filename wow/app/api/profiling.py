@@ -0,0 +1,238 @@
+import cProfile
+import hmac
+import io
+import marshal
+import pstats
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, cast
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Request header asking for a request to be profiled; its value is the profile format
+PROFILE_HEADER = "X-Profile"
+# Request header carrying the profiling token, when one is configured
+PROFILE_TOKEN_HEADER = "X-Profile-Token"
+# Response header carrying the ID the profile of the request was stored under
+PROFILE_ID_HEADER = "X-Profile-Id"
+# Request header whose value, if valid, is used as the profile ID
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# "pstats" runs the request under cProfile; "collapsed" samples the stack of the event loop thread
+PROFILE_FORMATS = ("pstats", "collapsed")
+
+# Seconds between stack samples of a "collapsed" profile
+SAMPLE_INTERVAL = 0.001
+
+_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+class Profile(NamedTuple):
+    """
+    The profile of one request.
+    """
+    id: str
+    method: str
+    path: str
+    query: str
+    status: int
+    format: str
+    duration_ms: float
+    created_at: datetime
+    # Marshalled pstats data, or collapsed stacks as UTF-8 text
+    data: bytes
+
+    def info(self) -> Dict:
+        """
+        Describe the profile, without its data.
+        """
+        info = self._asdict()
+        del info["data"]
+        info["size"] = len(self.data)
+        return info
+
+    def text(self, limit: int = 50) -> str:
+        """
+        Get the profile as text: the ``limit`` functions with the most cumulative time, or the collapsed stacks.
+        """
+        if self.format == "collapsed":
+            return self.data.decode()
+        output = io.StringIO()
+        # pstats reads the stats attribute of any object it is given, though typed to take a profiler
+        stats = pstats.Stats(cast(cProfile.Profile, _LoadedStats(marshal.loads(self.data))), stream=output)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+        return output.getvalue()
+
+
+class _LoadedStats:
+    # What pstats.Stats reads a profile from, for stats that were marshalled
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+def matches_token(token: Optional[str], given: Optional[str]) -> bool:
+    """
+    Check a token sent by a client against the configured one; any client matches when none is configured.
+    """
+    return token is None or (given is not None and hmac.compare_digest(token.encode(), given.encode()))
+
+
+class ProfileStore:
+    """
+    Keeps the profiles of the most recent profiled requests, by ID.
+    """
+    def __init__(self, max_profiles: int = 20):
+        self.max_profiles = max_profiles
+        self._profiles: "OrderedDict[str, Profile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def add(self, profile: Profile) -> None:
+        with self._lock:
+            self._profiles[profile.id] = profile
+            self._profiles.move_to_end(profile.id)
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        return self._profiles.get(profile_id)
+
+    def list(self) -> List[Profile]:
+        """
+        Get the stored profiles, most recent first.
+        """
+        with self._lock:
+            return list(reversed(self._profiles.values()))
+
+
+class _StackSampler:
+    """
+    Samples the stack of one thread from a background thread, counting collapsed stacks.
+
+    A collapsed stack is the ``module:function`` of every frame from the
+    outermost, joined with ``;``, as read by flame graph tools. While
+    sampling, the interpreter switches threads at least every ``interval``
+    (rather than every 5 ms), so the sampler gets to run while the sampled
+    thread is busy.
+    """
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="wow-profile-sampler", daemon=True)
+        self._switch_interval = sys.getswitchinterval()
+
+    def start(self) -> None:
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self._thread.start()
+
+    def stop(self) -> bytes:
+        """
+        Stop sampling and get the collapsed stacks with their sample counts, one per line, most frequent first.
+        """
+        self._stop.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common()).encode()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+                frame = frame.f_back
+            if names:
+                self.samples[";".join(reversed(names))] += 1
+
+
+class ProfilingMiddleware:
+    """
+    Profiles the requests that ask for it with the ``X-Profile`` header.
+
+    The header's value is the format of the profile: ``pstats`` runs the
+    request under cProfile, ``collapsed`` samples the stack of the event
+    loop thread every millisecond. The profile is stored in the
+    ProfileStore under the request's ``X-Request-ID`` (or a new ID), which
+    is returned in the ``X-Profile-Id`` response header. When a token is
+    configured, only requests sending it in ``X-Profile-Token`` are
+    profiled; others are served as usual.
+
+    One request is profiled at a time; a request asking while another one
+    is profiled is served without a profile. Both profilers see everything
+    the event loop thread runs meanwhile, including other requests.
+
+    Only installed when profiling is enabled, so it costs nothing otherwise.
+    """
+    def __init__(self, app: ASGIApp, store: ProfileStore, token: Optional[str] = None):
+        self.app = app
+        self.store = store
+        self.token = token
+        self._active = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._active:
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        profile_format = headers.get(PROFILE_HEADER)
+        if profile_format is None or not matches_token(self.token, headers.get(PROFILE_TOKEN_HEADER)):
+            await self.app(scope, receive, send)
+            return
+        profile_format = profile_format.strip().lower()
+        if profile_format not in PROFILE_FORMATS:
+            profile_format = PROFILE_FORMATS[0]
+
+        request_id = headers.get(REQUEST_ID_HEADER, "")
+        profile_id = request_id if _REQUEST_ID.match(request_id) else uuid.uuid4().hex
+        status = 500
+
+        async def send_with_profile_id(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message)[PROFILE_ID_HEADER] = profile_id
+            await send(message)
+
+        self._active = True
+        start = time.perf_counter()
+        if profile_format == "pstats":
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            sampler = _StackSampler(threading.get_ident())
+            sampler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            if profile_format == "pstats":
+                profiler.disable()
+                profiler.create_stats()
+                data = marshal.dumps(profiler.stats)
+            else:
+                data = sampler.stop()
+            self._active = False
+            self.store.add(Profile(
+                id=profile_id,
+                method=scope["method"],
+                path=scope["path"],
+                query=scope.get("query_string", b"").decode("latin-1"),
+                status=status,
+                format=profile_format,
+                duration_ms=(time.perf_counter() - start) * 1000,
+                created_at=datetime.now(),
+                data=data,
+            ))
@@ -0,0 +1,40 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.api.encoding import CatalogJSONResponse
+from app.dependencies import get_query_service
+from app.models.query import QueryResult
+from app.services.query_service import QueryService
+
+router = APIRouter(prefix="/query", tags=["query"])
+
+
+@router.get("/", response_model=QueryResult)
+async def query(
+    q: str = Query(..., min_length=1, max_length=2000,
+                   description="Filter expression, e.g. tech_stack = Java AND NOT sla = \"99.9%\""),
+    entity: str = Query("services", pattern="^(teams|services|runtime_components)$",
+                        description="teams, services (default) or runtime_components"),
+    limit: Optional[int] = Query(None, ge=0, description="Maximum number of results to return"),
+    query_service: QueryService = Depends(get_query_service)
+):
+    """
+    Find teams, services or runtime components with a boolean filter expression.
+    
+    - **q**: Comparisons combined with `AND`, `OR`, `NOT` and parentheses, e.g. `business_segment = "Internet Banking Division" AND (tech_stack = Java OR sla IN ("99.9%", "99.95%"))`
+    - **entity**: Return `services` (default), `teams` or `runtime_components`
+    - **limit**: Return at most this many results; `total` still counts every match
+    
+    Comparisons are `field = value`, `field != value`, `field IN (a, b)`
+    and `field NOT IN (a, b)`. Fields: `team_id`, `business_segment`,
+    `team_type`, `value_stream` (of the team), `team_name`, `service_name`,
+    `tech_stack`, `sla`, `value_stream_segment`, `component_name`. Values
+    are exact; quote them when they hold spaces or punctuation. A team
+    field applies to its services and components, and a service or
+    component field matches a team or service when any of its services or
+    components does. Results are in file order.
+    """
+    try:
+        return CatalogJSONResponse(query_service.query(q, entity, limit))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,99 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+from fastapi import Response
+
+from app.api.encoding import CatalogJSONResponse
+from app.data.catalog import CatalogSnapshot
+
+
+class ResponseCache:
+    """
+    Caches the encoded JSON bodies of canonical resources for the current catalog version.
+
+    Bodies are rendered once per snapshot version and returned as raw
+    responses afterwards, skipping JSON encoding entirely. Entries belong to
+    the newest snapshot version seen and are dropped as soon as a newer one
+    is published (see ``invalidate``) or first requested. Requests still
+    running on an older snapshot are rendered but not cached.
+    """
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self.version: Optional[int] = None
+        self._bodies: "OrderedDict[str, bytes]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._bodies)
+
+    def get(self, catalog: CatalogSnapshot, key: str) -> Optional[Response]:
+        """
+        Get the cached response for a resource.
+
+        Args:
+            catalog: The snapshot the request is served from.
+            key: Identifies the resource, e.g. the request path.
+
+        Returns:
+            A JSON response with the encoded body, or None on a miss.
+        """
+        with self._lock:
+            if self.version is None or catalog.version > self.version:
+                self._bodies.clear()
+                self.version = catalog.version
+
+            body = self._bodies.get(key) if catalog.version == self.version else None
+            if body is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._bodies.move_to_end(key)
+        return Response(body, media_type="application/json")
+
+    def put(self, catalog: CatalogSnapshot, key: str, content: Any) -> Response:
+        """
+        Encode a resource, caching the body if it belongs to the current version.
+
+        Args:
+            catalog: The snapshot the content was read from.
+            key: Identifies the resource, e.g. the request path.
+            content: The JSON content of the resource, which may hold record views.
+
+        Returns:
+            A JSON response with the encoded body.
+        """
+        response = CatalogJSONResponse(content)
+        with self._lock:
+            if catalog.version == self.version and self.max_entries > 0:
+                self._bodies[key] = response.body
+                self._bodies.move_to_end(key)
+                if len(self._bodies) > self.max_entries:
+                    self._bodies.popitem(last=False)
+        return response
+
+    def invalidate(self, catalog: CatalogSnapshot) -> None:
+        """
+        Drop every entry older than the given snapshot.
+
+        Registered as a CatalogStore listener so a reload frees the cached
+        bodies immediately.
+        """
+        with self._lock:
+            if self.version is None or catalog.version > self.version:
+                self._bodies.clear()
+                self.version = catalog.version
+
+    def stats(self) -> dict:
+        """
+        Get the cache counters.
+        """
+        return {
+            "version": self.version,
+            "entries": len(self._bodies),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -1,7 +1,11 @@
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 
+from app.api.encoding import CatalogJSONResponse
+from app.api.listing import (is_listing_request, ndjson_response, page_response, parse_fields_param,
+                              wants_ndjson)
 from app.dependencies import get_runtime_component_service
+from app.models.batch import BatchResult, InstanceResolveRequest, RuntimeComponentBatchRequest
 from app.services.runtime_component_service import RuntimeComponentService
 
 router = APIRouter(prefix="/runtime-components", tags=["runtime-components"])
@@ -9,8 +13,14 @@ router = APIRouter(prefix="/runtime-components", tags=["runtime-components"])
 
 @router.get("/", response_model=List[Dict[str, Any]])
 async def get_runtime_components(
+    request: Request,
     component_name: Optional[str] = Query(None, description="Filter by component name (partial match)"),
     service_name: Optional[str] = Query(None, description="Filter by service name"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. component_name,team_id"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of components to return"),
+    cursor: Optional[str] = Query(None, description="Cursor of the page to return, from the X-Next-Cursor header"),
+    response_format: Optional[str] = Query(None, alias="format", pattern="^(json|ndjson)$",
+                                           description="json (default) or ndjson to stream one component per line"),
     runtime_component_service: RuntimeComponentService = Depends(get_runtime_component_service)
 ):
     """
@@ -18,11 +28,56 @@ async def get_runtime_components(
     
     - **component_name**: Filter components by name (partial match)
     - **service_name**: Filter components by service name
+    - **fields**: Return only these fields (comma-separated, dotted paths select nested fields)
+    - **limit**: Return at most this many components; the cursor of the next page is returned in the X-Next-Cursor header
+    - **cursor**: Return the page following the one that returned this cursor
+    - **format**: `ndjson` streams one component per line (also selected by `Accept: application/x-ndjson`)
     """
-    return runtime_component_service.get_all_runtime_components(
+    if wants_ndjson(request, response_format):
+        projection = parse_fields_param(fields, RuntimeComponentService.FIELDS)
+        return ndjson_response(lambda: runtime_component_service.iter_runtime_components_page(
+            component_name=component_name,
+            service_name=service_name,
+            fields=projection,
+            limit=limit,
+            cursor=cursor
+        ))
+        
+    if is_listing_request(fields, limit, cursor):
+        projection = parse_fields_param(fields, RuntimeComponentService.FIELDS)
+        return page_response(lambda: runtime_component_service.get_runtime_components_page(
+            component_name=component_name,
+            service_name=service_name,
+            fields=projection,
+            limit=limit,
+            cursor=cursor
+        ))
+        
+    return CatalogJSONResponse(runtime_component_service.get_all_runtime_components(
         component_name=component_name,
         service_name=service_name
-    )
+    ))
+
+
+@router.get("/resolve", response_model=Dict[str, Any])
+async def resolve_instance(
+    instance: str = Query(..., min_length=1, description="Name of a running instance, e.g. a pod or host name"),
+    runtime_component_service: RuntimeComponentService = Depends(get_runtime_component_service)
+):
+    """
+    Resolve a live instance name to the runtime component it runs, for routing alerts.
+    
+    - **instance**: The instance name; the component with the longest name that is a prefix of it is returned
+    
+    Returns the runtime component with its owning service, team and the team's contact channels.
+    """
+    resolution = runtime_component_service.resolve_instance(instance)
+    if not resolution:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No runtime component matches instance {instance}"
+        )
+    return CatalogJSONResponse(resolution)
 
 
 @router.get("/{component_name}", response_model=Dict[str, Any])
@@ -41,4 +96,36 @@ async def get_runtime_component(
             status_code=404, 
             detail=f"Runtime component with name {component_name} not found"
         )
-    return component
+    return CatalogJSONResponse(component)
+
+
+@router.post(":batch", response_model=BatchResult)
+async def get_runtime_components_batch(
+    batch: RuntimeComponentBatchRequest,
+    runtime_component_service: RuntimeComponentService = Depends(get_runtime_component_service)
+):
+    """
+    Get several runtime components by their names in one request.
+    
+    - **component_names**: The names of the runtime components to retrieve
+    
+    Returns the runtime components found and the names that were not found.
+    """
+    found, not_found = runtime_component_service.get_runtime_components_by_names(batch.component_names)
+    return CatalogJSONResponse({"found": found, "not_found": not_found})
+
+
+@router.post(":resolve", response_model=BatchResult)
+async def resolve_instances(
+    batch: InstanceResolveRequest,
+    runtime_component_service: RuntimeComponentService = Depends(get_runtime_component_service)
+):
+    """
+    Resolve several live instance names to the runtime components they run in one request.
+    
+    - **instances**: The instance names to resolve
+    
+    Returns the resolved instances and the instance names that matched no runtime component.
+    """
+    found, not_found = runtime_component_service.resolve_instances(batch.instances)
+    return CatalogJSONResponse({"found": found, "not_found": not_found})
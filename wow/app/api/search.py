@@ -1,6 +1,8 @@
-from typing import Dict, List, Any
-from fastapi import APIRouter, Depends, Query
+from typing import Dict, List, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 
+from app.api.encoding import CatalogJSONResponse
+from app.data.fuzzy_index import MAX_DISTANCE
 from app.dependencies import get_search_service
 from app.services.search_service import SearchService
 
@@ -10,16 +12,30 @@ router = APIRouter(prefix="/search", tags=["search"])
 @router.get("/", response_model=Dict[str, List[Dict[str, Any]]])
 async def search(
     query: str = Query(..., description="Search query string"),
+    fuzzy: bool = Query(False, description="Match names within an edit distance of the query, closest first"),
+    max_distance: Optional[int] = Query(None, ge=0, le=MAX_DISTANCE,
+                                        description="Largest edit distance of fuzzy matches"),
+    ranked: bool = Query(False, description="Order results by relevance to the words of the query"),
+    limit: Optional[int] = Query(None, ge=1, le=1000,
+                                 description="Maximum number of results of each type (default 10 when ranked)"),
     search_service: SearchService = Depends(get_search_service)
 ):
     """
     Search across teams, services, and runtime components.
     
     - **query**: The search query string
+    - **fuzzy**: Instead of substrings, match team IDs and names, service names and runtime component names within an edit distance of the whole query, e.g. `mortage-procesing` finds `mortgage-processing`; results are ranked by distance
+    - **max_distance**: Largest number of inserted, deleted or replaced characters of a fuzzy match; by default 0 for queries of up to 2 characters, 1 up to 5 and 2 beyond
+    - **ranked**: Instead of substrings, match the words of the query in team names, missions, value stream names and descriptions, service names and tech stacks, and runtime component names, and return the best matches first, scored with BM25; cannot be combined with `fuzzy`
+    - **limit**: Maximum number of results of each type; 10 by default when ranked, all otherwise
     
     Returns a dictionary with search results categorized by type:
     - **teams**: List of teams matching the query
     - **services**: List of services matching the query
     - **runtime_components**: List of runtime components matching the query
     """
-    return search_service.search(query)
+    try:
+        return CatalogJSONResponse(search_service.search(query, fuzzy=fuzzy, max_distance=max_distance,
+                                                  ranked=ranked, limit=limit))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,8 +1,14 @@
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 
-from app.dependencies import get_service_service
+from app.api.encoding import CatalogJSONResponse
+from app.api.listing import (is_listing_request, ndjson_response, page_response, parse_fields_param,
+                              wants_ndjson)
+from app.api.response_cache import ResponseCache
+from app.data.catalog import CatalogSnapshot
+from app.dependencies import get_catalog, get_response_cache, get_service_service
 from app.services.service_service import ServiceService
+from app.models.batch import BatchResult, ServiceBatchRequest
 from app.models.service import Service
 
 router = APIRouter(prefix="/services", tags=["services"])
@@ -10,12 +16,20 @@ router = APIRouter(prefix="/services", tags=["services"])
 
 @router.get("/", response_model=List[Dict[str, Any]])
 async def get_services(
+    request: Request,
     team_id: Optional[str] = Query(None, description="Filter by team ID"),
     team_name: Optional[str] = Query(None, description="Filter by team name"),
     business_segment: Optional[str] = Query(None, description="Filter by business segment"),
     value_stream_name: Optional[str] = Query(None, description="Filter by value stream name"),
     sla: Optional[str] = Query(None, description="Filter by SLA"),
-    service_service: ServiceService = Depends(get_service_service)
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. service_name,team_id,team_name"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of services to return"),
+    cursor: Optional[str] = Query(None, description="Cursor of the page to return, from the X-Next-Cursor header"),
+    response_format: Optional[str] = Query(None, alias="format", pattern="^(json|ndjson)$",
+                                           description="json (default) or ndjson to stream one service per line"),
+    service_service: ServiceService = Depends(get_service_service),
+    catalog: CatalogSnapshot = Depends(get_catalog),
+    response_cache: ResponseCache = Depends(get_response_cache)
 ):
     """
     Get all services, optionally filtered by various criteria.
@@ -25,24 +39,86 @@ async def get_services(
     - **business_segment**: Filter services by business segment
     - **value_stream_name**: Filter services by value stream name
     - **sla**: Filter services by SLA
+    - **fields**: Return only these fields (comma-separated, dotted paths select nested fields)
+    - **limit**: Return at most this many services; the cursor of the next page is returned in the X-Next-Cursor header
+    - **cursor**: Return the page following the one that returned this cursor
+    - **format**: `ndjson` streams one service per line (also selected by `Accept: application/x-ndjson`)
     """
-    return service_service.get_all_services(
+    if wants_ndjson(request, response_format):
+        projection = parse_fields_param(fields, ServiceService.FIELDS)
+        return ndjson_response(lambda: service_service.iter_services_page(
+            team_id=team_id,
+            team_name=team_name,
+            business_segment=business_segment,
+            value_stream_name=value_stream_name,
+            sla=sla,
+            fields=projection,
+            limit=limit,
+            cursor=cursor
+        ))
+        
+    if is_listing_request(fields, limit, cursor):
+        projection = parse_fields_param(fields, ServiceService.FIELDS)
+        return page_response(lambda: service_service.get_services_page(
+            team_id=team_id,
+            team_name=team_name,
+            business_segment=business_segment,
+            value_stream_name=value_stream_name,
+            sla=sla,
+            fields=projection,
+            limit=limit,
+            cursor=cursor
+        ))
+        
+    if not (team_id or team_name or business_segment or value_stream_name or sla):
+        cached = response_cache.get(catalog, "services")
+        if cached is not None:
+            return cached
+        return response_cache.put(catalog, "services", service_service.get_all_services())
+        
+    return CatalogJSONResponse(service_service.get_all_services(
         team_id=team_id,
         team_name=team_name,
         business_segment=business_segment,
         value_stream_name=value_stream_name,
         sla=sla
-    )
+    ))
 
 
 @router.get("/{service_name}", response_model=Dict[str, Any])
-async def get_service(service_name: str, service_service: ServiceService = Depends(get_service_service)):
+async def get_service(
+    service_name: str,
+    service_service: ServiceService = Depends(get_service_service),
+    catalog: CatalogSnapshot = Depends(get_catalog),
+    response_cache: ResponseCache = Depends(get_response_cache)
+):
     """
     Get a service by its name.
     
     - **service_name**: The name of the service to retrieve
     """
+    cache_key = f"services/{service_name}"
+    cached = response_cache.get(catalog, cache_key)
+    if cached is not None:
+        return cached
+        
     service = service_service.get_service_by_name(service_name)
     if not service:
         raise HTTPException(status_code=404, detail=f"Service with name {service_name} not found")
-    return service
+    return response_cache.put(catalog, cache_key, service)
+
+
+@router.post(":batch", response_model=BatchResult)
+async def get_services_batch(
+    batch: ServiceBatchRequest,
+    service_service: ServiceService = Depends(get_service_service)
+):
+    """
+    Get several services by their names in one request.
+    
+    - **service_names**: The names of the services to retrieve
+    
+    Returns the services found and the names that were not found.
+    """
+    found, not_found = service_service.get_services_by_names(batch.service_names)
+    return CatalogJSONResponse({"found": found, "not_found": not_found})
@@ -1,8 +1,14 @@
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 
-from app.dependencies import get_team_service
+from app.api.encoding import CatalogJSONResponse
+from app.api.listing import (is_listing_request, ndjson_response, page_response, parse_fields_param,
+                              wants_ndjson)
+from app.api.response_cache import ResponseCache
+from app.data.catalog import CatalogSnapshot
+from app.dependencies import get_catalog, get_response_cache, get_team_service
 from app.services.team_service import TeamService
+from app.models.batch import TeamBatchRequest, TeamBatchResult
 from app.models.team import Team
 
 router = APIRouter(prefix="/teams", tags=["teams"])
@@ -10,27 +16,82 @@ router = APIRouter(prefix="/teams", tags=["teams"])
 
 @router.get("/", response_model=List[Team])
 async def get_teams(
+    request: Request,
     business_segment: Optional[str] = Query(None, description="Filter by business segment"),
     value_stream_name: Optional[str] = Query(None, description="Filter by value stream name"),
-    team_service: TeamService = Depends(get_team_service)
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. team_id,team_name,team_api.contact_channels"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of teams to return"),
+    cursor: Optional[str] = Query(None, description="Cursor of the page to return, from the X-Next-Cursor header"),
+    response_format: Optional[str] = Query(None, alias="format", pattern="^(json|ndjson)$",
+                                           description="json (default) or ndjson to stream one team per line"),
+    team_service: TeamService = Depends(get_team_service),
+    catalog: CatalogSnapshot = Depends(get_catalog),
+    response_cache: ResponseCache = Depends(get_response_cache)
 ):
     """
     Get all teams, optionally filtered by business segment or value stream.
     
     - **business_segment**: Filter teams by business segment
     - **value_stream_name**: Filter teams by value stream name
+    - **fields**: Return only these fields (comma-separated, dotted paths select nested fields)
+    - **limit**: Return at most this many teams; the cursor of the next page is returned in the X-Next-Cursor header
+    - **cursor**: Return the page following the one that returned this cursor
+    - **format**: `ndjson` streams one team per line (also selected by `Accept: application/x-ndjson`)
     """
-    return team_service.get_all_teams(business_segment, value_stream_name)
+    if wants_ndjson(request, response_format):
+        projection = parse_fields_param(fields, TeamService.FIELDS)
+        return ndjson_response(lambda: team_service.iter_teams_page(
+            business_segment, value_stream_name, fields=projection, limit=limit, cursor=cursor))
+        
+    if is_listing_request(fields, limit, cursor):
+        projection = parse_fields_param(fields, TeamService.FIELDS)
+        return page_response(lambda: team_service.get_teams_page(
+            business_segment, value_stream_name, fields=projection, limit=limit, cursor=cursor))
+        
+    if business_segment or value_stream_name:
+        # The catalog holds teams in validated, serialized form; skip response validation
+        return CatalogJSONResponse(team_service.get_all_teams(business_segment, value_stream_name))
+        
+    cached = response_cache.get(catalog, "teams")
+    if cached is not None:
+        return cached
+    return response_cache.put(catalog, "teams", team_service.get_all_teams())
 
 
 @router.get("/{team_id}", response_model=Team)
-async def get_team(team_id: str, team_service: TeamService = Depends(get_team_service)):
+async def get_team(
+    team_id: str,
+    team_service: TeamService = Depends(get_team_service),
+    catalog: CatalogSnapshot = Depends(get_catalog),
+    response_cache: ResponseCache = Depends(get_response_cache)
+):
     """
     Get a team by its ID.
     
     - **team_id**: The ID of the team to retrieve
     """
+    cache_key = f"teams/{team_id}"
+    cached = response_cache.get(catalog, cache_key)
+    if cached is not None:
+        return cached
+        
     team = team_service.get_team_by_id(team_id)
     if not team:
         raise HTTPException(status_code=404, detail=f"Team with ID {team_id} not found")
-    return team
+    return response_cache.put(catalog, cache_key, team)
+
+
+@router.post(":batch", response_model=TeamBatchResult)
+async def get_teams_batch(
+    batch: TeamBatchRequest,
+    team_service: TeamService = Depends(get_team_service)
+):
+    """
+    Get several teams by their IDs in one request.
+    
+    - **team_ids**: The IDs of the teams to retrieve
+    
+    Returns the teams found and the IDs that were not found.
+    """
+    found, not_found = team_service.get_teams_by_ids(batch.team_ids)
+    return CatalogJSONResponse({"found": found, "not_found": not_found})
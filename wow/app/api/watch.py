@@ -0,0 +1,36 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import StreamingResponse
+
+from app.api.catalog_events import CatalogEvents
+from app.dependencies import get_catalog_events
+
+router = APIRouter(prefix="/watch", tags=["watch"])
+
+
+@router.get("/", response_class=StreamingResponse)
+async def watch_catalog(
+    last_event_id: Optional[str] = Header(None, description="ID of the last event received, to resume after a reconnect"),
+    catalog_events: CatalogEvents = Depends(get_catalog_events)
+):
+    """
+    Stream catalog updates as server-sent events, instead of polling the list endpoints.
+    
+    - **Last-Event-ID**: Resume from the version of the last event received (sent by `EventSource` on reconnect)
+    
+    Event IDs are catalog versions qualified by their epoch, as
+    `<epoch>:<version>`. A new stream starts with a `ready` event holding the
+    version and epoch being served. Every time a new version is loaded, a
+    `catalog` event reports it with the number of teams, services and runtime
+    components added, removed and modified; `/changes?since=&epoch=` lists
+    them. A resumed stream first gets one `catalog` event for everything it
+    missed, or a `resync` event if that is no longer known or the epoch is
+    not the one of this process (another worker, or before a restart), and
+    the full catalog has to be reloaded. Idle streams get a heartbeat comment
+    every `WOW_WATCH_HEARTBEAT_INTERVAL` seconds.
+    """
+    return StreamingResponse(
+        catalog_events.stream(last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,142 @@
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.data.catalog_index import ReadOnlyIndex
+
+# Entities in containment order: teams own services, services own components
+ENTITIES = ("teams", "services", "components")
+
+# Attribute -> (entity carrying it, inverted index of its values)
+ATTRIBUTES: Dict[str, Tuple[str, str]] = {
+    "team_id": ("teams", "teams_by_id"),
+    "business_segment": ("teams", "teams_by_business_segment"),
+    "team_type": ("teams", "teams_by_team_type"),
+    "team_name": ("teams", "teams_by_team_name"),
+    "value_stream": ("teams", "teams_by_value_stream"),
+    "service_name": ("services", "services_by_name"),
+    "tech_stack": ("services", "services_by_tech_stack"),
+    "sla": ("services", "services_by_sla"),
+    "value_stream_segment": ("services", "services_by_value_stream_segment"),
+    "component_name": ("components", "components_by_name"),
+}
+
+# Bitsets of attribute values kept per catalog version
+DEFAULT_CACHE_SIZE = 1024
+
+
+def from_ordinals(ordinals: Iterable[int], size: int) -> int:
+    """
+    Get the bitset with the bits of some ordinals set, as an int.
+    """
+    bits = bytearray((size + 7) >> 3)
+    for ordinal in ordinals:
+        bits[ordinal >> 3] |= 1 << (ordinal & 7)
+    return int.from_bytes(bits, "little")
+
+
+def to_ordinals(bits: int, limit: Optional[int] = None) -> List[int]:
+    """
+    Get the ordinals whose bits are set, ascending, up to ``limit`` of them.
+    """
+    # Set bits are found by a scan of the bit string in C, so the loop runs once per match
+    digits = format(bits, "b")[::-1]
+    ordinals: List[int] = []
+    find = digits.find
+    position = find("1")
+    while position >= 0 and (limit is None or len(ordinals) < limit):
+        ordinals.append(position)
+        position = find("1", position + 1)
+    return ordinals
+
+
+class BitsetIndex:
+    """
+    Bitsets over the entity ordinals of one catalog version, for boolean queries.
+
+    The bitset of an attribute value has the bit of every team, service or
+    component carrying it set, and is an int, so AND, OR and NOT of
+    filters are single word-parallel operations. A value is looked up in
+    the inverted index of its attribute and converted on first use, at a
+    cost proportional to its posting list; the most recently used bitsets
+    are kept.
+
+    Attributes of an entity apply to everything it owns (a service is in
+    the business segment of its team), and attributes of owned entities
+    to their owner when any of them carries the value (a team has a Java
+    service). Both follow from teams, services and components being
+    numbered in file order, so an owner's children are a contiguous range.
+    """
+    def __init__(self, index: ReadOnlyIndex, cache_size: int = DEFAULT_CACHE_SIZE):
+        self._index = index
+        self._cache: "OrderedDict[Tuple[str, str, str], int]" = OrderedDict()
+        self._cache_size = cache_size
+        self._parents: Dict[str, Sequence[int]] = {}
+        self._lock = threading.Lock()
+
+    def size(self, entity: str) -> int:
+        """
+        Get the number of teams, services or components.
+        """
+        return len(getattr(self._index, entity))
+
+    def all(self, entity: str) -> int:
+        """
+        Get the bitset with the bit of every entity set.
+        """
+        return (1 << self.size(entity)) - 1
+
+    def bitset(self, entity: str, attribute: str, value: str) -> int:
+        """
+        Get the bitset of the entities matching an attribute value.
+
+        Args:
+            entity: One of ``ENTITIES``.
+            attribute: One of ``ATTRIBUTES``.
+            value: The exact value.
+
+        Raises:
+            KeyError: If the entity or attribute is unknown.
+        """
+        key = (entity, attribute, value)
+        cache = self._cache
+        with self._lock:
+            bits = cache.get(key)
+            if bits is not None:
+                cache.move_to_end(key)
+                return bits
+        bits = self._build(entity, attribute, value)
+        with self._lock:
+            cache[key] = bits
+            if len(cache) > self._cache_size:
+                cache.popitem(last=False)
+        return bits
+
+    def _build(self, entity: str, attribute: str, value: str) -> int:
+        owner, posting_map = ATTRIBUTES[attribute]
+        level, owner_level = ENTITIES.index(entity), ENTITIES.index(owner)
+        ordinals: Iterable[int] = getattr(self._index, posting_map).get(value, ())
+        # Down to the children of the matching owners, or up to the owners of the matching children
+        while owner_level < level:
+            owner_level += 1
+            ordinals = self._children(ENTITIES[owner_level], ordinals)
+        while owner_level > level:
+            parents = self._parent_ordinals(ENTITIES[owner_level])
+            ordinals = {parents[ordinal] for ordinal in ordinals}
+            owner_level -= 1
+        return from_ordinals(ordinals, self.size(entity))
+
+    def _children(self, entity: str, parent_ordinals: Iterable[int]) -> List[int]:
+        parents = self._parent_ordinals(entity)
+        children: List[int] = []
+        for parent in parent_ordinals:
+            start = bisect_left(parents, parent)
+            children.extend(range(start, bisect_left(parents, parent + 1, start)))
+        return children
+
+    def _parent_ordinals(self, entity: str) -> Sequence[int]:
+        parents = self._parents.get(entity)
+        if parents is None:
+            parents = self._parents[entity] = self._index.parent_ordinals(entity)
+        return parents
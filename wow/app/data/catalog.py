@@ -0,0 +1,391 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Protocol
+
+from app.data.bitsets import BitsetIndex
+from app.data.catalog_delta import CatalogDelta
+from app.data.catalog_index import CatalogIndex, ReadOnlyIndex
+from app.data.facets import FacetTables
+from app.data.fuzzy_index import FuzzyNames
+from app.data.json_loader import JsonLoader
+from app.data.mapped_catalog import open_mapped_catalog
+from app.data.snapshot_file import read_compiled_snapshot
+from app.data.text_index import TextIndexes
+from app.metrics import CATALOG_LOAD_PHASE_DURATION, CATALOG_LOADS, timed
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogSource(Protocol):
+    """
+    Anything the services can read catalog data from (a snapshot or a loader).
+    """
+    def get_data(self) -> Dict[str, Any]:
+        ...
+
+    def get_index(self) -> ReadOnlyIndex:
+        ...
+
+
+class SourceFingerprint(NamedTuple):
+    """
+    Identifies one revision of the data file on disk.
+    """
+    mtime_ns: int
+    size: int
+    content_hash: str
+
+    @classmethod
+    def from_path(cls, file_path: str) -> "SourceFingerprint":
+        """
+        Stat and hash the file at the given path.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        stat = os.stat(file_path)
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return cls(stat.st_mtime_ns, stat.st_size, digest.hexdigest())
+
+
+class CatalogSnapshot:
+    """
+    An immutable, validated copy of the catalog at one point in time,
+    together with the lookup index built over it.
+
+    Snapshots are never modified after construction; a reload builds a new
+    snapshot and swaps it in, so a request holding a reference keeps reading
+    a consistent version for its whole lifetime.
+    """
+    def __init__(self,
+                 data: Dict[str, Any],
+                 version: int,
+                 fingerprint: SourceFingerprint,
+                 loaded_at: Optional[datetime] = None,
+                 index: Optional[ReadOnlyIndex] = None,
+                 source: str = "json",
+                 team_fingerprints: Optional[List[bytes]] = None,
+                 delta: Optional[CatalogDelta] = None,
+                 facets: Optional[FacetTables] = None,
+                 fuzzy_names: Optional[FuzzyNames] = None,
+                 text_indexes: Optional[TextIndexes] = None,
+                 epoch: str = ""):
+        self._data = data
+        self._index: ReadOnlyIndex = index if index is not None else CatalogIndex(data)
+        self._facets = facets if facets is not None else FacetTables(self._index)
+        self._bitsets = BitsetIndex(self._index)
+        self._fuzzy_names = fuzzy_names if fuzzy_names is not None else FuzzyNames(self._index)
+        self._text_indexes = text_indexes if text_indexes is not None else TextIndexes(self._index)
+        self.version = version
+        # The history the version belongs to, see CatalogStore.epoch
+        self.epoch = epoch
+        self.fingerprint = fingerprint
+        self.loaded_at = loaded_at or datetime.now()
+        # "json", "compiled" or "mapped", depending on how the snapshot was read
+        self.source = source
+        # Fingerprints of the team records in the data file, if it was read
+        self.team_fingerprints = team_fingerprints
+        # How this snapshot differs from the previous one, if it was loaded as a change to it
+        self.delta = delta
+
+    @property
+    def content_hash(self) -> str:
+        return self.fingerprint.content_hash
+
+    def get_data(self) -> Dict[str, Any]:
+        """
+        Get the catalog data. Callers must treat it as read-only.
+        """
+        return self._data
+
+    def get_index(self) -> ReadOnlyIndex:
+        """
+        Get the lookup index built for this snapshot.
+        """
+        return self._index
+
+    def get_facets(self) -> FacetTables:
+        """
+        Get the facet tables built over the index of this snapshot.
+        """
+        return self._facets
+
+    def get_bitsets(self) -> BitsetIndex:
+        """
+        Get the bitsets of attribute values over the index of this snapshot.
+        """
+        return self._bitsets
+
+    def get_fuzzy_names(self) -> FuzzyNames:
+        """
+        Get the fuzzy name indexes built over the index of this snapshot.
+        """
+        return self._fuzzy_names
+
+    def get_text_indexes(self) -> TextIndexes:
+        """
+        Get the ranked text indexes built over the index of this snapshot.
+        """
+        return self._text_indexes
+
+
+class CatalogStore:
+    """
+    Owns the current catalog snapshot for the whole process.
+
+    The store loads the data file once and hands the same snapshot to every
+    request. Reloads build and validate a complete new snapshot before
+    publishing it with a single reference assignment; a failed reload keeps
+    the last good snapshot and records the error.
+
+    If a compiled snapshot file (see ``compile_catalog.py``) was compiled from
+    the current contents of the data file, it is loaded instead, skipping
+    parsing, validation and index construction. With ``mapped`` set, the
+    snapshot file is memory-mapped and read in place instead of being loaded,
+    so every process serving the same file shares one copy of the catalog.
+
+    Otherwise a reload after a snapshot read from the data file only
+    validates and re-indexes the teams whose record changed, and reuses the
+    rest of the previous snapshot (see ``JsonLoader.load_delta``).
+    """
+    def __init__(self,
+                 file_path: str,
+                 loader_factory: Callable[[str], JsonLoader] = JsonLoader,
+                 compiled_path: Optional[str] = None,
+                 mapped: bool = False):
+        self.file_path = file_path
+        self.compiled_path = compiled_path
+        self.mapped = mapped
+        self._loader_factory = loader_factory
+        self._snapshot: Optional[CatalogSnapshot] = None
+        # Versions count the loads of this store only, so they are qualified by an ID of its history: a
+        # version from another worker process or from before a restart has another epoch
+        self.epoch = uuid.uuid4().hex[:16]
+        self._reload_lock = threading.Lock()
+        self.last_error: Optional[str] = None
+        self.last_error_at: Optional[datetime] = None
+        self.reload_count = 0
+        self._listeners: List[Callable[[CatalogSnapshot], None]] = []
+
+    def subscribe(self, listener: Callable[[CatalogSnapshot], None]) -> None:
+        """
+        Register a callback invoked with every newly published snapshot.
+
+        Listeners run in the thread that published the snapshot, after the
+        swap; an exception in a listener is logged and does not affect others.
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[CatalogSnapshot], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    @property
+    def current(self) -> CatalogSnapshot:
+        """
+        Get the snapshot currently being served.
+
+        Raises:
+            RuntimeError: If no snapshot has been loaded yet.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            raise RuntimeError("Catalog has not been loaded")
+        return snapshot
+
+    def is_loaded(self) -> bool:
+        return self._snapshot is not None
+
+    def load(self) -> CatalogSnapshot:
+        """
+        Build a snapshot from the data file and publish it.
+
+        Returns:
+            CatalogSnapshot: The newly published snapshot.
+
+        Raises:
+            FileNotFoundError: If the data file does not exist.
+            ValueError: If the data file is invalid.
+        """
+        with self._reload_lock:
+            snapshot = self._build_snapshot()
+            self._publish(snapshot)
+            return snapshot
+
+    def reload(self) -> bool:
+        """
+        Rebuild the snapshot, keeping the current one if that fails.
+
+        Returns:
+            bool: True if a new snapshot was published, False otherwise.
+        """
+        with self._reload_lock:
+            try:
+                snapshot = self._build_snapshot()
+            except Exception as e:
+                CATALOG_LOADS.labels("failed").inc()
+                self.last_error = str(e)
+                self.last_error_at = datetime.now()
+                logger.error("Catalog reload failed, keeping version %s: %s",
+                             self._snapshot.version if self._snapshot else None, e)
+                return False
+            self._publish(snapshot)
+            return True
+
+    def _build_snapshot(self) -> CatalogSnapshot:
+        fingerprint = SourceFingerprint.from_path(self.file_path)
+        version = self._snapshot.version + 1 if self._snapshot else 1
+        if self.compiled_path:
+            start = time.perf_counter()
+            if self.mapped:
+                compiled = open_mapped_catalog(self.compiled_path, fingerprint.content_hash)
+            else:
+                compiled = read_compiled_snapshot(self.compiled_path, fingerprint.content_hash)
+            if compiled is not None:
+                # Only snapshots actually used are timed; a missing or stale one is not a load phase
+                CATALOG_LOAD_PHASE_DURATION.labels("compiled").observe(time.perf_counter() - start)
+                index = compiled.catalog_index
+                if self.mapped:
+                    # Every worker mapping the file would build and hold its own copy of the tables derived
+                    # from the index, whether asked for them or not; they are built on first use instead
+                    return CatalogSnapshot(compiled.data, version, fingerprint, index=index, source="mapped",
+                                           epoch=self.epoch)
+                return CatalogSnapshot(compiled.data, version, fingerprint, index=index, source="compiled",
+                                       epoch=self.epoch, facets=self._build_facets(index),
+                                       fuzzy_names=self._build_fuzzy_names(index),
+                                       text_indexes=self._build_text_indexes(index))
+            if self.mapped:
+                logger.warning("No up-to-date compiled snapshot at %s, loading %s into memory",
+                               self.compiled_path, self.file_path)
+        loader = self._loader_factory(self.file_path)
+        previous = self._snapshot
+        previous_index = previous.get_index() if previous is not None else None
+        # Only a snapshot read from the data file, into memory, can be updated by a delta
+        if (previous is not None and previous.team_fingerprints is not None
+                and isinstance(previous_index, CatalogIndex)):
+            data = loader.load_delta(previous.get_data()["teams"], previous.team_fingerprints, previous_index)
+        else:
+            data = loader.load()
+        with timed(CATALOG_LOAD_PHASE_DURATION, "index"):
+            index = loader.get_index()
+        return CatalogSnapshot(data, version, fingerprint, index=index, epoch=self.epoch,
+                               team_fingerprints=loader.team_fingerprints, delta=loader.delta,
+                               facets=self._build_facets(index), fuzzy_names=self._build_fuzzy_names(index),
+                               text_indexes=self._build_text_indexes(index))
+
+    def _build_facets(self, index: ReadOnlyIndex) -> FacetTables:
+        # Built with the snapshot, off the request path, reusing the entries of unchanged values
+        previous = self._snapshot
+        facets = FacetTables(index, previous.get_facets() if previous is not None else None)
+        with timed(CATALOG_LOAD_PHASE_DURATION, "facets"):
+            facets.build()
+        return facets
+
+    @staticmethod
+    def _build_fuzzy_names(index: ReadOnlyIndex) -> FuzzyNames:
+        fuzzy_names = FuzzyNames(index)
+        with timed(CATALOG_LOAD_PHASE_DURATION, "fuzzy_index"):
+            fuzzy_names.build()
+        return fuzzy_names
+
+    @staticmethod
+    def _build_text_indexes(index: ReadOnlyIndex) -> TextIndexes:
+        text_indexes = TextIndexes(index)
+        with timed(CATALOG_LOAD_PHASE_DURATION, "text_index"):
+            text_indexes.build()
+        return text_indexes
+
+    def _publish(self, snapshot: CatalogSnapshot) -> None:
+        if self._snapshot is not None:
+            self.reload_count += 1
+        self._snapshot = snapshot
+        CATALOG_LOADS.labels("published").inc()
+        self.last_error = None
+        self.last_error_at = None
+        logger.info("Catalog version %s published (%s)", snapshot.version, snapshot.content_hash[:12])
+        if snapshot.delta is not None:
+            delta = snapshot.delta
+            logger.info("Catalog version %s: %d teams added, %d removed, %d changed, %d re-indexed",
+                        snapshot.version, len(delta.added), len(delta.removed), len(delta.changed),
+                        delta.reindexed)
+        for listener in self._listeners:
+            try:
+                listener(snapshot)
+            except Exception:
+                logger.exception("Catalog listener failed for version %s", snapshot.version)
+
+
+class CatalogWatcher:
+    """
+    Polls the data file in a background thread and reloads the store on change.
+
+    A cheap stat (mtime and size) is taken on every poll; the file is only
+    hashed when the stat changes, and only reloaded when the hash differs
+    from the snapshot being served.
+    """
+    def __init__(self, store: CatalogStore, interval: float = 2.0):
+        self.store = store
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_stat: Optional[tuple] = None
+
+    def check(self) -> bool:
+        """
+        Poll the data file once.
+
+        Returns:
+            bool: True if the store was reloaded with a new snapshot.
+        """
+        try:
+            stat = os.stat(self.store.file_path)
+        except OSError as e:
+            self.store.last_error = str(e)
+            self.store.last_error_at = datetime.now()
+            self._last_stat = None
+            return False
+
+        current_stat = (stat.st_mtime_ns, stat.st_size)
+        if current_stat == self._last_stat:
+            return False
+        self._last_stat = current_stat
+
+        if self.store.is_loaded():
+            fingerprint = self.store.current.fingerprint
+            if (fingerprint.mtime_ns, fingerprint.size) == current_stat:
+                return False
+            try:
+                if SourceFingerprint.from_path(self.store.file_path).content_hash == fingerprint.content_hash:
+                    return False
+            except OSError:
+                return False
+
+        return self.store.reload()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="catalog-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Catalog watcher poll failed")
@@ -0,0 +1,251 @@
+import hashlib
+import json
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from app.data.catalog_index import POSTING_MAPS, SEARCH_INDEXES, CatalogIndex
+from app.data.postings import POSTING_TYPECODE, Postings
+from app.data.trigram_index import TrigramIndex
+
+_TEAM, _SERVICE, _COMPONENT = range(3)
+
+# What the ordinals of each inverted and trigram index number
+_ORDINAL_KINDS = {
+    name: _TEAM if name.startswith("team") else _SERVICE if name.startswith("service") else _COMPONENT
+    for name in POSTING_MAPS + SEARCH_INDEXES
+}
+
+# Point lookup -> inverted index holding every ordinal of its keys, and the entities they number
+_LOOKUPS = (
+    ("team_by_id", "teams_by_id", "teams"),
+    ("service_by_name", "services_by_name", "services"),
+    ("component_by_name", "components_by_name", "components"),
+)
+
+
+def team_fingerprint(team: Any) -> bytes:
+    """
+    Get a digest of a team record as read from the data file, before validation.
+    """
+    return hashlib.blake2b(json.dumps(team, separators=(",", ":")).encode(), digest_size=16).digest()
+
+
+class CatalogDelta(NamedTuple):
+    """
+    How a reloaded catalog differs from the version it replaced.
+    """
+    # Team IDs, in file order
+    added: List[str]
+    removed: List[str]
+    changed: List[str]
+    # Teams taken over from the previous version without validating them again
+    reused: int
+    # Teams whose index entries were rebuilt
+    reindexed: int
+
+
+class _Renumbering(NamedTuple):
+    """
+    How the ordinals of one kind of entity move between two versions of an index.
+    """
+    # Ordinal in the index of the removed teams -> old ordinal, and of the added teams -> new ordinal
+    removed: List[int]
+    added: List[int]
+    # Old ordinals from segment_starts[i] up to the next start move by deltas[i]
+    segment_starts: List[int]
+    deltas: List[int]
+    # The first old ordinal that moves, if any
+    first_moved: Optional[int]
+
+
+def _sizes(team: Dict[str, Any]) -> Tuple[int, int, int]:
+    services = team["services_applications"]
+    return 1, len(services), sum(len(service["runtime_components"]) for service in services)
+
+
+def _starts(sizes: List[Tuple[int, int, int]]) -> Tuple[List[int], List[int], List[int]]:
+    # First team, service and component ordinal of each team, and the totals after the last
+    starts: Tuple[List[int], List[int], List[int]] = ([0], [0], [0])
+    for team_sizes in sizes:
+        for kind_starts, size in zip(starts, team_sizes):
+            kind_starts.append(kind_starts[-1] + size)
+    return starts
+
+
+def update_index(index: CatalogIndex, teams: List[Dict[str, Any]]) -> Tuple[CatalogIndex, int]:
+    """
+    Derive the index of a new version of the catalog from the index of the previous one.
+
+    Teams are compared by identity: a team dict taken over from the previous
+    version is unchanged. Only the teams that were added, removed or
+    replaced by a changed record are indexed; the entries of unchanged teams
+    are kept and, where teams before them gained or lost services or
+    components, renumbered. Everything left untouched is shared with the
+    previous index, which is not modified.
+
+    Args:
+        index: The index of the previous version.
+        teams: The validated teams of the new version.
+
+    Returns:
+        The new index, and the number of teams that were indexed.
+    """
+    previous_teams = index.teams
+    previous_positions = {id(team): position for position, team in enumerate(previous_teams)}
+
+    # Previous position of each unchanged team; unchanged teams that moved are re-indexed
+    matches: List[Optional[int]] = []
+    last_match = -1
+    for team in teams:
+        position = previous_positions.get(id(team))
+        if position is not None and position > last_match:
+            last_match = position
+        else:
+            position = None
+        matches.append(position)
+    matched = set(match for match in matches if match is not None)
+    removed_teams = [team for position, team in enumerate(previous_teams) if position not in matched]
+    added_teams = [team for team, match in zip(teams, matches) if match is None]
+
+    previous_sizes = [_sizes(team) for team in previous_teams]
+    added_sizes = [_sizes(team) for team in added_teams]
+    previous_starts = _starts(previous_sizes)
+    added_starts = _starts(added_sizes)
+    added_positions = iter(range(len(added_teams)))
+    starts = _starts([previous_sizes[match] if match is not None else added_sizes[next(added_positions)]
+                      for match in matches])
+    renumberings = [_renumbering(previous_starts[kind], starts[kind], matches, len(previous_teams))
+                    for kind in (_TEAM, _SERVICE, _COMPONENT)]
+
+    # Indexes over just the teams that leave and enter
+    removed = CatalogIndex({"teams": removed_teams})
+    added = CatalogIndex({"teams": added_teams})
+
+    # Runs of consecutive teams from the previous index or the added teams, in file order
+    runs: List[Tuple[bool, int, int]] = []
+    added_count = 0
+    for match in matches:
+        is_match = match is not None
+        source_position = added_count if match is None else match
+        if runs and runs[-1][0] == is_match and runs[-1][2] == source_position:
+            runs[-1] = (is_match, runs[-1][1], source_position + 1)
+        else:
+            runs.append((is_match, source_position, source_position + 1))
+        if not is_match:
+            added_count += 1
+
+    def assemble(kind: int, previous_items: Sequence, added_items: Sequence) -> list:
+        items: List[Any] = []
+        for is_match, start, end in runs:
+            if is_match:
+                items.extend(previous_items[previous_starts[kind][start]:previous_starts[kind][end]])
+            else:
+                items.extend(added_items[added_starts[kind][start]:added_starts[kind][end]])
+        return items
+
+    def patch(name: str, previous_postings: Postings, removed_postings: Postings, added_postings: Postings):
+        return _patch_postings(previous_postings, removed_postings, added_postings,
+                               renumberings[_ORDINAL_KINDS[name]])
+
+    updated = CatalogIndex()
+    updated.teams = teams
+    updated.services = assemble(_SERVICE, index.services, added.services)
+    updated.components = assemble(_COMPONENT, index.components, added.components)
+    for name in POSTING_MAPS:
+        setattr(updated, name, patch(name, getattr(index, name), getattr(removed, name), getattr(added, name)))
+    for name in SEARCH_INDEXES:
+        search, added_search = getattr(index, name), getattr(added, name)
+        documents = assemble(_ORDINAL_KINDS[name], search.documents, added_search.documents)
+        postings = patch(name, search.postings, getattr(removed, name).postings, added_search.postings)
+        setattr(updated, name, TrigramIndex.from_documents(documents, postings))
+
+    # Lookups keep the first occurrence of a key, which the inverted index of the key gives
+    for lookup, postings_name, entities_name in _LOOKUPS:
+        values = dict(getattr(index, lookup))
+        postings, entities = getattr(updated, postings_name), getattr(updated, entities_name)
+        for key in getattr(removed, lookup).keys() | getattr(added, lookup).keys():
+            ordinals = postings.get(key)
+            if ordinals:
+                values[key] = entities[ordinals[0]]
+            else:
+                values.pop(key, None)
+        setattr(updated, lookup, values)
+    updated.component_prefixes = index.component_prefixes.updated({
+        key: updated.component_by_name.get(key)
+        for key in removed.component_by_name.keys() | added.component_by_name.keys()
+    })
+
+    return updated, len(added_teams)
+
+
+def _renumbering(previous_starts: List[int],
+                 starts: List[int],
+                 matches: List[Optional[int]],
+                 previous_count: int) -> _Renumbering:
+    positions: List[Optional[int]] = [None] * previous_count
+    for position, match in enumerate(matches):
+        if match is not None:
+            positions[match] = position
+
+    removed: List[int] = []
+    segment_starts, deltas = [0], [0]
+    first_moved = None
+    for previous_position, new_position in enumerate(positions):
+        start, end = previous_starts[previous_position], previous_starts[previous_position + 1]
+        if new_position is None:
+            removed.extend(range(start, end))
+            continue
+        delta = starts[new_position] - start
+        if delta != deltas[-1]:
+            segment_starts.append(start)
+            deltas.append(delta)
+        if delta and first_moved is None and end > start:
+            first_moved = start
+
+    added: List[int] = []
+    for position, match in enumerate(matches):
+        if match is None:
+            added.extend(range(starts[position], starts[position + 1]))
+    return _Renumbering(removed, added, segment_starts, deltas, first_moved)
+
+
+def _renumber(ordinals: array, renumbering: _Renumbering) -> array:
+    segment_starts, deltas = renumbering.segment_starts, renumbering.deltas
+    position = bisect_left(ordinals, renumbering.first_moved)
+    renumbered = ordinals[:position]
+    while position < len(ordinals):
+        segment = bisect_right(segment_starts, ordinals[position]) - 1
+        if segment + 1 < len(segment_starts):
+            end = bisect_left(ordinals, segment_starts[segment + 1], position)
+        else:
+            end = len(ordinals)
+        if deltas[segment]:
+            renumbered.extend(array(POSTING_TYPECODE, map(deltas[segment].__add__, ordinals[position:end])))
+        else:
+            renumbered.extend(ordinals[position:end])
+        position = end
+    return renumbered
+
+
+def _patch_postings(previous: Postings, removed: Postings, added: Postings, renumbering: _Renumbering) -> Postings:
+    postings = dict(previous)
+    keys = removed.keys() | added.keys()
+    first_moved = renumbering.first_moved
+    if first_moved is not None:
+        keys.update(key for key, ordinals in previous.items() if ordinals[-1] >= first_moved)
+
+    for key in keys:
+        ordinals = array(POSTING_TYPECODE, previous.get(key, ()))
+        # Removed ordinals go before renumbering, while they still identify the removed teams
+        for ordinal in reversed(removed.get(key, ())):
+            del ordinals[bisect_left(ordinals, renumbering.removed[ordinal])]
+        if first_moved is not None and ordinals and ordinals[-1] >= first_moved:
+            ordinals = _renumber(ordinals, renumbering)
+        for ordinal in added.get(key, ()):
+            insort(ordinals, renumbering.added[ordinal])
+        if ordinals:
+            postings[key] = ordinals
+        else:
+            postings.pop(key, None)
+    return postings
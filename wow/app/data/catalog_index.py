@@ -0,0 +1,317 @@
+from array import array
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Protocol, Sequence, Tuple
+
+from app.data.postings import POSTING_TYPECODE, Postings, add_posting, intersect_postings
+from app.data.prefix_trie import PrefixTrie
+from app.data.trigram_index import TrigramIndex
+
+
+class ServiceRef(NamedTuple):
+    """
+    A service together with the team that owns it.
+    """
+    team: Dict[str, Any]
+    service: Dict[str, Any]
+
+
+class ComponentRef(NamedTuple):
+    """
+    A runtime component name together with its owning service and team.
+    """
+    component_name: str
+    team: Dict[str, Any]
+    service: Dict[str, Any]
+
+
+# Inverted indexes (value -> sorted ordinals), see CatalogIndex
+POSTING_MAPS = (
+    "teams_by_id",
+    "teams_by_business_segment",
+    "teams_by_value_stream",
+    "teams_by_team_type",
+    "teams_by_team_name",
+    "services_by_name",
+    "services_by_team_id",
+    "services_by_team_name",
+    "services_by_business_segment",
+    "services_by_team_value_stream",
+    "services_by_value_stream_segment",
+    "services_by_tech_stack",
+    "services_by_sla",
+    "components_by_name",
+    "components_by_service_name",
+)
+
+# Trigram indexes over the searchable text fields, see CatalogIndex
+SEARCH_INDEXES = ("team_search", "service_search", "component_search")
+
+
+class SubstringSearch(Protocol):
+    """
+    Case-insensitive substring search over the texts of one kind of entity, by ordinal (see ``TrigramIndex``).
+    """
+    def __len__(self) -> int:
+        ...
+
+    def document(self, ordinal: int) -> Tuple[str, ...]:
+        ...
+
+    def search(self, query: str) -> List[int]:
+        ...
+
+
+class ReadOnlyIndex(Protocol):
+    """
+    The lookup structures services read, whether built in memory (``CatalogIndex``) or mapped from a snapshot.
+
+    Entities are sequences indexed by ordinal, and lookups and inverted
+    indexes are mappings; nothing is changed through them. The attribute
+    filters are implemented here, once, over these members.
+    """
+    teams: Sequence[Dict[str, Any]]
+    services: Sequence[ServiceRef]
+    components: Sequence[ComponentRef]
+
+    team_by_id: Mapping[str, Dict[str, Any]]
+    service_by_name: Mapping[str, ServiceRef]
+    component_by_name: Mapping[str, ComponentRef]
+
+    teams_by_id: Mapping[str, Sequence[int]]
+    teams_by_business_segment: Mapping[str, Sequence[int]]
+    teams_by_value_stream: Mapping[str, Sequence[int]]
+    teams_by_team_type: Mapping[str, Sequence[int]]
+    teams_by_team_name: Mapping[str, Sequence[int]]
+    services_by_name: Mapping[str, Sequence[int]]
+    services_by_team_id: Mapping[str, Sequence[int]]
+    services_by_team_name: Mapping[str, Sequence[int]]
+    services_by_business_segment: Mapping[str, Sequence[int]]
+    services_by_team_value_stream: Mapping[str, Sequence[int]]
+    services_by_value_stream_segment: Mapping[str, Sequence[int]]
+    services_by_tech_stack: Mapping[str, Sequence[int]]
+    services_by_sla: Mapping[str, Sequence[int]]
+    components_by_name: Mapping[str, Sequence[int]]
+    components_by_service_name: Mapping[str, Sequence[int]]
+
+    team_search: SubstringSearch
+    service_search: SubstringSearch
+    component_search: SubstringSearch
+
+    def resolve_component(self, instance: str) -> Optional[ComponentRef]:
+        """
+        Get the component with the longest name that is a prefix of an instance name.
+        """
+        ...
+
+    def parent_ordinals(self, entity: str) -> Sequence[int]:
+        """
+        Get the ordinal of the owning team of every service, or of the owning service of every component.
+
+        Args:
+            entity: "services" or "components".
+
+        Raises:
+            KeyError: If the entity has no owner.
+        """
+        ...
+
+    def find_teams(self,
+                   business_segment: Optional[str] = None,
+                   value_stream_name: Optional[str] = None,
+                   team_type: Optional[str] = None) -> List[int]:
+        """
+        Get the ordinals of teams matching all given filters.
+        """
+        postings: List[Sequence[int]] = []
+        if business_segment:
+            postings.append(self.teams_by_business_segment.get(business_segment, []))
+        if value_stream_name:
+            postings.append(self.teams_by_value_stream.get(value_stream_name, []))
+        if team_type:
+            postings.append(self.teams_by_team_type.get(team_type, []))
+        if not postings:
+            return list(range(len(self.teams)))
+        return intersect_postings(postings)
+
+    def find_services(self,
+                      team_id: Optional[str] = None,
+                      team_name: Optional[str] = None,
+                      business_segment: Optional[str] = None,
+                      value_stream_name: Optional[str] = None,
+                      sla: Optional[str] = None,
+                      tech_stack: Optional[str] = None) -> List[int]:
+        """
+        Get the ordinals of services matching all given filters.
+
+        A value stream matches a service when its team is aligned with the
+        value stream and the service lists it as one of its segments.
+        """
+        postings: List[Sequence[int]] = []
+        if team_id:
+            postings.append(self.services_by_team_id.get(team_id, []))
+        if team_name:
+            postings.append(self.services_by_team_name.get(team_name, []))
+        if business_segment:
+            postings.append(self.services_by_business_segment.get(business_segment, []))
+        if value_stream_name:
+            postings.append(self.services_by_team_value_stream.get(value_stream_name, []))
+            postings.append(self.services_by_value_stream_segment.get(value_stream_name, []))
+        if sla:
+            postings.append(self.services_by_sla.get(sla, []))
+        if tech_stack:
+            postings.append(self.services_by_tech_stack.get(tech_stack, []))
+        if not postings:
+            return list(range(len(self.services)))
+        return intersect_postings(postings)
+
+
+class CatalogIndex(ReadOnlyIndex):
+    """
+    Lookup structures derived from one version of the catalog data.
+
+    Teams, services and runtime components are numbered by their position in
+    the data file (their ordinal). Point lookups are answered from hash maps
+    and attribute filters from inverted indexes mapping a value to the sorted
+    ordinals that carry it, so results keep the file order of a full scan.
+    Where a key occurs more than once, the point lookup returns the first
+    occurrence, as a scan would. Trigram indexes over the searchable text
+    fields answer case-insensitive substring queries, and a prefix trie over
+    the component names resolves instance names to their component.
+
+    The inverted and trigram indexes can be exported and handed back to a
+    new index over the same data (see ``export_postings``), which then only
+    rebuilds the cheap hash maps.
+    """
+    def __init__(self,
+                 data: Optional[Dict[str, Any]] = None,
+                 postings: Optional[Dict[str, Postings]] = None):
+        self.teams: List[Dict[str, Any]] = []
+        self.services: List[ServiceRef] = []
+        self.components: List[ComponentRef] = []
+
+        self.team_by_id: Dict[str, Dict[str, Any]] = {}
+        self.service_by_name: Dict[str, ServiceRef] = {}
+        self.component_by_name: Dict[str, ComponentRef] = {}
+
+        # Component name -> first occurrence
+        self.component_prefixes = PrefixTrie()
+
+        # Team ordinals
+        self.teams_by_id: Postings = {}
+        self.teams_by_business_segment: Postings = {}
+        self.teams_by_value_stream: Postings = {}
+        self.teams_by_team_type: Postings = {}
+        self.teams_by_team_name: Postings = {}
+
+        # Service ordinals
+        self.services_by_name: Postings = {}
+        self.services_by_team_id: Postings = {}
+        self.services_by_team_name: Postings = {}
+        self.services_by_business_segment: Postings = {}
+        self.services_by_team_value_stream: Postings = {}
+        self.services_by_value_stream_segment: Postings = {}
+        self.services_by_tech_stack: Postings = {}
+        self.services_by_sla: Postings = {}
+
+        # Component ordinals
+        self.components_by_name: Postings = {}
+        self.components_by_service_name: Postings = {}
+
+        self._build_postings = postings is None
+        if postings is not None:
+            for name in POSTING_MAPS:
+                setattr(self, name, postings[name])
+
+        # Substring search over the fields matched by SearchService
+        self.team_search = TrigramIndex(postings["team_search"] if postings is not None else None)
+        self.service_search = TrigramIndex(postings["service_search"] if postings is not None else None)
+        self.component_search = TrigramIndex(postings["component_search"] if postings is not None else None)
+
+        if data is not None:
+            for team in data.get("teams", []):
+                self.add_team(team)
+
+    def add_team(self, team: Dict[str, Any]) -> None:
+        """
+        Append a team to the index, after every team added so far.
+
+        Args:
+            team: The validated team data.
+        """
+        build_postings = self._build_postings
+        team_ordinal = len(self.teams)
+        self.teams.append(team)
+        self.team_by_id.setdefault(team["team_id"], team)
+        self.team_search.add([
+            team["team_id"],
+            team["team_name"],
+            team["business_segment"],
+            team["team_api"]["team_mission"],
+            *(text for vs in team["value_streams"]
+              for text in (vs["value_stream_name"], vs["value_stream_description"]))
+        ])
+        team_value_streams = [vs["value_stream_name"] for vs in team["value_streams"]]
+        if build_postings:
+            add_posting(self.teams_by_id, team["team_id"], team_ordinal)
+            add_posting(self.teams_by_business_segment, team["business_segment"], team_ordinal)
+            for value_stream_name in team_value_streams:
+                add_posting(self.teams_by_value_stream, value_stream_name, team_ordinal)
+            add_posting(self.teams_by_team_type, team["team_api"]["team_type"], team_ordinal)
+            add_posting(self.teams_by_team_name, team["team_name"], team_ordinal)
+
+        for service in team["services_applications"]:
+            service_ordinal = len(self.services)
+            service_ref = ServiceRef(team, service)
+            self.services.append(service_ref)
+            self.service_by_name.setdefault(service["service_name"], service_ref)
+            self.service_search.add([service["service_name"], service["tech_stack"]])
+
+            if build_postings:
+                add_posting(self.services_by_name, service["service_name"], service_ordinal)
+                add_posting(self.services_by_team_id, team["team_id"], service_ordinal)
+                add_posting(self.services_by_team_name, team["team_name"], service_ordinal)
+                add_posting(self.services_by_business_segment, team["business_segment"], service_ordinal)
+                for value_stream_name in team_value_streams:
+                    add_posting(self.services_by_team_value_stream, value_stream_name, service_ordinal)
+                for segment in service["value_stream_segments"]:
+                    add_posting(self.services_by_value_stream_segment, segment, service_ordinal)
+                add_posting(self.services_by_tech_stack, service["tech_stack"], service_ordinal)
+                add_posting(self.services_by_sla, service["business_criticality"]["sla"], service_ordinal)
+
+            for component in service["runtime_components"]:
+                component_ordinal = len(self.components)
+                component_ref = ComponentRef(component, team, service)
+                self.components.append(component_ref)
+                self.component_by_name.setdefault(component, component_ref)
+                self.component_prefixes.insert(component, component_ref)
+                self.component_search.add([component])
+                if build_postings:
+                    add_posting(self.components_by_name, component, component_ordinal)
+                    add_posting(self.components_by_service_name, service["service_name"], component_ordinal)
+
+    def export_postings(self) -> Dict[str, Postings]:
+        """
+        Get every inverted and trigram index by name.
+
+        Returns:
+            The posting maps, suitable for ``CatalogIndex(data, postings=...)``
+            over the same data.
+        """
+        postings = {name: getattr(self, name) for name in POSTING_MAPS}
+        for name in SEARCH_INDEXES:
+            postings[name] = getattr(self, name).postings
+        return postings
+
+    def resolve_component(self, instance: str) -> Optional[ComponentRef]:
+        # Answered from the prefix trie
+        match = self.component_prefixes.longest_prefix(instance)
+        return match[1] if match is not None else None
+
+    def parent_ordinals(self, entity: str) -> Sequence[int]:
+        # Not kept by the index, derived from the records on every call
+        if entity == "services":
+            return array(POSTING_TYPECODE, (ordinal for ordinal, team in enumerate(self.teams)
+                               for _ in team["services_applications"]))
+        if entity == "components":
+            return array(POSTING_TYPECODE, (ordinal for ordinal, service_ref in enumerate(self.services)
+                               for _ in service_ref.service["runtime_components"]))
+        raise KeyError(entity)
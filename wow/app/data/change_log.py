@@ -0,0 +1,202 @@
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Mapping, NamedTuple, Optional
+
+from app.data.catalog import CatalogSnapshot
+
+# Kinds of entities tracked, in the order they are reported
+ENTITY_KINDS = ("teams", "services", "runtime_components")
+
+_ADDED, _REMOVED, _MODIFIED = "added", "removed", "modified"
+
+# What two consecutive changes to the same key amount to; None when they cancel out
+_COMBINED = {
+    (_ADDED, _MODIFIED): _ADDED,
+    (_ADDED, _REMOVED): None,
+    (_MODIFIED, _MODIFIED): _MODIFIED,
+    (_MODIFIED, _REMOVED): _REMOVED,
+    (_REMOVED, _ADDED): _MODIFIED,
+}
+
+# Key -> how it changed, for each kind of entity
+Changes = Dict[str, Dict[str, str]]
+
+
+class VersionDiff(NamedTuple):
+    """
+    How one catalog version differs from the version before it.
+    """
+    base_version: int
+    version: int
+    changes: Changes
+
+
+class ChangeSet(NamedTuple):
+    """
+    The net changes between two catalog versions.
+    """
+    since: int
+    version: int
+    # The history ``version`` belongs to, see CatalogStore.epoch
+    epoch: str
+    # False when the diffs from ``since`` are no longer kept and the client has to reload everything
+    complete: bool
+    # The oldest version changes can still be asked for
+    oldest_version: int
+    changes: Changes
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Get the change set in the form returned by the API, with the keys of each kind of change in sorted order.
+        """
+        result: Dict[str, Any] = {
+            "since": self.since,
+            "version": self.version,
+            "epoch": self.epoch,
+            "resync_required": not self.complete,
+            "oldest_version": self.oldest_version,
+        }
+        for kind in ENTITY_KINDS:
+            by_change: Dict[str, List[str]] = {_ADDED: [], _REMOVED: [], _MODIFIED: []}
+            for key, change in self.changes.get(kind, {}).items():
+                by_change[change].append(key)
+            result[kind] = {change: sorted(keys) for change, keys in by_change.items()}
+        return result
+
+
+def _diff_entities(previous: Mapping[str, Any], current: Mapping[str, Any], same) -> Dict[str, str]:
+    changes = {}
+    for key, entity in current.items():
+        previous_entity = previous.get(key)
+        if previous_entity is None:
+            changes[key] = _ADDED
+        elif previous_entity is not entity and not same(previous_entity, entity):
+            changes[key] = _MODIFIED
+    for key in previous.keys() - current.keys():
+        changes[key] = _REMOVED
+    return changes
+
+
+def diff_snapshots(previous: CatalogSnapshot, current: CatalogSnapshot) -> Changes:
+    """
+    Compare two catalog versions by team ID, service name and runtime component name.
+
+    A service also counts as modified when it moved to another team, and a
+    runtime component when it moved to another service or team. Where a key
+    occurs more than once, its first occurrence is compared, as returned by
+    the point lookups. Teams carried over unchanged by a delta reload are the
+    same objects in both versions and are not compared field by field.
+
+    Returns:
+        The changed keys of each kind of entity and whether they were added, removed or modified.
+    """
+    previous_index, index = previous.get_index(), current.get_index()
+    return {
+        "teams": _diff_entities(
+            previous_index.team_by_id, index.team_by_id, lambda a, b: a == b),
+        "services": _diff_entities(
+            previous_index.service_by_name, index.service_by_name,
+            lambda a, b: a.team["team_id"] == b.team["team_id"] and a.service == b.service),
+        "runtime_components": _diff_entities(
+            previous_index.component_by_name, index.component_by_name,
+            lambda a, b: (a.team["team_id"] == b.team["team_id"]
+                          and a.service["service_name"] == b.service["service_name"])),
+    }
+
+
+class ChangeLog:
+    """
+    Keeps the diffs between the most recent catalog versions, to tell clients what changed since a version.
+
+    Registered as a CatalogStore listener: every published snapshot is
+    compared with the one before it, off the request path, and the diff is
+    appended to a ring holding at most ``max_versions`` diffs. Only the last
+    snapshot is referenced, so the ring costs the changed keys alone.
+    """
+    def __init__(self, max_versions: int = 100):
+        self.max_versions = max_versions
+        self._diffs: Deque[VersionDiff] = deque(maxlen=max_versions)
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._diffs)
+
+    @property
+    def version(self) -> Optional[int]:
+        """
+        The newest version recorded, or None before the first snapshot.
+        """
+        snapshot = self._snapshot
+        return snapshot.version if snapshot is not None else None
+
+    @property
+    def epoch(self) -> Optional[str]:
+        """
+        The history of the versions recorded, or None before the first snapshot.
+        """
+        snapshot = self._snapshot
+        return snapshot.epoch if snapshot is not None else None
+
+    def record(self, snapshot: CatalogSnapshot) -> None:
+        """
+        Record a newly published snapshot, keeping its diff from the previously recorded one.
+
+        A snapshot of another history (epoch) starts the log over.
+        """
+        with self._lock:
+            previous = self._snapshot
+            if previous is not None and previous.epoch != snapshot.epoch:
+                self._diffs.clear()
+                previous = None
+            if previous is not None and snapshot.version <= previous.version:
+                return
+            if previous is not None and self.max_versions > 0:
+                self._diffs.append(VersionDiff(previous.version, snapshot.version,
+                                               diff_snapshots(previous, snapshot)))
+            self._snapshot = snapshot
+
+    def changes_since(self, since: int, epoch: Optional[str]) -> ChangeSet:
+        """
+        Combine the diffs from a version up to the newest one.
+
+        Args:
+            since: The version the client holds.
+            epoch: The history of that version, as returned with it.
+
+        Returns:
+            The net change of every key changed since that version; a key
+            removed and added back counts as modified. If the diffs leading
+            from it are no longer kept, or it is not a version of this
+            history (it was read from another worker process, or from
+            before a restart), the change set is marked incomplete and empty.
+
+        Raises:
+            RuntimeError: If no snapshot has been recorded yet.
+        """
+        with self._lock:
+            if self._snapshot is None:
+                raise RuntimeError("No catalog version has been recorded")
+            version, current_epoch = self._snapshot.version, self._snapshot.epoch
+            diffs = list(self._diffs)
+        oldest_version = diffs[0].base_version if diffs else version
+        if epoch != current_epoch or since < oldest_version or since > version:
+            return ChangeSet(since, version, current_epoch, False, oldest_version, {})
+
+        changes: Changes = {kind: {} for kind in ENTITY_KINDS}
+        for diff in diffs:
+            if diff.base_version < since:
+                continue
+            for kind, kind_changes in diff.changes.items():
+                combined = changes[kind]
+                for key, change in kind_changes.items():
+                    earlier = combined.get(key)
+                    if earlier is None:
+                        combined[key] = change
+                        continue
+                    merged = _COMBINED.get((earlier, change), change)
+                    if merged is None:
+                        del combined[key]
+                    else:
+                        combined[key] = merged
+        return ChangeSet(since, version, current_epoch, True, oldest_version, changes)
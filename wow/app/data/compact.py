@@ -0,0 +1,91 @@
+from typing import Any, Dict, Hashable, Iterable, List, Set, Union
+
+# Lists of records that are never shared, so every team and service keeps an identity of its own
+_RECORD_LISTS = ("teams", "services_applications")
+
+
+class CatalogCompactor:
+    """
+    Rebuilds validated catalog records so that equal values are held once.
+
+    Validation produces a fresh object for every value of every record, so a
+    tech stack, an SLA or a value stream name used by thousands of services
+    is held thousands of times. The compactor dictionary-encodes strings:
+    each distinct string is kept once, in a table, and every record refers
+    to that one copy. Lists and dicts that hold only strings (or containers
+    that are themselves shared), such as business criticalities, value
+    stream segments and whole value streams, are shared the same way.
+
+    The records keep their exact shape, being plain dicts and lists still,
+    so the API serializes them as before and no reader changes. This relies
+    on catalog records never being modified once loaded. Teams and services
+    are rebuilt but never shared, as the index tells them apart by identity.
+
+    The tables are only needed while records are added; drop the compactor
+    once the catalog is built.
+    """
+    def __init__(self):
+        self._strings: Dict[str, str] = {}
+        self._containers: Dict[Hashable, Any] = {}
+        # IDs of the shared containers, which stand for them in the key of a container holding them
+        self._shared_ids: Set[int] = set()
+
+    def catalog(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Compact validated catalog data: its metadata and every team.
+        """
+        return {self.value(key): self.teams(value) if key == "teams" else self.value(value)
+                for key, value in data.items()}
+
+    def teams(self, teams: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [self.team(team) for team in teams]
+
+    def team(self, team: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Compact one validated team record.
+        """
+        return self._record(team)
+
+    def value(self, value: Any) -> Any:
+        """
+        Get the shared copy of a value, compacting what it contains.
+        """
+        kind = type(value)
+        if kind is str:
+            return self._strings.setdefault(value, value)
+        if kind is dict:
+            entries = {self.value(key): self.value(item) for key, item in value.items()}
+            return self._share(entries, (part for item in entries.items() for part in item))
+        if kind is list:
+            items = [self.value(item) for item in value]
+            return self._share(items, items)
+        return value
+
+    def _record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        return {self.value(key): [self._record(item) for item in value] if key in _RECORD_LISTS
+                else self.value(value)
+                for key, value in record.items()}
+
+    def _share(self, container: Any, items: Iterable[Any]) -> Any:
+        # The key holds strings and None as they are and shared containers by ID
+        parts: List[Union[str, int, None]] = []
+        for item in items:
+            if item is None or type(item) is str:
+                parts.append(item)
+            elif id(item) in self._shared_ids:
+                parts.append(id(item))
+            else:
+                return container
+        key = (type(container), tuple(parts))
+        shared = self._containers.get(key)
+        if shared is None:
+            self._containers[key] = shared = container
+            self._shared_ids.add(id(container))
+        return shared
+
+
+def compact_catalog(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compact validated catalog data with a compactor of its own (see ``CatalogCompactor``).
+    """
+    return CatalogCompactor().catalog(data)
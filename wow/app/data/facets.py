@@ -0,0 +1,130 @@
+import threading
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple
+
+from app.data.catalog_index import ReadOnlyIndex
+from app.data.postings import intersect_postings
+
+# Entity -> dimension -> inverted indexes whose posting lists, intersected per value, hold the
+# entities with that value
+FACET_DIMENSIONS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "teams": {
+        "business_segment": ("teams_by_business_segment",),
+        "team_type": ("teams_by_team_type",),
+        "value_stream": ("teams_by_value_stream",),
+    },
+    "services": {
+        "tech_stack": ("services_by_tech_stack",),
+        "sla": ("services_by_sla",),
+        "business_segment": ("services_by_business_segment",),
+        "team_id": ("services_by_team_id",),
+        # As the value_stream_name filter: the team is aligned with it and the service lists it
+        "value_stream": ("services_by_team_value_stream", "services_by_value_stream_segment"),
+    },
+}
+
+
+class FacetTable(NamedTuple):
+    """
+    The entities carrying each value of one dimension, and how many there are.
+    """
+    postings: Dict[str, Sequence[int]]
+    counts: Dict[str, int]
+    # Value -> the posting lists the value's postings were derived from
+    sources: Dict[str, tuple]
+
+
+class FacetTables:
+    """
+    Value counts of the facet dimensions of one catalog version.
+
+    A table per dimension maps each value to the sorted ordinals of the
+    entities carrying it and their count, so unfiltered facets are read
+    straight from the table and filtered ones only intersect the matching
+    ordinals with the postings of each value. Tables are built once, on
+    first use or by ``build``; values whose posting lists are the very
+    objects the previous version's tables were built from (as kept by a
+    delta reload) reuse its entries.
+    """
+    def __init__(self, index: ReadOnlyIndex, previous: Optional["FacetTables"] = None):
+        self._index = index
+        self._previous = previous
+        self._tables: Dict[Tuple[str, str], FacetTable] = {}
+        self._lock = threading.Lock()
+
+    def build(self) -> None:
+        """
+        Build every table now, rather than on first use.
+        """
+        for entity, dimensions in FACET_DIMENSIONS.items():
+            for dimension in dimensions:
+                self.table(entity, dimension)
+        self._previous = None
+
+    def table(self, entity: str, dimension: str) -> FacetTable:
+        """
+        Get the table of one dimension.
+
+        Raises:
+            KeyError: If the entity has no such dimension.
+        """
+        key = (entity, dimension)
+        table = self._tables.get(key)
+        if table is not None:
+            return table
+        posting_maps = [getattr(self._index, name) for name in FACET_DIMENSIONS[entity][dimension]]
+        with self._lock:
+            table = self._tables.get(key)
+            if table is None:
+                previous = self._previous._tables.get(key) if self._previous is not None else None
+                table = _build_table(posting_maps, previous)
+                self._tables[key] = table
+        return table
+
+    def counts(self, entity: str, dimension: str, ordinals: Optional[Sequence[int]] = None) -> Dict[str, int]:
+        """
+        Count the entities per value of a dimension.
+
+        Args:
+            entity: "teams" or "services".
+            dimension: A dimension of the entity, see ``FACET_DIMENSIONS``.
+            ordinals: The sorted ordinals of the entities to count, or None for all.
+
+        Returns:
+            The number of entities per value, omitting values no entity carries.
+
+        Raises:
+            KeyError: If the entity has no such dimension.
+        """
+        table = self.table(entity, dimension)
+        if ordinals is None:
+            return dict(table.counts)
+        counts = {}
+        for value, postings in table.postings.items():
+            count = len(intersect_postings((ordinals, postings)))
+            if count:
+                counts[value] = count
+        return counts
+
+
+def _build_table(posting_maps: list, previous: Optional[FacetTable]) -> FacetTable:
+    first = posting_maps[0]
+    postings, counts, sources = {}, {}, {}
+    for value in first.keys():
+        value_sources = tuple(posting_map.get(value) for posting_map in posting_maps)
+        if previous is not None and _same(previous.sources.get(value), value_sources):
+            value_postings = previous.postings[value]
+        elif len(posting_maps) == 1:
+            value_postings = value_sources[0]
+        elif all(value_sources):
+            value_postings = intersect_postings(value_sources)
+        else:
+            continue
+        if value_postings:
+            postings[value] = value_postings
+            counts[value] = len(value_postings)
+            sources[value] = value_sources
+    return FacetTable(postings, counts, sources)
+
+
+def _same(a: Optional[tuple], b: tuple) -> bool:
+    return a is not None and len(a) == len(b) and all(x is y for x, y in zip(a, b))
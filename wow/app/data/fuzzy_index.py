@@ -0,0 +1,174 @@
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.data.catalog_index import ReadOnlyIndex
+from app.data.postings import POSTING_TYPECODE
+
+# Largest edit distance a query may ask for; the work per query grows steeply with it
+MAX_DISTANCE = 3
+
+
+def default_max_distance(query: str) -> int:
+    """
+    Get the edit distance tolerated for a query by default: none for up to 2 characters, 1 up to 5, else 2.
+    """
+    length = len(query)
+    return 0 if length <= 2 else 1 if length <= 5 else 2
+
+
+class FuzzyIndex:
+    """
+    Case-insensitive index of names answering "which names are within k edits of this query".
+
+    The distinct lowercased names are kept sorted, which makes the list a
+    trie whose nodes are the ranges of names sharing a prefix: the
+    children of a node are found by binary search, so it costs no memory
+    beyond the names. A query walks the trie depth-first carrying one row
+    of the Levenshtein matrix of the query against the node's prefix,
+    limited to the band of 2k+1 cells that can stay within k, and prunes
+    every subtree whose row exceeds k everywhere. Only prefixes within k
+    edits of a prefix of the query are visited, however many names share
+    them.
+    """
+    def __init__(self, names: Iterable[Tuple[str, int]]):
+        # Most names belong to a single entity; the others are kept apart to spare a list per name
+        first: Dict[str, int] = {}
+        shared: Dict[str, List[int]] = {}
+        for name, ordinal in names:
+            name = name.lower()
+            if name in first:
+                shared.setdefault(name, [first[name]]).append(ordinal)
+            else:
+                first[name] = ordinal
+        self._names = sorted(first)
+        self._first = array(POSTING_TYPECODE, (first[name] for name in self._names))
+        self._shared = {name: sorted(ordinals) for name, ordinals in shared.items()}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def search(self, query: str, max_distance: int) -> List[Tuple[int, int]]:
+        """
+        Find the entities whose name is within an edit distance of a query.
+
+        Args:
+            query: The text to match, compared case-insensitively.
+            max_distance: The largest number of inserted, deleted or replaced characters.
+
+        Returns:
+            ``(distance, ordinal)`` of every matching entity, closest first,
+            then in ordinal order.
+        """
+        query = query.lower()
+        names = self._names
+        if not names:
+            return []
+        length = len(query)
+        over = max_distance + 1
+        matches: List[Tuple[int, int]] = []
+        # (first name, end of the range, prefix length, row of the prefix)
+        stack = [(0, len(names), 0, [min(column, over) for column in range(length + 1)])]
+        while stack:
+            position, end, depth, row = stack.pop()
+            name = names[position]
+            if len(name) == depth:
+                # The prefix itself is a name, the first of its range
+                if row[length] <= max_distance:
+                    ordinals = self._shared.get(name) or (self._first[position],)
+                    matches.extend((row[length], ordinal) for ordinal in ordinals)
+                position += 1
+            first_column = max(1, depth + 1 - max_distance)
+            last_column = min(length, depth + 1 + max_distance)
+            while position < end:
+                name = names[position]
+                char = name[depth]
+                child_end = bisect_left(names, name[:depth] + chr(ord(char) + 1), position, end)
+                child = [over] * (length + 1)
+                left = child[0] = min(row[0] + 1, over)
+                best = left
+                for column in range(first_column, last_column + 1):
+                    cost = row[column - 1] + (query[column - 1] != char)
+                    if row[column] + 1 < cost:
+                        cost = row[column] + 1
+                    if left + 1 < cost:
+                        cost = left + 1
+                    if cost > over:
+                        cost = over
+                    child[column] = left = cost
+                    if cost < best:
+                        best = cost
+                if best <= max_distance:
+                    stack.append((position, child_end, depth + 1, child))
+                position = child_end
+        matches.sort()
+        return matches
+
+
+class FuzzyNames:
+    """
+    Fuzzy indexes over the names of the teams, services and runtime components of one catalog version.
+
+    Teams are matched by ID and name, services by name and runtime
+    components by name. Indexes are built once, on first use or by ``build``.
+    """
+    def __init__(self, index: ReadOnlyIndex):
+        self._index = index
+        self._indexes: Dict[str, FuzzyIndex] = {}
+        self._lock = threading.Lock()
+
+    def build(self) -> None:
+        """
+        Build every index now, rather than on first use.
+        """
+        for entity in ("teams", "services", "components"):
+            self.get(entity)
+
+    def get(self, entity: str) -> FuzzyIndex:
+        """
+        Get the index of "teams", "services" or "components".
+        """
+        fuzzy_index = self._indexes.get(entity)
+        if fuzzy_index is None:
+            with self._lock:
+                fuzzy_index = self._indexes.get(entity)
+                if fuzzy_index is None:
+                    fuzzy_index = self._indexes[entity] = FuzzyIndex(self._names(entity))
+        return fuzzy_index
+
+    def search(self, entity: str, query: str, max_distance: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        Find the entities with a name within an edit distance of a query, each once at its closest.
+
+        Args:
+            entity: "teams", "services" or "components".
+            query: The text to match, compared case-insensitively.
+            max_distance: The largest edit distance, or None for ``default_max_distance``.
+
+        Returns:
+            ``(distance, ordinal)`` of every matching entity, closest first,
+            then in ordinal order.
+        """
+        if max_distance is None:
+            max_distance = default_max_distance(query)
+        seen = set()
+        matches = []
+        for distance, ordinal in self.get(entity).search(query, max_distance):
+            if ordinal not in seen:
+                seen.add(ordinal)
+                matches.append((distance, ordinal))
+        return matches
+
+    def _names(self, entity: str) -> Iterable[Tuple[str, int]]:
+        index = self._index
+        if entity == "teams":
+            for ordinal, team in enumerate(index.teams):
+                yield team["team_id"], ordinal
+                yield team["team_name"], ordinal
+            return
+        # The point lookup keys, read from the posting maps so a mapped index decodes nothing
+        posting_map = getattr(index, {"services": "services_by_name", "components": "components_by_name"}[entity])
+        for name, ordinals in posting_map.items():
+            for ordinal in ordinals:
+                yield name, ordinal
@@ -1,25 +1,63 @@
 import json
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 from pydantic import ValidationError
 
-from app.models.team import TeamList
+from app.data.catalog_delta import CatalogDelta, team_fingerprint, update_index
+from app.data.catalog_index import CatalogIndex
+from app.data.compact import CatalogCompactor, compact_catalog
+from app.data.json_stream import JsonObjectStream
+from app.metrics import CATALOG_LOAD_PHASE_DURATION, timed
+from app.models.team import Metadata, Team, TeamList
+
+
+class TeamValidationError(ValueError):
+    """
+    Raised when a single team in the data file fails validation.
+    """
+    def __init__(self, team_index: int, team_id: Optional[str], error: Exception):
+        self.team_index = team_index
+        self.team_id = team_id
+        super().__init__(f"Invalid team at index {team_index} (team_id={team_id!r}): {error}")
 
 
 class JsonLoader:
     """
     Responsible for loading and validating the JSON data file.
+    
+    In streaming mode the ``teams`` array is read incrementally: each team is
+    validated on its own as soon as it has been parsed and added straight to
+    the index, so neither the whole file text nor a model tree of the whole
+    catalog is ever held in memory.
+    
+    Every team record is fingerprinted as it is read, so that a later
+    version of the file can be loaded as a change to this one (see
+    ``load_delta``).
+    
+    Validated records are compacted (see ``CatalogCompactor``): equal
+    strings and string-only values are held once for the whole catalog.
     """
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, streaming: bool = False):
         self.file_path = file_path
+        self.streaming = streaming
         self._data: Optional[Dict[str, Any]] = None
         self._last_loaded: Optional[datetime] = None
+        self._index: Optional[CatalogIndex] = None
+        # Fingerprints of the team records, in file order
+        self.team_fingerprints: Optional[List[bytes]] = None
+        # Set when the data was loaded as a change to a previous version
+        self.delta: Optional[CatalogDelta] = None
         
     def load(self) -> Dict[str, Any]:
         """
         Load JSON data from file and validate against schema.
         
+        The data is returned in the normalized form produced by validation
+        (missing optional fields set to None, unknown fields dropped), which
+        is exactly what the API serializes, so it never has to be validated
+        again.
+        
         Returns:
             Dict[str, Any]: The loaded and validated JSON data.
             
@@ -30,18 +68,163 @@ class JsonLoader:
         if not os.path.exists(self.file_path):
             raise FileNotFoundError(f"JSON file not found: {self.file_path}")
             
-        with open(self.file_path, 'r') as f:
+        if self.streaming:
+            return self._load_streaming()
+            
+        with timed(CATALOG_LOAD_PHASE_DURATION, "parse"), open(self.file_path, 'r') as f:
             raw_data = json.load(f)
             
         # Validate data against Pydantic model
+        with timed(CATALOG_LOAD_PHASE_DURATION, "validate"):
+            try:
+                team_list = TeamList.model_validate(raw_data)
+            except Exception as e:
+                raise ValueError(f"Invalid JSON data: {str(e)}")
+            data = team_list.model_dump(mode="json")
+        del team_list
+        with timed(CATALOG_LOAD_PHASE_DURATION, "compact"):
+            data = compact_catalog(data)
+            
+        self._data = data
+        self._index = None
+        with timed(CATALOG_LOAD_PHASE_DURATION, "fingerprint"):
+            self.team_fingerprints = [team_fingerprint(team) for team in raw_data["teams"]]
+        self._last_loaded = datetime.now()
+        return data
+        
+    def _load_streaming(self) -> Dict[str, Any]:
+        raw_data: Dict[str, Any] = {}
+        index = CatalogIndex()
+        compactor = CatalogCompactor()
+        fingerprints = []
+        
+        # Parsing, validation, fingerprinting and indexing are interleaved team by team
+        with timed(CATALOG_LOAD_PHASE_DURATION, "stream"), open(self.file_path, 'r', encoding='utf-8') as f:
+            stream = JsonObjectStream(f)
+            for key, position, value in stream.members(stream_keys=("teams",)):
+                if position is None:
+                    raw_data[key] = value
+                    continue
+                fingerprints.append(team_fingerprint(value))
+                index.add_team(compactor.team(self._validate_team(position, value)))
+            if "teams" in stream.streamed_keys:
+                raw_data["teams"] = index.teams
+                
         try:
-            TeamList.model_validate(raw_data)
+            metadata = Metadata.model_validate(raw_data.get("metadata"))
+            if not isinstance(raw_data.get("teams"), list):
+                raise ValueError("teams must be a list")
         except Exception as e:
             raise ValueError(f"Invalid JSON data: {str(e)}")
             
-        self._data = raw_data
+        data = {"metadata": compactor.value(metadata.model_dump(mode="json")), "teams": index.teams}
+        self._data = data
+        self._index = index
+        self.team_fingerprints = fingerprints
         self._last_loaded = datetime.now()
-        return raw_data
+        return data
+
+    def load_delta(self,
+                   teams: List[Dict[str, Any]],
+                   fingerprints: List[bytes],
+                   index: CatalogIndex) -> Dict[str, Any]:
+        """
+        Load the data file as a change to a previously loaded version of it.
+        
+        Teams whose record has the fingerprint of a previous team are taken
+        over from the previous version as they are, without validating them
+        again, and the previous index is updated for the other teams only
+        (see ``update_index``). The difference is recorded in ``delta``.
+        
+        Args:
+            teams: The validated teams of the previous version.
+            fingerprints: Their fingerprints, from ``team_fingerprints`` of the loader that loaded them.
+            index: The index of the previous version, which is left unchanged.
+            
+        Returns:
+            Dict[str, Any]: The loaded and validated JSON data.
+            
+        Raises:
+            FileNotFoundError: If the JSON file does not exist.
+            ValueError: If the JSON data is invalid.
+        """
+        if not os.path.exists(self.file_path):
+            raise FileNotFoundError(f"JSON file not found: {self.file_path}")
+            
+        reusable: Dict[bytes, List[Dict[str, Any]]] = {}
+        for fingerprint, team in zip(fingerprints, teams):
+            reusable.setdefault(fingerprint, []).append(team)
+        new_teams, new_fingerprints, validated = [], [], []
+        compactor = CatalogCompactor()
+        
+        def add_team(position: int, value: Any) -> None:
+            fingerprint = team_fingerprint(value)
+            previous = reusable.get(fingerprint)
+            if previous:
+                new_teams.append(previous.pop(0))
+            else:
+                team = compactor.team(self._validate_team(position, value))
+                new_teams.append(team)
+                validated.append(team)
+            new_fingerprints.append(fingerprint)
+            
+        # Parses the file and validates the changed teams only
+        with timed(CATALOG_LOAD_PHASE_DURATION, "delta"), open(self.file_path, 'r', encoding='utf-8') as f:
+            if self.streaming:
+                stream = JsonObjectStream(f)
+                raw_data: Dict[str, Any] = {}
+                for key, position, value in stream.members(stream_keys=("teams",)):
+                    if position is None:
+                        raw_data[key] = value
+                    else:
+                        add_team(position, value)
+                if "teams" in stream.streamed_keys:
+                    raw_data["teams"] = new_teams
+            else:
+                raw_data = json.load(f)
+                if isinstance(raw_data, dict) and isinstance(raw_data.get("teams"), list):
+                    for position, value in enumerate(raw_data["teams"]):
+                        add_team(position, value)
+                    raw_data["teams"] = new_teams
+                    
+        try:
+            if not isinstance(raw_data, dict):
+                raise ValueError("the data file must contain an object")
+            metadata = Metadata.model_validate(raw_data.get("metadata"))
+            if not isinstance(raw_data.get("teams"), list):
+                raise ValueError("teams must be a list")
+        except Exception as e:
+            raise ValueError(f"Invalid JSON data: {str(e)}")
+            
+        with timed(CATALOG_LOAD_PHASE_DURATION, "index"):
+            self._index, reindexed = update_index(index, new_teams)
+        
+        previous_ids = {team["team_id"] for team in teams}
+        new_ids = {team["team_id"] for team in new_teams}
+        validated_ids = list(dict.fromkeys(team["team_id"] for team in validated))
+        self.delta = CatalogDelta(
+            added=[team_id for team_id in validated_ids if team_id not in previous_ids],
+            removed=list(dict.fromkeys(team["team_id"] for left in reusable.values() for team in left
+                                       if team["team_id"] not in new_ids)),
+            changed=[team_id for team_id in validated_ids if team_id in previous_ids],
+            reused=len(new_teams) - len(validated),
+            reindexed=reindexed,
+        )
+        
+        data = {"metadata": compactor.value(metadata.model_dump(mode="json")), "teams": new_teams}
+        self._data = data
+        self.team_fingerprints = new_fingerprints
+        self._last_loaded = datetime.now()
+        return data
+
+    @staticmethod
+    def _validate_team(position: int, value: Any) -> Dict[str, Any]:
+        try:
+            team = Team.model_validate(value)
+        except ValidationError as e:
+            team_id = value.get("team_id") if isinstance(value, dict) else None
+            raise TeamValidationError(position, team_id, e)
+        return team.model_dump(mode="json")
         
     def get_data(self) -> Dict[str, Any]:
         """
@@ -53,3 +236,14 @@ class JsonLoader:
         if self._data is None:
             return self.load()
         return self._data
+
+    def get_index(self) -> CatalogIndex:
+        """
+        Get the lookup index for the loaded data, building it on first use.
+        
+        Returns:
+            CatalogIndex: The index over the loaded data.
+        """
+        if self._index is None:
+            self._index = CatalogIndex(self.get_data())
+        return self._index
@@ -0,0 +1,161 @@
+import json
+import re
+from typing import Any, Collection, Dict, Iterator, List, Optional, TextIO, Tuple
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Decode errors this close to the end of the buffer may only mean the value continues in the next chunk;
+# the longest token reported at its start when cut off is a literal or a \uXXXX escape
+_TRUNCATION_WINDOW = 16
+
+
+def _skip_whitespace(text: str, pos: int) -> int:
+    match = _WHITESPACE.match(text, pos)
+    return match.end() if match else pos
+
+
+def _may_be_truncated(error: json.JSONDecodeError, length: int) -> bool:
+    return error.pos >= length - _TRUNCATION_WINDOW or error.msg.startswith("Unterminated string")
+
+
+class JsonObjectStream:
+    """
+    Incremental reader for a top-level JSON object.
+
+    Members are decoded one at a time from a buffer that is refilled from the
+    file in chunks. Members named in ``stream_keys`` that hold an array are
+    not decoded as a whole; their elements are decoded and handed out one by
+    one instead, so the memory needed is bounded by the largest element
+    rather than by the whole array.
+
+    Object keys are shared across everything decoded by one stream, as
+    ``json.load`` does within a single document, so repeated keys such as
+    ``"service_name"`` are stored once instead of once per element.
+    """
+    def __init__(self, fp: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._keys: Dict[str, str] = {}
+        self._decoder = json.JSONDecoder(object_pairs_hook=self._make_object)
+        self._buffer = ""
+        self._pos = 0
+        self._offset = 0  # Characters of the file dropped before the buffer
+        self._eof = False
+        # Keys whose array values have been streamed element by element
+        self.streamed_keys: List[str] = []
+
+    def members(self, stream_keys: Collection[str] = ()) -> Iterator[Tuple[str, Optional[int], Any]]:
+        """
+        Iterate over the members of the top-level object.
+
+        Args:
+            stream_keys: Names of array members whose elements should be yielded one by one.
+
+        Yields:
+            (key, None, value) for a member decoded as a whole, and
+            (key, position, element) for every element of a streamed array.
+
+        Raises:
+            ValueError: If the document is not valid JSON or not an object.
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            self._expect_end()
+            return
+
+        while True:
+            key = self._decode()
+            if not isinstance(key, str):
+                raise self._error("Expecting property name enclosed in double quotes")
+            self._expect(":")
+
+            if key in stream_keys and self._peek() == "[":
+                self._pos += 1
+                self.streamed_keys.append(key)
+                yield from self._array_elements(key)
+            else:
+                yield key, None, self._decode()
+
+            if self._next_delimiter(",}") == "}":
+                break
+        self._expect_end()
+
+    def _array_elements(self, key: str) -> Iterator[Tuple[str, Optional[int], Any]]:
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        position = 0
+        while True:
+            yield key, position, self._decode()
+            position += 1
+            if self._next_delimiter(",]") == "]":
+                return
+
+    def _make_object(self, pairs: List[Tuple[str, Any]]) -> Dict[str, Any]:
+        keys = self._keys
+        return {keys.setdefault(key, key): value for key, value in pairs}
+
+    def _fill(self, size: int) -> bool:
+        chunk = self._fp.read(size)
+        if not chunk:
+            self._eof = True
+            return False
+        # Drop what has been consumed so the buffer only holds unread input
+        self._offset += self._pos
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            self._pos = _skip_whitespace(self._buffer, self._pos)
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill(self._chunk_size):
+                raise self._error("Unexpected end of data")
+
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            raise self._error(f"Expecting '{char}'")
+        self._pos += 1
+
+    def _next_delimiter(self, chars: str) -> str:
+        char = self._peek()
+        if char not in chars:
+            raise self._error(f"Expecting one of {', '.join(repr(c) for c in chars)}")
+        self._pos += 1
+        return char
+
+    def _expect_end(self) -> None:
+        while True:
+            self._pos = _skip_whitespace(self._buffer, self._pos)
+            if self._pos < len(self._buffer):
+                raise self._error("Extra data")
+            if not self._fill(self._chunk_size):
+                return
+
+    def _decode(self) -> Any:
+        self._peek()
+        read_size = self._chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                # The value may just be cut off at the end of the buffer; an error before that is
+                # reported right away, without reading the rest of the file to find out
+                if self._eof or not _may_be_truncated(e, len(self._buffer)) or not self._fill(read_size):
+                    raise self._error(e.msg, e.pos) from None
+                read_size *= 2
+                continue
+            # A number ending exactly at the end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and not self._eof and self._fill(read_size):
+                continue
+            self._pos = end
+            return value
+
+    def _error(self, msg: str, pos: Optional[int] = None) -> ValueError:
+        position = self._offset + (self._pos if pos is None else pos)
+        return ValueError(f"Invalid JSON: {msg} at character {position}")
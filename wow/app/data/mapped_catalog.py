@@ -0,0 +1,265 @@
+import marshal
+import threading
+from abc import abstractmethod
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.data.catalog_index import ComponentRef, ReadOnlyIndex, ServiceRef
+from app.data.postings import intersect_postings
+from app.data.snapshot_file import (OFFSET_TYPECODE, TEXT_SEPARATOR, CompiledCatalog, SnapshotFile, StringTable,
+                                    open_snapshot)
+from app.data.trigram_index import ngrams
+
+# Decoded team records kept per process; the mapped file itself is shared
+DEFAULT_RECORD_CACHE_SIZE = 256
+
+# Entity -> array holding the ordinal of each one's owner
+_PARENT_ARRAYS = {"services": "services.team", "components": "components.service"}
+
+
+class _Records(Sequence):
+    """
+    Team records decoded on access, with the most recently used ones cached.
+    """
+    def __init__(self, table: StringTable, cache_size: int):
+        self._table = table
+        self._cache: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[p] for p in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("team ordinal out of range")
+        cache = self._cache
+        with self._lock:
+            record = cache.get(position)
+            if record is not None:
+                cache.move_to_end(position)
+                return record
+        record = marshal.loads(self._table.raw(position))
+        with self._lock:
+            cache[position] = record
+            if len(cache) > self._cache_size:
+                cache.popitem(last=False)
+        return record
+
+
+class _Located(Sequence):
+    """
+    Entities located by the ordinal of their parent and their position in it.
+    """
+    def __init__(self, parents: Sequence, parent_ordinals: memoryview, positions: memoryview, make):
+        self._parents = parents
+        self._parent_ordinals = parent_ordinals
+        self._positions = positions
+        self._make = make
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __getitem__(self, ordinal):
+        if isinstance(ordinal, slice):
+            return [self[o] for o in range(*ordinal.indices(len(self)))]
+        return self._make(self._parents[self._parent_ordinals[ordinal]], self._positions[ordinal])
+
+
+def _service_ref(team: Dict[str, Any], position: int) -> ServiceRef:
+    return ServiceRef(team, team["services_applications"][position])
+
+
+def _component_ref(service_ref: ServiceRef, position: int) -> ComponentRef:
+    return ComponentRef(service_ref.service["runtime_components"][position], service_ref.team, service_ref.service)
+
+
+class _KeyedMapping(Mapping):
+    """
+    Read-only mapping over a sorted key table.
+    """
+    def __init__(self, keys: StringTable):
+        self._keys = keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[str]:
+        keys = self._keys
+        return (keys[position] for position in range(len(keys)))
+
+    def __getitem__(self, key):
+        position = self._keys.find(key) if isinstance(key, str) else None
+        if position is None:
+            raise KeyError(key)
+        return self._value(position)
+
+    @abstractmethod
+    def _value(self, position: int) -> Any:
+        ...
+
+
+class _Lookup(_KeyedMapping):
+    """
+    Key -> entity at the ordinal stored for the key.
+    """
+    def __init__(self, keys: StringTable, ordinals: memoryview, entities: Sequence):
+        super().__init__(keys)
+        self._ordinals = ordinals
+        self._entities = entities
+
+    def _value(self, position: int) -> Any:
+        return self._entities[self._ordinals[position]]
+
+    def longest_prefix(self, text: str) -> Optional[Any]:
+        """
+        Get the entity of the longest key that is a prefix of the text.
+        """
+        position = self._keys.longest_prefix(text)
+        return None if position is None else self._value(position)
+
+
+class _Postings(_KeyedMapping):
+    """
+    Key -> sorted ordinals, as a view into the mapped file.
+    """
+    def __init__(self, keys: StringTable, snapshot: SnapshotFile, name: str):
+        super().__init__(keys)
+        self._ordinals = snapshot.array(f"{name}.postings.blob")
+        self._offsets = snapshot.array(f"{name}.postings.offsets", OFFSET_TYPECODE)
+        self._itemsize = self._ordinals.itemsize
+
+    def _value(self, position: int) -> memoryview:
+        offsets = self._offsets
+        return self._ordinals[offsets[position] // self._itemsize:offsets[position + 1] // self._itemsize]
+
+
+class MappedTrigramIndex:
+    """
+    Read-only counterpart of TrigramIndex over a mapped snapshot.
+
+    Candidates are narrowed with the stored posting lists and checked for the
+    query bytes directly in the mapped document texts, without decoding them.
+    """
+    def __init__(self, postings: _Postings, texts: StringTable):
+        self._postings = postings
+        self._texts = texts
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    @property
+    def postings(self) -> Mapping:
+        return self._postings
+
+    def document(self, ordinal: int) -> Tuple[str, ...]:
+        return tuple(self._texts[ordinal].split(TEXT_SEPARATOR))
+
+    def search(self, query: str) -> List[int]:
+        """
+        Get the ordinals of documents with a text containing the query, ignoring case.
+        """
+        query = query.lower()
+        if TEXT_SEPARATOR in query:
+            return []
+        if not query:
+            return list(range(len(self)))
+        encoded = query.encode()
+        grams = ngrams(query)
+        if not grams:
+            return self._texts.positions_containing(encoded)
+
+        postings = []
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                return []
+            postings.append(posting)
+        texts = self._texts
+        return [ordinal for ordinal in intersect_postings(postings) if texts.contains(ordinal, encoded)]
+
+
+class MappedCatalogIndex(ReadOnlyIndex):
+    """
+    Read-only index of the catalog whose entities and indexes live in a mapped snapshot file.
+
+    Nothing is built at load time: lookups binary-search the sorted key
+    tables (the component names also stand in for the prefix trie), posting
+    lists are views into the file and team records are decoded when
+    accessed. Processes mapping the same file share its pages, so each one
+    only adds its cache of recently decoded teams.
+    """
+    def __init__(self, snapshot: SnapshotFile, record_cache_size: int = DEFAULT_RECORD_CACHE_SIZE):
+        self.snapshot = snapshot
+        self.teams = _Records(snapshot.strings("teams"), record_cache_size)
+        self.services = _Located(self.teams, snapshot.array("services.team"),
+                                 snapshot.array("services.position"), _service_ref)
+        self.components = _Located(self.services, snapshot.array("components.service"),
+                                   snapshot.array("components.position"), _component_ref)
+
+        self.team_by_id = _Lookup(snapshot.strings("team_by_id.keys"),
+                                  snapshot.array("team_by_id.values"), self.teams)
+        self.service_by_name = _Lookup(snapshot.strings("service_by_name.keys"),
+                                       snapshot.array("service_by_name.values"), self.services)
+        self.component_by_name: _Lookup = _Lookup(snapshot.strings("component_by_name.keys"),
+                                                  snapshot.array("component_by_name.values"), self.components)
+
+        self.teams_by_id = self._postings("teams_by_id")
+        self.teams_by_business_segment = self._postings("teams_by_business_segment")
+        self.teams_by_value_stream = self._postings("teams_by_value_stream")
+        self.teams_by_team_type = self._postings("teams_by_team_type")
+        self.teams_by_team_name = self._postings("teams_by_team_name")
+        self.services_by_name = self._postings("services_by_name")
+        self.services_by_team_id = self._postings("services_by_team_id")
+        self.services_by_team_name = self._postings("services_by_team_name")
+        self.services_by_business_segment = self._postings("services_by_business_segment")
+        self.services_by_team_value_stream = self._postings("services_by_team_value_stream")
+        self.services_by_value_stream_segment = self._postings("services_by_value_stream_segment")
+        self.services_by_tech_stack = self._postings("services_by_tech_stack")
+        self.services_by_sla = self._postings("services_by_sla")
+        self.components_by_name = self._postings("components_by_name")
+        self.components_by_service_name = self._postings("components_by_service_name")
+        self.team_search = MappedTrigramIndex(self._postings("team_search"), snapshot.strings("team_search.texts"))
+        self.service_search = MappedTrigramIndex(self._postings("service_search"),
+                                                 snapshot.strings("service_search.texts"))
+        self.component_search = MappedTrigramIndex(self._postings("component_search"),
+                                                   snapshot.strings("component_search.texts"))
+
+    def _postings(self, name: str) -> _Postings:
+        snapshot = self.snapshot
+        return _Postings(snapshot.strings(f"{name}.keys"), snapshot, name)
+
+    def resolve_component(self, instance: str) -> Optional[ComponentRef]:
+        return self.component_by_name.longest_prefix(instance)
+
+    def parent_ordinals(self, entity: str) -> Sequence[int]:
+        if entity not in _PARENT_ARRAYS:
+            raise KeyError(entity)
+        return self.snapshot.array(_PARENT_ARRAYS[entity])
+
+
+def open_mapped_catalog(path: str, content_hash: str,
+                        record_cache_size: int = DEFAULT_RECORD_CACHE_SIZE) -> Optional[CompiledCatalog]:
+    """
+    Map a compiled snapshot if it was compiled from the given data file contents.
+
+    Args:
+        path: The snapshot file to map.
+        content_hash: The sha256 of the current data file.
+        record_cache_size: How many decoded team records to keep.
+
+    Returns:
+        The data and its index, both backed by the mapped file, or None if
+        the snapshot cannot be used (see ``open_snapshot``).
+    """
+    snapshot = open_snapshot(path, content_hash)
+    if snapshot is None:
+        return None
+    index = MappedCatalogIndex(snapshot, record_cache_size)
+    data = {"metadata": marshal.loads(snapshot.bytes("metadata")), "teams": index.teams}
+    return CompiledCatalog(data, index)
@@ -0,0 +1,54 @@
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Sequence
+
+# Posting lists are packed arrays of unsigned 32-bit ordinals
+POSTING_TYPECODE = "I"
+
+Postings = Dict[str, "array[int]"]
+
+
+def add_posting(postings: Postings, key: str, ordinal: int) -> None:
+    """
+    Append an ordinal to the posting list of a key.
+
+    Ordinals must be added in increasing order; adding the same ordinal twice
+    in a row is a no-op, so posting lists stay sorted and free of duplicates.
+    """
+    ordinal_list = postings.get(key)
+    if ordinal_list is None:
+        postings[key] = array(POSTING_TYPECODE, (ordinal,))
+    elif ordinal_list[-1] != ordinal:
+        ordinal_list.append(ordinal)
+
+
+def intersect_postings(postings: Iterable[Sequence[int]]) -> List[int]:
+    """
+    Intersect sorted ordinal lists, keeping ascending (file) order.
+
+    The shortest list drives the intersection and is probed into the others
+    by binary search, so the cost depends on the shortest list rather than
+    on the longest one.
+
+    Args:
+        postings: The posting lists to intersect. Must contain at least one list.
+
+    Returns:
+        The ordinals present in every posting list, in ascending order.
+    """
+    ordered = sorted(postings, key=len)
+    result = list(ordered[0])
+    for other in ordered[1:]:
+        if not result:
+            break
+        kept = []
+        position = 0
+        other_length = len(other)
+        for ordinal in result:
+            position = bisect_left(other, ordinal, position)
+            if position == other_length:
+                break
+            if other[position] == ordinal:
+                kept.append(ordinal)
+        result = kept
+    return result
@@ -0,0 +1,168 @@
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+
+class _Node:
+    __slots__ = ("edges", "value")
+
+    def __init__(self, value: Any = None):
+        # First character of an edge -> (edge label, child); None while the node is a leaf
+        self.edges: Optional[Dict[str, Tuple[str, "_Node"]]] = None
+        self.value = value
+
+
+def _copy(node: _Node) -> _Node:
+    copy = _Node(node.value)
+    if node.edges is not None:
+        copy.edges = dict(node.edges)
+    return copy
+
+
+class PrefixTrie:
+    """
+    Radix trie mapping string keys to values, answering longest-prefix queries.
+
+    Chains of single-child nodes are collapsed into one edge labelled with
+    the whole substring, so a built trie holds at most two nodes per key and
+    a query walks at most one edge per character of the text.
+    """
+    def __init__(self):
+        self._root = _Node()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, key: str, value: Any) -> None:
+        """
+        Map a key to a value, unless the key is already mapped (first insert wins).
+        """
+        self._set(key, value, overwrite=False)
+
+    def updated(self, values: Dict[str, Any]) -> "PrefixTrie":
+        """
+        Get a copy of the trie with some keys set to new values, or removed where the value is None.
+
+        Only the nodes on the paths to the given keys are copied; the rest
+        are shared with this trie, which is left unchanged.
+        """
+        trie = PrefixTrie()
+        trie._root = _copy(self._root)
+        trie._size = self._size
+        copied = {id(trie._root)}
+        for key, value in values.items():
+            if value is None:
+                trie._remove(key, copied)
+            else:
+                trie._set(key, value, overwrite=True, copied=copied)
+        return trie
+
+    def _set(self, key: str, value: Any, overwrite: bool, copied: Optional[Set[int]] = None) -> None:
+        # Nodes whose id is in ``copied`` belong to this trie alone and may be modified
+        node = self._root
+        rest = key
+        while rest:
+            if node.edges is None:
+                node.edges = {}
+            edge = node.edges.get(rest[0])
+            if edge is None:
+                leaf = _Node(value)
+                if copied is not None:
+                    copied.add(id(leaf))
+                node.edges[rest[0]] = (rest, leaf)
+                self._size += 1
+                return
+            label, child = edge
+            if rest.startswith(label):
+                common = len(label)
+                if copied is not None and id(child) not in copied:
+                    child = _copy(child)
+                    copied.add(id(child))
+                    node.edges[rest[0]] = (label, child)
+            else:
+                common = _common_prefix_length(label, rest)
+                # Split the edge where the key leaves it
+                middle = _Node()
+                if copied is not None:
+                    copied.add(id(middle))
+                middle.edges = {label[common]: (label[common:], child)}
+                node.edges[rest[0]] = (label[:common], middle)
+                child = middle
+            node = child
+            rest = rest[common:]
+        if node.value is None:
+            node.value = value
+            self._size += 1
+        elif overwrite:
+            node.value = value
+
+    def _remove(self, key: str, copied: Set[int]) -> None:
+        parent = None
+        node = self._root
+        rest = key
+        while rest:
+            edge = node.edges.get(rest[0]) if node.edges is not None else None
+            if edge is None or not rest.startswith(edge[0]):
+                return
+            label, child = edge
+            if id(child) not in copied:
+                child = _copy(child)
+                copied.add(id(child))
+                node.edges[rest[0]] = (label, child)
+            parent = (node, rest[0])
+            node = child
+            rest = rest[len(label):]
+        if node.value is None:
+            return
+        node.value = None
+        self._size -= 1
+        if not node.edges and parent is not None:
+            # Drop the emptied leaf; inner nodes are kept even if no longer needed
+            del parent[0].edges[parent[1]]
+
+    def longest_prefix(self, text: str) -> Optional[Tuple[str, Any]]:
+        """
+        Find the longest key that is a prefix of the text.
+
+        Returns:
+            The key and its value, or None if no key is a prefix of the text.
+        """
+        node = self._root
+        position = 0
+        best = None
+        while True:
+            if node.value is not None:
+                best = (position, node.value)
+            if not node.edges or position == len(text):
+                break
+            edge = node.edges.get(text[position])
+            if edge is None:
+                break
+            label, child = edge
+            if not text.startswith(label, position):
+                break
+            position += len(label)
+            node = child
+        if best is None:
+            return None
+        return text[:best[0]], best[1]
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Iterate over the keys and values, in no particular order.
+        """
+        stack = [("", self._root)]
+        while stack:
+            prefix, node = stack.pop()
+            if node.value is not None:
+                yield prefix, node.value
+            if node.edges is not None:
+                for label, child in node.edges.values():
+                    stack.append((prefix + label, child))
+
+
+def _common_prefix_length(a: str, b: str) -> int:
+    length = min(len(a), len(b))
+    for i in range(length):
+        if a[i] != b[i]:
+            return i
+    return length
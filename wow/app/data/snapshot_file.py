@@ -0,0 +1,422 @@
+import json
+import logging
+import marshal
+import mmap
+import os
+import sys
+from array import array
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.data.catalog_index import POSTING_MAPS, SEARCH_INDEXES, CatalogIndex, ReadOnlyIndex
+from app.data.compact import CatalogCompactor
+from app.data.postings import POSTING_TYPECODE
+
+logger = logging.getLogger(__name__)
+
+# Identifies the file type; the layout is identified by the format in the header
+MAGIC = b"WOWSNAP\n"
+
+# Bump whenever the layout of the data or the index changes
+FORMAT_VERSION = 5
+
+# Offsets into the file
+OFFSET_TYPECODE = "Q"
+
+# Sections start on multiples of this, so array sections can be viewed in place
+ALIGNMENT = 8
+
+# Point lookups (key -> first ordinal carrying it), see CatalogIndex
+LOOKUP_MAPS = ("team_by_id", "service_by_name", "component_by_name")
+
+# Separates the texts of one document in a search index; never part of a query match
+TEXT_SEPARATOR = "\x00"
+
+
+class CompiledCatalog(NamedTuple):
+    """
+    Catalog data and index read back from a compiled snapshot file.
+    """
+    data: Dict[str, Any]
+    catalog_index: ReadOnlyIndex
+
+
+class _SectionWriter:
+    """
+    Lays out named, aligned sections one after the other.
+    """
+    def __init__(self):
+        self.sections: Dict[str, Tuple[int, int]] = {}
+        self._chunks: List[bytes] = []
+        self._size = 0
+
+    def add(self, name: str, payload: bytes) -> None:
+        padding = -self._size % ALIGNMENT
+        if padding:
+            self._chunks.append(b"\0" * padding)
+            self._size += padding
+        self.sections[name] = (self._size, len(payload))
+        self._chunks.append(payload)
+        self._size += len(payload)
+
+    def add_array(self, name: str, typecode: str, values: Iterable[int]) -> None:
+        self.add(name, array(typecode, values).tobytes())
+
+    def add_strings(self, name: str, items: Iterable[bytes]) -> None:
+        # One blob plus the offset of every item in it (and of its end)
+        offsets = array(OFFSET_TYPECODE, (0,))
+        chunks = []
+        for item in items:
+            chunks.append(item)
+            offsets.append(offsets[-1] + len(item))
+        self.add(f"{name}.blob", b"".join(chunks))
+        self.add(f"{name}.offsets", offsets.tobytes())
+
+    def write_to(self, f) -> None:
+        for chunk in self._chunks:
+            f.write(chunk)
+
+
+def _build_info() -> Dict[str, Any]:
+    # What a reader must share with the writer of a snapshot, besides the format: the layout of the
+    # packed arrays and the marshal format of the records, which may change with any Python release
+    return {
+        "byte_order": sys.byteorder,
+        "itemsizes": {typecode: array(typecode).itemsize for typecode in (POSTING_TYPECODE, OFFSET_TYPECODE)},
+        "marshal_version": marshal.version,
+        "python": sys.implementation.cache_tag,
+    }
+
+
+def _sorted_keys(keys: Iterable[str]) -> List[Tuple[bytes, str]]:
+    # Ordered by encoded bytes, the order StringTable.find searches in
+    return sorted((key.encode(), key) for key in keys)
+
+
+def write_compiled_snapshot(path: str, data: Dict[str, Any], index: CatalogIndex, content_hash: str) -> int:
+    """
+    Write validated catalog data and its index to a compiled snapshot file.
+
+    The file starts with a magic line and a JSON header line identifying the
+    source data file by content hash, recording the format, byte order and
+    marshal version it was written with and listing the sections that follow.
+    Every team is marshalled on its own and located through an offset table,
+    so it can be decoded independently of the others. The point lookups,
+    inverted indexes and trigram indexes are stored as sorted key tables
+    with packed arrays of ordinals, which can be searched in place in a
+    memory-mapped file (see ``SnapshotFile``). The file is written next to
+    its destination and renamed into place, so readers never see a partial
+    snapshot.
+
+    Args:
+        path: The snapshot file to write.
+        data: The validated data, as returned by ``JsonLoader.load``.
+        index: The index built over ``data``.
+        content_hash: The sha256 of the source data file.
+
+    Returns:
+        int: The size of the written file in bytes.
+    """
+    sections = _SectionWriter()
+    sections.add("metadata", marshal.dumps(data.get("metadata")))
+    sections.add_strings("teams", (marshal.dumps(team) for team in index.teams))
+
+    # Services and components are located inside their team's record
+    service_teams, service_positions = array(POSTING_TYPECODE), array(POSTING_TYPECODE)
+    component_services, component_positions = array(POSTING_TYPECODE), array(POSTING_TYPECODE)
+    for team_ordinal, team in enumerate(index.teams):
+        for service_position, service in enumerate(team["services_applications"]):
+            for component_position in range(len(service["runtime_components"])):
+                component_services.append(len(service_teams))
+                component_positions.append(component_position)
+            service_teams.append(team_ordinal)
+            service_positions.append(service_position)
+    sections.add("services.team", service_teams.tobytes())
+    sections.add("services.position", service_positions.tobytes())
+    sections.add("components.service", component_services.tobytes())
+    sections.add("components.position", component_positions.tobytes())
+
+    lookups: Dict[str, Dict[str, int]] = {name: {} for name in LOOKUP_MAPS}
+    for ordinal, team in enumerate(index.teams):
+        lookups["team_by_id"].setdefault(team["team_id"], ordinal)
+    for ordinal, service_ref in enumerate(index.services):
+        lookups["service_by_name"].setdefault(service_ref.service["service_name"], ordinal)
+    for ordinal, component_ref in enumerate(index.components):
+        lookups["component_by_name"].setdefault(component_ref.component_name, ordinal)
+    for name, lookup in lookups.items():
+        keys = _sorted_keys(lookup)
+        sections.add_strings(f"{name}.keys", (encoded for encoded, _ in keys))
+        sections.add_array(f"{name}.values", POSTING_TYPECODE, (lookup[key] for _, key in keys))
+
+    for name, posting_map in index.export_postings().items():
+        keys = _sorted_keys(posting_map)
+        sections.add_strings(f"{name}.keys", (encoded for encoded, _ in keys))
+        sections.add_strings(f"{name}.postings", (posting_map[key].tobytes() for _, key in keys))
+
+    for name in SEARCH_INDEXES:
+        search_index = getattr(index, name)
+        sections.add_strings(f"{name}.texts", (TEXT_SEPARATOR.join(search_index.document(ordinal)).encode()
+                                               for ordinal in range(len(search_index))))
+
+    header = {
+        "format": FORMAT_VERSION,
+        "content_hash": content_hash,
+        **_build_info(),
+        "teams": len(index.teams),
+        "services": len(index.services),
+        "components": len(index.components),
+        "sections": sections.sections,
+    }
+    header_line = MAGIC + json.dumps(header).encode() + b"\n"
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header_line)
+        f.write(b"\0" * (-len(header_line) % ALIGNMENT))
+        sections.write_to(f)
+        size = f.tell()
+    os.replace(tmp_path, path)
+    return size
+
+
+class StringTable:
+    """
+    A sequence of byte strings stored as one blob plus an offset table, read in place.
+
+    Used for the team records, the document texts of the search indexes and,
+    sorted, for the keys of lookups and inverted indexes.
+    """
+    def __init__(self, buffer: mmap.mmap, base: int, offsets: memoryview):
+        self._buffer = buffer
+        self._base = base
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def raw(self, position: int) -> bytes:
+        """
+        Get the bytes of an item.
+        """
+        offsets = self._offsets
+        return self._buffer[self._base + offsets[position]:self._base + offsets[position + 1]]
+
+    def __getitem__(self, position: int) -> str:
+        return self.raw(position).decode()
+
+    def find(self, key: str) -> Optional[int]:
+        """
+        Get the position of a key by binary search, for tables sorted by encoded bytes.
+        """
+        encoded = key.encode()
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self.raw(middle) < encoded:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self) and self.raw(low) == encoded:
+            return low
+        return None
+
+    def longest_prefix(self, text: str) -> Optional[int]:
+        """
+        Get the position of the longest item that is a prefix of the text, for tables sorted by encoded bytes.
+
+        The last item not after the text is the answer if it is a prefix of
+        it; otherwise any shorter answer is also a prefix of the part both
+        share, so the search repeats on that, shrinking it on every step.
+        """
+        encoded = text.encode()
+        while True:
+            low, high = 0, len(self)
+            while low < high:
+                middle = (low + high) // 2
+                if self.raw(middle) <= encoded:
+                    low = middle + 1
+                else:
+                    high = middle
+            if low == 0:
+                return None
+            item = self.raw(low - 1)
+            if encoded.startswith(item):
+                return low - 1
+            common = 0
+            while item[common] == encoded[common]:
+                common += 1
+            encoded = encoded[:common]
+
+    def contains(self, position: int, sub: bytes) -> bool:
+        """
+        Check whether an item contains the given bytes.
+        """
+        offsets = self._offsets
+        start = self._base + offsets[position]
+        end = self._base + offsets[position + 1]
+        return end - start >= len(sub) and self._buffer.find(sub, start, end) != -1
+
+    def positions_containing(self, sub: bytes) -> List[int]:
+        """
+        Get the positions of every item containing the given non-empty bytes, in ascending order.
+        """
+        offsets = self._offsets
+        base = self._base
+        end = base + offsets[len(self)]
+        found: List[int] = []
+        start = base
+        while True:
+            match = self._buffer.find(sub, start, end)
+            if match == -1:
+                return found
+            # A match may straddle two items; only keep it if it fits in one
+            position = bisect_right(offsets, match - base) - 1
+            item_end = base + offsets[position + 1]
+            if match + len(sub) <= item_end:
+                found.append(position)
+                start = item_end
+            else:
+                start = match + 1
+
+
+class SnapshotFile:
+    """
+    A compiled snapshot file mapped read-only into memory.
+
+    Sections are exposed as views into the mapping rather than copies, so
+    every process mapping the same file shares its pages through the OS page
+    cache. The mapping stays open for as long as any view is referenced.
+    """
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not a compiled catalog snapshot")
+        header_end = self._mmap.find(b"\n", len(MAGIC))
+        if header_end == -1:
+            raise ValueError("Truncated compiled catalog snapshot")
+        self.header: Dict[str, Any] = json.loads(self._mmap[len(MAGIC):header_end])
+        self._base = header_end + 1 + (-(header_end + 1) % ALIGNMENT)
+        self._view = memoryview(self._mmap)
+
+    def is_compatible(self) -> bool:
+        """
+        Check whether the file was written in a layout this build can read, by the same marshal format.
+        """
+        header = self.header
+        return (header.get("format") == FORMAT_VERSION
+                and all(header.get(key) == value for key, value in _build_info().items()))
+
+    def _bounds(self, name: str) -> Tuple[int, int]:
+        offset, length = self.header["sections"][name]
+        start = self._base + offset
+        if start + length > len(self._mmap):
+            raise ValueError(f"Truncated compiled catalog snapshot (section {name})")
+        return start, start + length
+
+    def bytes(self, name: str) -> bytes:
+        """
+        Get a copy of a section.
+        """
+        start, end = self._bounds(name)
+        return self._mmap[start:end]
+
+    def array(self, name: str, typecode: str = POSTING_TYPECODE) -> memoryview:
+        """
+        Get a section of packed numbers as an in-place view.
+        """
+        start, end = self._bounds(name)
+        return self._view[start:end].cast(typecode)
+
+    def strings(self, name: str) -> StringTable:
+        """
+        Get a string table section.
+        """
+        start, _ = self._bounds(f"{name}.blob")
+        return StringTable(self._mmap, start, self.array(f"{name}.offsets", OFFSET_TYPECODE))
+
+
+def open_snapshot(path: str, content_hash: str) -> Optional[SnapshotFile]:
+    """
+    Map a compiled snapshot if it was compiled from the given data file contents.
+
+    Args:
+        path: The snapshot file to map.
+        content_hash: The sha256 of the current data file.
+
+    Returns:
+        The mapped snapshot, or None if the file is missing, unreadable, in
+        another format or compiled from a different data file.
+    """
+    try:
+        snapshot = SnapshotFile(path)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable compiled snapshot %s: %s", path, e)
+        return None
+
+    if not snapshot.is_compatible():
+        logger.info("Ignoring compiled snapshot %s: incompatible format", path)
+        return None
+    if snapshot.header.get("content_hash") != content_hash:
+        logger.info("Ignoring compiled snapshot %s: compiled from a different data file", path)
+        return None
+    return snapshot
+
+
+def read_snapshot_header(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Read the header of a compiled snapshot file.
+
+    Returns:
+        The header, or None if the file does not exist or is not a snapshot.
+    """
+    try:
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return None
+            return json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+
+
+def read_compiled_snapshot(path: str, content_hash: str) -> Optional[CompiledCatalog]:
+    """
+    Read a compiled snapshot into memory if it was compiled from the given data file contents.
+
+    Args:
+        path: The snapshot file to read.
+        content_hash: The sha256 of the current data file.
+
+    Returns:
+        The data and its index, or None if the snapshot cannot be used (see ``open_snapshot``).
+    """
+    snapshot = open_snapshot(path, content_hash)
+    if snapshot is None:
+        return None
+
+    compactor = CatalogCompactor()
+    try:
+        records = snapshot.strings("teams")
+        data = {
+            "metadata": compactor.value(marshal.loads(snapshot.bytes("metadata"))),
+            "teams": [compactor.team(marshal.loads(records.raw(position))) for position in range(len(records))],
+        }
+        postings = {}
+        for name in POSTING_MAPS + SEARCH_INDEXES:
+            keys = snapshot.strings(f"{name}.keys")
+            ordinals = snapshot.strings(f"{name}.postings")
+            # Keys of the posting maps are values of the records, and share their strings
+            shared_keys = name in POSTING_MAPS
+            posting_map = {}
+            for position in range(len(keys)):
+                posting = array(POSTING_TYPECODE)
+                posting.frombytes(ordinals.raw(position))
+                key = keys[position]
+                posting_map[compactor.value(key) if shared_keys else key] = posting
+            postings[name] = posting_map
+    except (KeyError, ValueError, EOFError, TypeError) as e:
+        logger.warning("Ignoring unreadable compiled snapshot %s: %s", path, e)
+        return None
+    return CompiledCatalog(data, CatalogIndex(data, postings=postings))
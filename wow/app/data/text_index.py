@@ -0,0 +1,234 @@
+import heapq
+import math
+import re
+import threading
+from array import array
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from app.data.catalog_index import ReadOnlyIndex
+from app.data.postings import POSTING_TYPECODE
+
+# Entity -> text fields ranked search scores, see TextIndex
+TEXT_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "teams": ("team_name", "team_mission", "value_stream_name", "value_stream_description"),
+    "services": ("service_name", "tech_stack"),
+    "components": ("component_name",),
+}
+
+# Weight of a match in each field, relative to a match in a mission or description
+DEFAULT_FIELD_WEIGHTS: Dict[str, float] = {
+    "team_name": 3.0,
+    "team_mission": 1.0,
+    "value_stream_name": 2.0,
+    "value_stream_description": 1.0,
+    "service_name": 3.0,
+    "tech_stack": 2.0,
+    "component_name": 3.0,
+}
+
+# BM25 saturation of term frequencies and strength of the length normalisation
+K1 = 1.2
+B = 0.75
+
+# Runs of letters and digits of any script
+_TOKEN = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split a text into casefolded runs of letters and digits.
+    """
+    return _TOKEN.findall(text.casefold())
+
+
+def parse_field_weights(text: str) -> Dict[str, float]:
+    """
+    Parse field weights such as ``team_mission=1,service_name=2.5`` over ``DEFAULT_FIELD_WEIGHTS``.
+
+    Raises:
+        ValueError: If a field is unknown or a weight is not a non-negative number.
+    """
+    weights = dict(DEFAULT_FIELD_WEIGHTS)
+    for item in text.split(","):
+        if not item.strip():
+            continue
+        field, _, weight = item.partition("=")
+        field = field.strip()
+        if field not in weights:
+            raise ValueError(f"Unknown text field: {field!r}. Valid fields: {', '.join(weights)}")
+        try:
+            weights[field] = float(weight)
+        except ValueError:
+            raise ValueError(f"Invalid weight of {field}: {weight.strip()!r}") from None
+        if not weights[field] >= 0:
+            raise ValueError(f"Invalid weight of {field}: {weight.strip()!r}")
+    return weights
+
+
+class _FieldPostings:
+    """
+    Term -> documents containing it in one field and their length-normalised term frequencies.
+    """
+    __slots__ = ("ordinals", "frequencies")
+
+    def __init__(self):
+        self.ordinals = array(POSTING_TYPECODE)
+        self.frequencies = array("d")
+
+
+class TextIndex:
+    """
+    BM25F index over the text fields of one kind of entity.
+
+    Every term of a field maps to the documents containing it, in ordinal
+    order, each with the term's frequency in the field divided by the
+    field's BM25 length normalisation ``1 - b + b * length / average
+    length``. Those, and the inverse document frequency of every term, are
+    computed when the index is built, so scoring a query only reads the
+    posting lists of its terms: the weighted normalised frequencies of a
+    term across fields are summed per document, saturated with ``k1`` and
+    scaled by the term's IDF. Weights are applied per query and can be
+    changed without a rebuild.
+
+    Args:
+        documents: ``(ordinal, field, text)`` for every text of every
+            document, in any order; a field may have several texts.
+        size: The number of documents.
+    """
+    def __init__(self, documents: Iterable[Tuple[int, str, str]], size: int):
+        # Field -> ordinal -> term -> frequency, and field -> ordinal -> length
+        frequencies: Dict[str, Dict[int, Dict[str, int]]] = {}
+        lengths: Dict[str, Dict[int, int]] = {}
+        for ordinal, field, text in documents:
+            terms = tokenize(text)
+            counts = frequencies.setdefault(field, {}).setdefault(ordinal, {})
+            for term in terms:
+                counts[term] = counts.get(term, 0) + 1
+            field_lengths = lengths.setdefault(field, {})
+            field_lengths[ordinal] = field_lengths.get(ordinal, 0) + len(terms)
+
+        self.size = size
+        self._postings: Dict[str, Dict[str, _FieldPostings]] = {field: {} for field in frequencies}
+        averages = {field: sum(field_lengths.values()) / len(field_lengths) or 1.0
+                    for field, field_lengths in lengths.items()}
+        # Term -> the last document counted and the number of documents containing it; documents are
+        # visited in ordinal order, so one holding the term in several fields counts once
+        document_frequencies: Dict[str, List[int]] = {}
+        ordinals = sorted({ordinal for field_frequencies in frequencies.values() for ordinal in field_frequencies})
+        for ordinal in ordinals:
+            for field, field_frequencies in frequencies.items():
+                term_counts = field_frequencies.get(ordinal)
+                if term_counts is None:
+                    continue
+                postings = self._postings[field]
+                norm = 1 - B + B * lengths[field][ordinal] / averages[field]
+                for term, frequency in term_counts.items():
+                    term_postings = postings.get(term)
+                    if term_postings is None:
+                        term_postings = postings[term] = _FieldPostings()
+                    term_postings.ordinals.append(ordinal)
+                    term_postings.frequencies.append(frequency / norm)
+                    counted = document_frequencies.get(term)
+                    if counted is None:
+                        document_frequencies[term] = [ordinal, 1]
+                    elif counted[0] != ordinal:
+                        counted[0] = ordinal
+                        counted[1] += 1
+        self._idf = {term: math.log(1 + (size - count + 0.5) / (count + 0.5))
+                     for term, (_, count) in document_frequencies.items()}
+
+    def idf(self, term: str) -> float:
+        """
+        Get the inverse document frequency of a term, 0 if no document contains it.
+        """
+        return self._idf.get(term, 0.0)
+
+    def top(self, query: str, limit: int, weights: Mapping[str, float]) -> List[Tuple[float, int]]:
+        """
+        Get the documents scoring highest for a query.
+
+        Args:
+            query: The query text; a document matches when it contains any of its terms.
+            limit: The number of documents to return.
+            weights: Field -> weight; fields without a weight are ignored.
+
+        Returns:
+            ``(score, ordinal)`` of at most ``limit`` matching documents,
+            highest score first, then in ordinal order.
+        """
+        terms = [term for term in dict.fromkeys(tokenize(query)) if term in self._idf]
+        scores: Dict[int, float] = {}
+        for term in terms:
+            weighted: Dict[int, float] = {}
+            for field, postings in self._postings.items():
+                weight = weights.get(field, 0.0)
+                term_postings = postings.get(term)
+                if not weight or term_postings is None:
+                    continue
+                for ordinal, frequency in zip(term_postings.ordinals, term_postings.frequencies):
+                    weighted[ordinal] = weighted.get(ordinal, 0.0) + weight * frequency
+            idf = self._idf[term]
+            for ordinal, frequency in weighted.items():
+                scores[ordinal] = scores.get(ordinal, 0.0) + idf * frequency * (K1 + 1) / (frequency + K1)
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(score, ordinal) for ordinal, score in best]
+
+
+class TextIndexes:
+    """
+    Text indexes over the teams, services and runtime components of one catalog version.
+
+    Indexes are built once, on first use or by ``build``.
+    """
+    def __init__(self, index: ReadOnlyIndex):
+        self._index = index
+        self._indexes: Dict[str, TextIndex] = {}
+        self._lock = threading.Lock()
+
+    def build(self) -> None:
+        """
+        Build every index now, rather than on first use.
+        """
+        for entity in TEXT_FIELDS:
+            self.get(entity)
+
+    def get(self, entity: str) -> TextIndex:
+        """
+        Get the index of "teams", "services" or "components".
+        """
+        text_index = self._indexes.get(entity)
+        if text_index is None:
+            with self._lock:
+                text_index = self._indexes.get(entity)
+                if text_index is None:
+                    size = len(getattr(self._index, entity))
+                    text_index = self._indexes[entity] = TextIndex(self._documents(entity), size)
+        return text_index
+
+    def top(self,
+            entity: str,
+            query: str,
+            limit: int,
+            weights: Optional[Mapping[str, float]] = None) -> List[Tuple[float, int]]:
+        """
+        Get the entities scoring highest for a query, see ``TextIndex.top``.
+        """
+        return self.get(entity).top(query, limit, weights if weights is not None else DEFAULT_FIELD_WEIGHTS)
+
+    def _documents(self, entity: str) -> Iterable[Tuple[int, str, str]]:
+        index = self._index
+        if entity == "teams":
+            for ordinal, team in enumerate(index.teams):
+                yield ordinal, "team_name", team["team_name"]
+                yield ordinal, "team_mission", team["team_api"]["team_mission"]
+                for value_stream in team["value_streams"]:
+                    yield ordinal, "value_stream_name", value_stream["value_stream_name"]
+                    yield ordinal, "value_stream_description", value_stream["value_stream_description"]
+            return
+        # Read from the posting maps of the values, so a mapped index decodes nothing
+        fields = {"services": (("service_name", "services_by_name"), ("tech_stack", "services_by_tech_stack")),
+                  "components": (("component_name", "components_by_name"),)}[entity]
+        for field, posting_map in fields:
+            for value, ordinals in getattr(index, posting_map).items():
+                for ordinal in ordinals:
+                    yield ordinal, field, value
@@ -0,0 +1,123 @@
+from typing import Iterable, List, Optional, Tuple
+
+from app.data.postings import Postings, add_posting, intersect_postings
+
+NGRAM_SIZE = 3
+
+
+def ngrams(text: str) -> set:
+    """
+    Get the distinct trigrams of a text.
+    """
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+def _lowered(text: str) -> str:
+    # Texts that are lowercase already are kept rather than copied
+    lowered = text.lower()
+    return text if lowered == text else lowered
+
+
+class TrigramIndex:
+    """
+    Case-insensitive substring index over documents made of one or more texts.
+
+    Every trigram of a document's lowercased texts maps to the sorted ordinals
+    of the documents containing it. A query is first narrowed to the documents
+    holding all of its trigrams, then each candidate is checked for the exact
+    substring, so results are the same as testing every document with ``in``.
+    Queries shorter than a trigram cannot be narrowed and are checked against
+    every document.
+    """
+    def __init__(self, postings: Optional[Postings] = None):
+        self._texts: List[Tuple[str, ...]] = []
+        self._postings: Postings = postings if postings is not None else {}
+        # Postings given up front already cover every document that will be added
+        self._index_grams = postings is None
+
+    @classmethod
+    def from_documents(cls, documents: List[Tuple[str, ...]], postings: Postings) -> "TrigramIndex":
+        """
+        Create an index over lowercased documents whose posting lists are already built.
+        """
+        index = cls()
+        index._texts = documents
+        index._postings = postings
+        return index
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def add(self, texts: Iterable[str]) -> int:
+        """
+        Add a document.
+
+        Args:
+            texts: The searchable texts of the document.
+
+        Returns:
+            int: The ordinal of the document, i.e. the number of documents added before it.
+        """
+        ordinal = len(self._texts)
+        lowered = tuple(_lowered(text) for text in texts)
+        self._texts.append(lowered)
+
+        if self._index_grams:
+            grams = set()
+            for text in lowered:
+                grams |= ngrams(text)
+            postings = self._postings
+            for gram in grams:
+                add_posting(postings, gram, ordinal)
+        return ordinal
+
+    @property
+    def postings(self) -> Postings:
+        """
+        Get the posting lists by trigram.
+        """
+        return self._postings
+
+    @property
+    def documents(self) -> List[Tuple[str, ...]]:
+        """
+        Get the lowercased texts of every document, by ordinal. Callers must treat it as read-only.
+        """
+        return self._texts
+
+    def document(self, ordinal: int) -> Tuple[str, ...]:
+        """
+        Get the lowercased texts of a document.
+        """
+        return self._texts[ordinal]
+
+    def candidates(self, query: str) -> List[int]:
+        """
+        Get the ordinals of documents that may contain the lowercased query.
+        """
+        grams = ngrams(query)
+        if not grams:
+            return list(range(len(self._texts)))
+
+        postings = []
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if not posting:
+                return []
+            postings.append(posting)
+        return intersect_postings(postings)
+
+    def search(self, query: str) -> List[int]:
+        """
+        Get the ordinals of documents with a text containing the query, ignoring case.
+
+        Args:
+            query: The substring to look for.
+
+        Returns:
+            The matching ordinals in ascending order.
+        """
+        query = query.lower()
+        texts = self._texts
+        return [ordinal for ordinal in self.candidates(query)
+                if any(query in text for text in texts[ordinal])]
@@ -1,26 +1,88 @@
 import os
-from fastapi import Depends
+from fastapi import Depends, Request
 
-from app.data.json_loader import JsonLoader
+from app.api.catalog_events import CatalogEvents
+from app.api.profiling import ProfileStore
+from app.api.response_cache import ResponseCache
+from app.data.catalog import CatalogSnapshot, CatalogStore
+from app.data.change_log import ChangeLog
+from app.data.text_index import parse_field_weights
 from app.services.team_service import TeamService
 from app.services.service_service import ServiceService
 from app.services.runtime_component_service import RuntimeComponentService
 from app.services.search_service import SearchService
+from app.services.facet_service import FacetService
+from app.services.query_service import QueryService
 
 # Data file path
 DATA_FILE = os.environ.get("WOW_DATA_FILE", "app/data/wow_data.json")
 
-def get_json_loader():
-    return JsonLoader(DATA_FILE)
+# Compiled snapshot of the data file, loaded instead of it when up to date (see compile_catalog.py)
+SNAPSHOT_FILE = os.environ.get("WOW_SNAPSHOT_FILE", os.path.splitext(DATA_FILE)[0] + ".snapshot")
 
-def get_team_service(json_loader: JsonLoader = Depends(get_json_loader)):
-    return TeamService(json_loader)
+# Memory-map the compiled snapshot instead of loading it, sharing it between worker processes
+MAPPED_CATALOG = os.environ.get("WOW_MAPPED_CATALOG", "").lower() in ("1", "true", "yes")
 
-def get_service_service(json_loader: JsonLoader = Depends(get_json_loader)):
-    return ServiceService(json_loader)
+# Parse the teams array incrementally instead of loading the whole file at once
+STREAMING_LOAD = os.environ.get("WOW_STREAMING_LOAD", "").lower() in ("1", "true", "yes")
 
-def get_runtime_component_service(json_loader: JsonLoader = Depends(get_json_loader)):
-    return RuntimeComponentService(json_loader)
+# Seconds between data file polls; 0 disables hot reload
+RELOAD_INTERVAL = float(os.environ.get("WOW_RELOAD_INTERVAL", "2.0"))
 
-def get_search_service(json_loader: JsonLoader = Depends(get_json_loader)):
-    return SearchService(json_loader)
+# Maximum number of encoded responses kept per catalog version; 0 disables the cache
+RESPONSE_CACHE_SIZE = int(os.environ.get("WOW_RESPONSE_CACHE_SIZE", "10000"))
+
+# Number of catalog version diffs kept for GET /changes
+CHANGE_LOG_SIZE = int(os.environ.get("WOW_CHANGE_LOG_SIZE", "100"))
+
+# Seconds between heartbeats on idle GET /watch streams
+WATCH_HEARTBEAT_INTERVAL = float(os.environ.get("WOW_WATCH_HEARTBEAT_INTERVAL", "15.0"))
+
+# Weights of the text fields in ranked search, e.g. "team_mission=1,service_name=2.5" (see DEFAULT_FIELD_WEIGHTS)
+SEARCH_FIELD_WEIGHTS = parse_field_weights(os.environ.get("WOW_SEARCH_FIELD_WEIGHTS", ""))
+
+# Profile the requests sending an X-Profile header; off by default, and free when off
+PROFILING_ENABLED = os.environ.get("WOW_PROFILING", "").lower() in ("1", "true", "yes")
+
+# Token required in the X-Profile-Token header to profile a request or read profiles; unset allows any client
+PROFILING_TOKEN = os.environ.get("WOW_PROFILING_TOKEN") or None
+
+# Number of request profiles kept for GET /profiles
+PROFILE_STORE_SIZE = int(os.environ.get("WOW_PROFILE_STORE_SIZE", "20"))
+
+def get_catalog_store(request: Request) -> CatalogStore:
+    return request.app.state.catalog_store
+
+def get_catalog(request: Request, store: CatalogStore = Depends(get_catalog_store)) -> CatalogSnapshot:
+    # The snapshot a conditional GET was pinned to, so the response matches its ETag
+    return getattr(request.state, "catalog", None) or store.current
+
+def get_response_cache(request: Request) -> ResponseCache:
+    return request.app.state.response_cache
+
+def get_change_log(request: Request) -> ChangeLog:
+    return request.app.state.change_log
+
+def get_catalog_events(request: Request) -> CatalogEvents:
+    return request.app.state.catalog_events
+
+def get_profile_store(request: Request) -> ProfileStore:
+    return request.app.state.profile_store
+
+def get_team_service(catalog: CatalogSnapshot = Depends(get_catalog)):
+    return TeamService(catalog)
+
+def get_service_service(catalog: CatalogSnapshot = Depends(get_catalog)):
+    return ServiceService(catalog)
+
+def get_runtime_component_service(catalog: CatalogSnapshot = Depends(get_catalog)):
+    return RuntimeComponentService(catalog)
+
+def get_search_service(catalog: CatalogSnapshot = Depends(get_catalog)):
+    return SearchService(catalog, field_weights=SEARCH_FIELD_WEIGHTS)
+
+def get_facet_service(catalog: CatalogSnapshot = Depends(get_catalog)):
+    return FacetService(catalog)
+
+def get_query_service(catalog: CatalogSnapshot = Depends(get_catalog)):
+    return QueryService(catalog)
@@ -1,29 +1,115 @@
+from contextlib import asynccontextmanager
+from functools import partial
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api import teams, services, runtime_components, search
+from app.api import (teams, services, runtime_components, search, catalog, changes, watch, facets, query, metrics,
+                     profiles)
+from app.api.catalog_events import CatalogEvents
+from app.api.conditional import ConditionalGetMiddleware
+from app.api.metrics import MetricsMiddleware, collect_catalog_metrics
+from app.api.profiling import ProfileStore, ProfilingMiddleware
+from app.api.response_cache import ResponseCache
+from app.data.catalog import CatalogStore, CatalogWatcher
+from app.data.change_log import ChangeLog
+from app.data.json_loader import JsonLoader
+from app.metrics import REGISTRY
+from app.dependencies import (CHANGE_LOG_SIZE, DATA_FILE, MAPPED_CATALOG, PROFILE_STORE_SIZE, PROFILING_ENABLED,
+                              PROFILING_TOKEN, RELOAD_INTERVAL, RESPONSE_CACHE_SIZE, SNAPSHOT_FILE, STREAMING_LOAD,
+                              WATCH_HEARTBEAT_INTERVAL)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the catalog once per process (unless a store was provided) and keep it fresh in the background
+    store = getattr(app.state, "catalog_store", None)
+    if store is None:
+        store = CatalogStore(DATA_FILE,
+                             loader_factory=partial(JsonLoader, streaming=STREAMING_LOAD),
+                             compiled_path=SNAPSHOT_FILE,
+                             mapped=MAPPED_CATALOG)
+        store.load()
+        app.state.catalog_store = store
+
+    # Encoded responses are dropped as soon as a new catalog version is published
+    response_cache = ResponseCache(max_entries=RESPONSE_CACHE_SIZE)
+    store.subscribe(response_cache.invalidate)
+    app.state.response_cache = response_cache
+
+    # Diffs between the most recent versions, starting from the one being served
+    change_log = ChangeLog(max_versions=CHANGE_LOG_SIZE)
+    change_log.record(store.current)
+    store.subscribe(change_log.record)
+    app.state.change_log = change_log
+
+    # Pushes every new version to the /watch streams; subscribed after the change log it reads
+    catalog_events = CatalogEvents(change_log, heartbeat_interval=WATCH_HEARTBEAT_INTERVAL)
+    store.subscribe(catalog_events.publish)
+    app.state.catalog_events = catalog_events
+
+    # The catalog gauges are read from the snapshot being served when /metrics is scraped
+    catalog_collector = partial(collect_catalog_metrics, store)
+    REGISTRY.add_collector(catalog_collector)
+
+    watcher = None
+    if RELOAD_INTERVAL > 0:
+        watcher = CatalogWatcher(store, interval=RELOAD_INTERVAL)
+        watcher.start()
+    try:
+        yield
+    finally:
+        if watcher is not None:
+            watcher.stop()
+        store.unsubscribe(response_cache.invalidate)
+        store.unsubscribe(change_log.record)
+        store.unsubscribe(catalog_events.publish)
+        catalog_events.close()
+        REGISTRY.remove_collector(catalog_collector)
+
 
 # Create FastAPI app
 app = FastAPI(
     title="WOW - Who Owns What",
     description="API for querying software services ownership by DevOps teams",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-# Add CORS middleware
+# Tag catalog responses with their version and answer If-None-Match with 304
+app.add_middleware(ConditionalGetMiddleware)
+
+# Add CORS middleware (outermost, so it also applies to 304 responses)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Catalog-Version", "X-Next-Cursor"],
 )
 
+# Profile the requests asking for it; not installed at all unless enabled
+if PROFILING_ENABLED:
+    app.state.profile_store = ProfileStore(max_profiles=PROFILE_STORE_SIZE)
+    app.add_middleware(ProfilingMiddleware, store=app.state.profile_store, token=PROFILING_TOKEN)
+
+# Record the latency, size and status of every request (outermost, so it times the whole stack)
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(teams.router)
 app.include_router(services.router)
 app.include_router(runtime_components.router)
 app.include_router(search.router)
+app.include_router(facets.router)
+app.include_router(query.router)
+app.include_router(catalog.router)
+app.include_router(changes.router)
+app.include_router(watch.router)
+app.include_router(metrics.router)
+if PROFILING_ENABLED:
+    app.include_router(profiles.router)
 
 @app.get("/")
 async def root():
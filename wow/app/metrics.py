@@ -0,0 +1,306 @@
+import functools
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+# Upper bounds in seconds of the latency buckets, from 0.1 ms to 10 s
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+                   2.5, 5.0, 10.0)
+
+# Upper bounds in bytes of the response size buckets, from 100 B to 100 MB
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+
+# Upper bounds in seconds of the catalog load phase buckets, from 1 ms to 5 min
+PHASE_BUCKETS = (0.001, 0.01, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    """
+    A named metric and its values per combination of label values.
+
+    Values are created on first use of their labels and kept for the life
+    of the process, so label values must come from a small fixed set (route
+    templates, not request paths). Look a value up once with ``labels`` and
+    keep it where it is updated often; updating it then allocates nothing.
+    """
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *label_values: str):
+        """
+        Get the value of this metric for some label values, in the order of ``label_names``.
+        """
+        value = self._values.get(label_values)
+        if value is None:
+            if len(label_values) != len(self.label_names):
+                raise ValueError(f"{self.name} takes labels {self.label_names}, got {label_values}")
+            with self._lock:
+                value = self._values.setdefault(label_values, self._new_value())
+        return value
+
+    def render(self) -> List[str]:
+        """
+        Get the lines of this metric in the Prometheus text format.
+        """
+        lines = [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.kind}"]
+        for label_values, value in sorted(self._values.items()):
+            labels = [f'{name}="{_escape(str(label))}"' for name, label in zip(self.label_names, label_values)]
+            lines.extend(self._render_value(labels, value))
+        return lines
+
+    @abstractmethod
+    def _new_value(self):
+        ...
+
+    def _render_value(self, labels: List[str], value) -> List[str]:
+        return [f"{self.name}{{{','.join(labels)}}} {_format_value(value.value)}" if labels
+                else f"{self.name} {_format_value(value.value)}"]
+
+
+class _CounterValue:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeValue:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+
+class _HistogramValue:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        # One count per bucket, the last for values above every bound
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        bucket = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[bucket] += 1
+            self.sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+
+class Counter(_Metric):
+    """
+    A total that only goes up, such as a number of requests.
+    """
+    kind = "counter"
+
+    def _new_value(self) -> _CounterValue:
+        return _CounterValue()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """
+        Increment the value of a metric without labels.
+        """
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric):
+    """
+    A value that goes up and down, such as a number of requests in flight.
+    """
+    kind = "gauge"
+
+    def _new_value(self) -> _GaugeValue:
+        return _GaugeValue()
+
+    def set(self, value: float) -> None:
+        """
+        Set the value of a metric without labels.
+        """
+        self.labels().set(value)
+
+
+class Histogram(_Metric):
+    """
+    A distribution of observed values, counted into buckets fixed when the metric is created.
+
+    Every value holds one preallocated count per bucket; an observation
+    finds its bucket by bisection and increments that count and the sum.
+    Counts are made cumulative, as Prometheus expects, only when rendered.
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_value(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """
+        Record a value of a metric without labels.
+        """
+        self.labels().observe(value)
+
+    def _render_value(self, labels: List[str], value: _HistogramValue) -> List[str]:
+        with value._lock:
+            counts, total = list(value.counts), value.sum
+        lines, cumulative = [], 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            cumulative += count
+            bucket_labels = ",".join(labels + [f'le="{_format_value(bound)}"'])
+            lines.append(f"{self.name}_bucket{{{bucket_labels}}} {cumulative}")
+        suffix = f"{{{','.join(labels)}}}" if labels else ""
+        lines.append(f"{self.name}_sum{suffix} {_format_value(total)}")
+        lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+M = TypeVar("M", bound=_Metric)
+
+
+class Registry:
+    """
+    The metrics of the process, rendered together by ``render``.
+
+    Collectors registered with ``add_collector`` are called before every
+    render, to set gauges read from elsewhere (such as the current catalog
+    version) only when they are scraped.
+    """
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: M) -> M:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        self._collectors.append(collector)
+
+    def remove_collector(self, collector: Callable[[], None]) -> None:
+        if collector in self._collectors:
+            self._collectors.remove(collector)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """
+        Get every metric in the Prometheus text exposition format (version 0.0.4).
+        """
+        for collector in list(self._collectors):
+            collector()
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "wow_http_requests_total", "HTTP requests completed, by route template and status code.",
+    ("method", "route", "status")))
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "wow_http_request_duration_seconds",
+    "Time from receiving an HTTP request to sending the end of its response, except event streams, which stay open.",
+    ("method", "route")))
+HTTP_RESPONSE_SIZE = REGISTRY.register(Histogram(
+    "wow_http_response_size_bytes", "Size of HTTP response bodies.", ("method", "route"), buckets=SIZE_BUCKETS))
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.register(Gauge(
+    "wow_http_requests_in_flight", "HTTP requests being handled."))
+
+CATALOG_LOAD_PHASE_DURATION = REGISTRY.register(Histogram(
+    "wow_catalog_load_phase_duration_seconds",
+    "Time spent in each phase of building a catalog snapshot: parse, validate, compact, fingerprint and index "
+    "(stream when a streaming load interleaves them, delta when a reload validates changed teams only), "
+    "facets, fuzzy_index and text_index, or compiled when reading a compiled snapshot.",
+    ("phase",), buckets=PHASE_BUCKETS))
+CATALOG_LOADS = REGISTRY.register(Counter(
+    "wow_catalog_loads_total", "Catalog snapshot builds, by result (published or failed).", ("result",)))
+CATALOG_VERSION = REGISTRY.register(Gauge(
+    "wow_catalog_version", "Version of the catalog snapshot being served."))
+CATALOG_AGE = REGISTRY.register(Gauge(
+    "wow_catalog_age_seconds", "Seconds since the catalog snapshot being served was loaded."))
+CATALOG_ENTITIES = REGISTRY.register(Gauge(
+    "wow_catalog_entities", "Entities in the catalog snapshot being served.", ("entity",)))
+
+SERVICE_DURATION = REGISTRY.register(Histogram(
+    "wow_service_duration_seconds",
+    "Time spent in service methods selecting results, excluding the serialization of streamed pages.",
+    ("operation",)))
+
+
+@contextmanager
+def timed(histogram: Histogram, *label_values: str) -> Iterator[None]:
+    """
+    Record the duration of a block in seconds.
+    """
+    value = histogram.labels(*label_values)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        value.observe(time.perf_counter() - start)
+
+
+def timed_operation(func: Callable) -> Callable:
+    """
+    Decorate a service method to record its duration in ``SERVICE_DURATION``, labelled with its qualified name.
+    """
+    value = SERVICE_DURATION.labels(func.__qualname__)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            value.observe(time.perf_counter() - start)
+    return wrapper
@@ -0,0 +1,51 @@
+from typing import Any, Dict, List
+from pydantic import BaseModel, Field
+
+from app.models.team import Team
+
+# Maximum number of keys in one batch request
+MAX_BATCH_SIZE = 10000
+
+
+class TeamBatchRequest(BaseModel):
+    """
+    Team IDs to look up in one request.
+    """
+    team_ids: List[str] = Field(..., max_length=MAX_BATCH_SIZE)
+
+
+class ServiceBatchRequest(BaseModel):
+    """
+    Service names to look up in one request.
+    """
+    service_names: List[str] = Field(..., max_length=MAX_BATCH_SIZE)
+
+
+class RuntimeComponentBatchRequest(BaseModel):
+    """
+    Runtime component names to look up in one request.
+    """
+    component_names: List[str] = Field(..., max_length=MAX_BATCH_SIZE)
+
+
+class InstanceResolveRequest(BaseModel):
+    """
+    Live instance names to resolve to runtime components in one request.
+    """
+    instances: List[str] = Field(..., max_length=MAX_BATCH_SIZE)
+
+
+class TeamBatchResult(BaseModel):
+    """
+    Teams found for a batch request, and the requested IDs that were not found.
+    """
+    found: List[Team]
+    not_found: List[str]
+
+
+class BatchResult(BaseModel):
+    """
+    Records found for a batch request, and the requested keys that were not found.
+    """
+    found: List[Dict[str, Any]]
+    not_found: List[str]
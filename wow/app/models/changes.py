@@ -0,0 +1,25 @@
+from typing import List
+from pydantic import BaseModel
+
+
+class EntityChanges(BaseModel):
+    """
+    Keys of one kind of entity that changed between two catalog versions.
+    """
+    added: List[str]
+    removed: List[str]
+    modified: List[str]
+
+
+class ChangeFeed(BaseModel):
+    """
+    What changed in the catalog since a version held by the client.
+    """
+    since: int
+    version: int
+    epoch: str
+    resync_required: bool
+    oldest_version: int
+    teams: EntityChanges
+    services: EntityChanges
+    runtime_components: EntityChanges
@@ -0,0 +1,11 @@
+from typing import Dict
+from pydantic import BaseModel
+
+
+class FacetCounts(BaseModel):
+    """
+    Number of teams or services per value of each requested dimension.
+    """
+    entity: str
+    total: int
+    facets: Dict[str, Dict[str, int]]
@@ -0,0 +1,17 @@
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class ProfileInfo(BaseModel):
+    """
+    A stored request profile, without its data.
+    """
+    id: str
+    method: str
+    path: str
+    query: str
+    status: int
+    format: str
+    duration_ms: float
+    created_at: datetime
+    size: int
@@ -0,0 +1,11 @@
+from typing import Any, Dict, List
+from pydantic import BaseModel
+
+
+class QueryResult(BaseModel):
+    """
+    Teams, services or runtime components matching a filter expression.
+    """
+    entity: str
+    total: int
+    items: List[Dict[str, Any]]
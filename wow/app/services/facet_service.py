@@ -0,0 +1,69 @@
+from typing import Any, Dict, List, Optional
+
+from app.data.catalog import CatalogSnapshot
+from app.data.facets import FACET_DIMENSIONS
+from app.metrics import timed_operation
+
+# Entity -> filters accepted, as by the list endpoints of the entity
+FACET_FILTERS = {
+    "teams": ("business_segment", "value_stream_name", "team_type"),
+    "services": ("team_id", "team_name", "business_segment", "value_stream_name", "sla", "tech_stack"),
+}
+
+
+class FacetService:
+    """
+    Service for counting teams and services per value of their attributes.
+    """
+    def __init__(self, catalog: CatalogSnapshot):
+        self.catalog = catalog
+
+    @timed_operation
+    def get_facets(self,
+                   entity: str,
+                   dimensions: List[str],
+                   filters: Optional[Dict[str, Optional[str]]] = None) -> Dict[str, Any]:
+        """
+        Count the teams or services matching some filters per value of some dimensions.
+        
+        Unfiltered counts are read from the facet tables of the snapshot;
+        filtered counts intersect the matching ordinals with the postings
+        of each value, without reading any entity.
+        
+        Args:
+            entity: "teams" or "services".
+            dimensions: The dimensions to count by, see ``FACET_DIMENSIONS``.
+            filters: Optional filters by name, see ``FACET_FILTERS``; None values are ignored.
+            
+        Returns:
+            The entity, the number of entities matching the filters, and for
+            each dimension the count per value, largest first.
+            
+        Raises:
+            ValueError: If the entity, a dimension or a filter is unknown.
+        """
+        if entity not in FACET_DIMENSIONS:
+            raise ValueError(f"Unknown entity: {entity}. Allowed: {', '.join(FACET_DIMENSIONS)}")
+        allowed_dimensions = FACET_DIMENSIONS[entity]
+        unknown = [dimension for dimension in dimensions if dimension not in allowed_dimensions]
+        if unknown:
+            raise ValueError(f"Unknown {entity} dimensions: {', '.join(unknown)}. "
+                             f"Allowed: {', '.join(allowed_dimensions)}")
+        filters = {name: value for name, value in (filters or {}).items() if value}
+        unknown = [name for name in filters if name not in FACET_FILTERS[entity]]
+        if unknown:
+            raise ValueError(f"Unknown {entity} filters: {', '.join(unknown)}. "
+                             f"Allowed: {', '.join(FACET_FILTERS[entity])}")
+
+        index = self.catalog.get_index()
+        ordinals: Optional[List[int]] = None
+        if filters:
+            ordinals = index.find_teams(**filters) if entity == "teams" else index.find_services(**filters)
+        total = len(ordinals) if ordinals is not None else len(getattr(index, entity))
+
+        facet_tables = self.catalog.get_facets()
+        facets = {}
+        for dimension in dict.fromkeys(dimensions):
+            counts = facet_tables.counts(entity, dimension, ordinals)
+            facets[dimension] = dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+        return {"entity": entity, "total": total, "facets": facets}
@@ -0,0 +1,110 @@
+import base64
+import binascii
+import json
+from bisect import bisect_right
+from typing import Any, Callable, Iterable, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+
+class Cursor(NamedTuple):
+    """
+    Position after the last item of a page: its ordinal and its key.
+    """
+    ordinal: int
+    key: str
+
+
+class Page(NamedTuple):
+    """
+    One page of a listing and the cursor of the next page, if any.
+
+    The items are a list, or a generator producing them on demand for pages
+    that are streamed.
+    """
+    items: Iterable[Mapping[str, Any]]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    """
+    Encode a cursor as an opaque URL-safe token.
+    """
+    payload = json.dumps([cursor.ordinal, cursor.key], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Cursor:
+    """
+    Decode a token produced by ``encode_cursor``.
+
+    Raises:
+        ValueError: If the token is not a valid cursor.
+    """
+    try:
+        payload = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        ordinal, key = json.loads(payload)
+    except (binascii.Error, ValueError, TypeError):
+        raise ValueError(f"Invalid cursor: {token!r}") from None
+    if not isinstance(ordinal, int) or ordinal < 0 or not isinstance(key, str):
+        raise ValueError(f"Invalid cursor: {token!r}")
+    return Cursor(ordinal, key)
+
+
+def resume_after(cursor: Cursor, count: int, key_at: Callable[[int], str]) -> int:
+    """
+    Get the ordinal of the last item already returned to the client.
+
+    Within one catalog version this is the ordinal in the cursor. After a
+    reload the item is looked up by its key, comparing the keys at
+    increasing distances from its old ordinal, after it then before it, since
+    items rarely move far: the nearest occurrence is found after as many
+    lookups as it moved. If it is gone, the listing resumes at its old
+    position.
+
+    Args:
+        cursor: The decoded cursor.
+        count: The number of items in the catalog being listed.
+        key_at: Gets the key of the item at an ordinal.
+    """
+    start = min(cursor.ordinal, count - 1)
+    if start >= 0 and key_at(start) == cursor.key:
+        return start
+    for distance in range(1, max(start, count - 1 - start) + 1):
+        after, before = start + distance, start - distance
+        if after < count and key_at(after) == cursor.key:
+            return after
+        if before >= 0 and key_at(before) == cursor.key:
+            return before
+    return cursor.ordinal - 1
+
+
+def page_ordinals(ordinals: Sequence[int],
+                  limit: Optional[int],
+                  cursor: Optional[str],
+                  count: int,
+                  key_at: Callable[[int], str]) -> Tuple[Sequence[int], Optional[str]]:
+    """
+    Select one page from the ascending ordinals of a listing.
+
+    Args:
+        ordinals: The ordinals of every matching item, in ascending order.
+        limit: The maximum number of items in the page, or None for all remaining items.
+        cursor: The cursor returned with the previous page, or None for the first page.
+        count: The number of items in the catalog being listed.
+        key_at: Gets the key of the item at an ordinal.
+
+    Returns:
+        The ordinals of the page and the cursor of the next page (None on the last page).
+
+    Raises:
+        ValueError: If the cursor is invalid.
+    """
+    start = 0
+    if cursor:
+        start = bisect_right(ordinals, resume_after(decode_cursor(cursor), count, key_at))
+    end = len(ordinals) if limit is None else min(start + limit, len(ordinals))
+    page = ordinals[start:end]
+    next_cursor = None
+    if end < len(ordinals) and page:
+        last = page[-1]
+        next_cursor = encode_cursor(Cursor(last, key_at(last)))
+    return page, next_cursor
@@ -0,0 +1,60 @@
+from typing import Any, Collection, Dict, Optional
+
+# Requested fields: name -> nested projection, or None for the whole value
+FieldSpec = Dict[str, Optional["FieldSpec"]]
+
+
+def parse_fields(fields: Optional[str], allowed: Collection[str]) -> Optional[FieldSpec]:
+    """
+    Parse a comma-separated field list such as ``service_name,business_criticality.sla``.
+
+    Dotted paths select nested fields; they apply to every element of a
+    list. Asking for a field and one of its nested fields keeps the whole
+    field.
+
+    Args:
+        fields: The field list, or None/empty for all fields.
+        allowed: The top-level field names of the resource.
+
+    Returns:
+        The projection, or None when all fields are requested.
+
+    Raises:
+        ValueError: If a top-level field is unknown or a path is empty.
+    """
+    if not fields or not fields.strip():
+        return None
+
+    spec: FieldSpec = {}
+    for path in fields.split(","):
+        names = [name.strip() for name in path.split(".")]
+        if not all(names):
+            raise ValueError(f"Invalid field path: {path.strip()!r}")
+        if names[0] not in allowed:
+            raise ValueError(f"Unknown field: {names[0]!r}. Valid fields: {', '.join(allowed)}")
+
+        node = spec
+        for name in names[:-1]:
+            child = node.setdefault(name, {})
+            if child is None:
+                break  # Already selected as a whole
+            node = child
+        else:
+            node[names[-1]] = None
+    return spec
+
+
+def project(value: Any, spec: Optional[FieldSpec]) -> Any:
+    """
+    Select the fields of a value described by a projection.
+
+    Dicts keep only the selected keys they have, lists are projected element
+    by element and anything else is returned as is.
+    """
+    if spec is None:
+        return value
+    if isinstance(value, dict):
+        return {name: project(value[name], sub) for name, sub in spec.items() if name in value}
+    if isinstance(value, list):
+        return [project(item, spec) for item in value]
+    return value
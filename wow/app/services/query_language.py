@@ -0,0 +1,189 @@
+import re
+from typing import List, NamedTuple, NoReturn, Optional, Tuple, Union
+
+# Deepest nesting of parentheses and NOT accepted
+MAX_DEPTH = 32
+
+_KEYWORDS = ("AND", "OR", "NOT", "IN")
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<quoted>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<operator>!=|=|\(|\)|,)
+      | (?P<word>[^\s"'()=!,]+)
+    )""", re.VERBOSE)
+
+
+class QuerySyntaxError(ValueError):
+    """
+    Raised when a query expression cannot be parsed.
+    """
+    def __init__(self, message: str, position: int):
+        self.position = position
+        super().__init__(f"{message} at position {position}")
+
+
+class Match(NamedTuple):
+    """
+    An attribute equal to one of some values.
+    """
+    field: str
+    values: Tuple[str, ...]
+
+
+class Not(NamedTuple):
+    operand: "Expression"
+
+
+class And(NamedTuple):
+    operands: Tuple["Expression", ...]
+
+
+class Or(NamedTuple):
+    operands: Tuple["Expression", ...]
+
+
+Expression = Union[Match, Not, And, Or]
+
+
+class _Token(NamedTuple):
+    kind: str  # "value", "keyword" or "operator"
+    text: str
+    position: int
+
+
+def _tokenize(text: str) -> List[_Token]:
+    tokens: List[_Token] = []
+    position = 0
+    while True:
+        while position < len(text) and text[position].isspace():
+            position += 1
+        if position == len(text):
+            return tokens
+        match = _TOKEN.match(text, position)
+        if match is None or match.lastgroup is None:
+            raise QuerySyntaxError(f"Unexpected character {text[position]!r}", position)
+        group = match.lastgroup
+        start = match.start(group)
+        token = match.group(group)
+        if group == "quoted":
+            tokens.append(_Token("value", re.sub(r"\\(.)", r"\1", token[1:-1]), start))
+        elif group == "operator":
+            tokens.append(_Token("operator", token, start))
+        elif token.upper() in _KEYWORDS:
+            tokens.append(_Token("keyword", token.upper(), start))
+        else:
+            tokens.append(_Token("value", token, start))
+        position = match.end()
+
+
+class _Parser:
+    """
+    Recursive descent over the grammar::
+
+        expression := term (OR term)*
+        term       := factor (AND factor)*
+        factor     := NOT factor | "(" expression ")" | comparison
+        comparison := field ("=" | "!=") value | field [NOT] IN "(" value ("," value)* ")"
+    """
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.position = 0
+        self.depth = 0
+
+    def parse(self) -> Expression:
+        if not self.tokens:
+            raise QuerySyntaxError("Empty query", 0)
+        expression = self.expression()
+        if self.position < len(self.tokens):
+            self.fail("Unexpected " + repr(self.tokens[self.position].text))
+        return expression
+
+    def expression(self) -> Expression:
+        operands = [self.term()]
+        while self.accept("keyword", "OR"):
+            operands.append(self.term())
+        return operands[0] if len(operands) == 1 else Or(tuple(operands))
+
+    def term(self) -> Expression:
+        operands = [self.factor()]
+        while self.accept("keyword", "AND"):
+            operands.append(self.factor())
+        return operands[0] if len(operands) == 1 else And(tuple(operands))
+
+    def factor(self) -> Expression:
+        self.depth += 1
+        if self.depth > MAX_DEPTH:
+            self.fail(f"Query nested deeper than {MAX_DEPTH} levels")
+        expression: Expression
+        if self.accept("keyword", "NOT"):
+            expression = Not(self.factor())
+        elif self.accept("operator", "("):
+            expression = self.expression()
+            self.expect("operator", ")")
+        else:
+            expression = self.comparison()
+        self.depth -= 1
+        return expression
+
+    def comparison(self) -> Expression:
+        field = self.expect("value", description="a field name")
+        if self.accept("operator", "="):
+            return Match(field, (self.expect("value"),))
+        if self.accept("operator", "!="):
+            return Not(Match(field, (self.expect("value"),)))
+        negated = self.accept("keyword", "NOT")
+        if not self.accept("keyword", "IN"):
+            self.fail(f"Expected '=', '!=' or IN after {field!r}")
+        self.expect("operator", "(")
+        values = [self.expect("value")]
+        while self.accept("operator", ","):
+            values.append(self.expect("value"))
+        self.expect("operator", ")")
+        match = Match(field, tuple(dict.fromkeys(values)))
+        return Not(match) if negated else match
+
+    def accept(self, kind: str, text: str) -> bool:
+        if self.position < len(self.tokens):
+            token = self.tokens[self.position]
+            if token.kind == kind and token.text == text:
+                self.position += 1
+                return True
+        return False
+
+    def expect(self, kind: str, text: Optional[str] = None, description: str = "a value") -> str:
+        if self.position < len(self.tokens):
+            token = self.tokens[self.position]
+            if token.kind == kind and (text is None or token.text == text):
+                self.position += 1
+                return token.text
+        self.fail(f"Expected {text!r}" if text is not None else f"Expected {description}")
+
+    def fail(self, message: str) -> NoReturn:
+        if self.position < len(self.tokens):
+            raise QuerySyntaxError(message, self.tokens[self.position].position)
+        raise QuerySyntaxError(message + " but the query ended", len(self.text))
+
+
+def parse_query(text: str) -> Expression:
+    """
+    Parse a filter expression such as ``tech_stack = Java AND NOT sla IN ("99.9%", "99.5%")``.
+
+    Comparisons test an attribute for equality with ``=`` and ``!=``, or
+    membership with ``IN`` and ``NOT IN``, and combine with ``AND``, ``OR``,
+    ``NOT`` and parentheses; ``AND`` binds tighter than ``OR`` and keywords
+    are case-insensitive. Values are quoted with single or double quotes
+    when they hold spaces, quotes, parentheses, ``=``, ``!`` or commas, or
+    are keywords; a backslash escapes the next character of a quoted value.
+
+    Args:
+        text: The expression.
+
+    Returns:
+        The expression tree. Field names are not checked.
+
+    Raises:
+        QuerySyntaxError: If the expression is malformed.
+    """
+    return _Parser(text).parse()
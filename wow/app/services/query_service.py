@@ -0,0 +1,80 @@
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from app.data.bitsets import ATTRIBUTES, BitsetIndex, to_ordinals
+from app.data.catalog import CatalogSnapshot
+from app.metrics import timed_operation
+from app.services.query_language import And, Expression, Match, Not, parse_query
+from app.services.views import ComponentView, ServiceView
+
+
+class QueryService:
+    """
+    Service for filtering teams, services or runtime components with boolean expressions.
+    """
+    # Entity queried -> entity of the bitsets and index, and shape of a result as returned by the list
+    # endpoints of the entity
+    _ENTITIES: Dict[str, Tuple[str, Callable[[Any], Mapping[str, Any]]]] = {
+        "teams": ("teams", lambda team: team),
+        "services": ("services", ServiceView),
+        "runtime_components": ("components", ComponentView),
+    }
+
+    def __init__(self, catalog: CatalogSnapshot):
+        self.catalog = catalog
+
+    @timed_operation
+    def query(self, expression: str, entity: str = "services", limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get the entities matching a filter expression, in file order.
+
+        The expression (see ``parse_query``) compares the attributes in
+        ``ATTRIBUTES``. It is evaluated over the bitsets of the snapshot:
+        every comparison is the bitset of its values and every operator an
+        int operation on whole bitsets, so only matching entities are read.
+        An attribute of a team applies to its services and components, and
+        one of a service or component applies to its team or service when
+        any of them carries the value.
+
+        Args:
+            expression: The filter expression.
+            entity: "teams", "services" or "runtime_components".
+            limit: Maximum number of entities to return, or None for all.
+
+        Returns:
+            The entity, the number of matching entities and the first
+            ``limit`` of them.
+
+        Raises:
+            ValueError: If the entity or a field is unknown, or the expression is malformed.
+        """
+        if entity not in self._ENTITIES:
+            raise ValueError(f"Unknown entity: {entity}. Allowed: {', '.join(self._ENTITIES)}")
+        indexed, shape = self._ENTITIES[entity]
+        tree = parse_query(expression)
+        bitsets = self.catalog.get_bitsets()
+        bits = _evaluate(tree, bitsets, indexed, bitsets.all(indexed))
+
+        entities = getattr(self.catalog.get_index(), indexed)
+        items = [shape(entities[ordinal]) for ordinal in to_ordinals(bits, limit)]
+        return {"entity": entity, "total": bits.bit_count(), "items": items}
+
+
+def _evaluate(expression: Expression, bitsets: BitsetIndex, entity: str, everything: int) -> int:
+    if isinstance(expression, Match):
+        if expression.field not in ATTRIBUTES:
+            raise ValueError(f"Unknown field: {expression.field}. Allowed: {', '.join(ATTRIBUTES)}")
+        bits = 0
+        for value in expression.values:
+            bits |= bitsets.bitset(entity, expression.field, value)
+        return bits
+    if isinstance(expression, Not):
+        return everything & ~_evaluate(expression.operand, bitsets, entity, everything)
+    if isinstance(expression, And):
+        bits = everything
+        for operand in expression.operands:
+            bits &= _evaluate(operand, bitsets, entity, everything)
+        return bits
+    bits = 0
+    for operand in expression.operands:
+        bits |= _evaluate(operand, bitsets, entity, everything)
+    return bits
@@ -1,20 +1,33 @@
-from typing import List, Optional, Dict, Any
-from app.data.json_loader import JsonLoader
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from app.data.catalog import CatalogSource
+from app.data.catalog_index import ComponentRef, ReadOnlyIndex
+from app.data.postings import intersect_postings
+from app.metrics import timed_operation
+from app.services.pagination import Page, page_ordinals
+from app.services.projection import FieldSpec, project
+from app.services.views import COMPONENT_FIELDS, ComponentDetailView, ComponentView
 
 
 class RuntimeComponentService:
     """
     Service for retrieving and filtering runtime component data.
     """
-    def __init__(self, json_loader: JsonLoader):
-        self.json_loader = json_loader
+    # Fields that can be selected with a projection
+    FIELDS = tuple(COMPONENT_FIELDS)
+
+    def __init__(self, catalog: CatalogSource):
+        self.catalog = catalog
         
+    @timed_operation
     def get_all_runtime_components(self,
                                   component_name: Optional[str] = None,
-                                  service_name: Optional[str] = None) -> List[Dict[str, Any]]:
+                                  service_name: Optional[str] = None) -> List[ComponentView]:
         """
         Get all runtime components, optionally filtered by component name or service name.
         
+        Components are selected by their index postings and returned as views
+        (see ``ComponentView``), so no context is copied for them.
+        
         Args:
             component_name: Optional filter by component name (partial match).
             service_name: Optional filter by service name.
@@ -22,35 +35,83 @@ class RuntimeComponentService:
         Returns:
             List of runtime components matching the filters.
         """
-        data = self.json_loader.get_data()
-        teams = data.get("teams", [])
-        all_components = []
+        index = self.catalog.get_index()
+        components = index.components
+        return [ComponentView(components[ordinal]) for ordinal in self._find(index, component_name, service_name)]
+
+    @timed_operation
+    def get_runtime_components_page(self,
+                                    component_name: Optional[str] = None,
+                                    service_name: Optional[str] = None,
+                                    fields: Optional[FieldSpec] = None,
+                                    limit: Optional[int] = None,
+                                    cursor: Optional[str] = None) -> Page:
+        """
+        Get one page of runtime components, optionally filtered and reduced to some fields.
         
-        for team in teams:
-            for service in team["services_applications"]:
-                # Apply service-level filter
-                if service_name and service["service_name"] != service_name:
-                    continue
-                    
-                for component in service["runtime_components"]:
-                    # Apply component-level filter
-                    if component_name and component_name.lower() not in component.lower():
-                        continue
-                        
-                    component_with_context = {
-                        "component_name": component,
-                        "service_name": service["service_name"],
-                        "team_id": team["team_id"],
-                        "team_name": team["team_name"],
-                        "business_segment": team["business_segment"],
-                        "tech_stack": service["tech_stack"]
-                    }
-                    
-                    all_components.append(component_with_context)
-                    
-        return all_components
+        See ``iter_runtime_components_page`` for the arguments.
+        """
+        page = self._runtime_components_page(component_name, service_name, fields, limit, cursor)
+        return Page(list(page.items), page.next_cursor)
+
+    @timed_operation
+    def iter_runtime_components_page(self,
+                                     component_name: Optional[str] = None,
+                                     service_name: Optional[str] = None,
+                                     fields: Optional[FieldSpec] = None,
+                                     limit: Optional[int] = None,
+                                     cursor: Optional[str] = None) -> Page:
+        """
+        Get one page of runtime components as a generator, so they can be streamed one at a time.
+        
+        Only the requested fields are read from the component's service and team.
         
-    def get_runtime_component_by_name(self, component_name: str) -> Optional[Dict[str, Any]]:
+        Args:
+            component_name: Optional filter by component name (partial match).
+            service_name: Optional filter by service name.
+            fields: Optional projection of the fields to return.
+            limit: Optional maximum number of components in the page.
+            cursor: Optional cursor returned with the previous page.
+            
+        Returns:
+            The runtime components of the page, produced on iteration, and the cursor of the next page.
+            
+        Raises:
+            ValueError: If the cursor is invalid.
+        """
+        return self._runtime_components_page(component_name, service_name, fields, limit, cursor)
+
+    def _runtime_components_page(self,
+                                 component_name: Optional[str],
+                                 service_name: Optional[str],
+                                 fields: Optional[FieldSpec],
+                                 limit: Optional[int],
+                                 cursor: Optional[str]) -> Page:
+        index = self.catalog.get_index()
+        components = index.components
+        ordinals, next_cursor = page_ordinals(self._find(index, component_name, service_name),
+                                              limit, cursor, len(components),
+                                              lambda ordinal: components[ordinal].component_name)
+        items: Iterable[Mapping[str, Any]]
+        if fields is None:
+            items = (ComponentView(components[ordinal]) for ordinal in ordinals)
+        else:
+            items = ({name: project(COMPONENT_FIELDS[name](components[ordinal]), nested)
+                      for name, nested in fields.items()}
+                     for ordinal in ordinals)
+        return Page(items, next_cursor)
+
+    @staticmethod
+    def _find(index: ReadOnlyIndex, component_name: Optional[str], service_name: Optional[str]):
+        postings: List[Sequence[int]] = []
+        if service_name:
+            postings.append(index.components_by_service_name.get(service_name, []))
+        if component_name:
+            postings.append(index.component_search.search(component_name))
+        return intersect_postings(postings) if postings else range(len(index.components))
+
+    @timed_operation
+    def get_runtime_component_by_name(self, component_name: str) -> Optional[ComponentDetailView]:
         """
         Get a runtime component by its exact name.
         
@@ -60,22 +121,84 @@ class RuntimeComponentService:
         Returns:
             The runtime component with the specified name, or None if not found.
         """
-        data = self.json_loader.get_data()
-        teams = data.get("teams", [])
+        ref = self.catalog.get_index().component_by_name.get(component_name)
+        if ref is None:
+            return None
+        return ComponentDetailView(ref)
+
+    @timed_operation
+    def get_runtime_components_by_names(self,
+                                        component_names: List[str]) -> Tuple[List[ComponentDetailView], List[str]]:
+        """
+        Get several runtime components by their exact names in one pass.
+        
+        Each distinct name is looked up once, in request order.
+        
+        Args:
+            component_names: The names of the runtime components to retrieve.
+            
+        Returns:
+            The runtime components found, and the names that were not found.
+        """
+        component_by_name = self.catalog.get_index().component_by_name
+        found, not_found = [], []
+        for component_name in dict.fromkeys(component_names):
+            ref = component_by_name.get(component_name)
+            if ref is None:
+                not_found.append(component_name)
+            else:
+                found.append(ComponentDetailView(ref))
+        return found, not_found
+
+    @timed_operation
+    def resolve_instance(self, instance: str) -> Optional[Dict[str, Any]]:
+        """
+        Resolve a live instance name (e.g. a pod or host name) to the runtime component it runs.
+        
+        The component is the one with the longest name that is a prefix of
+        the instance name, so ``payments-api-worker-7f9c`` resolves to
+        ``payments-api-worker`` rather than ``payments-api`` when both exist.
         
-        for team in teams:
-            for service in team["services_applications"]:
-                for component in service["runtime_components"]:
-                    if component == component_name:
-                        component_with_context = {
-                            "component_name": component,
-                            "service_name": service["service_name"],
-                            "team_id": team["team_id"],
-                            "team_name": team["team_name"],
-                            "business_segment": team["business_segment"],
-                            "tech_stack": service["tech_stack"],
-                            "business_criticality": service["business_criticality"]
-                        }
-                        return component_with_context
-                        
-        return None
+        Args:
+            instance: The name of the running instance.
+            
+        Returns:
+            The runtime component with its owning service and the team's
+            contact channels, or None if no component name is a prefix of
+            the instance name.
+        """
+        ref = self.catalog.get_index().resolve_component(instance)
+        if ref is None:
+            return None
+        return self._resolution(instance, ref)
+
+    @timed_operation
+    def resolve_instances(self, instances: List[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Resolve several live instance names to their runtime components in one pass.
+        
+        Each distinct instance name is resolved once, in request order.
+        
+        Args:
+            instances: The names of the running instances.
+            
+        Returns:
+            The resolved instances, and the instance names that matched no component.
+        """
+        index = self.catalog.get_index()
+        found, not_found = [], []
+        for instance in dict.fromkeys(instances):
+            ref = index.resolve_component(instance)
+            if ref is None:
+                not_found.append(instance)
+            else:
+                found.append(self._resolution(instance, ref))
+        return found, not_found
+
+    @staticmethod
+    def _resolution(instance: str, ref: ComponentRef) -> Dict[str, Any]:
+        return {
+            "instance": instance,
+            **ComponentDetailView(ref).to_dict(),
+            "contact_channels": ref.team["team_api"]["contact_channels"]
+        }
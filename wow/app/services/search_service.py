@@ -1,24 +1,61 @@
-from typing import List, Dict, Any
-from app.data.json_loader import JsonLoader
+from typing import List, Dict, Any, Mapping, Optional
+from app.data.catalog import CatalogSnapshot
+from app.metrics import timed_operation
+from app.services.views import ComponentView, ServiceView
+
+
+# Results per type of a ranked search without a limit
+DEFAULT_RANKED_LIMIT = 10
 
 
 class SearchService:
     """
     Service for searching across teams, services, and runtime components.
     """
-    def __init__(self, json_loader: JsonLoader):
-        self.json_loader = json_loader
+    def __init__(self, catalog: CatalogSnapshot, field_weights: Optional[Mapping[str, float]] = None):
+        self.catalog = catalog
+        self.field_weights = field_weights
         
-    def search(self, query: str) -> Dict[str, List[Dict[str, Any]]]:
+    @timed_operation
+    def search(self,
+               query: str,
+               fuzzy: bool = False,
+               max_distance: Optional[int] = None,
+               ranked: bool = False,
+               limit: Optional[int] = None) -> Dict[str, List[Mapping[str, Any]]]:
         """
         Search across teams, services, and runtime components.
         
+        By default a result contains the query as a case-insensitive
+        substring of one of its fields. With ``fuzzy``, a result is a team
+        whose ID or name, a service whose name or a runtime component whose
+        name is within ``max_distance`` edits of the whole query, closest
+        first; the names are matched with the fuzzy indexes of the snapshot.
+        With ``ranked``, a result contains any word of the query in one of
+        its text fields (see ``TEXT_FIELDS``), and results are ordered by
+        their BM25 score weighted by ``field_weights``; only the top
+        ``limit`` of each type are scored into a heap and returned.
+        
         Args:
             query: The search query string.
+            fuzzy: Match names within an edit distance instead of substrings.
+            max_distance: The largest edit distance for fuzzy matches, or None
+                for a default depending on the query length (see
+                ``default_max_distance``).
+            ranked: Rank results by relevance instead of matching substrings.
+            limit: Maximum number of results of each type, or None for all
+                (``DEFAULT_RANKED_LIMIT`` when ranked).
             
         Returns:
-            Dictionary with search results categorized by type.
+            Dictionary with search results categorized by type. Teams are
+            the catalog records; services and components are views of them
+            (see ``ServiceView`` and ``ComponentView``).
+            
+        Raises:
+            ValueError: If both fuzzy and ranked are set.
         """
+        if fuzzy and ranked:
+            raise ValueError("fuzzy and ranked search cannot be combined")
         if not query or len(query.strip()) == 0:
             return {
                 "teams": [],
@@ -26,62 +63,50 @@ class SearchService:
                 "runtime_components": []
             }
             
-        query = query.lower()
-        data = self.json_loader.get_data()
-        teams = data.get("teams", [])
+        index = self.catalog.get_index()
+        if fuzzy:
+            return self._fuzzy_search(index, query.strip(), max_distance, limit)
+        if ranked:
+            return self._ranked_search(index, query, limit if limit is not None else DEFAULT_RANKED_LIMIT)
         
-        team_results = []
-        service_results = []
-        component_results = []
+        # Candidates are narrowed by trigram postings, then checked for the exact substring
+        team_results: List[Mapping[str, Any]] = [index.teams[ordinal]
+                                                 for ordinal in index.team_search.search(query)[:limit]]
         
-        for team in teams:
-            # Search in team fields
-            team_match = (
-                query in team["team_id"].lower() or
-                query in team["team_name"].lower() or
-                query in team["business_segment"].lower() or
-                query in team["team_api"]["team_mission"].lower()
-            )
-            
-            if team_match:
-                team_results.append(team)
-                
-            # Search in value streams
-            for value_stream in team["value_streams"]:
-                if (query in value_stream["value_stream_name"].lower() or
-                    query in value_stream["value_stream_description"].lower()):
-                    if team not in team_results:
-                        team_results.append(team)
-                        
-            # Search in services
-            for service in team["services_applications"]:
-                service_match = (
-                    query in service["service_name"].lower() or
-                    query in service["tech_stack"].lower()
-                )
-                
-                if service_match:
-                    service_with_context = service.copy()
-                    service_with_context["team_id"] = team["team_id"]
-                    service_with_context["team_name"] = team["team_name"]
-                    service_with_context["business_segment"] = team["business_segment"]
-                    service_results.append(service_with_context)
-                    
-                # Search in runtime components
-                for component in service["runtime_components"]:
-                    if query in component.lower():
-                        component_with_context = {
-                            "component_name": component,
-                            "service_name": service["service_name"],
-                            "team_id": team["team_id"],
-                            "team_name": team["team_name"],
-                            "business_segment": team["business_segment"],
-                            "tech_stack": service["tech_stack"]
-                        }
-                        component_results.append(component_with_context)
+        service_results: List[Mapping[str, Any]] = [ServiceView(index.services[ordinal])
+                                                    for ordinal in index.service_search.search(query)[:limit]]
+        component_results: List[Mapping[str, Any]] = [ComponentView(index.components[ordinal])
+                                                      for ordinal in index.component_search.search(query)[:limit]]
                         
         return {
             "teams": team_results,
             "services": service_results,
             "runtime_components": component_results
         }
+
+    def _fuzzy_search(self,
+                      index,
+                      query: str,
+                      max_distance: Optional[int],
+                      limit: Optional[int]) -> Dict[str, List[Mapping[str, Any]]]:
+        fuzzy_names = self.catalog.get_fuzzy_names()
+        return {
+            "teams": [index.teams[ordinal]
+                      for _, ordinal in fuzzy_names.search("teams", query, max_distance)[:limit]],
+            "services": [ServiceView(index.services[ordinal])
+                         for _, ordinal in fuzzy_names.search("services", query, max_distance)[:limit]],
+            "runtime_components": [ComponentView(index.components[ordinal])
+                                   for _, ordinal in fuzzy_names.search("components", query, max_distance)[:limit]]
+        }
+
+    def _ranked_search(self, index, query: str, limit: int) -> Dict[str, List[Mapping[str, Any]]]:
+        text_indexes = self.catalog.get_text_indexes()
+        weights = self.field_weights
+        return {
+            "teams": [index.teams[ordinal]
+                      for _, ordinal in text_indexes.top("teams", query, limit, weights)],
+            "services": [ServiceView(index.services[ordinal])
+                         for _, ordinal in text_indexes.top("services", query, limit, weights)],
+            "runtime_components": [ComponentView(index.components[ordinal])
+                                   for _, ordinal in text_indexes.top("components", query, limit, weights)]
+        }
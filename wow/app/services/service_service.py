@@ -1,23 +1,36 @@
-from typing import List, Optional, Dict, Any
-from app.data.json_loader import JsonLoader
+from typing import List, Optional, Any, Mapping, Tuple
+from app.data.catalog import CatalogSource
+from app.data.catalog_index import ServiceRef
+from app.metrics import timed_operation
+from app.models.service import Service
+from app.services.pagination import Page, page_ordinals
+from app.services.projection import FieldSpec, project
+from app.services.views import TEAM_CONTEXT_FIELDS, ServiceView
 
 
 class ServiceService:
     """
     Service for retrieving and filtering service data.
     """
-    def __init__(self, json_loader: JsonLoader):
-        self.json_loader = json_loader
+    # Fields that can be selected with a projection
+    FIELDS = tuple(Service.model_fields) + TEAM_CONTEXT_FIELDS
+
+    def __init__(self, catalog: CatalogSource):
+        self.catalog = catalog
         
+    @timed_operation
     def get_all_services(self,
                         team_id: Optional[str] = None,
                         team_name: Optional[str] = None,
                         business_segment: Optional[str] = None,
                         value_stream_name: Optional[str] = None,
-                        sla: Optional[str] = None) -> List[Dict[str, Any]]:
+                        sla: Optional[str] = None) -> List[ServiceView]:
         """
         Get all services, optionally filtered by various criteria.
         
+        Services are selected by their index postings and returned as views
+        of the catalog records (see ``ServiceView``), so none is copied.
+        
         Args:
             team_id: Optional filter by team ID.
             team_name: Optional filter by team name.
@@ -28,44 +41,95 @@ class ServiceService:
         Returns:
             List of services matching the filters.
         """
-        data = self.json_loader.get_data()
-        teams = data.get("teams", [])
-        all_services = []
+        index = self.catalog.get_index()
+        ordinals = index.find_services(
+            team_id=team_id,
+            team_name=team_name,
+            business_segment=business_segment,
+            value_stream_name=value_stream_name,
+            sla=sla
+        )
+        services = index.services
+        return [ServiceView(services[ordinal]) for ordinal in ordinals]
+
+    @timed_operation
+    def get_services_page(self,
+                          team_id: Optional[str] = None,
+                          team_name: Optional[str] = None,
+                          business_segment: Optional[str] = None,
+                          value_stream_name: Optional[str] = None,
+                          sla: Optional[str] = None,
+                          fields: Optional[FieldSpec] = None,
+                          limit: Optional[int] = None,
+                          cursor: Optional[str] = None) -> Page:
+        """
+        Get one page of services, optionally filtered and reduced to some fields.
+        
+        See ``iter_services_page`` for the arguments.
+        """
+        page = self._services_page(team_id, team_name, business_segment, value_stream_name, sla,
+                                   fields, limit, cursor)
+        return Page(list(page.items), page.next_cursor)
+
+    @timed_operation
+    def iter_services_page(self,
+                           team_id: Optional[str] = None,
+                           team_name: Optional[str] = None,
+                           business_segment: Optional[str] = None,
+                           value_stream_name: Optional[str] = None,
+                           sla: Optional[str] = None,
+                           fields: Optional[FieldSpec] = None,
+                           limit: Optional[int] = None,
+                           cursor: Optional[str] = None) -> Page:
+        """
+        Get one page of services as a generator, so they can be streamed one at a time.
+        
+        Services are returned as views when every field is requested; otherwise
+        only the requested fields are copied from the service and its team.
         
-        for team in teams:
-            # Apply team-level filters
-            if team_id and team["team_id"] != team_id:
-                continue
-                
-            if team_name and team["team_name"] != team_name:
-                continue
-                
-            if business_segment and team["business_segment"] != business_segment:
-                continue
-                
-            if value_stream_name and not any(vs["value_stream_name"] == value_stream_name 
-                                           for vs in team["value_streams"]):
-                continue
-                
-            # Add team context to each service
-            for service in team["services_applications"]:
-                service_with_context = service.copy()
-                service_with_context["team_id"] = team["team_id"]
-                service_with_context["team_name"] = team["team_name"]
-                service_with_context["business_segment"] = team["business_segment"]
-                
-                # Apply service-level filters
-                if value_stream_name and value_stream_name not in service["value_stream_segments"]:
-                    continue
-                    
-                if sla and service["business_criticality"]["sla"] != sla:
-                    continue
-                    
-                all_services.append(service_with_context)
-                
-        return all_services
+        Args:
+            team_id: Optional filter by team ID.
+            team_name: Optional filter by team name.
+            business_segment: Optional filter by business segment.
+            value_stream_name: Optional filter by value stream name.
+            sla: Optional filter by SLA.
+            fields: Optional projection of the fields to return.
+            limit: Optional maximum number of services in the page.
+            cursor: Optional cursor returned with the previous page.
+            
+        Returns:
+            The services of the page, produced on iteration, and the cursor of the next page.
+            
+        Raises:
+            ValueError: If the cursor is invalid.
+        """
+        return self._services_page(team_id, team_name, business_segment, value_stream_name, sla,
+                                   fields, limit, cursor)
+
+    def _services_page(self,
+                       team_id: Optional[str],
+                       team_name: Optional[str],
+                       business_segment: Optional[str],
+                       value_stream_name: Optional[str],
+                       sla: Optional[str],
+                       fields: Optional[FieldSpec],
+                       limit: Optional[int],
+                       cursor: Optional[str]) -> Page:
+        index = self.catalog.get_index()
+        services = index.services
+        matching = index.find_services(
+            team_id=team_id,
+            team_name=team_name,
+            business_segment=business_segment,
+            value_stream_name=value_stream_name,
+            sla=sla
+        )
+        ordinals, next_cursor = page_ordinals(matching, limit, cursor, len(services),
+                                              lambda ordinal: services[ordinal].service["service_name"])
+        return Page((self._project(services[ordinal], fields) for ordinal in ordinals), next_cursor)
         
-    def get_service_by_name(self, service_name: str) -> Optional[Dict[str, Any]]:
+    @timed_operation
+    def get_service_by_name(self, service_name: str) -> Optional[ServiceView]:
         """
         Get a service by its name.
         
@@ -75,16 +139,41 @@ class ServiceService:
         Returns:
             The service with the specified name, or None if not found.
         """
-        data = self.json_loader.get_data()
-        teams = data.get("teams", [])
+        service_ref = self.catalog.get_index().service_by_name.get(service_name)
+        if service_ref is None:
+            return None
+        return ServiceView(service_ref)
+
+    @timed_operation
+    def get_services_by_names(self, service_names: List[str]) -> Tuple[List[ServiceView], List[str]]:
+        """
+        Get several services by their names in one pass.
+        
+        Each distinct name is looked up once, in request order.
         
-        for team in teams:
-            for service in team["services_applications"]:
-                if service["service_name"] == service_name:
-                    service_with_context = service.copy()
-                    service_with_context["team_id"] = team["team_id"]
-                    service_with_context["team_name"] = team["team_name"]
-                    service_with_context["business_segment"] = team["business_segment"]
-                    return service_with_context
-                    
-        return None
+        Args:
+            service_names: The names of the services to retrieve.
+            
+        Returns:
+            The services found, and the names that were not found.
+        """
+        service_by_name = self.catalog.get_index().service_by_name
+        found, not_found = [], []
+        for service_name in dict.fromkeys(service_names):
+            service_ref = service_by_name.get(service_name)
+            if service_ref is None:
+                not_found.append(service_name)
+            else:
+                found.append(ServiceView(service_ref))
+        return found, not_found
+
+    @staticmethod
+    def _project(service_ref: ServiceRef, fields: Optional[FieldSpec]) -> Mapping[str, Any]:
+        if fields is None:
+            return ServiceView(service_ref)
+        projected = {}
+        for name, nested in fields.items():
+            source = service_ref.team if name in TEAM_CONTEXT_FIELDS else service_ref.service
+            if name in source:
+                projected[name] = project(source[name], nested)
+        return projected
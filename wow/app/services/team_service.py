@@ -1,15 +1,22 @@
-from typing import List, Optional, Dict, Any
-from app.data.json_loader import JsonLoader
+from typing import List, Optional, Dict, Any, Tuple
+from app.data.catalog import CatalogSource
+from app.metrics import timed_operation
 from app.models.team import Team
+from app.services.pagination import Page, page_ordinals
+from app.services.projection import FieldSpec, project
 
 
 class TeamService:
     """
     Service for retrieving and filtering team data.
     """
-    def __init__(self, json_loader: JsonLoader):
-        self.json_loader = json_loader
+    # Fields that can be selected with a projection
+    FIELDS = tuple(Team.model_fields)
+
+    def __init__(self, catalog: CatalogSource):
+        self.catalog = catalog
         
+    @timed_operation
     def get_all_teams(self, 
                      business_segment: Optional[str] = None,
                      value_stream_name: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -23,18 +30,63 @@ class TeamService:
         Returns:
             List of teams matching the filters.
         """
-        data = self.json_loader.get_data()
-        teams = data.get("teams", [])
+        index = self.catalog.get_index()
+        return [index.teams[ordinal] for ordinal in index.find_teams(business_segment, value_stream_name)]
+
+    @timed_operation
+    def get_teams_page(self,
+                       business_segment: Optional[str] = None,
+                       value_stream_name: Optional[str] = None,
+                       fields: Optional[FieldSpec] = None,
+                       limit: Optional[int] = None,
+                       cursor: Optional[str] = None) -> Page:
+        """
+        Get one page of teams, optionally filtered and reduced to some fields.
         
-        if business_segment:
-            teams = [t for t in teams if t["business_segment"] == business_segment]
+        See ``iter_teams_page`` for the arguments.
+        """
+        page = self._teams_page(business_segment, value_stream_name, fields, limit, cursor)
+        return Page(list(page.items), page.next_cursor)
+
+    @timed_operation
+    def iter_teams_page(self,
+                        business_segment: Optional[str] = None,
+                        value_stream_name: Optional[str] = None,
+                        fields: Optional[FieldSpec] = None,
+                        limit: Optional[int] = None,
+                        cursor: Optional[str] = None) -> Page:
+        """
+        Get one page of teams as a generator, so they can be streamed one at a time.
+        
+        Args:
+            business_segment: Optional filter by business segment.
+            value_stream_name: Optional filter by value stream name.
+            fields: Optional projection of the fields to return.
+            limit: Optional maximum number of teams in the page.
+            cursor: Optional cursor returned with the previous page.
             
-        if value_stream_name:
-            teams = [t for t in teams if any(vs["value_stream_name"] == value_stream_name 
-                                           for vs in t["value_streams"])]
-                                           
-        return teams
+        Returns:
+            The teams of the page, produced on iteration, and the cursor of the next page.
+            
+        Raises:
+            ValueError: If the cursor is invalid.
+        """
+        return self._teams_page(business_segment, value_stream_name, fields, limit, cursor)
+
+    def _teams_page(self,
+                    business_segment: Optional[str],
+                    value_stream_name: Optional[str],
+                    fields: Optional[FieldSpec],
+                    limit: Optional[int],
+                    cursor: Optional[str]) -> Page:
+        index = self.catalog.get_index()
+        teams = index.teams
+        ordinals, next_cursor = page_ordinals(index.find_teams(business_segment, value_stream_name),
+                                              limit, cursor, len(teams),
+                                              lambda ordinal: teams[ordinal]["team_id"])
+        return Page((project(teams[ordinal], fields) for ordinal in ordinals), next_cursor)
         
+    @timed_operation
     def get_team_by_id(self, team_id: str) -> Optional[Dict[str, Any]]:
         """
         Get a team by its ID.
@@ -45,11 +97,27 @@ class TeamService:
         Returns:
             The team with the specified ID, or None if not found.
         """
-        data = self.json_loader.get_data()
-        teams = data.get("teams", [])
+        return self.catalog.get_index().team_by_id.get(team_id)
+
+    @timed_operation
+    def get_teams_by_ids(self, team_ids: List[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Get several teams by their IDs in one pass.
         
-        for team in teams:
-            if team["team_id"] == team_id:
-                return team
-                
-        return None
+        Each distinct ID is looked up once, in request order.
+        
+        Args:
+            team_ids: The IDs of the teams to retrieve.
+            
+        Returns:
+            The teams found, and the IDs that were not found.
+        """
+        team_by_id = self.catalog.get_index().team_by_id
+        found, not_found = [], []
+        for team_id in dict.fromkeys(team_ids):
+            team = team_by_id.get(team_id)
+            if team is None:
+                not_found.append(team_id)
+            else:
+                found.append(team)
+        return found, not_found
@@ -0,0 +1,137 @@
+from abc import abstractmethod
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator
+
+from app.data.catalog_index import ComponentRef, ServiceRef
+
+# Fields of the owning team added to every service
+TEAM_CONTEXT_FIELDS = ("team_id", "team_name", "business_segment")
+
+# How each field of a listed runtime component is read from its reference
+COMPONENT_FIELDS: Dict[str, Callable[[ComponentRef], Any]] = {
+    "component_name": lambda ref: ref.component_name,
+    "service_name": lambda ref: ref.service["service_name"],
+    "team_id": lambda ref: ref.team["team_id"],
+    "team_name": lambda ref: ref.team["team_name"],
+    "business_segment": lambda ref: ref.team["business_segment"],
+    "tech_stack": lambda ref: ref.service["tech_stack"],
+}
+
+# Fields of a runtime component looked up by name: the listed ones and the service's criticality
+COMPONENT_DETAIL_FIELDS: Dict[str, Callable[[ComponentRef], Any]] = {
+    **COMPONENT_FIELDS,
+    "business_criticality": lambda ref: ref.service["business_criticality"],
+}
+
+
+class RecordView(Mapping):
+    """
+    A read-only result combining a catalog record with fields of the records that own it.
+
+    A view holds the index reference of its record and reads every field
+    from the catalog when asked, so building one copies nothing: results
+    are selected and filtered as views, and only the ones returned are ever
+    turned into dicts, one at a time as they are encoded (see ``to_dict``).
+    Views compare equal to the dicts they stand for.
+    """
+    __slots__ = ("ref",)
+
+    def __init__(self, ref):
+        self.ref = ref
+
+    @abstractmethod
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the fields of the view as a new dict, in order.
+        """
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class ServiceView(RecordView):
+    """
+    A service with the ``TEAM_CONTEXT_FIELDS`` of its team after its own fields.
+    """
+    __slots__ = ()
+    ref: ServiceRef
+
+    def __getitem__(self, name: str) -> Any:
+        if name in TEAM_CONTEXT_FIELDS:
+            return self.ref.team[name]
+        return self.ref.service[name]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.ref.service
+        yield from TEAM_CONTEXT_FIELDS
+
+    def __len__(self) -> int:
+        return len(self.ref.service) + len(TEAM_CONTEXT_FIELDS)
+
+    def __contains__(self, name: object) -> bool:
+        return name in TEAM_CONTEXT_FIELDS or name in self.ref.service
+
+    def to_dict(self) -> Dict[str, Any]:
+        team, service = self.ref
+        service_with_context = service.copy()
+        service_with_context["team_id"] = team["team_id"]
+        service_with_context["team_name"] = team["team_name"]
+        service_with_context["business_segment"] = team["business_segment"]
+        return service_with_context
+
+
+class ComponentView(RecordView):
+    """
+    A runtime component with its service's name and tech stack and its team's context (``COMPONENT_FIELDS``).
+    """
+    __slots__ = ()
+    ref: ComponentRef
+    fields = COMPONENT_FIELDS
+
+    def __getitem__(self, name: str) -> Any:
+        return self.fields[name](self.ref)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.fields)
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.fields
+
+    def to_dict(self) -> Dict[str, Any]:
+        component, team, service = self.ref
+        return {
+            "component_name": component,
+            "service_name": service["service_name"],
+            "team_id": team["team_id"],
+            "team_name": team["team_name"],
+            "business_segment": team["business_segment"],
+            "tech_stack": service["tech_stack"]
+        }
+
+
+class ComponentDetailView(ComponentView):
+    """
+    A runtime component as looked up by name, with its service's business criticality as well.
+    """
+    __slots__ = ()
+    fields = COMPONENT_DETAIL_FIELDS
+
+    def to_dict(self) -> Dict[str, Any]:
+        component_with_criticality = super().to_dict()
+        component_with_criticality["business_criticality"] = self.ref.service["business_criticality"]
+        return component_with_criticality
+
+
+def view_to_dict(value: Any) -> Dict[str, Any]:
+    """
+    Turn a record view into its dict; the ``default`` hook of JSON encoders, so views are encoded as they are met.
+
+    Raises:
+        TypeError: If the value is not a view.
+    """
+    if isinstance(value, RecordView):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
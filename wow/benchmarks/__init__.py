@@ -0,0 +1,5 @@
+"""
+Benchmarks for the WOW application.
+
+Run a benchmark from the ``wow`` directory, e.g. ``python -m benchmarks.bench_search``.
+"""
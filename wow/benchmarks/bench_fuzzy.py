@@ -0,0 +1,115 @@
+"""
+Compare fuzzy name search against computing the edit distance to every name, across catalog sizes.
+
+Usage: python -m benchmarks.bench_fuzzy [--sizes 100,1000,5000] [--queries 200] [--scan-queries 3]
+"""
+import argparse
+import random
+import statistics
+import time
+from typing import List, Tuple
+
+from app.data.catalog_index import CatalogIndex
+from app.data.fuzzy_index import FuzzyNames, default_max_distance
+from benchmarks.synthetic import generate_catalog
+
+ENTITIES = ("teams", "services", "components")
+
+
+def _distance(a: str, b: str, max_distance: int) -> int:
+    row = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        previous, row[0] = row[0], i
+        for j in range(1, len(b) + 1):
+            previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (char != b[j - 1]))
+        if min(row) > max_distance:
+            return max_distance + 1
+    return row[-1]
+
+
+def scan_fuzzy(index: CatalogIndex, query: str, entity: str) -> List[Tuple[int, int]]:
+    """
+    Pairwise distances from the query to the name of every entity, as a search without an index would compute.
+    """
+    max_distance = default_max_distance(query)
+    query = query.lower()
+    matches = []
+    if entity == "teams":
+        for ordinal, team in enumerate(index.teams):
+            distance = min(_distance(query, team["team_id"].lower(), max_distance),
+                           _distance(query, team["team_name"].lower(), max_distance))
+            if distance <= max_distance:
+                matches.append((distance, ordinal))
+    else:
+        if entity == "services":
+            names = [ref.service["service_name"] for ref in index.services]
+        else:
+            names = [ref.component_name for ref in index.components]
+        for ordinal, name in enumerate(names):
+            distance = _distance(query, name.lower(), max_distance)
+            if distance <= max_distance:
+                matches.append((distance, ordinal))
+    return sorted(matches)
+
+
+def _typo(rng: random.Random, text: str) -> str:
+    chars = list(text)
+    for _ in range(rng.randint(1, 2)):
+        position = rng.randrange(len(chars))
+        operation = rng.randrange(3)
+        if operation == 0:
+            del chars[position]
+        elif operation == 1:
+            chars[position] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+        else:
+            chars.insert(position, rng.choice("abcdefghijklmnopqrstuvwxyz-"))
+    return "".join(chars)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000,5000", help="Comma-separated numbers of teams")
+    parser.add_argument("--queries", type=int, default=200, help="Misspelled names searched per size")
+    parser.add_argument("--scan-queries", type=int, default=3, help="Of those, how many are also scanned")
+    args = parser.parse_args()
+
+    print(f"{'teams':>7} {'names':>8} {'build ms':>9} {'scan ms':>9} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        data = generate_catalog(size)
+        index = CatalogIndex(data)
+        start = time.perf_counter()
+        fuzzy_names = FuzzyNames(index)
+        fuzzy_names.build()
+        build_ms = (time.perf_counter() - start) * 1000
+        names = sum(len(fuzzy_names.get(entity)) for entity in ENTITIES)
+
+        rng = random.Random(size)
+        queries = []
+        for _ in range(args.queries):
+            entity = rng.choice(ENTITIES[1:])
+            if entity == "services":
+                name = rng.choice(index.services).service["service_name"]
+            else:
+                name = rng.choice(index.components).component_name
+            queries.append(_typo(rng, name))
+
+        timings, scan_timings = [], []
+        for number, query in enumerate(queries):
+            start = time.perf_counter()
+            results = [fuzzy_names.search(entity, query) for entity in ENTITIES]
+            timings.append((time.perf_counter() - start) * 1000)
+            if number < args.scan_queries:
+                start = time.perf_counter()
+                expected = [scan_fuzzy(index, query, entity) for entity in ENTITIES]
+                scan_timings.append((time.perf_counter() - start) * 1000)
+                assert results == expected, f"result mismatch for {query!r}"
+
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        scan_ms = statistics.mean(scan_timings) if scan_timings else float("nan")
+        print(f"{size:>7} {names:>8} {build_ms:>9.1f} {scan_ms:>9.1f} {statistics.median(timings):>8.3f} "
+              f"{p95:>8.3f} {timings[-1]:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
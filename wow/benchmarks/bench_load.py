@@ -0,0 +1,138 @@
+"""
+Load the ASGI app in-process with concurrent HTTP requests and report latency percentiles and throughput.
+
+The app runs with its lifespan, middleware and response cache as in
+production, over a generated catalog, and is called through httpx's ASGI
+transport, so no server or socket is involved. Each scenario sends
+``--requests`` GETs to one endpoint from ``--concurrency`` concurrent
+clients, cycling through distinct paths spread over the catalog so most
+responses are rendered rather than read from the cache. See
+benchmarks/harness.py for the baseline options.
+
+Usage: python -m benchmarks.bench_load [--teams 1000] [--requests 500] [--concurrency 8]
+                                       [--save-baseline | --check]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+from urllib.parse import quote
+
+import httpx
+
+from app.data.catalog import CatalogStore
+from app.main import app
+from benchmarks import harness
+from benchmarks.synthetic import WORDS, generate_catalog
+
+SUITE = "load"
+
+
+def scenarios(data: Dict[str, Any], count: int) -> Dict[str, List[str]]:
+    """
+    Get the request paths of every scenario: scenario name -> up to ``count`` distinct paths.
+    """
+    teams = data["teams"]
+    services = [service for team in teams for service in team["services_applications"]]
+    components = [component for service in services for component in service["runtime_components"]]
+
+    def spread(items):
+        return items[::max(1, len(items) // count)][:count]
+
+    segments = sorted({team["business_segment"] for team in teams})
+    return {
+        "GET /teams/": [f"/teams/?business_segment={quote(segment)}" for segment in segments],
+        "GET /teams/{team_id}": [f"/teams/{team['team_id']}" for team in spread(teams)],
+        "GET /services/": [f"/services/?team_id={team['team_id']}" for team in spread(teams)],
+        "GET /services/{service_name}": [f"/services/{s['service_name']}" for s in spread(services)],
+        "GET /runtime-components/": [f"/runtime-components/?service_name={s['service_name']}"
+                                     for s in spread(services)],
+        "GET /runtime-components/{component_name}": [f"/runtime-components/{c}" for c in spread(components)],
+        "GET /search/": [f"/search/?query={s['service_name'][:12]}" for s in spread(services)],
+        "GET /search/?ranked=true": [f"/search/?query={a}+{b}&ranked=true" for a in WORDS for b in WORDS][:count],
+    }
+
+
+async def _load(client: httpx.AsyncClient, paths: List[str], requests: int,
+                concurrency: int) -> Tuple[List[float], float]:
+    # Latency of every request in milliseconds, and the wall time of the whole scenario in seconds
+    latencies: List[float] = []
+    next_request = iter(range(requests))
+
+    async def worker():
+        for number in next_request:
+            path = paths[number % len(paths)]
+            start = time.perf_counter()
+            response = await client.get(path)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                raise RuntimeError(f"GET {path} returned {response.status_code}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - start
+
+
+async def run_load(data_file: str, requests: int, concurrency: int, warmup: int = 20) -> Dict[str, Dict[str, float]]:
+    """
+    Run every scenario against the app serving a catalog file.
+
+    Args:
+        data_file: The catalog to serve.
+        requests: Requests per scenario.
+        concurrency: Concurrent clients per scenario.
+        warmup: Untimed requests sent first per scenario.
+
+    Returns:
+        Scenario -> summary of its latencies (see ``harness.summarize``),
+        with its throughput in requests per second as ``rps``.
+    """
+    with open(data_file) as f:
+        paths = scenarios(json.load(f), requests)
+    store = CatalogStore(data_file)
+    store.load()
+    app.state.catalog_store = store
+    results = {}
+    try:
+        async with app.router.lifespan_context(app):
+            # httpx types ASGI scopes and messages as dicts, starlette as mutable mappings
+            transport = httpx.ASGITransport(app=app)  # type: ignore[arg-type]
+            async with httpx.AsyncClient(transport=transport, base_url="http://wow.benchmark") as client:
+                for name, scenario_paths in paths.items():
+                    await _load(client, scenario_paths, warmup, concurrency)
+                    latencies, elapsed = await _load(client, scenario_paths, requests, concurrency)
+                    results[name] = {**harness.summarize(latencies), "rps": requests / elapsed}
+    finally:
+        del app.state.catalog_store
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--teams", type=int, default=1000, help="Number of teams in the catalog")
+    parser.add_argument("--services-per-team", type=int, default=5)
+    parser.add_argument("--components-per-service", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients per scenario")
+    harness.add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, "wow_data.json")
+        with open(data_file, "w") as f:
+            json.dump(generate_catalog(args.teams, args.services_per_team, args.components_per_service), f)
+        results = asyncio.run(run_load(data_file, args.requests, args.concurrency))
+
+    harness.print_table(results, extra=("rps",))
+    settings = {"teams": args.teams, "services_per_team": args.services_per_team,
+                "components_per_service": args.components_per_service, "requests": args.requests,
+                "concurrency": args.concurrency}
+    sys.exit(harness.finish(args, SUITE, settings, results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Compare peak memory and load time of the full and streaming JsonLoader modes.
+
+Each measurement runs in a fresh interpreter so peak RSS is not shared
+between modes. "Retained" is the Python heap held by the loaded data and
+index; "transient" is how far the heap peaked above that while loading,
+i.e. the memory the load needed on top of its result.
+
+Usage: python -m benchmarks.bench_loader [--sizes 1000,10000,30000]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import generate_catalog
+
+MODES = ("full", "streaming")
+
+
+def _measure(path: str, mode: str, trace: bool) -> dict:
+    from app.data.json_loader import JsonLoader
+
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    loader = JsonLoader(path, streaming=(mode == "streaming"))
+    loader.load()
+    transient = _phase_transient(trace)
+    loader.get_index()
+    transient = max(transient, _phase_transient(trace))
+    elapsed = time.perf_counter() - start
+    result = {"seconds": elapsed, "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}
+    if trace:
+        retained, peak = tracemalloc.get_traced_memory()
+        result["retained_mb"] = retained / (1024 * 1024)
+        result["transient_mb"] = transient / (1024 * 1024)
+    return result
+
+
+def _phase_transient(trace: bool) -> int:
+    """
+    Get how far the heap peaked above what the last phase retained, and start a new phase.
+    """
+    if not trace:
+        return 0
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    return peak - retained
+
+
+def _run_child(path: str, mode: str, trace: bool) -> dict:
+    args = [sys.executable, "-m", "benchmarks.bench_loader", "--child", mode, path]
+    if trace:
+        args.append("--trace")
+    output = subprocess.run(args, check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,30000", help="Comma-separated numbers of teams")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    parser.add_argument("--trace", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        mode, path = args.child
+        print(json.dumps(_measure(path, mode, args.trace)))
+        return
+
+    print(f"{'teams':>7} {'file MB':>8} {'mode':<10} {'seconds':>8} {'max RSS MB':>11} "
+          f"{'retained MB':>12} {'transient MB':>13}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in (int(s) for s in args.sizes.split(",")):
+            path = os.path.join(tmp_dir, f"catalog_{size}.json")
+            with open(path, "w") as f:
+                json.dump(generate_catalog(size), f, indent=2)
+            file_mb = os.path.getsize(path) / (1024 * 1024)
+
+            for mode in MODES:
+                timing = _run_child(path, mode, trace=False)
+                traced = _run_child(path, mode, trace=True)
+                print(f"{size:>7} {file_mb:>8.1f} {mode:<10} {timing['seconds']:>8.2f} "
+                      f"{timing['max_rss_mb']:>11.1f} {traced['retained_mb']:>12.1f} {traced['transient_mb']:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
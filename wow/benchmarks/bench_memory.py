@@ -0,0 +1,111 @@
+"""
+Compare the memory held by the catalog as plain validated dicts and as compacted by the loader.
+
+"plain" is the catalog as validation returns it, every value a separate
+object; "compact" is what JsonLoader serves, with equal strings and
+string-only values held once (see ``CatalogCompactor``). Each measurement
+runs in a fresh interpreter. "Data" is the Python heap held by the records,
+"index" what the CatalogIndex over them adds, and "compact s" the time
+compaction adds to a load, measured without tracing. Both representations
+must serialize to the same JSON, which is checked by comparing digests.
+
+Usage: python -m benchmarks.bench_memory [--services 10000,100000]
+"""
+import argparse
+import gc
+import hashlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import generate_catalog
+
+REPRESENTATIONS = ("plain", "compact")
+
+SERVICES_PER_TEAM = 5
+
+
+def _validated(path: str):
+    from app.models.team import TeamList
+
+    with open(path) as f:
+        return TeamList.model_validate(json.load(f)).model_dump(mode="json")
+
+
+def _measure(path: str, representation: str) -> dict:
+    from app.data.catalog_index import CatalogIndex
+    from app.data.compact import compact_catalog
+
+    tracemalloc.start()
+    data = _validated(path)
+    if representation == "compact":
+        data = compact_catalog(data)
+    gc.collect()
+    data_bytes = tracemalloc.get_traced_memory()[0]
+    index = CatalogIndex(data)
+    gc.collect()
+    index_bytes = tracemalloc.get_traced_memory()[0] - data_bytes
+    tracemalloc.stop()
+    result = {
+        "data_mb": data_bytes / (1024 * 1024),
+        "index_mb": index_bytes / (1024 * 1024),
+        "services": len(index.services),
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "digest": hashlib.sha256(json.dumps(data).encode()).hexdigest(),
+    }
+    if representation == "compact":
+        del data, index
+        validated = _validated(path)
+        start = time.perf_counter()
+        compact_catalog(validated)
+        result["compact_seconds"] = time.perf_counter() - start
+    return result
+
+
+def _run_child(path: str, representation: str) -> dict:
+    args = [sys.executable, "-m", "benchmarks.bench_memory", "--child", representation, path]
+    output = subprocess.run(args, check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--services", default="10000,100000", help="Comma-separated numbers of services")
+    parser.add_argument("--child", nargs=2, metavar=("REPRESENTATION", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        representation, path = args.child
+        print(json.dumps(_measure(path, representation)))
+        return
+
+    print(f"{'services':>9} {'repr':<8} {'data MB':>8} {'index MB':>9} {'total MB':>9} "
+          f"{'max RSS MB':>11} {'B/service':>10} {'saved':>6} {'compact s':>10}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for services in (int(s) for s in args.services.split(",")):
+            path = os.path.join(tmp_dir, f"catalog_{services}.json")
+            with open(path, "w") as f:
+                json.dump(generate_catalog(max(1, services // SERVICES_PER_TEAM),
+                                           services_per_team=SERVICES_PER_TEAM), f)
+
+            results = {representation: _run_child(path, representation) for representation in REPRESENTATIONS}
+            if len({result["digest"] for result in results.values()}) != 1:
+                sys.exit(f"The representations of {services} services do not serialize to the same JSON")
+            plain_mb = results["plain"]["data_mb"]
+            for representation, result in results.items():
+                total_mb = result["data_mb"] + result["index_mb"]
+                per_service = result["data_mb"] * 1024 * 1024 / result["services"]
+                saved = 1 - result["data_mb"] / plain_mb
+                compact_seconds = f"{result['compact_seconds']:.2f}" if "compact_seconds" in result else "-"
+                print(f"{result['services']:>9} {representation:<8} {result['data_mb']:>8.1f} "
+                      f"{result['index_mb']:>9.1f} {total_mb:>9.1f} {result['max_rss_mb']:>11.1f} "
+                      f"{per_service:>10.0f} {saved:>6.0%} {compact_seconds:>10}")
+
+
+if __name__ == "__main__":
+    main()
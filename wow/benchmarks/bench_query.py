@@ -0,0 +1,109 @@
+"""
+Compare QueryService against a loop evaluating the expression on every service, across catalog sizes.
+
+Usage: python -m benchmarks.bench_query [--sizes 100,1000,10000] [--repeat 20]
+"""
+import argparse
+import time
+from typing import Any, Callable, Dict, List
+
+from app.data.catalog import CatalogSnapshot, SourceFingerprint
+from app.services.query_language import And, Expression, Match, Not, parse_query
+from app.services.query_service import QueryService
+from benchmarks.synthetic import generate_catalog
+
+QUERIES = {
+    "one team": "team_id = {team_id}",
+    "and": "business_segment = \"{segment}\" AND tech_stack = {tech_stack}",
+    "and not": "tech_stack = {tech_stack} AND NOT sla IN (\"{sla}\")",
+    "or": "(sla = \"{sla}\" OR team_type = {team_type}) AND value_stream = \"{value_stream}\"",
+    "no match": "service_name = zzz-unknown OR component_name = zzz-unknown",
+}
+
+# Field -> values of a service, as the loop reads them
+FIELDS: Dict[str, Callable[[Dict[str, Any], Dict[str, Any]], List[str]]] = {
+    "team_id": lambda team, service: [team["team_id"]],
+    "business_segment": lambda team, service: [team["business_segment"]],
+    "team_type": lambda team, service: [team["team_api"]["team_type"]],
+    "value_stream": lambda team, service: [vs["value_stream_name"] for vs in team["value_streams"]],
+    "service_name": lambda team, service: [service["service_name"]],
+    "tech_stack": lambda team, service: [service["tech_stack"]],
+    "sla": lambda team, service: [service["business_criticality"]["sla"]],
+    "component_name": lambda team, service: service["runtime_components"],
+}
+
+
+def _predicate(expression: Expression) -> Callable[[Dict[str, Any], Dict[str, Any]], bool]:
+    if isinstance(expression, Match):
+        values, field = set(expression.values), FIELDS[expression.field]
+        return lambda team, service: any(value in values for value in field(team, service))
+    if isinstance(expression, Not):
+        operand = _predicate(expression.operand)
+        return lambda team, service: not operand(team, service)
+    operands = [_predicate(operand) for operand in expression.operands]
+    if isinstance(expression, And):
+        return lambda team, service: all(operand(team, service) for operand in operands)
+    return lambda team, service: any(operand(team, service) for operand in operands)
+
+
+def scan_query(data: Dict[str, Any], query: str) -> Dict[str, Any]:
+    """
+    Filter services the way the list endpoints did before the inverted indexes: test each one in a loop.
+    """
+    holds = _predicate(parse_query(query))
+    items = []
+    for team in data["teams"]:
+        for service in team["services_applications"]:
+            if holds(team, service):
+                service_with_context = service.copy()
+                service_with_context["team_id"] = team["team_id"]
+                service_with_context["team_name"] = team["team_name"]
+                service_with_context["business_segment"] = team["business_segment"]
+                items.append(service_with_context)
+    return {"entity": "services", "total": len(items), "items": items}
+
+
+def _time_ms(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000,10000", help="Comma-separated numbers of teams")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per query")
+    args = parser.parse_args()
+
+    print(f"{'teams':>7} {'services':>8} {'query':<10} {'matches':>8} {'scan ms':>9} "
+          f"{'first ms':>9} {'query ms':>9} {'speedup':>8}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        data = generate_catalog(size)
+        snapshot = CatalogSnapshot(data, 1, SourceFingerprint(0, 0, "bench"))
+        service = QueryService(snapshot)
+        team = data["teams"][-1]
+        first_service = team["services_applications"][0]
+        fields = {
+            "team_id": team["team_id"],
+            "segment": team["business_segment"],
+            "tech_stack": first_service["tech_stack"],
+            "sla": first_service["business_criticality"]["sla"],
+            "team_type": team["team_api"]["team_type"],
+            "value_stream": team["value_streams"][0]["value_stream_name"],
+        }
+
+        for label, template in QUERIES.items():
+            query = template.format(**fields)
+            # The first run converts the posting lists of the values to bitsets
+            first_ms = _time_ms(lambda: service.query(query), 1)
+            result = service.query(query)
+            assert result == scan_query(data, query), f"result mismatch for {query!r}"
+            scan_ms = _time_ms(lambda: scan_query(data, query), args.repeat)
+            query_ms = _time_ms(lambda: service.query(query), args.repeat)
+            print(f"{size:>7} {len(snapshot.get_index().services):>8} {label:<10} {result['total']:>8} "
+                  f"{scan_ms:>9.3f} {first_ms:>9.3f} {query_ms:>9.3f} {scan_ms / query_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Measure the cost removed from GET /teams by serving validated data directly.
+
+"validated" reproduces what FastAPI did with ``response_model=List[Team]``:
+validate every team again, run ``jsonable_encoder`` and render a
+JSONResponse. "direct" is what the endpoint does now: render the snapshot's
+already-validated data. A final end-to-end request through the ASGI app is
+reported for reference.
+
+Usage: python -m benchmarks.bench_responses [--sizes 100,1000,5000] [--repeat 10]
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.testclient import TestClient
+from fastapi.utils import create_response_field
+
+from app.data.catalog import CatalogStore
+from app.data.json_loader import JsonLoader
+from app.main import app
+from app.models.team import Team
+from benchmarks.synthetic import generate_catalog
+
+
+def _time_ms(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000,5000", help="Comma-separated numbers of teams")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per measurement")
+    args = parser.parse_args()
+
+    response_field = create_response_field(name="Response_get_teams", type_=List[Team])
+
+    def validated(teams):
+        content = asyncio.run(serialize_response(field=response_field, response_content=teams))
+        return JSONResponse(content).body
+
+    def direct(teams):
+        return JSONResponse(teams).body
+
+    print(f"{'teams':>6} {'validated ms':>13} {'direct ms':>10} {'speedup':>8} {'GET /teams ms':>14}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in (int(s) for s in args.sizes.split(",")):
+            path = os.path.join(tmp_dir, f"catalog_{size}.json")
+            with open(path, "w") as f:
+                json.dump(generate_catalog(size), f)
+            teams = JsonLoader(path).load()["teams"]
+            assert validated(teams) == direct(teams), "response bodies differ"
+
+            validated_ms = _time_ms(lambda: validated(teams), args.repeat)
+            direct_ms = _time_ms(lambda: direct(teams), args.repeat)
+
+            store = CatalogStore(path)
+            store.load()
+            app.state.catalog_store = store
+            with TestClient(app) as client:
+                request_ms = _time_ms(lambda: client.get("/teams"), args.repeat)
+
+            print(f"{size:>6} {validated_ms:>13.2f} {direct_ms:>10.2f} {validated_ms / direct_ms:>7.1f}x {request_ms:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
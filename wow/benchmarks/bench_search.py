@@ -0,0 +1,90 @@
+"""
+Compare SearchService against the full scan it replaced, across catalog sizes.
+
+Usage: python -m benchmarks.bench_search [--sizes 100,1000,10000] [--repeat 20]
+"""
+import argparse
+import time
+from typing import Any, Dict, List
+
+from app.data.catalog import CatalogSnapshot, SourceFingerprint
+from app.services.search_service import SearchService
+from benchmarks.synthetic import generate_catalog
+
+QUERIES = {
+    "exact service": "{service}",
+    "exact team id": "{team_id}",
+    "rare word": "kyc-audit",
+    "no match": "zzz-unknown",
+    "broad": "java",
+}
+
+
+def scan_search(data: Dict[str, Any], query: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    The linear substring scan SearchService used before the trigram index.
+    """
+    query = query.lower()
+    team_results, service_results, component_results = [], [], []
+    for team in data["teams"]:
+        if (query in team["team_id"].lower() or query in team["team_name"].lower() or
+                query in team["business_segment"].lower() or
+                query in team["team_api"]["team_mission"].lower()):
+            team_results.append(team)
+        for value_stream in team["value_streams"]:
+            if (query in value_stream["value_stream_name"].lower() or
+                    query in value_stream["value_stream_description"].lower()):
+                if team not in team_results:
+                    team_results.append(team)
+        for service in team["services_applications"]:
+            if query in service["service_name"].lower() or query in service["tech_stack"].lower():
+                service_with_context = service.copy()
+                service_with_context["team_id"] = team["team_id"]
+                service_with_context["team_name"] = team["team_name"]
+                service_with_context["business_segment"] = team["business_segment"]
+                service_results.append(service_with_context)
+            for component in service["runtime_components"]:
+                if query in component.lower():
+                    component_results.append({
+                        "component_name": component,
+                        "service_name": service["service_name"],
+                        "team_id": team["team_id"],
+                        "team_name": team["team_name"],
+                        "business_segment": team["business_segment"],
+                        "tech_stack": service["tech_stack"]
+                    })
+    return {"teams": team_results, "services": service_results, "runtime_components": component_results}
+
+
+def _time_ms(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000,10000", help="Comma-separated numbers of teams")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per query")
+    args = parser.parse_args()
+
+    print(f"{'teams':>7} {'components':>10} {'query':<14} {'scan ms':>9} {'index ms':>9} {'speedup':>8}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        data = generate_catalog(size)
+        catalog = CatalogSnapshot(data, 1, SourceFingerprint(0, 0, "synthetic"))
+        service = SearchService(catalog)
+        last_team = data["teams"][-1]
+        fields = {"service": last_team["services_applications"][0]["service_name"], "team_id": last_team["team_id"]}
+
+        for label, template in QUERIES.items():
+            query = template.format(**fields)
+            assert service.search(query) == scan_search(data, query), f"result mismatch for {query!r}"
+            scan_ms = _time_ms(lambda: scan_search(data, query), args.repeat)
+            index_ms = _time_ms(lambda: service.search(query), args.repeat)
+            print(f"{size:>7} {len(catalog.get_index().components):>10} {label:<14} "
+                  f"{scan_ms:>9.3f} {index_ms:>9.3f} {scan_ms / index_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
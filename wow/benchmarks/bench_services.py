@@ -0,0 +1,183 @@
+"""
+Microbenchmarks of every service method and helper in app/services over a synthetic catalog.
+
+Each case calls one method the way an endpoint does, on a snapshot whose
+indexes are already built, and is reported as ``Class.method`` or
+``module.function``, with a ``:variant`` suffix where a method is measured
+with different arguments. See benchmarks/harness.py for the baseline options.
+
+Usage: python -m benchmarks.bench_services [--teams 1000] [--repeat 50] [--cases TeamService.]
+                                           [--save-baseline | --check]
+"""
+import argparse
+import sys
+from typing import Any, Callable, Dict
+
+from app.data.catalog import CatalogSnapshot, SourceFingerprint
+from app.services.facet_service import FacetService
+from app.services.pagination import Cursor, decode_cursor, encode_cursor, page_ordinals, resume_after
+from app.services.projection import parse_fields, project
+from app.services.query_language import parse_query
+from app.services.query_service import QueryService
+from app.services.runtime_component_service import RuntimeComponentService
+from app.services.search_service import SearchService
+from app.services.service_service import ServiceService
+from app.services.team_service import TeamService
+from app.services.views import ServiceView, view_to_dict
+from benchmarks import harness
+from benchmarks.synthetic import generate_catalog
+
+SUITE = "services"
+
+# Items per page of the paged cases, and names per batch lookup
+PAGE_SIZE = 100
+BATCH_SIZE = 50
+
+QUERY = "tech_stack IN (Java, Kotlin) AND NOT sla = '99.99%' OR team_type = platform"
+
+
+def build_snapshot(data: Dict[str, Any]) -> CatalogSnapshot:
+    """
+    Wrap a catalog in a snapshot and build every index it builds lazily, so no case pays for them.
+    """
+    snapshot = CatalogSnapshot(data, 1, SourceFingerprint(0, 0, "synthetic"))
+    snapshot.get_bitsets()
+    snapshot.get_fuzzy_names().build()
+    snapshot.get_text_indexes().build()
+    return snapshot
+
+
+def _spread(items, count: int):
+    # Every n-th item, so batches touch the whole catalog
+    return items[::max(1, len(items) // count)][:count]
+
+
+def _consume(page) -> int:
+    return sum(1 for _ in page.items)
+
+
+def service_cases(snapshot: CatalogSnapshot) -> Dict[str, Callable[[], Any]]:
+    """
+    Get the benchmark cases over a snapshot: case name -> call to time.
+
+    Lookups probe the team in the middle of the catalog, its first service
+    and that service's first runtime component.
+    """
+    index = snapshot.get_index()
+    team = index.teams[len(index.teams) // 2]
+    service = team["services_applications"][0]
+    component = service["runtime_components"][0]
+    segment = team["business_segment"]
+    value_stream = team["value_streams"][0]["value_stream_name"]
+    team_ids = [t["team_id"] for t in _spread(index.teams, BATCH_SIZE)]
+    service_names = [ref.service["service_name"] for ref in _spread(index.services, BATCH_SIZE)]
+    component_names = [ref.component_name for ref in _spread(index.components, BATCH_SIZE)]
+    instances = [f"{name}-7f9c-x2" for name in component_names]
+
+    teams = TeamService(snapshot)
+    services = ServiceService(snapshot)
+    components = RuntimeComponentService(snapshot)
+    search = SearchService(snapshot)
+    facets = FacetService(snapshot)
+    queries = QueryService(snapshot)
+
+    team_fields = parse_fields("team_id,team_name,team_api.contact_channels", TeamService.FIELDS)
+    service_fields = parse_fields("service_name,team_id,business_criticality.sla", ServiceService.FIELDS)
+    component_fields = parse_fields("component_name,service_name", RuntimeComponentService.FIELDS)
+    mid_cursor = Cursor(len(index.services) // 2, index.services[len(index.services) // 2].service["service_name"])
+    moved_cursor = Cursor(0, mid_cursor.key)
+    token = encode_cursor(mid_cursor)
+
+    def service_key(ordinal: int) -> str:
+        return index.services[ordinal].service["service_name"]
+
+    return {
+        "TeamService.get_all_teams": lambda: teams.get_all_teams(),
+        "TeamService.get_all_teams:segment": lambda: teams.get_all_teams(business_segment=segment),
+        "TeamService.get_teams_page": lambda: teams.get_teams_page(fields=team_fields, limit=PAGE_SIZE),
+        "TeamService.iter_teams_page": lambda: _consume(teams.iter_teams_page(value_stream_name=value_stream)),
+        "TeamService.get_team_by_id": lambda: teams.get_team_by_id(team["team_id"]),
+        "TeamService.get_teams_by_ids": lambda: teams.get_teams_by_ids(team_ids),
+
+        "ServiceService.get_all_services": lambda: services.get_all_services(),
+        "ServiceService.get_all_services:team": lambda: services.get_all_services(team_id=team["team_id"]),
+        "ServiceService.get_services_page": lambda: services.get_services_page(
+            fields=service_fields, limit=PAGE_SIZE, cursor=token),
+        "ServiceService.iter_services_page": lambda: _consume(services.iter_services_page(
+            business_segment=segment, sla="99.9%")),
+        "ServiceService.get_service_by_name": lambda: services.get_service_by_name(service["service_name"]),
+        "ServiceService.get_services_by_names": lambda: services.get_services_by_names(service_names),
+
+        "RuntimeComponentService.get_all_runtime_components": lambda: components.get_all_runtime_components(),
+        "RuntimeComponentService.get_all_runtime_components:name": lambda: components.get_all_runtime_components(
+            component_name="api"),
+        "RuntimeComponentService.get_runtime_components_page": lambda: components.get_runtime_components_page(
+            fields=component_fields, limit=PAGE_SIZE),
+        "RuntimeComponentService.iter_runtime_components_page": lambda: _consume(
+            components.iter_runtime_components_page(service_name=service["service_name"])),
+        "RuntimeComponentService.get_runtime_component_by_name": lambda: components.get_runtime_component_by_name(
+            component),
+        "RuntimeComponentService.get_runtime_components_by_names":
+            lambda: components.get_runtime_components_by_names(component_names),
+        "RuntimeComponentService.resolve_instance": lambda: components.resolve_instance(f"{component}-7f9c-x2"),
+        "RuntimeComponentService.resolve_instances": lambda: components.resolve_instances(instances),
+
+        "SearchService.search": lambda: search.search(service["service_name"][:8]),
+        "SearchService.search:fuzzy": lambda: search.search(service["service_name"][1:], fuzzy=True),
+        "SearchService.search:ranked": lambda: search.search("payment ledger java", ranked=True),
+        "FacetService.get_facets": lambda: facets.get_facets("services", ["tech_stack", "sla"]),
+        "FacetService.get_facets:filtered": lambda: facets.get_facets(
+            "services", ["tech_stack", "sla"], {"business_segment": segment}),
+        "QueryService.query": lambda: queries.query(QUERY, limit=PAGE_SIZE),
+        "QueryService.query:runtime_components": lambda: queries.query(QUERY, entity="runtime_components",
+                                                                       limit=PAGE_SIZE),
+
+        "query_language.parse_query": lambda: parse_query(QUERY),
+        "projection.parse_fields": lambda: parse_fields("service_name,business_criticality.sla,team_id",
+                                                        ServiceService.FIELDS),
+        "projection.project": lambda: project(team, team_fields),
+        "pagination.encode_cursor": lambda: encode_cursor(mid_cursor),
+        "pagination.decode_cursor": lambda: decode_cursor(token),
+        "pagination.resume_after": lambda: resume_after(moved_cursor, len(index.services), service_key),
+        "pagination.page_ordinals": lambda: page_ordinals(range(len(index.services)), PAGE_SIZE, token,
+                                                          len(index.services), service_key),
+        "views.view_to_dict": lambda: view_to_dict(ServiceView(index.services[mid_cursor.ordinal])),
+    }
+
+
+def run(num_teams: int,
+        services_per_team: int,
+        components_per_service: int,
+        repeat: int,
+        prefix: str = "") -> Dict[str, Dict[str, float]]:
+    """
+    Time the cases whose name starts with ``prefix`` over a generated catalog.
+
+    Returns:
+        Case name -> summary of its timings, see ``harness.summarize``.
+    """
+    data = generate_catalog(num_teams, services_per_team, components_per_service)
+    cases = service_cases(build_snapshot(data))
+    return {name: harness.summarize(harness.measure(func, repeat))
+            for name, func in cases.items() if name.startswith(prefix)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--teams", type=int, default=1000, help="Number of teams in the catalog")
+    parser.add_argument("--services-per-team", type=int, default=5)
+    parser.add_argument("--components-per-service", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=50, help="Timed calls per case")
+    parser.add_argument("--cases", default="", help="Only run the cases whose name starts with this")
+    harness.add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    results = run(args.teams, args.services_per_team, args.components_per_service, args.repeat, args.cases)
+    harness.print_table(results)
+    settings = {"teams": args.teams, "services_per_team": args.services_per_team,
+                "components_per_service": args.components_per_service, "repeat": args.repeat}
+    sys.exit(harness.finish(args, SUITE, settings, results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Compare time-to-first-request of the server started from JSON and from a compiled snapshot.
+
+Every run starts a fresh uvicorn process, as a container restart or an
+autoscaling event would, and polls until the first request is answered.
+The "import" column is how long a process that serves nothing takes to get
+there, i.e. the interpreter and application import cost both paths share.
+
+Usage: python -m benchmarks.bench_startup [--sizes 1000,10000] [--repeat 3]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+from benchmarks.synthetic import generate_catalog
+
+STARTUP_TIMEOUT = 300
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _time_to_first_request(data_file: str, snapshot_file: str, path: str) -> float:
+    port = _free_port()
+    env = dict(os.environ,
+               WOW_DATA_FILE=data_file,
+               WOW_SNAPSHOT_FILE=snapshot_file,
+               WOW_RELOAD_INTERVAL="0")
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - start < STARTUP_TIMEOUT:
+            if server.poll() is not None:
+                raise RuntimeError(f"Server exited with code {server.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=5) as response:
+                    response.read()
+                return time.perf_counter() - start
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.01)
+        raise RuntimeError("Server did not answer in time")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def _time_to_import() -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import app.main"], check=True)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000", help="Comma-separated numbers of teams")
+    parser.add_argument("--repeat", type=int, default=3, help="Starts per path; the best one is reported")
+    args = parser.parse_args()
+
+    from compile_catalog import main as compile_catalog
+
+    print(f"{'teams':>7} {'JSON MB':>8} {'snapshot MB':>12} {'import s':>9} {'json s':>8} {'compiled s':>11} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in (int(s) for s in args.sizes.split(",")):
+            data = generate_catalog(size)
+            data_file = os.path.join(tmp_dir, f"catalog_{size}.json")
+            snapshot_file = os.path.join(tmp_dir, f"catalog_{size}.snapshot")
+            with open(data_file, "w") as f:
+                json.dump(data, f)
+            with contextlib.redirect_stdout(io.StringIO()):
+                compile_catalog(["--data-file", data_file, "--output", snapshot_file])
+
+            path = f"/teams/{data['teams'][-1]['team_id']}"
+            import_seconds = min(_time_to_import() for _ in range(args.repeat))
+            json_seconds = min(_time_to_first_request(data_file, "", path) for _ in range(args.repeat))
+            compiled_seconds = min(_time_to_first_request(data_file, snapshot_file, path)
+                                   for _ in range(args.repeat))
+            print(f"{size:>7} {os.path.getsize(data_file) / 1e6:>8.1f} {os.path.getsize(snapshot_file) / 1e6:>12.1f} "
+                  f"{import_seconds:>9.2f} {json_seconds:>8.2f} {compiled_seconds:>11.2f} "
+                  f"{json_seconds / compiled_seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
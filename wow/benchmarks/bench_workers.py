@@ -0,0 +1,183 @@
+"""
+Measure resident memory of a multi-worker server for each way of loading the catalog.
+
+For every mode and worker count a fresh ``uvicorn --workers N`` is started
+and the RSS and PSS (proportional set size, which splits shared pages
+between the processes mapping them) of the supervisor and all workers are
+summed from /proc, once when every worker has completed startup ("idle")
+and again after a warm-up with a mix of requests, including full listings,
+that leaves the response caches filled ("warm"). "PSS/extra worker" is how
+much each worker beyond the first adds to the total. Linux only.
+
+Modes:
+    json      every worker parses and validates the JSON data file
+    compiled  every worker loads the compiled snapshot into memory
+    mapped    every worker memory-maps the compiled snapshot (WOW_MAPPED_CATALOG)
+
+Usage: python -m benchmarks.bench_workers [--teams 2000] [--workers 1,4,8] [--modes json,compiled,mapped]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import List
+
+from benchmarks.synthetic import generate_catalog
+
+STARTUP_TIMEOUT = 600
+SETTLE_SECONDS = 1.0
+WARMUP_REQUESTS = 200
+
+MODES = ("json", "compiled", "mapped")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _descendants(pid: int) -> List[int]:
+    pids: List[int] = []
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            children = [int(child) for child in f.read().split()]
+    except OSError:
+        return pids
+    for child in children:
+        pids.append(child)
+        pids.extend(_descendants(child))
+    return pids
+
+
+def _memory_kb(pid: int) -> dict:
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ("Rss:", "Pss:"):
+                values[parts[0][:-1].lower()] = int(parts[1])
+    return values
+
+
+def _paths(data: dict) -> list:
+    teams = data["teams"]
+    paths = ["/teams", "/services", "/runtime-components", "/search?query=api"]
+    for team in teams[::max(1, len(teams) // 50)]:
+        service = team["services_applications"][0]
+        paths += [
+            f"/teams/{team['team_id']}",
+            f"/services/{service['service_name']}",
+            f"/runtime-components/{service['runtime_components'][0]}",
+            f"/services?team_id={team['team_id']}",
+        ]
+    return paths
+
+
+def _total_memory_kb(pid: int) -> dict:
+    totals = {"rss": 0, "pss": 0}
+    for process in [pid] + _descendants(pid):
+        for key, value in _memory_kb(process).items():
+            totals[key] += value
+    return totals
+
+
+def _measure(mode: str, workers: int, data_file: str, snapshot_file: str, paths: list) -> dict:
+    port = _free_port()
+    env = dict(os.environ,
+               WOW_DATA_FILE=data_file,
+               WOW_SNAPSHOT_FILE=snapshot_file if mode != "json" else "",
+               WOW_MAPPED_CATALOG="true" if mode == "mapped" else "",
+               WOW_RELOAD_INTERVAL="0")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", str(workers)],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+
+    started = threading.Semaphore(0)
+
+    def watch_log():
+        for line in server.stderr:
+            if "Application startup complete" in line:
+                started.release()
+
+    threading.Thread(target=watch_log, daemon=True).start()
+    try:
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        for _ in range(workers):
+            if not started.acquire(timeout=max(0.0, deadline - time.monotonic())):
+                raise RuntimeError(f"{mode} with {workers} workers did not start in time")
+
+        # A single worker only binds its socket after startup completes
+        while True:
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=60).close()
+                break
+            except (urllib.error.URLError, ConnectionError):
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+        time.sleep(SETTLE_SECONDS)
+        idle = _total_memory_kb(server.pid)
+
+        for i in range(WARMUP_REQUESTS):
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}{paths[i % len(paths)]}", timeout=60) as response:
+                response.read()
+        time.sleep(SETTLE_SECONDS)
+        return {"idle": idle, "warm": _total_memory_kb(server.pid)}
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--teams", type=int, default=2000, help="Number of teams in the generated catalog")
+    parser.add_argument("--workers", default="1,4,8", help="Comma-separated worker counts")
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma-separated modes")
+    args = parser.parse_args()
+
+    from compile_catalog import main as compile_catalog
+
+    worker_counts = [int(w) for w in args.workers.split(",")]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data = generate_catalog(args.teams)
+        data_file = os.path.join(tmp_dir, "catalog.json")
+        snapshot_file = os.path.join(tmp_dir, "catalog.snapshot")
+        with open(data_file, "w") as f:
+            json.dump(data, f)
+        with contextlib.redirect_stdout(io.StringIO()):
+            compile_catalog(["--data-file", data_file, "--output", snapshot_file])
+        paths = _paths(data)
+
+        print(f"{args.teams} teams, JSON {os.path.getsize(data_file) / 1e6:.1f} MB, "
+              f"snapshot {os.path.getsize(snapshot_file) / 1e6:.1f} MB")
+        print(f"{'':<17} | {'idle':^38} | {'warm':^38}")
+        columns = f"{'RSS MB':>8} {'PSS MB':>8} {'PSS/extra worker MB':>20}"
+        print(f"{'mode':<9} {'workers':>7} | {columns} | {columns}")
+        for mode in args.modes.split(","):
+            first = None
+            for workers in worker_counts:
+                result = _measure(mode, workers, data_file, snapshot_file, paths)
+                if first is None:
+                    first = (workers, result)
+                cells = []
+                for state in ("idle", "warm"):
+                    pss_mb = result[state]["pss"] / 1024
+                    extra = ""
+                    if workers > first[0]:
+                        extra = f"{(pss_mb - first[1][state]['pss'] / 1024) / (workers - first[0]):.1f}"
+                    cells.append(f"{result[state]['rss'] / 1024:>8.1f} {pss_mb:>8.1f} {extra:>20}")
+                print(f"{mode:<9} {workers:>7} | {cells[0]} | {cells[1]}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
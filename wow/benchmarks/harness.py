@@ -0,0 +1,198 @@
+"""
+Timing, reporting and baseline helpers shared by the benchmark suites.
+
+A suite measures named cases and gets a summary of each (see
+``summarize``). With ``--save-baseline`` the summaries are written to
+``benchmarks/baselines/<suite>.json``; with ``--check`` they are compared
+with that file and the process exits with status 1 if a case got slower
+than the baseline by more than ``--tolerance`` (see ``find_regressions``).
+Baselines are only comparable on the same machine and with the same suite
+settings, which are stored with them and checked.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+# Metric compared with the baseline; the median is the most stable under noise
+BASELINE_METRIC = "p50_ms"
+
+# A case regresses when its metric exceeds the baseline by this factor...
+DEFAULT_TOLERANCE = 2.0
+# ...and by more than this many milliseconds, so the run-to-run noise of fast cases is ignored
+DEFAULT_MIN_DELTA_MS = 0.2
+
+
+class Regression(NamedTuple):
+    """
+    A case slower than its baseline.
+    """
+    case: str
+    baseline_ms: float
+    current_ms: float
+
+    def __str__(self) -> str:
+        return (f"{self.case}: {BASELINE_METRIC} {self.current_ms:.3f} ms, baseline {self.baseline_ms:.3f} ms "
+                f"({self.current_ms / self.baseline_ms:.2f}x)")
+
+
+def percentile(sorted_samples: Sequence[float], fraction: float) -> float:
+    """
+    Get a percentile of ascending samples by the nearest-rank method, e.g. ``fraction=0.95`` for p95.
+    """
+    if not sorted_samples:
+        raise ValueError("No samples")
+    rank = max(1, math.ceil(fraction * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+def summarize(samples_ms: Sequence[float]) -> Dict[str, float]:
+    """
+    Summarize the durations of the runs of one case.
+
+    Returns:
+        The number of runs, and the mean, p50, p95, p99 and maximum durations in milliseconds.
+    """
+    ordered = sorted(samples_ms)
+    return {
+        "runs": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered),
+        "p50_ms": percentile(ordered, 0.50),
+        "p95_ms": percentile(ordered, 0.95),
+        "p99_ms": percentile(ordered, 0.99),
+        "max_ms": ordered[-1],
+    }
+
+
+def measure(func: Callable[[], Any], repeat: int, warmup: int = 1) -> List[float]:
+    """
+    Time each of ``repeat`` calls of a function, after ``warmup`` untimed calls.
+
+    Returns:
+        The duration of every timed call in milliseconds.
+    """
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def find_regressions(results: Dict[str, Dict[str, float]],
+                     baseline: Dict[str, Dict[str, float]],
+                     tolerance: float = DEFAULT_TOLERANCE,
+                     min_delta_ms: float = DEFAULT_MIN_DELTA_MS) -> List[Regression]:
+    """
+    Compare the summaries of a run with a baseline.
+
+    Cases missing from either side are not compared.
+
+    Returns:
+        The cases whose ``BASELINE_METRIC`` exceeds the baseline by a factor
+        of more than ``tolerance`` and by more than ``min_delta_ms``.
+    """
+    regressions = []
+    for case, summary in results.items():
+        if case not in baseline:
+            continue
+        baseline_ms, current_ms = baseline[case][BASELINE_METRIC], summary[BASELINE_METRIC]
+        if current_ms > baseline_ms * tolerance and current_ms - baseline_ms > min_delta_ms:
+            regressions.append(Regression(case, baseline_ms, current_ms))
+    return regressions
+
+
+def baseline_path(suite: str) -> str:
+    return os.path.join(BASELINE_DIR, f"{suite}.json")
+
+
+def save_baseline(path: str, settings: Dict[str, Any], results: Dict[str, Dict[str, float]]) -> None:
+    """
+    Write the summaries of a run and the settings it ran with as a baseline.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    baseline = {
+        "settings": settings,
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "cpus": os.cpu_count()},
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Read a baseline written by ``save_baseline``, or None if there is none.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def add_baseline_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the options of every suite to save and check baselines.
+    """
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the baseline")
+    parser.add_argument("--check", action="store_true",
+                        help="Exit with status 1 if a case is slower than the baseline")
+    parser.add_argument("--baseline", help="Baseline file (default: benchmarks/baselines/<suite>.json)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Allowed slowdown factor of {BASELINE_METRIC} (default {DEFAULT_TOLERANCE})")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help=f"Slowdowns smaller than this are noise (default {DEFAULT_MIN_DELTA_MS})")
+
+
+def finish(args: argparse.Namespace, suite: str, settings: Dict[str, Any],
+           results: Dict[str, Dict[str, float]]) -> int:
+    """
+    Save or check the baseline of a suite as asked on the command line.
+
+    Returns:
+        The exit status: 1 if the check found regressions or could not
+        compare, else 0.
+    """
+    path = args.baseline or baseline_path(suite)
+    if args.save_baseline:
+        save_baseline(path, settings, results)
+        print(f"Baseline saved to {path}")
+    if not args.check:
+        return 0
+
+    baseline = load_baseline(path)
+    if baseline is None:
+        print(f"No baseline at {path}; run with --save-baseline first", file=sys.stderr)
+        return 1
+    if baseline["settings"] != settings:
+        print(f"Baseline {path} was recorded with {baseline['settings']}, not {settings}", file=sys.stderr)
+        return 1
+    regressions = find_regressions(results, baseline["results"], args.tolerance, args.min_delta_ms)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    if not regressions:
+        print(f"No regressions against {path} (tolerance {args.tolerance}x)")
+    return 1 if regressions else 0
+
+
+def print_table(results: Dict[str, Dict[str, float]], extra: Sequence[str] = ()) -> None:
+    """
+    Print the summaries of a run, one case per line, followed by the ``extra`` values of each summary.
+    """
+    width = max([len(case) for case in results] + [4])
+    print(f"{'case':<{width}} {'runs':>6} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+          + "".join(f" {name:>9}" for name in extra))
+    for case, summary in results.items():
+        print(f"{case:<{width}} {summary['runs']:>6} {summary['mean_ms']:>9.3f} {summary['p50_ms']:>9.3f} "
+              f"{summary['p95_ms']:>9.3f} {summary['p99_ms']:>9.3f}"
+              + "".join(f" {summary[name]:>9.1f}" for name in extra))
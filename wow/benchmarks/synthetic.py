@@ -0,0 +1,168 @@
+"""
+Deterministic generator of synthetic catalogs for benchmarks.
+
+Usage: python -m benchmarks.synthetic --teams 50000 [--services-per-team 5] [--components-per-service 4]
+                                      [--seed 42] [--validate] --output wow_data.json
+"""
+import argparse
+import copy
+import json
+import random
+import sys
+from typing import Any, Dict, Iterator, TextIO
+
+SEGMENTS = [
+    "Internet Banking Division", "Customer Portals", "Payments", "Cards",
+    "Wealth Management", "Corporate Banking", "Risk & Compliance", "Platform Engineering",
+]
+TECH_STACKS = ["Java", "Kotlin", "Python", ".NET", "Go", "Angular", "React", "Node.js", "Scala", "Rust"]
+SLAS = [("99.5%", "99.9%"), ("99.8%", "99.9%"), ("99.9%", "99.95%"), ("99.95%", "99.99%"), ("99.99%", "99.995%")]
+TEAM_TYPES = ["stream-aligned", "platform", "enabling", "complicated-subsystem"]
+WORDS = [
+    "mortgage", "account", "payment", "ledger", "card", "loan", "fraud", "onboarding", "statement",
+    "transfer", "identity", "auth", "notification", "pricing", "risk", "report", "customer", "wallet",
+    "savings", "checkout", "limit", "kyc", "audit", "billing", "gateway", "portal", "catalog", "quote",
+]
+COMPONENT_SUFFIXES = ["api", "backend", "worker", "web", "scheduler", "consumer", "reporting", "gateway"]
+METADATA = {
+    "version": "1.0.0",
+    "last_updated": "2025-03-11T08:30:00Z",
+    "change_history": [
+        {"version": "1.0.0", "date": "2025-03-11T08:30:00Z", "description": "Synthetic catalog"}
+    ]
+}
+
+
+def generate_catalog(num_teams: int,
+                     services_per_team: int = 5,
+                     components_per_service: int = 3,
+                     value_streams_per_team: int = 2,
+                     seed: int = 42) -> Dict[str, Any]:
+    """
+    Generate a catalog that validates as a ``TeamList``.
+
+    The same arguments always produce the same catalog. Team IDs, service
+    names and component names are unique.
+
+    Args:
+        num_teams: Number of teams to generate.
+        services_per_team: Number of services owned by each team.
+        components_per_service: Number of runtime components per service.
+        value_streams_per_team: Number of value streams each team is aligned with.
+        seed: Seed for the random number generator.
+
+    Returns:
+        Dict[str, Any]: The generated catalog.
+    """
+    teams = list(iter_teams(num_teams, services_per_team, components_per_service, value_streams_per_team, seed))
+    return {"metadata": copy.deepcopy(METADATA), "teams": teams}
+
+
+def write_catalog(output: TextIO,
+                  num_teams: int,
+                  services_per_team: int = 5,
+                  components_per_service: int = 3,
+                  value_streams_per_team: int = 2,
+                  seed: int = 42) -> None:
+    """
+    Write the catalog ``generate_catalog`` returns for the same arguments as JSON, one team at a time.
+
+    Only one team is held in memory, so catalogs of millions of components
+    can be written.
+    """
+    output.write('{"metadata": ' + json.dumps(METADATA) + ', "teams": [')
+    for number, team in enumerate(iter_teams(num_teams, services_per_team, components_per_service,
+                                             value_streams_per_team, seed)):
+        output.write((",\n" if number else "\n") + json.dumps(team))
+    output.write("\n]}\n")
+
+
+def iter_teams(num_teams: int,
+               services_per_team: int = 5,
+               components_per_service: int = 3,
+               value_streams_per_team: int = 2,
+               seed: int = 42) -> Iterator[Dict[str, Any]]:
+    """
+    Generate the teams of the catalog ``generate_catalog`` returns for the same arguments, one at a time.
+    """
+    rng = random.Random(seed)
+    value_stream_names = [f"{a.title()} {b.title()}" for a in WORDS for b in WORDS if a != b][:200]
+
+    for team_number in range(num_teams):
+        value_streams = [
+            {
+                "value_stream_name": name,
+                "value_stream_description": f"End-to-end {name.lower()} process",
+                "value_stream_breakdown": {
+                    "countries": rng.sample(["US", "UK", "CA", "DE", "NL", "PL"], 2),
+                    "product_lines": [name.split()[0]]
+                }
+            }
+            for name in rng.sample(value_stream_names, value_streams_per_team)
+        ]
+
+        services = []
+        for service_number in range(services_per_team):
+            service_name = f"{rng.choice(WORDS)}-{rng.choice(WORDS)}-{team_number}-{service_number}"
+            sla, slo = rng.choice(SLAS)
+            services.append({
+                "service_name": service_name,
+                "value_stream_segments": [rng.choice(value_streams)["value_stream_name"]],
+                "tech_stack": rng.choice(TECH_STACKS),
+                "business_criticality": {"sla": sla, "slo": slo},
+                "runtime_components": [
+                    f"{service_name}-{suffix}"
+                    for suffix in rng.sample(COMPONENT_SUFFIXES, min(components_per_service, len(COMPONENT_SUFFIXES)))
+                ] + [f"{service_name}-extra-{n}" for n in range(components_per_service - len(COMPONENT_SUFFIXES))],
+                "repository_url": f"https://github.com/YourOrg/{service_name}"
+            })
+
+        team_word = rng.choice(WORDS)
+        yield {
+            "team_id": f"team_{team_word}_{team_number}",
+            "team_name": f"{team_word.title()} Team {team_number}",
+            "business_segment": rng.choice(SEGMENTS),
+            "value_streams": value_streams,
+            "services_applications": services,
+            "team_api": {
+                "team_mission": f"Deliver reliable {rng.choice(WORDS)} and {rng.choice(WORDS)} capabilities.",
+                "contact_channels": {
+                    "slack_channel": f"#team-{team_word}-{team_number}",
+                    "email": f"team-{team_word}-{team_number}@examplebank.com"
+                },
+                "team_type": rng.choice(TEAM_TYPES),
+                "collaboration_preferences": "We prefer asynchronous communication via Slack or tickets."
+            }
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--teams", type=int, required=True, help="Number of teams")
+    parser.add_argument("--services-per-team", type=int, default=5)
+    parser.add_argument("--components-per-service", type=int, default=3)
+    parser.add_argument("--value-streams-per-team", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--validate", action="store_true", help="Validate the written catalog as a TeamList")
+    parser.add_argument("--output", default="-", help="Output file, - for stdout")
+    args = parser.parse_args()
+
+    sizes = (args.teams, args.services_per_team, args.components_per_service, args.value_streams_per_team,
+             args.seed)
+    if args.output == "-":
+        write_catalog(sys.stdout, *sizes)
+        return
+    with open(args.output, "w") as f:
+        write_catalog(f, *sizes)
+    services = args.teams * args.services_per_team
+    print(f"Wrote {args.teams} teams, {services} services and {services * args.components_per_service} "
+          f"runtime components to {args.output}", file=sys.stderr)
+    if args.validate:
+        from app.models.team import TeamList
+        with open(args.output) as f:
+            TeamList.model_validate_json(f.read())
+        print("Catalog is a valid TeamList", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
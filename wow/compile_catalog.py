@@ -0,0 +1,43 @@
+import argparse
+import os
+import sys
+import time
+
+from app.data.catalog import SourceFingerprint
+from app.data.json_loader import JsonLoader
+from app.data.snapshot_file import write_compiled_snapshot
+from app.dependencies import DATA_FILE, SNAPSHOT_FILE
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Validate the catalog data file and compile it into a snapshot the server loads at startup."
+    )
+    parser.add_argument("--data-file", default=DATA_FILE, help="JSON data file (default: %(default)s)")
+    parser.add_argument("--output", default=None,
+                        help="Snapshot file to write (default: WOW_SNAPSHOT_FILE, or the data file with a .snapshot extension)")
+    args = parser.parse_args(argv)
+
+    output = args.output
+    if output is None:
+        output = SNAPSHOT_FILE if args.data_file == DATA_FILE else os.path.splitext(args.data_file)[0] + ".snapshot"
+
+    start = time.perf_counter()
+    try:
+        fingerprint = SourceFingerprint.from_path(args.data_file)
+        loader = JsonLoader(args.data_file)
+        data = loader.load()
+        index = loader.get_index()
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    size = write_compiled_snapshot(output, data, index, fingerprint.content_hash)
+
+    print(f"Compiled {args.data_file} -> {output} in {time.perf_counter() - start:.2f}s")
+    print(f"  teams: {len(index.teams)}, services: {len(index.services)}, components: {len(index.components)}")
+    print(f"  size: {size} bytes, content hash: {fingerprint.content_hash}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+import argparse
+import asyncio
+import inspect
+import io
+import json
+import pkgutil
+from importlib import import_module
+
+import app.services
+from app.models.team import TeamList
+from benchmarks import harness
+from benchmarks.bench_load import run_load
+from benchmarks.bench_services import build_snapshot, service_cases
+from benchmarks.synthetic import generate_catalog, write_catalog
+
+
+def _public_service_functions():
+    # "Class.method" of every public method of the service classes, "module.function" of every public function
+    names = set()
+    for module_info in pkgutil.iter_modules(app.services.__path__):
+        module = import_module(f"app.services.{module_info.name}")
+        for name, member in vars(module).items():
+            if name.startswith("_") or getattr(member, "__module__", None) != module.__name__:
+                continue
+            if inspect.isfunction(member):
+                names.add(f"{module_info.name}.{name}")
+            elif inspect.isclass(member) and name.endswith("Service"):
+                names.update(f"{name}.{method}" for method, _ in inspect.getmembers(member, inspect.isfunction)
+                             if not method.startswith("_"))
+    return names
+
+
+class TestSyntheticCatalog:
+    """
+    Tests for the generated benchmark catalogs.
+    """
+
+    def test_deterministic_and_valid(self):
+        """
+        Test that the same arguments give the same valid catalog, written or returned.
+        """
+        data = generate_catalog(30, services_per_team=3, components_per_service=10, seed=7)
+        assert data == generate_catalog(30, services_per_team=3, components_per_service=10, seed=7)
+        assert data != generate_catalog(30, services_per_team=3, components_per_service=10, seed=8)
+        TeamList.model_validate(data)
+
+        output = io.StringIO()
+        write_catalog(output, 30, services_per_team=3, components_per_service=10, seed=7)
+        assert json.loads(output.getvalue()) == data
+
+        components = [c for t in data["teams"] for s in t["services_applications"] for c in s["runtime_components"]]
+        assert len(components) == len(set(components)) == 900
+
+
+class TestHarness:
+    """
+    Tests for the timing summaries and the baseline check.
+    """
+
+    def test_summarize(self):
+        """
+        Test the nearest-rank percentiles of a run.
+        """
+        summary = harness.summarize([float(ms) for ms in range(100, 0, -1)])
+        assert (summary["runs"], summary["p50_ms"], summary["p95_ms"], summary["p99_ms"]) == (100, 50, 95, 99)
+        assert summary["mean_ms"] == 50.5 and harness.summarize([3.0])["p99_ms"] == 3.0
+
+    def test_find_regressions(self):
+        """
+        Test that only cases slower by both the tolerance and the minimum delta are regressions.
+        """
+        baseline = {"slow": {"p50_ms": 10.0}, "fast": {"p50_ms": 0.01}, "gone": {"p50_ms": 1.0}}
+        results = {"slow": {"p50_ms": 25.0}, "fast": {"p50_ms": 0.1}, "new": {"p50_ms": 5.0}}
+        assert harness.find_regressions(results, baseline) == [harness.Regression("slow", 10.0, 25.0)]
+        assert harness.find_regressions(results, baseline, tolerance=3.0) == []
+
+    def test_save_and_check_baseline(self, tmp_path):
+        """
+        Test that a saved baseline is checked, and that a change of settings fails the check.
+        """
+        parser = argparse.ArgumentParser()
+        harness.add_baseline_arguments(parser)
+        path = str(tmp_path / "baselines" / "suite.json")
+        results = {"case": harness.summarize([1.0, 2.0, 3.0])}
+
+        assert harness.finish(parser.parse_args(["--check", "--baseline", path]), "suite", {}, results) == 1
+        assert harness.finish(parser.parse_args(["--save-baseline", "--baseline", path]), "suite",
+                              {"teams": 10}, results) == 0
+        check = parser.parse_args(["--check", "--baseline", path])
+        assert harness.finish(check, "suite", {"teams": 10}, results) == 0
+        assert harness.finish(check, "suite", {"teams": 20}, results) == 1
+        slower = {"case": harness.summarize([10.0, 20.0, 30.0])}
+        assert harness.finish(check, "suite", {"teams": 10}, slower) == 1
+
+
+class TestSuites:
+    """
+    Tests that the benchmark suites cover the services and run.
+    """
+
+    def test_every_service_method_has_a_case(self):
+        """
+        Test that every public function and service method in app/services is benchmarked.
+        """
+        cases = service_cases(build_snapshot(generate_catalog(20)))
+        covered = {name.partition(":")[0] for name in cases}
+        assert _public_service_functions() <= covered
+        for func in cases.values():
+            func()
+
+    def test_load_harness(self, tmp_path):
+        """
+        Test that every load scenario gets successful responses and reports its throughput.
+        """
+        data_file = tmp_path / "wow_data.json"
+        data_file.write_text(json.dumps(generate_catalog(10)))
+        results = asyncio.run(run_load(str(data_file), requests=6, concurrency=3, warmup=1))
+        assert "GET /search/" in results
+        assert all(summary["runs"] == 6 and summary["rps"] > 0 for summary in results.values())
@@ -0,0 +1,140 @@
+import os
+import json
+import pytest
+
+from app.data.catalog import CatalogStore, CatalogWatcher
+
+
+@pytest.fixture
+def data_file(tmp_path, sample_json_data):
+    """
+    Fixture providing a data file containing the sample data.
+    """
+    path = tmp_path / "wow_data.json"
+    path.write_text(json.dumps(sample_json_data))
+    return path
+
+
+def _write(path, data, mtime_ns):
+    path.write_text(json.dumps(data))
+    # Force a distinct mtime; some filesystems have coarse timestamps
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class TestCatalogStore:
+    """
+    Tests for the CatalogStore class.
+    """
+
+    def test_current_before_load(self, data_file):
+        """
+        Test that reading the snapshot before loading fails.
+        """
+        store = CatalogStore(str(data_file))
+        assert not store.is_loaded()
+        with pytest.raises(RuntimeError):
+            store.current
+
+    def test_load(self, data_file, sample_json_data):
+        """
+        Test that loading publishes a first snapshot.
+        """
+        store = CatalogStore(str(data_file))
+        snapshot = store.load()
+
+        assert store.current is snapshot
+        assert snapshot.version == 1
+        assert snapshot.get_data() == sample_json_data
+        assert len(snapshot.content_hash) == 64
+
+    def test_reload_swaps_snapshot(self, data_file, sample_json_data):
+        """
+        Test that a reload publishes a new snapshot and leaves the old one intact.
+        """
+        store = CatalogStore(str(data_file))
+        old = store.load()
+
+        sample_json_data["teams"][0]["team_name"] = "Renamed Squad"
+        _write(data_file, sample_json_data, 2_000_000_000_000_000_000)
+
+        assert store.reload() is True
+        assert store.current.version == 2
+        assert store.current.get_data()["teams"][0]["team_name"] == "Renamed Squad"
+        assert old.get_data()["teams"][0]["team_name"] == "Alpha Squad"
+        assert store.reload_count == 1
+
+    def test_listeners_notified_on_publish(self, data_file, sample_json_data):
+        """
+        Test that subscribers receive every published snapshot.
+        """
+        store = CatalogStore(str(data_file))
+        published = []
+        store.subscribe(published.append)
+        store.load()
+
+        sample_json_data["teams"][0]["team_name"] = "Renamed Squad"
+        _write(data_file, sample_json_data, 2_000_000_000_000_000_000)
+        store.reload()
+        store.unsubscribe(published.append)
+        store.reload()
+
+        assert [snapshot.version for snapshot in published] == [1, 2]
+
+    def test_failed_reload_keeps_last_good(self, data_file):
+        """
+        Test that an invalid file does not replace the served snapshot.
+        """
+        store = CatalogStore(str(data_file))
+        old = store.load()
+
+        data_file.write_text(json.dumps({"metadata": {}}))
+
+        assert store.reload() is False
+        assert store.current is old
+        assert store.last_error is not None
+        assert store.last_error_at is not None
+
+
+class TestCatalogWatcher:
+    """
+    Tests for the CatalogWatcher class.
+    """
+
+    def test_no_change(self, data_file):
+        """
+        Test that polling an unchanged file does not reload.
+        """
+        store = CatalogStore(str(data_file))
+        store.load()
+        watcher = CatalogWatcher(store)
+
+        assert watcher.check() is False
+        assert store.current.version == 1
+
+    def test_touch_without_content_change(self, data_file, sample_json_data):
+        """
+        Test that a new mtime with identical content does not reload.
+        """
+        store = CatalogStore(str(data_file))
+        store.load()
+        watcher = CatalogWatcher(store)
+
+        _write(data_file, sample_json_data, 2_000_000_000_000_000_000)
+
+        assert watcher.check() is False
+        assert store.current.version == 1
+
+    def test_content_change_reloads(self, data_file, sample_json_data):
+        """
+        Test that changed content is picked up by the watcher.
+        """
+        store = CatalogStore(str(data_file))
+        store.load()
+        watcher = CatalogWatcher(store)
+
+        sample_json_data["teams"][0]["business_segment"] = "Payments"
+        _write(data_file, sample_json_data, 2_000_000_000_000_000_000)
+
+        assert watcher.check() is True
+        assert store.current.version == 2
+        assert watcher.check() is False
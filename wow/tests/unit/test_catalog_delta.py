@@ -0,0 +1,146 @@
+import copy
+import json
+import pytest
+
+from app.data.catalog import CatalogStore
+from app.data.catalog_delta import update_index
+from app.data.catalog_index import POSTING_MAPS, SEARCH_INDEXES, CatalogIndex
+from app.data.json_loader import JsonLoader
+
+
+def _team(template, number, services=1):
+    team = copy.deepcopy(template)
+    team["team_id"] = f"team_{number}"
+    team["team_name"] = f"Team {number}"
+    service_template = team["services_applications"][0]
+    team["services_applications"] = []
+    for s in range(services):
+        service = copy.deepcopy(service_template)
+        service["service_name"] = f"service-{number}-{s}"
+        service["runtime_components"] = [f"service-{number}-{s}-api", f"service-{number}-{s}-worker"]
+        team["services_applications"].append(service)
+    return team
+
+
+def _contents(index):
+    contents = {name: {key: list(ordinals) for key, ordinals in getattr(index, name).items()}
+                for name in POSTING_MAPS}
+    for name in SEARCH_INDEXES:
+        search = getattr(index, name)
+        contents[name] = ({key: list(ordinals) for key, ordinals in search.postings.items()}, search.documents)
+    contents["entities"] = (index.teams, index.services, index.components)
+    contents["lookups"] = (index.team_by_id, index.service_by_name, index.component_by_name)
+    contents["component_prefixes"] = sorted(index.component_prefixes.items())
+    return contents
+
+
+@pytest.fixture
+def teams(sample_json_data):
+    """
+    Fixture providing validated teams with one to three services each.
+    """
+    template = sample_json_data["teams"][0]
+    return [_team(template, number, services=1 + number % 3) for number in range(8)]
+
+
+class TestUpdateIndex:
+    """
+    Tests for deriving an index from the index of the previous version.
+    """
+
+    @pytest.mark.parametrize("change", [
+        lambda teams, new: teams.__setitem__(3, new(3, services=1 + 3 % 3)),
+        lambda teams, new: teams.__setitem__(3, new(3, services=3)),
+        lambda teams, new: teams.__delitem__(1),
+        lambda teams, new: teams.insert(2, new(20, services=2)),
+        lambda teams, new: teams.append(new(21)),
+        lambda teams, new: teams.__setitem__(slice(0, 8), teams[4:] + teams[:4]),
+        lambda teams, new: teams.clear(),
+    ], ids=["edit", "resize", "remove", "insert", "append", "reorder", "clear"])
+    def test_matches_full_build(self, teams, sample_json_data, change):
+        """
+        Test that an updated index is the index a full build gives, and the previous one is unchanged.
+        """
+        index = CatalogIndex({"teams": teams})
+        before = _contents(index)
+
+        changed = list(teams)
+        change(changed, lambda number, services=1: _team(sample_json_data["teams"][0], number, services))
+        updated, _ = update_index(index, changed)
+
+        assert _contents(updated) == _contents(CatalogIndex({"teams": changed}))
+        assert _contents(index) == before
+
+    def test_unchanged_teams_are_not_reindexed(self, teams):
+        """
+        Test that only teams that are not carried over are indexed, and unchanged structures are shared.
+        """
+        index = CatalogIndex({"teams": teams})
+        changed = list(teams)
+        changed[5] = copy.deepcopy(changed[5])
+
+        updated, reindexed = update_index(index, changed)
+
+        assert reindexed == 1
+        assert updated.services[0] is index.services[0]
+        assert updated.services_by_sla is not index.services_by_sla
+        assert updated.services_by_tech_stack["Java"] is not index.services_by_tech_stack["Java"]
+        assert updated.teams_by_id["team_0"] is index.teams_by_id["team_0"]
+        assert updated.component_prefixes.longest_prefix("service-0-0-api-1")[1] is index.components[0]
+
+
+class TestDeltaReload:
+    """
+    Tests for reloading only the teams that changed in the data file.
+    """
+
+    @pytest.fixture
+    def data(self, sample_json_data, teams):
+        """
+        Fixture providing catalog data with the teams.
+        """
+        data = copy.deepcopy(sample_json_data)
+        data["teams"] = copy.deepcopy(teams)
+        return data
+
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test_reload_reuses_unchanged_teams(self, tmp_path, data, streaming):
+        """
+        Test that a reload validates only changed teams and records the delta.
+        """
+        data_file = tmp_path / "wow_data.json"
+        data_file.write_text(json.dumps(data))
+        store = CatalogStore(str(data_file), loader_factory=lambda path: JsonLoader(path, streaming=streaming))
+        previous = store.load()
+        assert previous.delta is None
+
+        data["teams"][2]["team_name"] = "Renamed"
+        del data["teams"][4]
+        data["teams"].append(copy.deepcopy(data["teams"][0]))
+        data["teams"][-1]["team_id"] = "team_new"
+        data_file.write_text(json.dumps(data))
+        assert store.reload() is True
+
+        snapshot = store.current
+        assert snapshot.delta._asdict() == {
+            "added": ["team_new"], "removed": ["team_4"], "changed": ["team_2"], "reused": 6, "reindexed": 2,
+        }
+        assert snapshot.get_data()["teams"][0] is previous.get_data()["teams"][0]
+        assert snapshot.get_data() == JsonLoader(str(data_file)).load()
+        assert _contents(snapshot.get_index()) == _contents(CatalogIndex(snapshot.get_data()))
+
+    def test_invalid_changed_team_keeps_snapshot(self, tmp_path, data):
+        """
+        Test that a changed team failing validation fails the reload.
+        """
+        data_file = tmp_path / "wow_data.json"
+        data_file.write_text(json.dumps(data))
+        store = CatalogStore(str(data_file))
+        store.load()
+
+        del data["teams"][3]["team_api"]
+        data_file.write_text(json.dumps(data))
+
+        assert store.reload() is False
+        assert "team_3" in store.last_error
+        assert store.current.version == 1
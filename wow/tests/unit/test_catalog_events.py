@@ -0,0 +1,197 @@
+import asyncio
+import copy
+import json
+import pytest
+
+from app.api.catalog_events import HEARTBEAT, CatalogEvents
+from app.data.catalog import CatalogStore
+from app.data.change_log import ChangeLog
+from app.main import app
+
+
+def _events(body):
+    # Field name -> value for each event in a chunk of the stream
+    return [dict(line.split(": ", 1) for line in block.split("\n"))
+            for block in body.decode().split("\n\n") if block]
+
+
+@pytest.fixture
+def data_file(tmp_path, sample_json_data):
+    """
+    Fixture providing the path to a data file holding the sample data.
+    """
+    data_file = tmp_path / "wow_data.json"
+    data_file.write_text(json.dumps(sample_json_data))
+    return data_file
+
+
+@pytest.fixture
+def store(data_file):
+    """
+    Fixture providing a store with the data file loaded.
+    """
+    store = CatalogStore(str(data_file))
+    store.load()
+    return store
+
+
+def _watch(store, max_versions=100, heartbeat_interval=15.0):
+    # Must be called on the event loop
+    change_log = ChangeLog(max_versions=max_versions)
+    change_log.record(store.current)
+    store.subscribe(change_log.record)
+    events = CatalogEvents(change_log, max_events=max_versions, heartbeat_interval=heartbeat_interval)
+    store.subscribe(events.publish)
+    return events
+
+
+async def _reload(store, data_file, data, team_name):
+    data = copy.deepcopy(data)
+    data["teams"][0]["team_name"] = team_name
+    data_file.write_text(json.dumps(data))
+    assert await asyncio.to_thread(store.reload) is True
+
+
+class TestCatalogEvents:
+    """
+    Tests for broadcasting catalog versions to watch streams.
+    """
+
+    def test_streams_receive_each_version(self, store, data_file, sample_json_data):
+        """
+        Test that every open stream gets a ready event, then one event per new version.
+        """
+        async def scenario():
+            events = _watch(store)
+            streams = [events.stream() for _ in range(200)]
+            ready = {"id": f"{store.epoch}:1", "event": "ready", "data": f'{{"version":1,"epoch":"{store.epoch}"}}'}
+            for stream in streams:
+                assert _events(await anext(stream)) == [ready]
+            assert events.connections == 200
+
+            pending = [asyncio.ensure_future(anext(stream)) for stream in streams]
+            await _reload(store, data_file, sample_json_data, "Renamed")
+            bodies = await asyncio.gather(*pending)
+
+            assert len(set(bodies)) == 1
+            event, = _events(bodies[0])
+            assert (event["id"], event["event"]) == (f"{store.epoch}:2", "catalog")
+            assert json.loads(event["data"]) == {
+                "version": 2,
+                "epoch": store.epoch,
+                "previous_version": 1,
+                "teams": {"added": 0, "removed": 0, "modified": 1},
+                "services": {"added": 0, "removed": 0, "modified": 0},
+                "runtime_components": {"added": 0, "removed": 0, "modified": 0},
+            }
+            for stream in streams:
+                await stream.aclose()
+            assert events.connections == 0
+
+        asyncio.run(scenario())
+
+    def test_idle_stream_gets_heartbeats_until_closed(self, store):
+        """
+        Test that an idle stream gets heartbeat comments and ends when the events are closed.
+        """
+        async def scenario():
+            events = _watch(store, heartbeat_interval=0.01)
+            stream = events.stream()
+            await anext(stream)
+            assert await anext(stream) == HEARTBEAT
+
+            events.close()
+            with pytest.raises(StopAsyncIteration):
+                while True:
+                    await anext(stream)
+
+        asyncio.run(scenario())
+
+    def test_resume_from_last_event_id(self, store, data_file, sample_json_data):
+        """
+        Test that a resumed stream first gets the events it missed, or a resync when they are not kept.
+        """
+        async def scenario():
+            events = _watch(store, max_versions=2)
+            for number in range(3):
+                await _reload(store, data_file, sample_json_data, f"Alpha {number}")
+            await asyncio.sleep(0)
+
+            epoch = store.epoch
+            missed = _events(await anext(events.stream(f"{epoch}:2")))
+            assert [(event["id"], json.loads(event["data"])["previous_version"]) for event in missed] == \
+                [(f"{epoch}:3", 2), (f"{epoch}:4", 3)]
+
+            # Evicted and unknown versions, and versions of another worker process or from before a restart
+            for last_event_id in (f"{epoch}:1", f"{epoch}:7", "unknown", "4", "other:4", f"{epoch}x:2"):
+                resync, = _events(await anext(events.stream(last_event_id)))
+                assert (resync["id"], resync["event"]) == (f"{epoch}:4", "resync")
+                assert json.loads(resync["data"]) == {"version": 4, "epoch": epoch, "oldest_version": 2}
+
+            stream = events.stream(f"{epoch}:4")
+            pending = asyncio.ensure_future(anext(stream))
+            await _reload(store, data_file, sample_json_data, "Alpha")
+            assert _events(await pending)[0]["id"] == f"{epoch}:5"
+
+        asyncio.run(scenario())
+
+    def test_open_stream_follows_a_new_epoch(self, store, data_file):
+        """
+        Test that an open stream is told to resync when a store of another history is published, then waits.
+        """
+        async def scenario():
+            events = _watch(store)
+            stream = events.stream()
+            await anext(stream)
+            pending = asyncio.ensure_future(anext(stream))
+
+            restarted = CatalogStore(str(data_file))
+            restarted.subscribe(events.change_log.record)
+            restarted.subscribe(events.publish)
+            await asyncio.to_thread(restarted.load)
+            event, = _events(await pending)
+            assert (event["id"], event["event"]) == (f"{restarted.epoch}:1", "resync")
+
+            pending = asyncio.ensure_future(anext(stream))
+            await asyncio.sleep(0.05)
+            assert not pending.done()
+            pending.cancel()
+
+        asyncio.run(scenario())
+
+    def test_watch_endpoint(self, store):
+        """
+        Test that the endpoint streams events from the Last-Event-ID until the client disconnects.
+        """
+        async def scenario():
+            app.state.catalog_events = _watch(store)
+            disconnected = asyncio.Event()
+            messages = []
+
+            async def receive():
+                await disconnected.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                messages.append(message)
+                if message.get("body"):
+                    disconnected.set()
+
+            scope = {
+                "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+                "scheme": "http", "path": "/watch/", "raw_path": b"/watch/", "root_path": "",
+                "query_string": b"", "headers": [(b"host", b"testserver"), (b"last-event-id", b"0")],
+                "client": ("testclient", 50000), "server": ("testserver", 80), "app": app,
+            }
+            try:
+                await asyncio.wait_for(app(scope, receive, send), timeout=5)
+            finally:
+                del app.state.catalog_events
+
+            start = messages[0]
+            assert start["status"] == 200
+            assert (b"content-type", b"text/event-stream; charset=utf-8") in start["headers"]
+            resync, = _events(messages[1]["body"])
+            assert (resync["id"], resync["event"]) == (f"{store.epoch}:1", "resync")
+
+        asyncio.run(scenario())
@@ -0,0 +1,125 @@
+import copy
+import pytest
+
+from app.data.catalog_index import CatalogIndex
+from app.data.postings import intersect_postings
+
+
+@pytest.fixture
+def catalog_data(sample_json_data):
+    """
+    Fixture providing sample data with a second team sharing some attributes.
+    """
+    data = copy.deepcopy(sample_json_data)
+    beta = copy.deepcopy(data["teams"][0])
+    beta["team_id"] = "team_beta"
+    beta["team_name"] = "Beta Builders"
+    beta["value_streams"].append({
+        "value_stream_name": "Customer Account Opening",
+        "value_stream_description": "Enables new customers to create and manage accounts."
+    })
+    beta["services_applications"] = [
+        {
+            "service_name": "account-portal-ui",
+            "value_stream_segments": ["Customer Account Opening"],
+            "tech_stack": "Angular",
+            "business_criticality": {"sla": "99.8%", "slo": "99.9%"},
+            "runtime_components": ["account-portal-web"],
+            "repository_url": "https://github.com/YourOrg/account-portal-ui"
+        },
+        {
+            "service_name": "mortgage-reporting",
+            "value_stream_segments": ["Mortgage Application", "Mortgage Application"],
+            "tech_stack": "Java",
+            "business_criticality": {"sla": "99.9%", "slo": "99.95%"},
+            "runtime_components": ["mortgage-processing-backend", "reporting-worker"],
+            "repository_url": "https://github.com/YourOrg/mortgage-reporting"
+        }
+    ]
+    data["teams"].append(beta)
+    return data
+
+
+def test_intersect_postings():
+    """
+    Test that intersection keeps ascending order.
+    """
+    assert intersect_postings([[1, 3, 5, 7], [0, 3, 7], [3, 4, 7, 9]]) == [3, 7]
+    assert intersect_postings([[2, 4], []]) == []
+    assert intersect_postings([[2, 4]]) == [2, 4]
+
+
+class TestCatalogIndex:
+    """
+    Tests for the CatalogIndex class.
+    """
+
+    def test_point_lookups(self, catalog_data):
+        """
+        Test the hash map lookups by key.
+        """
+        index = CatalogIndex(catalog_data)
+
+        assert index.team_by_id["team_beta"]["team_name"] == "Beta Builders"
+        assert index.service_by_name["account-portal-ui"].team["team_id"] == "team_beta"
+        assert "missing" not in index.service_by_name
+
+    def test_duplicate_component_returns_first(self, catalog_data):
+        """
+        Test that a component name used twice resolves to its first occurrence.
+        """
+        index = CatalogIndex(catalog_data)
+
+        ref = index.component_by_name["mortgage-processing-backend"]
+        assert ref.service["service_name"] == "mortgage-processing"
+        assert ref.team["team_id"] == "team_alpha"
+
+    def test_find_teams(self, catalog_data):
+        """
+        Test team filtering by inverted index.
+        """
+        index = CatalogIndex(catalog_data)
+
+        assert index.find_teams() == [0, 1]
+        assert index.find_teams(value_stream_name="Customer Account Opening") == [1]
+        assert index.find_teams(business_segment="Internet Banking Division",
+                                value_stream_name="Mortgage Application") == [0, 1]
+        assert index.find_teams(business_segment="Unknown") == []
+
+    @pytest.mark.parametrize("filters", [
+        {},
+        {"team_id": "team_beta"},
+        {"team_name": "Alpha Squad"},
+        {"business_segment": "Internet Banking Division"},
+        {"value_stream_name": "Mortgage Application"},
+        {"value_stream_name": "Customer Account Opening", "sla": "99.8%"},
+        {"sla": "99.9%", "team_id": "team_alpha"},
+        {"sla": "100%"},
+    ])
+    def test_find_services_matches_scan(self, catalog_data, filters):
+        """
+        Test that indexed service filtering returns what a full scan would.
+        """
+        index = CatalogIndex(catalog_data)
+
+        expected = []
+        for team in catalog_data["teams"]:
+            if filters.get("team_id") and team["team_id"] != filters["team_id"]:
+                continue
+            if filters.get("team_name") and team["team_name"] != filters["team_name"]:
+                continue
+            if filters.get("business_segment") and team["business_segment"] != filters["business_segment"]:
+                continue
+            value_stream_name = filters.get("value_stream_name")
+            if value_stream_name and not any(vs["value_stream_name"] == value_stream_name
+                                             for vs in team["value_streams"]):
+                continue
+            for service in team["services_applications"]:
+                if value_stream_name and value_stream_name not in service["value_stream_segments"]:
+                    continue
+                if filters.get("sla") and service["business_criticality"]["sla"] != filters["sla"]:
+                    continue
+                expected.append(service["service_name"])
+
+        found = [index.services[ordinal].service["service_name"] for ordinal in index.find_services(**filters)]
+        assert found == expected
@@ -0,0 +1,165 @@
+import copy
+import json
+import pytest
+from fastapi.testclient import TestClient
+
+from app.data.catalog import CatalogStore
+from app.data.change_log import ChangeLog
+from app.main import app
+
+
+@pytest.fixture
+def data(sample_json_data):
+    """
+    Fixture providing catalog data with two teams.
+    """
+    data = copy.deepcopy(sample_json_data)
+    beta = copy.deepcopy(data["teams"][0])
+    beta["team_id"] = "team_beta"
+    beta["team_name"] = "Beta Squad"
+    beta["services_applications"][0]["service_name"] = "billing"
+    beta["services_applications"][0]["runtime_components"] = ["billing-api"]
+    data["teams"].append(beta)
+    return data
+
+
+@pytest.fixture
+def data_file(tmp_path, data):
+    """
+    Fixture providing the path to a data file holding the data.
+    """
+    data_file = tmp_path / "wow_data.json"
+    data_file.write_text(json.dumps(data))
+    return data_file
+
+
+def _publish(store, data_file, data):
+    data_file.write_text(json.dumps(data))
+    assert store.reload() is True
+
+
+def _changes(added=(), removed=(), modified=()):
+    return {"added": list(added), "removed": list(removed), "modified": list(modified)}
+
+
+class TestChangeLog:
+    """
+    Tests for the diffs kept between catalog versions.
+    """
+
+    @pytest.fixture
+    def store(self, data_file):
+        """
+        Fixture providing a store with the data file loaded.
+        """
+        store = CatalogStore(str(data_file))
+        store.load()
+        return store
+
+    @pytest.fixture
+    def change_log(self, store):
+        """
+        Fixture providing a change log keeping three diffs, subscribed to the store.
+        """
+        change_log = ChangeLog(max_versions=3)
+        change_log.record(store.current)
+        store.subscribe(change_log.record)
+        return change_log
+
+    def test_changes_of_one_version(self, store, change_log, data_file, data):
+        """
+        Test that teams, services and components are reported by key, including moves between owners.
+        """
+        data["teams"][0]["team_name"] = "Renamed"
+        moved = data["teams"][0]["services_applications"].pop()
+        data["teams"][1]["services_applications"].append(moved)
+        moved["runtime_components"].append("mortgage-processing-batch")
+        data["teams"][1]["services_applications"][0]["runtime_components"] = []
+        _publish(store, data_file, data)
+
+        result = change_log.changes_since(1, change_log.epoch).as_dict()
+
+        assert (result["since"], result["version"], result["resync_required"]) == (1, 2, False)
+        assert result["teams"] == _changes(modified=["team_alpha", "team_beta"])
+        assert result["services"] == _changes(modified=["billing", "mortgage-processing"])
+        assert result["runtime_components"] == _changes(
+            added=["mortgage-processing-batch"],
+            removed=["billing-api"],
+            modified=["mortgage-processing-backend", "mortgage-processing-reporting"],
+        )
+
+    def test_changes_combine_across_versions(self, store, change_log, data_file, data):
+        """
+        Test that successive changes to a key are reported as their net effect.
+
+        A key removed and added back is reported as modified, without comparing the records.
+        """
+        gamma = copy.deepcopy(data["teams"][1])
+        gamma["team_id"] = "team_gamma"
+        data["teams"].append(gamma)
+        _publish(store, data_file, data)
+        gamma["team_name"] = "Gamma Squad"
+        removed = data["teams"].pop(0)
+        _publish(store, data_file, data)
+        data["teams"].insert(0, removed)
+        _publish(store, data_file, data)
+
+        assert change_log.changes_since(1, change_log.epoch).as_dict()["teams"] == _changes(added=["team_gamma"],
+                                                                          modified=["team_alpha"])
+        assert change_log.changes_since(2, change_log.epoch).as_dict()["teams"] == _changes(modified=["team_alpha", "team_gamma"])
+        assert change_log.changes_since(4, change_log.epoch).as_dict()["teams"] == _changes()
+
+    def test_evicted_version_requires_resync(self, store, change_log, data_file, data):
+        """
+        Test that versions whose diffs were evicted, and unknown versions, are reported as incomplete.
+        """
+        for number in range(4):
+            data["teams"][0]["team_name"] = f"Alpha {number}"
+            _publish(store, data_file, data)
+
+        assert len(change_log) == 3
+        evicted = change_log.changes_since(1, change_log.epoch).as_dict()
+        assert (evicted["resync_required"], evicted["oldest_version"], evicted["version"]) == (True, 2, 5)
+        assert evicted["teams"] == _changes()
+        assert change_log.changes_since(2, change_log.epoch).as_dict()["resync_required"] is False
+        assert change_log.changes_since(6, change_log.epoch).as_dict()["resync_required"] is True
+
+    def test_other_epoch_requires_resync(self, store, change_log, data_file, data):
+        """
+        Test that a version of another history, such as another worker process, is reported as incomplete.
+        """
+        _publish(store, data_file, data)
+        assert change_log.changes_since(1, "other").as_dict()["resync_required"] is True
+        assert change_log.changes_since(1, None).as_dict()["resync_required"] is True
+
+        restarted = CatalogStore(str(data_file))
+        restarted.load()
+        assert restarted.epoch != store.epoch
+        change_log.record(restarted.current)
+        result = change_log.changes_since(1, restarted.epoch).as_dict()
+        assert (result["version"], result["epoch"], result["resync_required"]) == (1, restarted.epoch, False)
+        assert len(change_log) == 0
+        assert change_log.changes_since(1, store.epoch).as_dict()["resync_required"] is True
+
+    def test_changes_endpoint(self, data_file, data):
+        """
+        Test that the endpoint reports the changes since a version, and validates it.
+        """
+        store = CatalogStore(str(data_file))
+        store.load()
+        app.state.catalog_store = store
+        try:
+            with TestClient(app) as client:
+                data["teams"].pop()
+                _publish(store, data_file, data)
+
+                response = client.get("/changes", params={"since": 1, "epoch": store.epoch})
+                assert response.status_code == 200
+                assert (response.json()["version"], response.json()["epoch"]) == (2, store.epoch)
+                assert response.json()["services"] == _changes(removed=["billing"])
+
+                assert client.get("/changes", params={"since": 2, "epoch": store.epoch}).json()["teams"] == _changes()
+                assert client.get("/changes", params={"since": 1}).json()["resync_required"] is True
+                assert client.get("/changes").status_code == 422
+        finally:
+            del app.state.catalog_store
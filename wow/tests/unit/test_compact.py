@@ -0,0 +1,77 @@
+import copy
+import json
+
+from app.data.compact import CatalogCompactor, compact_catalog
+from app.data.json_loader import JsonLoader
+from benchmarks.synthetic import generate_catalog
+
+
+def _write_catalog(tmp_path, data):
+    data_file = tmp_path / "wow_data.json"
+    data_file.write_text(json.dumps(data))
+    return data_file
+
+
+class TestCatalogCompactor:
+    """
+    Tests for the CatalogCompactor class.
+    """
+
+    def test_shares_equal_values(self):
+        """
+        Test that compacted data is equal to the original, with equal strings and string-only values held once.
+        """
+        data = generate_catalog(20, services_per_team=3)
+        compacted = compact_catalog(copy.deepcopy(data))
+        assert compacted == data
+        assert json.dumps(compacted) == json.dumps(data)
+
+        services = [service for team in compacted["teams"] for service in team["services_applications"]]
+        by_sla = {}
+        for service in services:
+            criticality = service["business_criticality"]
+            assert by_sla.setdefault(criticality["sla"], criticality) is criticality
+        tech_stacks = {}
+        for service in services:
+            assert tech_stacks.setdefault(service["tech_stack"], service["tech_stack"]) is service["tech_stack"]
+        assert len({id(team["team_api"]["team_type"]) for team in compacted["teams"]}) == \
+            len({team["team_api"]["team_type"] for team in compacted["teams"]})
+
+    def test_records_keep_their_identity(self):
+        """
+        Test that equal teams and services stay separate objects, while their values are shared.
+        """
+        team = generate_catalog(1)["teams"][0]
+        team["services_applications"].append(copy.deepcopy(team["services_applications"][0]))
+        compactor = CatalogCompactor()
+        first, second = compactor.team(copy.deepcopy(team)), compactor.team(copy.deepcopy(team))
+        assert first == second == team
+        assert first is not second
+        assert first["services_applications"] is not second["services_applications"]
+        services = first["services_applications"]
+        assert services[0] is not services[-1]
+        assert services[0]["runtime_components"] is services[-1]["runtime_components"]
+        assert first["value_streams"] is second["value_streams"]
+
+    def test_loader_modes(self, tmp_path):
+        """
+        Test that full, streaming and delta loads all serve compacted records equal to the validated ones.
+        """
+        data = generate_catalog(10, services_per_team=2)
+        data_file = _write_catalog(tmp_path, data)
+        full = JsonLoader(str(data_file)).load()
+        streamed = JsonLoader(str(data_file), streaming=True).load()
+        assert full == streamed
+
+        previous = JsonLoader(str(data_file))
+        previous.load()
+        data["teams"][3]["business_segment"] = data["teams"][0]["business_segment"]
+        data_file.write_text(json.dumps(data))
+        delta = JsonLoader(str(data_file)).load_delta(previous.get_data()["teams"], previous.team_fingerprints,
+                                                     previous.get_index())
+        assert delta == JsonLoader(str(data_file)).load()
+        for loaded in (full, streamed, delta):
+            first_service = loaded["teams"][0]["services_applications"][0]
+            same_stack = [service for team in loaded["teams"] for service in team["services_applications"]
+                          if service["tech_stack"] == first_service["tech_stack"]]
+            assert all(service["tech_stack"] is first_service["tech_stack"] for service in same_stack)
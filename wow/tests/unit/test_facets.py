@@ -0,0 +1,156 @@
+import copy
+import json
+from collections import Counter
+import pytest
+from fastapi.testclient import TestClient
+
+from app.data.catalog import CatalogSnapshot, CatalogStore, SourceFingerprint
+from app.main import app
+from app.services.facet_service import FacetService
+from benchmarks.synthetic import generate_catalog
+
+# Dimension -> values of a team or service, as counted by the facets
+TEAM_VALUES = {
+    "business_segment": lambda team: [team["business_segment"]],
+    "team_type": lambda team: [team["team_api"]["team_type"]],
+    "value_stream": lambda team: [vs["value_stream_name"] for vs in team["value_streams"]],
+}
+SERVICE_VALUES = {
+    "tech_stack": lambda team, service: [service["tech_stack"]],
+    "sla": lambda team, service: [service["business_criticality"]["sla"]],
+    "business_segment": lambda team, service: [team["business_segment"]],
+    "team_id": lambda team, service: [team["team_id"]],
+    "value_stream": lambda team, service: [vs["value_stream_name"] for vs in team["value_streams"]
+                                           if vs["value_stream_name"] in service["value_stream_segments"]],
+}
+
+
+def _count(items, values):
+    counts = Counter(value for item in items for value in dict.fromkeys(values(*item)))
+    return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+
+@pytest.fixture
+def data():
+    """
+    Fixture providing a synthetic catalog of 40 teams.
+    """
+    return generate_catalog(40, services_per_team=4, seed=7)
+
+
+@pytest.fixture
+def facet_service(data):
+    """
+    Fixture providing a FacetService over a snapshot of the synthetic catalog.
+    """
+    return FacetService(CatalogSnapshot(data, 1, SourceFingerprint(0, 0, "hash")))
+
+
+class TestFacetService:
+    """
+    Tests for counting teams and services per value.
+    """
+
+    def test_unfiltered_counts_match_a_scan(self, facet_service, data):
+        """
+        Test that counts from the facet tables are the counts of a full scan, largest first.
+        """
+        services = [(team, service) for team in data["teams"] for service in team["services_applications"]]
+
+        teams = facet_service.get_facets("teams", list(TEAM_VALUES))
+        services_result = facet_service.get_facets("services", list(SERVICE_VALUES))
+
+        assert teams["total"] == 40
+        assert teams["facets"] == {dimension: _count([(team,) for team in data["teams"]], values)
+                                   for dimension, values in TEAM_VALUES.items()}
+        assert services_result["total"] == len(services)
+        for dimension, values in SERVICE_VALUES.items():
+            assert list(services_result["facets"][dimension].items()) == \
+                list(_count(services, values).items())
+
+    def test_filtered_counts_match_a_scan(self, facet_service, data):
+        """
+        Test that filtered counts are the counts of the entities the list endpoints would return.
+        """
+        team = data["teams"][3]
+        segment = team["business_segment"]
+        tech_stack = team["services_applications"][0]["tech_stack"]
+        matching = [(t, s) for t in data["teams"] for s in t["services_applications"]
+                    if t["business_segment"] == segment and s["tech_stack"] == tech_stack]
+
+        result = facet_service.get_facets("services", ["sla", "value_stream"],
+                                          {"business_segment": segment, "tech_stack": tech_stack, "sla": None})
+
+        assert result["total"] == len(matching)
+        assert result["facets"] == {dimension: _count(matching, SERVICE_VALUES[dimension])
+                                    for dimension in ("sla", "value_stream")}
+
+        team_type = team["team_api"]["team_type"]
+        typed = [(t,) for t in data["teams"] if t["team_api"]["team_type"] == team_type]
+        result = facet_service.get_facets("teams", ["business_segment"], {"team_type": team_type})
+        assert result["facets"]["business_segment"] == _count(typed, TEAM_VALUES["business_segment"])
+
+    @pytest.mark.parametrize("entity, dimensions, filters", [
+        ("components", ["tech_stack"], None),
+        ("teams", ["tech_stack"], None),
+        ("teams", ["team_type"], {"sla": "99.9%"}),
+    ])
+    def test_unknown_arguments_are_rejected(self, facet_service, entity, dimensions, filters):
+        """
+        Test that an unknown entity, dimension or filter raises ValueError.
+        """
+        with pytest.raises(ValueError):
+            facet_service.get_facets(entity, dimensions, filters)
+
+    def test_reload_reuses_unchanged_values(self, tmp_path, data):
+        """
+        Test that a delta reload rebuilds only the facet entries of values whose postings changed.
+        """
+        data_file = tmp_path / "wow_data.json"
+        data_file.write_text(json.dumps(data))
+        store = CatalogStore(str(data_file))
+        previous = store.load().get_facets().table("services", "tech_stack")
+
+        changed = copy.deepcopy(data)
+        service = changed["teams"][-1]["services_applications"][0]
+        old_stack, service["tech_stack"] = service["tech_stack"], "Cobol"
+        data_file.write_text(json.dumps(changed))
+        assert store.reload() is True
+
+        table = store.current.get_facets().table("services", "tech_stack")
+        assert table.counts["Cobol"] == 1
+        assert table.counts[old_stack] == previous.counts[old_stack] - 1
+        # Every posting list of a value carried by the changed team is rebuilt
+        touched = {s["tech_stack"] for s in data["teams"][-1]["services_applications"]} | {"Cobol"}
+        reused = [value for value in table.postings if value not in touched]
+        assert reused and all(table.postings[value] is previous.postings[value] for value in reused)
+        assert FacetService(store.current).get_facets("services", ["tech_stack"]) == \
+            FacetService(CatalogSnapshot(changed, 1, SourceFingerprint(0, 0, "hash"))).get_facets(
+                "services", ["tech_stack"])
+
+
+def test_facets_endpoint(tmp_path, sample_json_data):
+    """
+    Test the facets endpoint, including its validation.
+    """
+    data_file = tmp_path / "wow_data.json"
+    data_file.write_text(json.dumps(sample_json_data))
+    store = CatalogStore(str(data_file))
+    store.load()
+    app.state.catalog_store = store
+    try:
+        with TestClient(app) as client:
+            response = client.get("/facets", params={"dims": "tech_stack, sla", "team_id": "team_alpha"})
+            assert response.status_code == 200
+            assert response.json() == {"entity": "services", "total": 1,
+                                       "facets": {"tech_stack": {"Java": 1}, "sla": {"99.9%": 1}}}
+            assert "etag" in response.headers
+
+            teams = client.get("/facets", params={"dims": "team_type", "entity": "teams"}).json()
+            assert teams["facets"] == {"team_type": {"stream-aligned": 1}}
+
+            assert client.get("/facets", params={"dims": "team_type"}).status_code == 400
+            assert client.get("/facets", params={"dims": "sla", "entity": "teams"}).status_code == 400
+            assert client.get("/facets", params={"dims": "sla", "entity": "components"}).status_code == 422
+    finally:
+        del app.state.catalog_store
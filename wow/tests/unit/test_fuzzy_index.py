@@ -0,0 +1,120 @@
+import json
+import random
+import pytest
+from fastapi.testclient import TestClient
+
+from app.data.catalog import CatalogSnapshot, CatalogStore, SourceFingerprint
+from app.data.fuzzy_index import FuzzyIndex, FuzzyNames
+from app.main import app
+from app.services.search_service import SearchService
+from benchmarks.synthetic import generate_catalog
+
+
+def _distance(a, b):
+    row = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        previous, row[0] = row[0], i
+        for j in range(1, len(b) + 1):
+            previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (char != b[j - 1]))
+    return row[-1]
+
+
+def _typo(rng, text, edits):
+    chars = list(text)
+    for _ in range(edits):
+        position = rng.randrange(len(chars) + 1)
+        operation = rng.randrange(3) if position < len(chars) else 2
+        if operation == 0:
+            del chars[position]
+        elif operation == 1:
+            chars[position] = rng.choice("abcdefg-1")
+        else:
+            chars.insert(position, rng.choice("abcdefg-1"))
+    return "".join(chars)
+
+
+class TestFuzzyIndex:
+    """
+    Tests for finding names within an edit distance.
+    """
+
+    @pytest.mark.parametrize("max_distance", [0, 1, 2, 3])
+    def test_matches_pairwise_distances(self, max_distance):
+        """
+        Test that the matches are exactly the names within the distance, closest first, then by ordinal.
+        """
+        rng = random.Random(max_distance)
+        words = ["pay", "payment", "payments", "ledger", "ledgers", "led", "card", "cards-api", "", "a"]
+        names = [(rng.choice(words) + rng.choice(["", "-api", "-1", "-worker"]), ordinal) for ordinal in range(200)]
+        index = FuzzyIndex(names)
+
+        for _ in range(40):
+            query = _typo(rng, rng.choice(names)[0], rng.randint(0, 3))
+            expected = sorted((_distance(query, name), ordinal) for name, ordinal in names
+                              if _distance(query, name) <= max_distance)
+            assert index.search(query, max_distance) == expected, query
+
+    def test_case_insensitive(self):
+        """
+        Test that names and queries are compared lowercased.
+        """
+        index = FuzzyIndex([("Mortgage-Processing", 0), ("mortgage-processing", 1)])
+        assert index.search("MORTAGE-procesing", 2) == [(2, 0), (2, 1)]
+        assert FuzzyIndex([]).search("anything", 2) == []
+
+
+class TestFuzzyNames:
+    """
+    Tests for the fuzzy indexes of a catalog version.
+    """
+
+    def test_entities_are_matched_once_at_their_closest(self, sample_json_data):
+        """
+        Test that a team matched by both ID and name is returned once, at the smaller distance.
+        """
+        fuzzy_names = FuzzyNames(CatalogSnapshot(sample_json_data, 1, SourceFingerprint(0, 0, "hash")).get_index())
+        assert fuzzy_names.search("teams", "team alpha", 4) == [(1, 0)]
+        assert fuzzy_names.search("services", "mortage-procesing") == [(2, 0)]
+        assert fuzzy_names.search("services", "mortage-procesing", 1) == []
+
+    def test_search_service_ranks_by_distance(self):
+        """
+        Test that fuzzy search results are ordered by distance and shaped like substring results.
+        """
+        data = generate_catalog(20, seed=4)
+        service = data["teams"][7]["services_applications"][2]
+        search_service = SearchService(CatalogSnapshot(data, 1, SourceFingerprint(0, 0, "hash")))
+        query = _typo(random.Random(1), service["service_name"], 1)
+
+        results = search_service.search(query, fuzzy=True)
+        names = [result["service_name"] for result in results["services"]]
+        assert names[0] == service["service_name"]
+        distances = [_distance(query, name) for name in names]
+        assert distances == sorted(distances) and distances[-1] <= 2
+        exact = search_service.search(service["service_name"])
+        assert results["services"][0] == exact["services"][0]
+        assert [c["component_name"] for c in search_service.search(query, fuzzy=True, max_distance=0)[
+            "runtime_components"]] == []
+
+
+def test_fuzzy_search_endpoint(tmp_path, sample_json_data):
+    """
+    Test fuzzy search through the search endpoint, including its validation.
+    """
+    data_file = tmp_path / "wow_data.json"
+    data_file.write_text(json.dumps(sample_json_data))
+    store = CatalogStore(str(data_file))
+    store.load()
+    app.state.catalog_store = store
+    try:
+        with TestClient(app) as client:
+            assert client.get("/search", params={"query": "mortage-procesing"}).json()["services"] == []
+            response = client.get("/search", params={"query": "mortage-procesing", "fuzzy": "true"})
+            assert response.status_code == 200
+            assert [s["service_name"] for s in response.json()["services"]] == ["mortgage-processing"]
+            components = client.get("/search", params={"query": "mortgage-procesing-backend", "fuzzy": "true",
+                                                        "max_distance": 1}).json()["runtime_components"]
+            assert [c["component_name"] for c in components] == ["mortgage-processing-backend"]
+            assert client.get("/search", params={"query": "x", "fuzzy": "true", "max_distance": 9}).status_code == 422
+    finally:
+        del app.state.catalog_store
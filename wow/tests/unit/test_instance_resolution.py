@@ -0,0 +1,129 @@
+import copy
+import json
+import pytest
+from fastapi.testclient import TestClient
+
+from app.data.catalog import CatalogSnapshot, CatalogStore, SourceFingerprint
+from app.data.json_loader import JsonLoader
+from app.data.mapped_catalog import open_mapped_catalog
+from app.data.prefix_trie import PrefixTrie
+from app.data.snapshot_file import write_compiled_snapshot
+from app.main import app
+from app.services.runtime_component_service import RuntimeComponentService
+
+INSTANCES = [
+    "mortgage-processing-backend-7f9c4-x2k",
+    "mortgage-processing-backend",
+    "mortgage-processing-7d4f",
+    "mortgage-processing-reporting-0",
+    "mortgage-process",
+    "billing-api-1",
+    "",
+]
+
+
+@pytest.fixture
+def data_file(tmp_path, sample_json_data):
+    """
+    Fixture providing a data file whose component names are prefixes of each other.
+    """
+    data = copy.deepcopy(sample_json_data)
+    data["teams"][0]["services_applications"][0]["runtime_components"] = [
+        "mortgage-processing",
+        "mortgage-processing-backend",
+        "mortgage-processing-reporting",
+    ]
+    path = tmp_path / "wow_data.json"
+    path.write_text(json.dumps(data))
+    return path
+
+
+@pytest.fixture
+def catalogs(data_file, tmp_path):
+    """
+    Fixture providing an in-memory snapshot and a mapped snapshot of the data file.
+    """
+    loader = JsonLoader(str(data_file))
+    data = loader.load()
+    fingerprint = SourceFingerprint.from_path(str(data_file))
+    snapshot_file = tmp_path / "wow_data.snapshot"
+    write_compiled_snapshot(str(snapshot_file), data, loader.get_index(), fingerprint.content_hash)
+
+    mapped = open_mapped_catalog(str(snapshot_file), fingerprint.content_hash)
+    return (CatalogSnapshot(data, 1, fingerprint, index=loader.get_index()),
+            CatalogSnapshot(mapped.data, 1, fingerprint, index=mapped.catalog_index))
+
+
+def test_prefix_trie_longest_prefix():
+    """
+    Test that the trie finds the longest key that is a prefix of the text.
+    """
+    trie = PrefixTrie()
+    for value, key in enumerate(["api", "api-gateway", "apis", "web", "api"]):
+        trie.insert(key, value)
+
+    assert len(trie) == 4
+    assert trie.longest_prefix("api-gateway-5d8f") == ("api-gateway", 1)
+    assert trie.longest_prefix("api-gate") == ("api", 0)
+    assert trie.longest_prefix("apis") == ("apis", 2)
+    assert trie.longest_prefix("ap") is None
+    assert trie.longest_prefix("") is None
+    assert sorted(trie.items()) == [("api", 0), ("api-gateway", 1), ("apis", 2), ("web", 3)]
+
+
+class TestInstanceResolution:
+    """
+    Tests for resolving live instance names to runtime components.
+    """
+
+    def test_resolves_longest_component(self, catalogs):
+        """
+        Test that an instance resolves to the longest component name it starts with.
+        """
+        in_memory, _ = catalogs
+        service = RuntimeComponentService(in_memory)
+
+        resolved = service.resolve_instance("mortgage-processing-backend-7f9c4-x2k")
+        assert resolved == {
+            "instance": "mortgage-processing-backend-7f9c4-x2k",
+            **service.get_runtime_component_by_name("mortgage-processing-backend"),
+            "contact_channels": {
+                "slack_channel": "#alpha-squad-support",
+                "email": "alpha-squad@examplebank.com"
+            }
+        }
+        assert service.resolve_instance("mortgage-processing-7d4f")["component_name"] == "mortgage-processing"
+        assert service.resolve_instance("mortgage-process") is None
+
+    @pytest.mark.parametrize("instance", INSTANCES)
+    def test_mapped_matches_in_memory(self, catalogs, instance):
+        """
+        Test that a mapped snapshot resolves instances as the in-memory trie does.
+        """
+        in_memory, mapped = catalogs
+        assert RuntimeComponentService(mapped).resolve_instance(instance) == \
+            RuntimeComponentService(in_memory).resolve_instance(instance)
+
+    def test_resolve_endpoints(self, data_file):
+        """
+        Test the single and batch resolve endpoints.
+        """
+        store = CatalogStore(str(data_file))
+        store.load()
+        app.state.catalog_store = store
+        try:
+            with TestClient(app) as client:
+                single = client.get("/runtime-components/resolve",
+                                    params={"instance": "mortgage-processing-reporting-0"})
+                assert single.status_code == 200
+                assert single.json()["component_name"] == "mortgage-processing-reporting"
+                assert single.json()["contact_channels"]["email"] == "alpha-squad@examplebank.com"
+
+                assert client.get("/runtime-components/resolve", params={"instance": "billing-api-1"}).status_code == 404
+                assert client.get("/runtime-components/resolve").status_code == 422
+
+                batch = client.post("/runtime-components:resolve", json={
+                    "instances": ["billing-api-1", "mortgage-processing-reporting-0", "billing-api-1"]})
+                assert batch.json() == {"found": [single.json()], "not_found": ["billing-api-1"]}
+        finally:
+            del app.state.catalog_store
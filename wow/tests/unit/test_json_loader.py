@@ -4,7 +4,7 @@ import pytest
 from datetime import datetime
 from unittest.mock import patch, mock_open
 
-from app.data.json_loader import JsonLoader
+from app.data.json_loader import JsonLoader, TeamValidationError
 from app.models.team import TeamList
 
 
@@ -120,8 +120,10 @@ class TestJsonLoader:
         loader = JsonLoader("test.json")
         data = loader.load()
         
-        assert data == {"metadata": {}, "teams": []}
-        assert loader._data == {"metadata": {}, "teams": []}
+        # The validated model is kept in its serialized form
+        expected = mock_validate.return_value.model_dump(mode="json")
+        assert data == expected
+        assert loader._data == expected
         assert loader._last_loaded is not None
         mock_exists.assert_called_once_with("test.json")
         mock_file.assert_called_once_with("test.json", "r")
@@ -184,3 +186,79 @@ class TestJsonLoader:
         
         assert data == valid_json_data
         mock_load.assert_not_called()
+
+
+class TestJsonLoaderStreaming:
+    """
+    Tests for the streaming mode of the JsonLoader class.
+    """
+
+    def test_load_normalizes_data(self, tmp_path, valid_json_data):
+        """
+        Test that loaded data has the shape of the serialized models.
+        """
+        del valid_json_data["teams"][0]["value_streams"][0]["value_stream_breakdown"]["product_lines"]
+        valid_json_data["teams"][0]["unknown_field"] = "dropped"
+        path = tmp_path / "wow_data.json"
+        path.write_text(json.dumps(valid_json_data))
+
+        for streaming in (False, True):
+            data = JsonLoader(str(path), streaming=streaming).load()
+            assert data == TeamList.model_validate(valid_json_data).model_dump(mode="json")
+            assert data["teams"][0]["value_streams"][0]["value_stream_breakdown"]["product_lines"] is None
+            assert "unknown_field" not in data["teams"][0]
+
+    def test_streaming_matches_full_load(self, tmp_path, valid_json_data):
+        """
+        Test that streaming returns the same data and index as a full load.
+        """
+        path = tmp_path / "wow_data.json"
+        path.write_text(json.dumps(valid_json_data, indent=2))
+
+        loader = JsonLoader(str(path), streaming=True)
+        data = loader.load()
+
+        assert data == JsonLoader(str(path)).load()
+        assert loader.get_index().teams == data["teams"]
+        assert "team_alpha" in loader.get_index().team_by_id
+
+    def test_streaming_empty_teams(self, tmp_path, valid_json_data):
+        """
+        Test that an empty teams array is accepted.
+        """
+        valid_json_data["teams"] = []
+        path = tmp_path / "wow_data.json"
+        path.write_text(json.dumps(valid_json_data))
+
+        assert JsonLoader(str(path), streaming=True).load()["teams"] == []
+
+    def test_streaming_reports_invalid_team(self, tmp_path, valid_json_data):
+        """
+        Test that an invalid team is reported with its position and team_id.
+        """
+        second_team = dict(valid_json_data["teams"][0], team_id="team_broken")
+        del second_team["team_api"]
+        valid_json_data["teams"].append(second_team)
+        path = tmp_path / "wow_data.json"
+        path.write_text(json.dumps(valid_json_data))
+
+        with pytest.raises(TeamValidationError) as excinfo:
+            JsonLoader(str(path), streaming=True).load()
+
+        assert excinfo.value.team_index == 1
+        assert excinfo.value.team_id == "team_broken"
+
+    @pytest.mark.parametrize("content", [
+        '{"metadata": {}, "teams": []}',
+        '{"teams": []}',
+        '{"metadata": {"version": "1"}, "teams": [}',
+    ])
+    def test_streaming_invalid_document(self, tmp_path, content):
+        """
+        Test that structural problems are reported as ValueError.
+        """
+        path = tmp_path / "wow_data.json"
+        path.write_text(content)
+
+        with pytest.raises(ValueError):
+            JsonLoader(str(path), streaming=True).load()
@@ -0,0 +1,54 @@
+import io
+import json
+import pytest
+
+from app.data.json_stream import JsonObjectStream
+
+DOCUMENT = {
+    "metadata": {"version": "1.0.0", "ratio": 0.25},
+    "teams": [{"team_id": f"team_{i}", "size": 10 ** i} for i in range(12)],
+    "count": 1234567,
+}
+
+
+class TestJsonObjectStream:
+    """
+    Tests for the JsonObjectStream class.
+    """
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 1024 * 1024])
+    def test_members_across_chunk_boundaries(self, chunk_size):
+        """
+        Test that values split across chunks are decoded whole.
+        """
+        stream = JsonObjectStream(io.StringIO(json.dumps(DOCUMENT, indent=2)), chunk_size=chunk_size)
+        members = list(stream.members(stream_keys=("teams",)))
+
+        assert members[0] == ("metadata", None, DOCUMENT["metadata"])
+        assert members[1:-1] == [("teams", i, team) for i, team in enumerate(DOCUMENT["teams"])]
+        assert members[-1] == ("count", None, 1234567)
+        assert stream.streamed_keys == ["teams"]
+
+    def test_non_streamed_array(self):
+        """
+        Test that arrays not named in stream_keys are decoded as a whole.
+        """
+        stream = JsonObjectStream(io.StringIO('{"teams": [1, 2]}'))
+        assert list(stream.members()) == [("teams", None, [1, 2])]
+
+    @pytest.mark.parametrize("content", ['', '[]', '{"teams": [1, 2', '{"teams": [1 2]}', '{"a": 1} x', '{"a" 1}'])
+    def test_invalid_json(self, content):
+        """
+        Test that malformed documents raise ValueError.
+        """
+        with pytest.raises(ValueError):
+            list(JsonObjectStream(io.StringIO(content), chunk_size=2).members(stream_keys=("teams",)))
+
+    def test_invalid_value_does_not_read_ahead(self):
+        """
+        Test that an error inside a value is reported without reading the rest of the file.
+        """
+        content = io.StringIO('{"teams": [{"team_id": tru}, ' + ", ".join(['{"team_id": "x"}'] * 10000) + "]}")
+        with pytest.raises(ValueError, match="at character 23"):
+            list(JsonObjectStream(content, chunk_size=64).members(stream_keys=("teams",)))
+        assert content.tell() <= 64 * 2
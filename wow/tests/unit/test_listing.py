@@ -0,0 +1,95 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+
+from app.data.catalog import CatalogStore
+from app.main import app
+
+
+@pytest.fixture
+def client(tmp_path, sample_json_data):
+    """
+    Fixture providing a test client for the app serving the sample data.
+    """
+    data_file = tmp_path / "wow_data.json"
+    data_file.write_text(json.dumps(sample_json_data))
+    store = CatalogStore(str(data_file))
+    store.load()
+    app.state.catalog_store = store
+    with TestClient(app) as client:
+        yield client
+    del app.state.catalog_store
+
+
+class TestListEndpoints:
+    """
+    Tests for the paging, projection and streaming options of the list endpoints.
+    """
+
+    @pytest.mark.parametrize("path", ["/teams", "/services", "/runtime-components"])
+    def test_ndjson_matches_json(self, client, path):
+        """
+        Test that NDJSON streams the same items as the JSON list, one per line.
+        """
+        expected = client.get(path).json()
+
+        by_format = client.get(path, params={"format": "ndjson"})
+        by_accept = client.get(path, headers={"Accept": "application/x-ndjson"})
+
+        for response in (by_format, by_accept):
+            assert response.headers["content-type"] == "application/x-ndjson"
+            assert response.text.endswith("\n")
+            assert [json.loads(line) for line in response.text.splitlines()] == expected
+
+    def test_ndjson_page(self, client):
+        """
+        Test that NDJSON honours projection and returns the next cursor.
+        """
+        response = client.get("/runtime-components",
+                              params={"format": "ndjson", "fields": "component_name", "limit": 1})
+
+        assert response.text == '{"component_name":"mortgage-processing-backend"}\n'
+        next_page = client.get("/runtime-components", params={
+            "format": "ndjson", "fields": "component_name", "cursor": response.headers["x-next-cursor"]})
+        assert next_page.text == '{"component_name":"mortgage-processing-reporting"}\n'
+        assert "x-next-cursor" not in next_page.headers
+
+    def test_invalid_options(self, client):
+        """
+        Test that unknown fields and malformed cursors are rejected.
+        """
+        assert client.get("/services", params={"fields": "owner"}).status_code == 400
+        assert client.get("/teams", params={"cursor": "garbage"}).status_code == 400
+        assert client.get("/teams", params={"format": "ndjson", "cursor": "garbage"}).status_code == 400
+        assert client.get("/teams", params={"format": "xml"}).status_code == 422
+
+
+class TestBatchEndpoints:
+    """
+    Tests for the batch lookup endpoints.
+    """
+
+    @pytest.mark.parametrize("path, key, single_path, found_key, missing_key", [
+        ("/teams:batch", "team_ids", "/teams/{}", "team_alpha", "team_omega"),
+        ("/services:batch", "service_names", "/services/{}", "mortgage-processing", "billing"),
+        ("/runtime-components:batch", "component_names", "/runtime-components/{}",
+         "mortgage-processing-reporting", "billing-api"),
+    ])
+    def test_batch_matches_single_lookups(self, client, path, key, single_path, found_key, missing_key):
+        """
+        Test that a batch returns what single lookups would, with the missing keys listed once.
+        """
+        response = client.post(path, json={key: [missing_key, found_key, missing_key, found_key]})
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "found": [client.get(single_path.format(found_key)).json()],
+            "not_found": [missing_key],
+        }
+
+    def test_batch_requires_keys(self, client):
+        """
+        Test that a batch without keys is rejected.
+        """
+        assert client.post("/services:batch", json={}).status_code == 422
+        assert client.post("/services:batch", json={"service_names": []}).json() == {"found": [], "not_found": []}
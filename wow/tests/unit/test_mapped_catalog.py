@@ -0,0 +1,110 @@
+import json
+import pytest
+
+from app.data.catalog import CatalogSnapshot, CatalogStore, SourceFingerprint
+from app.data.json_loader import JsonLoader
+from app.data.mapped_catalog import open_mapped_catalog
+from app.data.snapshot_file import write_compiled_snapshot
+from app.metrics import CATALOG_LOAD_PHASE_DURATION
+from app.services.facet_service import FacetService
+from app.services.runtime_component_service import RuntimeComponentService
+from app.services.search_service import SearchService
+from app.services.service_service import ServiceService
+from app.services.team_service import TeamService
+
+
+@pytest.fixture
+def data_file(tmp_path, sample_json_data):
+    """
+    Fixture providing a data file containing the sample data.
+    """
+    path = tmp_path / "wow_data.json"
+    path.write_text(json.dumps(sample_json_data))
+    return path
+
+
+@pytest.fixture
+def snapshots(data_file, tmp_path):
+    """
+    Fixture providing an in-memory snapshot and a mapped snapshot of the same data file.
+    """
+    loader = JsonLoader(str(data_file))
+    data = loader.load()
+    fingerprint = SourceFingerprint.from_path(str(data_file))
+    snapshot_file = tmp_path / "wow_data.snapshot"
+    write_compiled_snapshot(str(snapshot_file), data, loader.get_index(), fingerprint.content_hash)
+
+    mapped = open_mapped_catalog(str(snapshot_file), fingerprint.content_hash)
+    return (CatalogSnapshot(data, 1, fingerprint, index=loader.get_index()),
+            CatalogSnapshot(mapped.data, 1, fingerprint, index=mapped.catalog_index))
+
+
+class TestMappedCatalog:
+    """
+    Tests for serving the catalog from a memory-mapped snapshot.
+    """
+
+    @pytest.mark.parametrize("call", [
+        lambda catalog: TeamService(catalog).get_all_teams(),
+        lambda catalog: TeamService(catalog).get_all_teams(value_stream_name="Mortgage Application"),
+        lambda catalog: TeamService(catalog).get_team_by_id("team_alpha"),
+        lambda catalog: TeamService(catalog).get_team_by_id("missing"),
+        lambda catalog: ServiceService(catalog).get_all_services(sla="99.9%"),
+        lambda catalog: ServiceService(catalog).get_service_by_name("mortgage-processing"),
+        lambda catalog: RuntimeComponentService(catalog).get_all_runtime_components(component_name="BACKEND"),
+        lambda catalog: RuntimeComponentService(catalog).get_runtime_component_by_name("mortgage-processing-reporting"),
+        lambda catalog: SearchService(catalog).search("mortgage"),
+        lambda catalog: SearchService(catalog).search("a"),
+        lambda catalog: SearchService(catalog).search("ab"),
+    ])
+    def test_matches_in_memory(self, snapshots, call):
+        """
+        Test that services answer the same from a mapped snapshot as from memory.
+        """
+        in_memory, mapped = snapshots
+        assert call(mapped) == call(in_memory)
+
+    def test_lookups_are_read_only_views(self, snapshots):
+        """
+        Test the mapping interface of lookups and posting lists.
+        """
+        _, mapped = snapshots
+        index = mapped.get_index()
+
+        assert "team_alpha" in index.team_by_id
+        assert "missing" not in index.service_by_name
+        assert list(index.services_by_sla) == ["99.9%"]
+        assert list(index.services_by_sla["99.9%"]) == [0]
+        assert index.services[-1].service["service_name"] == "mortgage-processing"
+        assert index.components[1].component_name == "mortgage-processing-reporting"
+        with pytest.raises(TypeError):
+            index.team_by_id["team_alpha"] = {}
+
+    def test_store_maps_snapshot(self, data_file, tmp_path, snapshots):
+        """
+        Test that a store configured for mapping serves a mapped snapshot.
+        """
+        in_memory, _ = snapshots
+        store = CatalogStore(str(data_file), compiled_path=str(tmp_path / "wow_data.snapshot"), mapped=True)
+
+        assert store.load().source == "mapped"
+        assert TeamService(store.current).get_all_teams() == TeamService(in_memory).get_all_teams()
+
+    def test_store_builds_derived_tables_on_first_use(self, data_file, tmp_path, snapshots):
+        """
+        Test that a mapped snapshot builds no tables derived from its index at load, and builds them when first asked.
+        """
+        in_memory, _ = snapshots
+        store = CatalogStore(str(data_file), compiled_path=str(tmp_path / "wow_data.snapshot"), mapped=True)
+        phases = [CATALOG_LOAD_PHASE_DURATION.labels(phase) for phase in ("facets", "fuzzy_index", "text_index")]
+        builds = [phase.count for phase in phases]
+
+        store.load()
+        assert [phase.count for phase in phases] == builds
+        assert FacetService(store.current).get_facets("services", ["sla", "tech_stack"]) == \
+            FacetService(in_memory).get_facets("services", ["sla", "tech_stack"])
+        service_name = in_memory.get_index().services[0].service["service_name"]
+        assert SearchService(store.current).search(service_name[1:], fuzzy=True) == \
+            SearchService(in_memory).search(service_name[1:], fuzzy=True)
+        assert SearchService(store.current).search(service_name, ranked=True) == \
+            SearchService(in_memory).search(service_name, ranked=True)
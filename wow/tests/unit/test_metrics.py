@@ -0,0 +1,144 @@
+import asyncio
+import json
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.metrics import UNMATCHED_ROUTE, MetricsMiddleware
+from app.data.catalog import CatalogStore
+from app.main import app
+from app.metrics import (Counter, Gauge, Histogram, HTTP_REQUEST_DURATION, HTTP_REQUESTS, Registry, SERVICE_DURATION,
+                         timed)
+
+
+def _samples(text):
+    # Sample line -> value, without comments
+    return {line.rpartition(" ")[0]: float(line.rpartition(" ")[2])
+            for line in text.splitlines() if line and not line.startswith("#")}
+
+
+class TestMetrics:
+    """
+    Tests for the metric types and their Prometheus rendering.
+    """
+
+    def test_histogram_buckets(self):
+        """
+        Test that observations are counted in the first bucket they fit, rendered cumulatively.
+        """
+        registry = Registry()
+        histogram = registry.register(Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0)))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.labels("/teams/").observe(value)
+        samples = _samples(registry.render())
+        assert samples['latency_seconds_bucket{route="/teams/",le="0.1"}'] == 2
+        assert samples['latency_seconds_bucket{route="/teams/",le="1"}'] == 3
+        assert samples['latency_seconds_bucket{route="/teams/",le="+Inf"}'] == 4
+        assert samples['latency_seconds_count{route="/teams/"}'] == 4
+        assert samples['latency_seconds_sum{route="/teams/"}'] == pytest.approx(3.65)
+
+    def test_counters_gauges_and_labels(self):
+        """
+        Test counters and gauges with and without labels, label escaping and the label count check.
+        """
+        registry = Registry()
+        counter = registry.register(Counter("requests_total", "Requests.", ("path",)))
+        gauge = registry.register(Gauge("in_flight", "In flight."))
+        counter.labels('a"b\\c').inc()
+        counter.labels('a"b\\c').inc(2)
+        gauge.set(3)
+        gauge.labels().dec()
+        text = registry.render()
+        assert '# TYPE requests_total counter' in text
+        assert 'requests_total{path="a\\"b\\\\c"} 3' in text
+        assert "\nin_flight 2\n" in text
+        with pytest.raises(ValueError):
+            counter.labels()
+        with pytest.raises(ValueError):
+            registry.register(Gauge("in_flight", "Again."))
+
+    def test_timed_and_collectors(self):
+        """
+        Test that a timed block is observed even when it raises, and that collectors run on render.
+        """
+        registry = Registry()
+        histogram = registry.register(Histogram("phase_seconds", "Phases.", ("phase",)))
+        gauge = registry.register(Gauge("version", "Version."))
+        with pytest.raises(KeyError):
+            with timed(histogram, "parse"):
+                raise KeyError("boom")
+        assert histogram.labels("parse").count == 1
+        registry.add_collector(lambda: gauge.set(7))
+        assert "\nversion 7\n" in registry.render()
+
+
+def test_metrics_endpoint(tmp_path, sample_json_data):
+    """
+    Test that requests, service calls, load phases and the catalog are reported on /metrics.
+    """
+    data_file = tmp_path / "wow_data.json"
+    data_file.write_text(json.dumps(sample_json_data))
+    store = CatalogStore(str(data_file))
+    store.load()
+    app.state.catalog_store = store
+    team_by_id = SERVICE_DURATION.labels("TeamService.get_team_by_id")
+    try:
+        with TestClient(app) as client:
+            before = _samples(client.get("/metrics").text)
+            calls = team_by_id.count
+            etag = client.get("/teams/team_alpha").headers["etag"]
+            client.get("/teams/team_alpha", headers={"If-None-Match": etag})
+            client.get("/teams/missing")
+            client.get("/no-such-route")
+            response = client.get("/metrics")
+    finally:
+        del app.state.catalog_store
+
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = _samples(response.text)
+
+    def delta(sample):
+        return samples.get(sample, 0) - before.get(sample, 0)
+
+    route = 'method="GET",route="/teams/{team_id}"'
+    assert delta(f'wow_http_requests_total{{{route},status="200"}}') == 1
+    assert delta(f'wow_http_requests_total{{{route},status="304"}}') == 1
+    assert delta(f'wow_http_requests_total{{{route},status="404"}}') == 1
+    assert delta('wow_http_requests_total{method="GET",route="unmatched",status="404"}') == 1
+    assert delta(f'wow_http_request_duration_seconds_count{{{route}}}') == 3
+    assert delta(f'wow_http_response_size_bytes_sum{{{route}}}') > 0
+    assert samples["wow_http_requests_in_flight"] == 1
+    assert team_by_id.count - calls == 2
+
+    assert samples["wow_catalog_version"] == 1 and samples["wow_catalog_age_seconds"] >= 0
+    assert samples['wow_catalog_entities{entity="teams"}'] == len(sample_json_data["teams"])
+    for phase in ("parse", "validate", "index", "facets", "fuzzy_index", "text_index"):
+        assert samples[f'wow_catalog_load_phase_duration_seconds_count{{phase="{phase}"}}'] >= 1
+
+
+def test_event_streams_and_other_methods():
+    """
+    Test that event streams are counted but not timed, and unknown methods share one label.
+    """
+    async def event_stream(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"text/event-stream; charset=utf-8")]})
+        await send({"type": "http.response.body", "body": b"data: 1\n\n"})
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        pass
+
+    async def request(method, path):
+        scope = {"type": "http", "method": method, "path": path, "root_path": "", "app": app}
+        await MetricsMiddleware(event_stream)(scope, receive, send)
+
+    watched = HTTP_REQUESTS.labels("GET", "/watch/", "200")
+    watch_duration = HTTP_REQUEST_DURATION.labels("GET", "/watch/")
+    other = HTTP_REQUESTS.labels("other", UNMATCHED_ROUTE, "200")
+    counts = watched.value, watch_duration.count, other.value
+    asyncio.run(request("GET", "/watch/"))
+    asyncio.run(request("BREW", "/teams"))
+    asyncio.run(request("brew", "/teams"))
+    assert (watched.value, watch_duration.count, other.value) == (counts[0] + 1, counts[1], counts[2] + 2)
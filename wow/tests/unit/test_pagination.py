@@ -0,0 +1,165 @@
+import copy
+import pytest
+
+from app.data.catalog import CatalogSnapshot, SourceFingerprint
+from app.services.pagination import Cursor, decode_cursor, encode_cursor, resume_after
+from app.services.projection import parse_fields, project
+from app.services.runtime_component_service import RuntimeComponentService
+from app.services.service_service import ServiceService
+from app.services.team_service import TeamService
+
+FINGERPRINT = SourceFingerprint(0, 0, "0" * 64)
+
+
+def _catalog(sample_json_data, team_numbers, version=1):
+    data = copy.deepcopy(sample_json_data)
+    template = data["teams"][0]
+    data["teams"] = []
+    for number in team_numbers:
+        team = copy.deepcopy(template)
+        team["team_id"] = f"team_{number}"
+        team["team_name"] = f"Team {number}"
+        team["services_applications"][0]["service_name"] = f"service-{number}"
+        team["services_applications"][0]["runtime_components"] = [f"component-{number}-a", f"component-{number}-b"]
+        data["teams"].append(team)
+    return CatalogSnapshot(data, version, FINGERPRINT)
+
+
+def _all_pages(get_page, limit):
+    items, cursor = [], None
+    while True:
+        page = get_page(limit=limit, cursor=cursor)
+        items.extend(page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            return items
+
+
+def test_parse_fields():
+    """
+    Test parsing of field lists into projections.
+    """
+    allowed = ("team_id", "team_api", "value_streams")
+    assert parse_fields(None, allowed) is None
+    assert parse_fields(" ", allowed) is None
+    assert parse_fields("team_id, team_api.contact_channels.email,team_api.team_type", allowed) == {
+        "team_id": None,
+        "team_api": {"contact_channels": {"email": None}, "team_type": None},
+    }
+    assert parse_fields("team_api,team_api.team_type", allowed) == {"team_api": None}
+    with pytest.raises(ValueError):
+        parse_fields("team_id,unknown", allowed)
+    with pytest.raises(ValueError):
+        parse_fields("team_api..team_type", allowed)
+
+
+def test_project_nested_lists():
+    """
+    Test that projections apply to every element of a list and skip missing keys.
+    """
+    team = {"team_id": "a", "value_streams": [{"value_stream_name": "x", "value_stream_description": "y"}]}
+    spec = parse_fields("value_streams.value_stream_name,team_api", ("team_id", "team_api", "value_streams"))
+    assert project(team, spec) == {"value_streams": [{"value_stream_name": "x"}]}
+
+
+def test_cursor_round_trip():
+    """
+    Test that cursors are opaque tokens that decode to what was encoded.
+    """
+    token = encode_cursor(Cursor(12, "service-12"))
+    assert "service" not in token
+    assert decode_cursor(token) == Cursor(12, "service-12")
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor")
+
+
+def test_resume_after_searches_outwards():
+    """
+    Test that a moved item is found at its nearest occurrence, with lookups growing with the distance it moved.
+    """
+    keys = [f"service-{number}" for number in range(1000)]
+    looked_up = []
+
+    def key_at(ordinal):
+        looked_up.append(ordinal)
+        return keys[ordinal]
+
+    assert resume_after(Cursor(500, "service-497"), len(keys), key_at) == 497
+    assert looked_up == [500, 501, 499, 502, 498, 503, 497]
+    assert resume_after(Cursor(5, "service-8"), len(keys), key_at) == 8
+    assert resume_after(Cursor(5000, "service-990"), len(keys), key_at) == 990
+
+    keys[490] = keys[520] = "service-497"
+    assert resume_after(Cursor(500, "service-497"), len(keys), key_at) == 497
+    keys[497] = "gone"
+    assert resume_after(Cursor(500, "service-497"), len(keys), key_at) == 490
+    keys[490] = keys[520] = "gone"
+    assert resume_after(Cursor(500, "service-497"), len(keys), key_at) == 499
+    assert resume_after(Cursor(3, "service-0"), 0, key_at) == 2
+
+
+class TestPagedListings:
+    """
+    Tests for the paged and projected listings of the services.
+    """
+
+    @pytest.mark.parametrize("limit", [1, 2, 3, 100])
+    def test_pages_cover_listing(self, sample_json_data, limit):
+        """
+        Test that following cursors returns every item exactly once, in order.
+        """
+        catalog = _catalog(sample_json_data, range(5))
+
+        teams = TeamService(catalog)
+        assert _all_pages(teams.get_teams_page, limit) == teams.get_all_teams()
+        services = ServiceService(catalog)
+        assert _all_pages(services.get_services_page, limit) == services.get_all_services()
+        components = RuntimeComponentService(catalog)
+        assert _all_pages(components.get_runtime_components_page, limit) == \
+            components.get_all_runtime_components()
+
+    def test_last_page_has_no_cursor(self, sample_json_data):
+        """
+        Test that no cursor is returned once the listing is exhausted.
+        """
+        catalog = _catalog(sample_json_data, range(2))
+
+        assert TeamService(catalog).get_teams_page(limit=2).next_cursor is None
+        assert TeamService(catalog).get_teams_page(limit=1).next_cursor is not None
+
+    def test_cursor_survives_reload(self, sample_json_data):
+        """
+        Test that a cursor resumes after its item when a reload moved it.
+        """
+        first_page = TeamService(_catalog(sample_json_data, range(5))).get_teams_page(limit=2)
+        assert [team["team_id"] for team in first_page.items] == ["team_0", "team_1"]
+
+        # Two teams inserted before the last team returned
+        reloaded = _catalog(sample_json_data, [10, 11, 0, 1, 2, 3, 4], version=2)
+        second_page = TeamService(reloaded).get_teams_page(limit=2, cursor=first_page.next_cursor)
+        assert [team["team_id"] for team in second_page.items] == ["team_2", "team_3"]
+
+    def test_projection(self, sample_json_data):
+        """
+        Test that only the requested fields are returned.
+        """
+        catalog = _catalog(sample_json_data, range(2))
+
+        services = ServiceService(catalog).get_services_page(
+            fields=parse_fields("service_name,team_id,business_criticality.sla", ServiceService.FIELDS))
+        assert services.items == [
+            {"service_name": "service-0", "team_id": "team_0", "business_criticality": {"sla": "99.9%"}},
+            {"service_name": "service-1", "team_id": "team_1", "business_criticality": {"sla": "99.9%"}},
+        ]
+
+        components = RuntimeComponentService(catalog).get_runtime_components_page(
+            service_name="service-1",
+            fields=parse_fields("component_name,team_name", RuntimeComponentService.FIELDS))
+        assert components.items == [
+            {"component_name": "component-1-a", "team_name": "Team 1"},
+            {"component_name": "component-1-b", "team_name": "Team 1"},
+        ]
+
+        teams = TeamService(catalog).get_teams_page(
+            value_stream_name="Mortgage Application", fields=parse_fields("team_id", TeamService.FIELDS), limit=1)
+        assert teams.items == [{"team_id": "team_0"}]
@@ -0,0 +1,103 @@
+import json
+import marshal
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import profiles, search
+from app.api.profiling import Profile, ProfileStore, ProfilingMiddleware
+from app.data.catalog import CatalogStore
+from app.main import app
+
+
+def _profiled_app(tmp_path, sample_json_data, token=None):
+    data_file = tmp_path / "wow_data.json"
+    data_file.write_text(json.dumps(sample_json_data))
+    store = CatalogStore(str(data_file))
+    store.load()
+    profiled = FastAPI()
+    profiled.state.catalog_store = store
+    profiled.state.profile_store = ProfileStore(max_profiles=2)
+    profiled.add_middleware(ProfilingMiddleware, store=profiled.state.profile_store, token=token)
+    profiled.include_router(search.router)
+    profiled.include_router(profiles.router)
+    return profiled
+
+
+class TestProfileStore:
+    """
+    Tests for the ProfileStore class.
+    """
+
+    def test_keeps_most_recent(self):
+        """
+        Test that the oldest profiles are dropped and the rest listed most recent first.
+        """
+        store = ProfileStore(max_profiles=2)
+        for profile_id in ("a", "b", "c"):
+            store.add(Profile(profile_id, "GET", "/search/", "", 200, "collapsed", 1.0, None, b"main 1\n"))
+        assert [profile.id for profile in store.list()] == ["c", "b"]
+        assert store.get("a") is None and store.get("b").info()["size"] == 7
+
+
+class TestProfilingMiddleware:
+    """
+    Tests for profiling requests through the middleware and reading the profiles.
+    """
+
+    def test_pstats_profile(self, tmp_path, sample_json_data):
+        """
+        Test that a request sending X-Profile is profiled under its request ID, and its profile downloaded.
+        """
+        with TestClient(_profiled_app(tmp_path, sample_json_data)) as client:
+            assert "x-profile-id" not in client.get("/search/", params={"query": "alpha"}).headers
+            response = client.get("/search/", params={"query": "alpha"},
+                                  headers={"X-Profile": "pstats", "X-Request-ID": "slow-search-1"})
+            assert response.status_code == 200 and response.headers["x-profile-id"] == "slow-search-1"
+
+            listed = client.get("/profiles/").json()
+            assert [(p["id"], p["path"], p["query"], p["format"]) for p in listed] == \
+                [("slow-search-1", "/search/", "query=alpha", "pstats")]
+
+            raw = client.get("/profiles/slow-search-1")
+            assert raw.headers["content-disposition"] == 'attachment; filename="slow-search-1.pstats"'
+            functions = {name for _, _, name in marshal.loads(raw.content)}
+            assert "search" in functions
+            text = client.get("/profiles/slow-search-1", params={"format": "text", "limit": 5}).text
+            assert "cumulative" in text
+            assert client.get("/profiles/unknown").status_code == 404
+
+    def test_collapsed_profile(self, tmp_path, sample_json_data):
+        """
+        Test that a sampled profile is stored as collapsed stacks under a new ID.
+        """
+        with TestClient(_profiled_app(tmp_path, sample_json_data)) as client:
+            response = client.get("/search/", params={"query": "alpha"},
+                                  headers={"X-Profile": "collapsed", "X-Request-ID": "not a valid id"})
+            profile_id = response.headers["x-profile-id"]
+            assert len(profile_id) == 32
+            stacks = client.get(f"/profiles/{profile_id}").text
+            for line in stacks.splitlines():
+                stack, _, count = line.rpartition(" ")
+                assert ";" in stack and int(count) >= 1
+
+    def test_token(self, tmp_path, sample_json_data, monkeypatch):
+        """
+        Test that only requests with the configured token are profiled or can read profiles.
+        """
+        monkeypatch.setattr(profiles, "PROFILING_TOKEN", "s3cret")
+        with TestClient(_profiled_app(tmp_path, sample_json_data, token="s3cret")) as client:
+            response = client.get("/search/", params={"query": "alpha"}, headers={"X-Profile": "pstats"})
+            assert response.status_code == 200 and "x-profile-id" not in response.headers
+            response = client.get("/search/", params={"query": "alpha"},
+                                  headers={"X-Profile": "pstats", "X-Profile-Token": "s3cret"})
+            assert "x-profile-id" in response.headers
+            assert client.get("/profiles/").status_code == 403
+            assert len(client.get("/profiles/", headers={"X-Profile-Token": "s3cret"}).json()) == 1
+
+
+def test_disabled_by_default():
+    """
+    Test that without WOW_PROFILING neither the middleware nor the endpoints are installed.
+    """
+    assert all(middleware.cls is not ProfilingMiddleware for middleware in app.user_middleware)
+    assert not any(route.path.startswith("/profiles") for route in app.routes)
@@ -0,0 +1,251 @@
+import json
+import random
+import pytest
+from fastapi.testclient import TestClient
+
+from app.data.catalog import CatalogSnapshot, CatalogStore, SourceFingerprint
+from app.data.json_loader import JsonLoader
+from app.data.mapped_catalog import open_mapped_catalog
+from app.data.snapshot_file import write_compiled_snapshot
+from app.main import app
+from app.services.query_language import And, Match, Not, Or, QuerySyntaxError, parse_query
+from app.services.query_service import QueryService
+from benchmarks.synthetic import generate_catalog
+
+# Field -> values of a team, service and component, as matched by the query language
+FIELD_VALUES = {
+    "team_id": lambda team, service, component: [team["team_id"]],
+    "business_segment": lambda team, service, component: [team["business_segment"]],
+    "team_type": lambda team, service, component: [team["team_api"]["team_type"]],
+    "value_stream": lambda team, service, component: [vs["value_stream_name"] for vs in team["value_streams"]],
+    "service_name": lambda team, service, component: [service["service_name"]],
+    "team_name": lambda team, service, component: [team["team_name"]],
+    "tech_stack": lambda team, service, component: [service["tech_stack"]],
+    "sla": lambda team, service, component: [service["business_criticality"]["sla"]],
+    "value_stream_segment": lambda team, service, component: service["value_stream_segments"],
+    "component_name": lambda team, service, component: [component],
+}
+SERVICE_FIELDS = ("service_name", "tech_stack", "sla", "value_stream_segment")
+
+
+def _holds(expression, team, service, component):
+    if isinstance(expression, Match):
+        return any(value in expression.values for value in FIELD_VALUES[expression.field](team, service, component))
+    if isinstance(expression, Not):
+        return not _holds(expression.operand, team, service, component)
+    results = [_holds(operand, team, service, component) for operand in expression.operands]
+    return all(results) if isinstance(expression, And) else any(results)
+
+
+def _any_child_holds(expression, entity, team, service):
+    # A field of an owned entity matches the owner when any owned entity carries the value
+    if isinstance(expression, Match):
+        if entity == "teams" and expression.field in SERVICE_FIELDS + ("component_name",):
+            return any(_any_child_holds(expression, "services", team, s) for s in team["services_applications"])
+        if entity != "runtime_components" and expression.field == "component_name":
+            return any(_holds(expression, team, service, c) for c in service["runtime_components"])
+        return _holds(expression, team, service, None)
+    if isinstance(expression, Not):
+        return not _any_child_holds(expression.operand, entity, team, service)
+    results = [_any_child_holds(operand, entity, team, service) for operand in expression.operands]
+    return all(results) if isinstance(expression, And) else any(results)
+
+
+def _scan(data, text, entity):
+    expression = parse_query(text)
+    if entity == "teams":
+        return [team["team_id"] for team in data["teams"] if _any_child_holds(expression, entity, team, None)]
+    if entity == "services":
+        return [service["service_name"] for team in data["teams"] for service in team["services_applications"]
+                if _any_child_holds(expression, entity, team, service)]
+    return [component for team in data["teams"] for service in team["services_applications"]
+            for component in service["runtime_components"] if _holds(expression, team, service, component)]
+
+
+def _keys(result):
+    key = {"teams": "team_id", "services": "service_name", "runtime_components": "component_name"}[result["entity"]]
+    return [item[key] for item in result["items"]]
+
+
+def _random_expression(rng, data, depth=0):
+    if depth < 3 and rng.random() < 0.5:
+        operands = [_random_expression(rng, data, depth + 1) for _ in range(rng.randint(2, 3))]
+        return "(" + f" {rng.choice(['AND', 'OR'])} ".join(operands) + ")"
+    team = rng.choice([team for team in data["teams"] if team["services_applications"]])
+    service = rng.choice(team["services_applications"])
+    field = rng.choice(list(FIELD_VALUES))
+    values = FIELD_VALUES[field](team, service, rng.choice(service["runtime_components"]))
+    value = json.dumps(rng.choice(values) if values else "none")
+    if rng.random() < 0.2:
+        return f"{field} NOT IN ({value}, \"other\")"
+    return f"{'NOT ' if rng.random() < 0.3 else ''}{field} {rng.choice(['=', '=', '!='])} {value}"
+
+
+@pytest.fixture
+def data():
+    """
+    Fixture providing a synthetic catalog of 30 teams.
+    """
+    return generate_catalog(30, services_per_team=4, seed=11)
+
+
+@pytest.fixture
+def query_service(data):
+    """
+    Fixture providing a QueryService over a snapshot of the synthetic catalog.
+    """
+    return QueryService(CatalogSnapshot(data, 1, SourceFingerprint(0, 0, "hash")))
+
+
+class TestQueryLanguage:
+    """
+    Tests for parsing filter expressions.
+    """
+
+    def test_precedence_and_values(self):
+        """
+        Test that AND binds tighter than OR, keywords are case-insensitive and quoted values are unescaped.
+        """
+        assert parse_query('a = 1 or b != "x \\" y" AND not c in (2, \'3\', 2)') == Or((
+            Match("a", ("1",)),
+            And((Not(Match("b", ('x " y',))), Not(Match("c", ("2", "3"))))),
+        ))
+        assert parse_query("(sla = 99.9% OR sla = \"and\") AND tech_stack NOT IN (Java)") == And((
+            Or((Match("sla", ("99.9%",)), Match("sla", ("and",)))),
+            Not(Match("tech_stack", ("Java",))),
+        ))
+
+    @pytest.mark.parametrize("text, position", [
+        ("", 0),
+        ("sla =", 5),
+        ("sla = 1 tech_stack = 2", 8),
+        ("(sla = 1", 8),
+        ("sla == 1", 5),
+        ("sla = 'open", 6),
+        ("sla IN ()", 8),
+        ("NOT " * 40 + "sla = 1", 128),
+    ])
+    def test_syntax_errors(self, text, position):
+        """
+        Test that a malformed expression raises a ValueError pointing at the offending token.
+        """
+        with pytest.raises(QuerySyntaxError) as error:
+            parse_query(text)
+        assert error.value.position == position
+
+
+class TestQueryService:
+    """
+    Tests for evaluating filter expressions over bitsets.
+    """
+
+    @pytest.mark.parametrize("entity", ["teams", "services", "runtime_components"])
+    def test_matches_a_scan(self, query_service, data, entity):
+        """
+        Test that random expressions select exactly what a scan evaluating them selects, in file order.
+        """
+        rng = random.Random(entity)
+        for _ in range(60):
+            text = _random_expression(rng, data)
+            result = query_service.query(text, entity)
+            expected = _scan(data, text, entity)
+            assert _keys(result) == expected, text
+            assert result["total"] == len(expected)
+
+    @pytest.mark.parametrize("entity", ["teams", "services", "runtime_components"])
+    def test_teams_without_services(self, data, entity):
+        """
+        Test that team attributes select teams without services, and NOT selects none of their services.
+        """
+        for team in data["teams"][1::7]:
+            team["services_applications"] = []
+        query_service = QueryService(CatalogSnapshot(data, 1, SourceFingerprint(0, 0, "hash")))
+        rng = random.Random(entity)
+        for _ in range(60):
+            text = _random_expression(rng, data)
+            assert _keys(query_service.query(text, entity)) == _scan(data, text, entity), text
+
+        team = data["teams"][1]
+        for field in ("team_id", "team_name"):
+            matching = query_service.query(f"{field} = {json.dumps(team[field])}", "teams")
+            assert _keys(matching) == [team["team_id"]]
+            excluded = query_service.query(f"NOT {field} = {json.dumps(team[field])}", "teams")
+            assert excluded["total"] == len(data["teams"]) - 1
+            assert team["team_id"] not in _keys(excluded)
+
+    def test_results_and_limit(self, query_service, data):
+        """
+        Test that results have the shape of the list endpoints and the limit keeps the total.
+        """
+        team = data["teams"][4]
+        result = query_service.query(f"team_id = {team['team_id']}", "services", limit=2)
+        assert result["total"] == 4
+        service = team["services_applications"][0]
+        assert result["items"] == [
+            {**service, "team_id": team["team_id"], "team_name": team["team_name"],
+             "business_segment": team["business_segment"]},
+            {**team["services_applications"][1], "team_id": team["team_id"], "team_name": team["team_name"],
+             "business_segment": team["business_segment"]},
+        ]
+
+        component = query_service.query(f"component_name = {service['runtime_components'][0]}", "runtime_components")
+        assert component["items"][0]["service_name"] == service["service_name"]
+        assert query_service.query("sla = missing", "teams") == {"entity": "teams", "total": 0, "items": []}
+        assert query_service.query("NOT sla = missing", "teams", limit=0)["total"] == 30
+
+    def test_unknown_field_or_entity(self, query_service):
+        """
+        Test that an unknown field or entity raises ValueError.
+        """
+        with pytest.raises(ValueError, match="Unknown field: owner"):
+            query_service.query("sla = 1 OR owner = me")
+        with pytest.raises(ValueError, match="Unknown entity"):
+            query_service.query("sla = 1", "value_streams")
+
+    def test_mapped_catalog_matches_in_memory(self, tmp_path, data):
+        """
+        Test that queries answer the same from a mapped snapshot as from memory.
+        """
+        data_file = tmp_path / "wow_data.json"
+        data_file.write_text(json.dumps(data))
+        loader = JsonLoader(str(data_file))
+        loaded = loader.load()
+        fingerprint = SourceFingerprint.from_path(str(data_file))
+        snapshot_file = tmp_path / "wow_data.snapshot"
+        write_compiled_snapshot(str(snapshot_file), loaded, loader.get_index(), fingerprint.content_hash)
+        mapped = open_mapped_catalog(str(snapshot_file), fingerprint.content_hash)
+        in_memory = QueryService(CatalogSnapshot(loaded, 1, fingerprint, index=loader.get_index()))
+        from_file = QueryService(CatalogSnapshot(mapped.data, 1, fingerprint, index=mapped.catalog_index))
+
+        rng = random.Random(5)
+        for entity in ("teams", "services", "runtime_components"):
+            for _ in range(20):
+                text = _random_expression(rng, data)
+                assert from_file.query(text, entity) == in_memory.query(text, entity), text
+
+
+def test_query_endpoint(tmp_path, sample_json_data):
+    """
+    Test the query endpoint, including its validation.
+    """
+    data_file = tmp_path / "wow_data.json"
+    data_file.write_text(json.dumps(sample_json_data))
+    store = CatalogStore(str(data_file))
+    store.load()
+    app.state.catalog_store = store
+    try:
+        with TestClient(app) as client:
+            response = client.get("/query", params={"q": 'tech_stack = Java AND sla IN ("99.9%", "99.5%")'})
+            assert response.status_code == 200
+            body = response.json()
+            assert body["total"] == 1 and body["items"][0]["service_name"] == "mortgage-processing"
+            assert "etag" in response.headers
+
+            teams = client.get("/query", params={"q": "NOT tech_stack = Go", "entity": "teams"}).json()
+            assert [team["team_id"] for team in teams["items"]] == ["team_alpha"]
+
+            assert client.get("/query", params={"q": "tech_stack = "}).status_code == 400
+            assert client.get("/query", params={"q": "owner = me"}).status_code == 400
+            assert client.get("/query", params={"q": "sla = 1", "entity": "value_streams"}).status_code == 422
+    finally:
+        del app.state.catalog_store
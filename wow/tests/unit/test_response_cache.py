@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+
+from app.api.response_cache import ResponseCache
+
+
+def _snapshot(version):
+    return SimpleNamespace(version=version)
+
+
+class TestResponseCache:
+    """
+    Tests for the ResponseCache class.
+    """
+
+    def test_miss_then_hit(self):
+        """
+        Test that a put body is returned as-is on the next get.
+        """
+        cache = ResponseCache()
+        catalog = _snapshot(1)
+
+        assert cache.get(catalog, "teams") is None
+        rendered = cache.put(catalog, "teams", [{"team_id": "team_alpha"}])
+        cached = cache.get(catalog, "teams")
+
+        assert cached.body == rendered.body == b'[{"team_id":"team_alpha"}]'
+        assert cached.media_type == "application/json"
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_new_version_invalidates(self):
+        """
+        Test that entries of an older version are not served.
+        """
+        cache = ResponseCache()
+        cache.get(_snapshot(1), "teams")
+        cache.put(_snapshot(1), "teams", [])
+
+        cache.invalidate(_snapshot(2))
+
+        assert len(cache) == 0
+        assert cache.get(_snapshot(2), "teams") is None
+
+    def test_old_version_is_not_cached(self):
+        """
+        Test that a request still on an older snapshot neither reads nor fills the cache.
+        """
+        cache = ResponseCache()
+        cache.get(_snapshot(2), "teams")
+        cache.put(_snapshot(2), "teams", ["new"])
+
+        assert cache.get(_snapshot(1), "teams") is None
+        cache.put(_snapshot(1), "teams", ["old"])
+        assert cache.get(_snapshot(2), "teams").body == b'["new"]'
+
+    def test_max_entries(self):
+        """
+        Test that the least recently used entry is evicted beyond the bound.
+        """
+        cache = ResponseCache(max_entries=2)
+        catalog = _snapshot(1)
+        for key in ("a", "b"):
+            cache.get(catalog, key)
+            cache.put(catalog, key, key)
+        cache.get(catalog, "a")
+        cache.put(catalog, "c", "c")
+
+        assert cache.get(catalog, "b") is None
+        assert cache.get(catalog, "a") is not None
+        assert len(cache) == 2
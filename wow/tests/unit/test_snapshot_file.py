@@ -0,0 +1,103 @@
+import json
+import pytest
+
+from app.data.catalog import CatalogStore, SourceFingerprint
+from app.data.json_loader import JsonLoader
+from app.data.snapshot_file import read_compiled_snapshot, read_snapshot_header, write_compiled_snapshot
+from app.metrics import CATALOG_LOAD_PHASE_DURATION
+
+
+@pytest.fixture
+def data_file(tmp_path, sample_json_data):
+    """
+    Fixture providing a data file containing the sample data.
+    """
+    path = tmp_path / "wow_data.json"
+    path.write_text(json.dumps(sample_json_data))
+    return path
+
+
+def _compile(data_file, snapshot_file):
+    loader = JsonLoader(str(data_file))
+    data = loader.load()
+    content_hash = SourceFingerprint.from_path(str(data_file)).content_hash
+    write_compiled_snapshot(str(snapshot_file), data, loader.get_index(), content_hash)
+    return loader, content_hash
+
+
+class TestCompiledSnapshot:
+    """
+    Tests for writing and reading compiled snapshot files.
+    """
+
+    def test_round_trip(self, data_file, tmp_path):
+        """
+        Test that a compiled snapshot reads back the same data and index.
+        """
+        snapshot_file = tmp_path / "wow_data.snapshot"
+        loader, content_hash = _compile(data_file, snapshot_file)
+
+        compiled = read_compiled_snapshot(str(snapshot_file), content_hash)
+
+        assert compiled.data == loader.get_data()
+        index = loader.get_index()
+        assert compiled.catalog_index.export_postings() == index.export_postings()
+        assert compiled.catalog_index.find_services(sla="99.9%") == index.find_services(sla="99.9%")
+        assert compiled.catalog_index.service_search.search("JAVA") == index.service_search.search("JAVA")
+        assert compiled.catalog_index.component_by_name.keys() == index.component_by_name.keys()
+
+        header = read_snapshot_header(str(snapshot_file))
+        assert header["content_hash"] == content_hash
+        assert header["teams"] == len(index.teams)
+
+    def test_other_content_hash_ignored(self, data_file, tmp_path):
+        """
+        Test that a snapshot compiled from other data file contents is not used.
+        """
+        snapshot_file = tmp_path / "wow_data.snapshot"
+        _compile(data_file, snapshot_file)
+
+        assert read_compiled_snapshot(str(snapshot_file), "0" * 64) is None
+
+    def test_other_marshal_version_ignored(self, data_file, tmp_path, monkeypatch):
+        """
+        Test that a snapshot whose records were marshalled in another format is not used.
+        """
+        snapshot_file = tmp_path / "wow_data.snapshot"
+        with monkeypatch.context() as patched:
+            patched.setattr("marshal.version", 0)
+            _, content_hash = _compile(data_file, snapshot_file)
+
+        assert read_snapshot_header(str(snapshot_file))["marshal_version"] == 0
+        assert read_compiled_snapshot(str(snapshot_file), content_hash) is None
+
+    def test_missing_or_corrupt_ignored(self, tmp_path):
+        """
+        Test that a missing or unreadable snapshot is not used.
+        """
+        snapshot_file = tmp_path / "wow_data.snapshot"
+        assert read_compiled_snapshot(str(snapshot_file), "0" * 64) is None
+
+        snapshot_file.write_bytes(b"garbage")
+        assert read_compiled_snapshot(str(snapshot_file), "0" * 64) is None
+        assert read_snapshot_header(str(snapshot_file)) is None
+
+    def test_store_prefers_current_snapshot(self, data_file, tmp_path, sample_json_data):
+        """
+        Test that the store loads an up-to-date snapshot and falls back to JSON otherwise.
+        """
+        snapshot_file = tmp_path / "wow_data.snapshot"
+        _compile(data_file, snapshot_file)
+        store = CatalogStore(str(data_file), compiled_path=str(snapshot_file))
+
+        compiled_phase = CATALOG_LOAD_PHASE_DURATION.labels("compiled")
+        compiled_loads = compiled_phase.count
+        assert store.load().source == "compiled"
+        assert compiled_phase.count == compiled_loads + 1
+
+        sample_json_data["teams"][0]["team_name"] = "Renamed Squad"
+        data_file.write_text(json.dumps(sample_json_data))
+        assert store.reload() is True
+        assert store.current.source == "json"
+        assert compiled_phase.count == compiled_loads + 1
+        assert store.current.get_data()["teams"][0]["team_name"] == "Renamed Squad"
@@ -0,0 +1,165 @@
+import json
+import math
+import random
+import pytest
+from fastapi.testclient import TestClient
+
+from app.data.catalog import CatalogSnapshot, CatalogStore, SourceFingerprint
+from app.data.catalog_index import CatalogIndex
+from app.data.text_index import B, DEFAULT_FIELD_WEIGHTS, K1, TextIndex, TextIndexes, parse_field_weights, tokenize
+from app.main import app
+from app.services.search_service import SearchService
+from benchmarks.synthetic import generate_catalog
+
+
+def _bm25f(documents, size, query, weights):
+    # Scores computed from the raw texts, as BM25F defines them
+    fields = {}
+    for ordinal, field, text in documents:
+        fields.setdefault(field, {}).setdefault(ordinal, []).extend(tokenize(text))
+    averages = {field: sum(map(len, texts.values())) / len(texts) for field, texts in fields.items()}
+    scores = {}
+    for term in dict.fromkeys(tokenize(query)):
+        containing = {o for texts in fields.values() for o, tokens in texts.items() if term in tokens}
+        if not containing:
+            continue
+        idf = math.log(1 + (size - len(containing) + 0.5) / (len(containing) + 0.5))
+        for ordinal in containing:
+            frequency = sum(weights.get(field, 0) * texts[ordinal].count(term)
+                            / (1 - B + B * len(texts[ordinal]) / averages[field])
+                            for field, texts in fields.items() if ordinal in texts)
+            if frequency:
+                scores[ordinal] = scores.get(ordinal, 0) + idf * frequency * (K1 + 1) / (frequency + K1)
+    return scores
+
+
+class TestTextIndex:
+    """
+    Tests for BM25F scoring over posting lists.
+    """
+
+    def test_scores_match_bm25f(self):
+        """
+        Test that the top documents and their scores are those of BM25F computed from the texts.
+        """
+        rng = random.Random(3)
+        words = ["payments", "ledger", "card", "mortgage", "risk", "java", "python", "api", "the", "and"]
+        documents = [(ordinal, field, " ".join(rng.choice(words) for _ in range(rng.randint(1, 8))))
+                     for ordinal in range(60) for field in ("team_mission", "service_name")
+                     for _ in range(rng.randint(0, 2))]
+        index = TextIndex(documents, 60)
+
+        for weights in (DEFAULT_FIELD_WEIGHTS, {"team_mission": 1.0}, {"team_mission": 0.5, "service_name": 4.0}):
+            for _ in range(20):
+                query = " ".join(rng.sample(words, rng.randint(1, 3)))
+                expected = _bm25f(documents, 60, query, weights)
+                top = index.top(query, 5, weights)
+                ranking = sorted(expected.items(), key=lambda item: (-item[1], item[0]))[:5]
+                assert [ordinal for _, ordinal in top] == [ordinal for ordinal, _ in ranking], query
+                assert all(math.isclose(score, expected[ordinal]) for score, ordinal in top)
+
+    def test_rare_terms_and_ties(self):
+        """
+        Test that a rarer term scores higher, unknown terms are ignored and ties keep ordinal order.
+        """
+        documents = [(0, "tech_stack", "Java"), (1, "tech_stack", "Java"), (2, "tech_stack", "Go"),
+                     (3, "tech_stack", "Java")]
+        index = TextIndex(documents, 4)
+        assert index.idf("go") > index.idf("java") > 0 == index.idf("cobol")
+        assert [ordinal for _, ordinal in index.top("java go cobol", 10, {"tech_stack": 1.0})] == [2, 0, 1, 3]
+        assert index.top("java", 2, {"tech_stack": 1.0})[1][1] == 1
+        assert index.top("java", 2, {"service_name": 1.0}) == []
+
+    def test_tokenize_any_script(self):
+        """
+        Test that words of any script are kept whole and matched case-insensitively.
+        """
+        assert tokenize("Zürich STRASSE-Straße_api, Ωmega2 東京") == ["zürich", "strasse", "strasse", "api", "ωmega2", "東京"]
+        index = TextIndex([(0, "team_name", "Équipe Zürich"), (1, "team_name", "Equipe Zurich")], 2)
+        assert [ordinal for _, ordinal in index.top("ZÜRICH", 10, {"team_name": 1.0})] == [0]
+
+    def test_parse_field_weights(self):
+        """
+        Test that configured weights override the defaults and invalid ones are rejected.
+        """
+        weights = parse_field_weights(" team_mission = 0.5,, tech_stack=0")
+        assert weights["team_mission"] == 0.5 and weights["tech_stack"] == 0.0
+        assert weights["service_name"] == DEFAULT_FIELD_WEIGHTS["service_name"]
+        for text in ("owner=1", "team_mission=heavy", "team_mission=-1", "team_mission=nan"):
+            with pytest.raises(ValueError):
+                parse_field_weights(text)
+
+
+class TestRankedSearch:
+    """
+    Tests for ranked search over the text indexes of a snapshot.
+    """
+
+    def test_ranked_results_and_limit(self):
+        """
+        Test that ranked search returns the top entities of each type, shaped like substring results.
+        """
+        data = generate_catalog(40, seed=8)
+        snapshot = CatalogSnapshot(data, 1, SourceFingerprint(0, 0, "hash"))
+        search_service = SearchService(snapshot)
+        service = data["teams"][5]["services_applications"][1]
+
+        results = search_service.search(service["service_name"], ranked=True, limit=3)
+        assert results["services"][0] == search_service.search(service["service_name"])["services"][0]
+        assert all(len(items) <= 3 for items in results.values())
+        text_indexes = snapshot.get_text_indexes()
+        assert [team["team_id"] for team in results["teams"]] == \
+            [data["teams"][ordinal]["team_id"] for _, ordinal in text_indexes.top("teams", service["service_name"], 3)]
+        assert len(search_service.search("mortgage", ranked=True)["teams"]) == 10
+
+        limited = search_service.search("e", limit=2)
+        assert limited == {kind: items[:2] for kind, items in search_service.search("e").items()}
+
+    def test_field_weights(self):
+        """
+        Test that the configured weights decide which field matters.
+        """
+        data = generate_catalog(10, seed=1)
+        team = data["teams"][3]
+        team["team_name"] = "Cobol Team"
+        data["teams"][6]["team_api"]["team_mission"] = "Cobol cobol cobol"
+        snapshot = CatalogSnapshot(data, 1, SourceFingerprint(0, 0, "hash"))
+
+        by_name = SearchService(snapshot, {**DEFAULT_FIELD_WEIGHTS, "team_mission": 0.1})
+        by_mission = SearchService(snapshot, {**DEFAULT_FIELD_WEIGHTS, "team_name": 0.1})
+        assert by_name.search("cobol", ranked=True)["teams"][0]["team_id"] == team["team_id"]
+        assert by_mission.search("cobol", ranked=True)["teams"][0]["team_id"] == data["teams"][6]["team_id"]
+        with pytest.raises(ValueError):
+            by_name.search("cobol", fuzzy=True, ranked=True)
+
+    def test_texts_read_from_posting_maps(self):
+        """
+        Test that service and component texts read from the posting maps are the ones of the entities.
+        """
+        data = generate_catalog(5, seed=2)
+        index = CatalogIndex(data)
+        documents = sorted(TextIndexes(index)._documents("services"))
+        assert documents == sorted((ordinal, field, ref.service[field]) for ordinal, ref in enumerate(index.services)
+                                   for field in ("service_name", "tech_stack"))
+
+
+def test_ranked_search_endpoint(tmp_path, sample_json_data):
+    """
+    Test ranked search through the search endpoint, including its validation.
+    """
+    data_file = tmp_path / "wow_data.json"
+    data_file.write_text(json.dumps(sample_json_data))
+    store = CatalogStore(str(data_file))
+    store.load()
+    app.state.catalog_store = store
+    try:
+        with TestClient(app) as client:
+            response = client.get("/search", params={"query": "Java mortgage", "ranked": "true", "limit": 1})
+            assert response.status_code == 200
+            body = response.json()
+            assert [s["service_name"] for s in body["services"]] == ["mortgage-processing"]
+            assert len(body["runtime_components"]) == 1
+            assert client.get("/search", params={"query": "x", "ranked": "true", "fuzzy": "true"}).status_code == 400
+            assert client.get("/search", params={"query": "x", "limit": 0}).status_code == 422
+    finally:
+        del app.state.catalog_store
@@ -0,0 +1,54 @@
+import pytest
+
+from app.data.trigram_index import TrigramIndex
+
+DOCUMENTS = [
+    ["mortgage-processing", "Java"],
+    ["shared-auth-service", ".NET"],
+    ["account-portal-ui", "Angular"],
+    ["Customer Onboarding Service", "Python"],
+]
+
+
+@pytest.fixture
+def index():
+    """
+    Fixture providing a TrigramIndex over a few documents.
+    """
+    trigram_index = TrigramIndex()
+    for texts in DOCUMENTS:
+        trigram_index.add(texts)
+    return trigram_index
+
+
+class TestTrigramIndex:
+    """
+    Tests for the TrigramIndex class.
+    """
+
+    @pytest.mark.parametrize("query", [
+        "service", "SERVICE", "mortgage-processing", "a", "ja", ".net", "-", "ice", "zzz", "ortal-u", "r o",
+    ])
+    def test_matches_substring_semantics(self, index, query):
+        """
+        Test that results equal a case-insensitive substring test over every document.
+        """
+        expected = [ordinal for ordinal, texts in enumerate(DOCUMENTS)
+                    if any(query.lower() in text.lower() for text in texts)]
+        assert index.search(query) == expected
+
+    def test_candidates_are_narrowed(self, index):
+        """
+        Test that a query with rare trigrams only yields the documents holding them.
+        """
+        assert index.candidates("portal") == [2]
+        assert index.candidates("xyz") == []
+
+    def test_add_returns_ordinal(self):
+        """
+        Test that documents are numbered in insertion order.
+        """
+        trigram_index = TrigramIndex()
+        assert trigram_index.add(["first"]) == 0
+        assert trigram_index.add(["second"]) == 1
+        assert len(trigram_index) == 2
@@ -0,0 +1,78 @@
+import json
+import pytest
+from fastapi.responses import JSONResponse
+
+from app.api.encoding import CatalogJSONResponse, encode_json
+from app.data.catalog import CatalogSnapshot, SourceFingerprint
+from app.services.runtime_component_service import RuntimeComponentService
+from app.services.search_service import SearchService
+from app.services.service_service import ServiceService
+from app.services.views import ComponentDetailView, ComponentView, ServiceView, view_to_dict
+from benchmarks.synthetic import generate_catalog
+
+
+@pytest.fixture
+def snapshot():
+    return CatalogSnapshot(generate_catalog(4, services_per_team=2), 1, SourceFingerprint(0, 0, "synthetic"))
+
+
+class TestRecordViews:
+    """
+    Tests for the read-only views of catalog records.
+    """
+
+    def test_service_view(self, snapshot):
+        """
+        Test that a service view reads the service and its team's context without copying either.
+        """
+        team, service = ref = snapshot.get_index().services[3]
+        view = ServiceView(ref)
+        expected = {**service, "team_id": team["team_id"], "team_name": team["team_name"],
+                    "business_segment": team["business_segment"]}
+        assert view == expected and expected == view
+        assert list(view) == list(expected) and len(view) == len(expected)
+        assert view["business_criticality"] is service["business_criticality"]
+        assert "team_name" in view and "team_api" not in view
+        assert view.get("team_api") is None
+        with pytest.raises(KeyError):
+            view["team_api"]
+        assert view_to_dict(view) == expected and type(view_to_dict(view)) is dict
+
+    def test_component_views(self, snapshot):
+        """
+        Test that component views have the fields of listed and looked up components, in order.
+        """
+        ref = snapshot.get_index().components[5]
+        summary, detail = ComponentView(ref), ComponentDetailView(ref)
+        assert list(summary) == ["component_name", "service_name", "team_id", "team_name", "business_segment",
+                                 "tech_stack"]
+        assert list(detail) == list(summary) + ["business_criticality"]
+        assert dict(summary) == summary.to_dict() and dict(detail) == detail.to_dict()
+        assert detail["business_criticality"] is ref.service["business_criticality"]
+
+    def test_encoding(self, snapshot):
+        """
+        Test that views are encoded exactly like the dicts they stand for, and anything else is refused.
+        """
+        content = SearchService(snapshot).search("a")
+        assert all(isinstance(item, (ServiceView, ComponentView))
+                   for item in content["services"] + content["runtime_components"])
+        materialized = {kind: [dict(item) for item in items] for kind, items in content.items()}
+        assert CatalogJSONResponse(content).body == JSONResponse(materialized).body
+        assert encode_json(ServiceService(snapshot).get_all_services()) == \
+            json.dumps([dict(view) for view in ServiceService(snapshot).get_all_services()],
+                       ensure_ascii=False, separators=(",", ":"))
+        with pytest.raises(TypeError):
+            encode_json({"value": object()})
+
+    def test_services_return_views(self, snapshot):
+        """
+        Test that the services and components returned are views of the catalog records.
+        """
+        index = snapshot.get_index()
+        services = ServiceService(snapshot).get_all_services(team_id=index.teams[1]["team_id"])
+        assert [view.ref for view in services] == [ref for ref in index.services if ref.team is index.teams[1]]
+        components = RuntimeComponentService(snapshot)
+        assert all(type(view) is ComponentView for view in components.get_all_runtime_components())
+        found, not_found = components.get_runtime_components_by_names([index.components[0].component_name, "x"])
+        assert [view.ref for view in found] == [index.components[0]] and not_found == ["x"]
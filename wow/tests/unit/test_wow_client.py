@@ -0,0 +1,259 @@
+import copy
+import json
+import pytest
+from fastapi.testclient import TestClient
+
+from app.data.catalog import CatalogStore
+from app.main import app
+from wow_client import LocalCache, WowApiError, WowClient
+
+
+class FakeClock:
+    """
+    Clock advanced by hand, to age cache entries.
+    """
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def data(sample_json_data):
+    """
+    Fixture providing catalog data with two teams.
+    """
+    data = copy.deepcopy(sample_json_data)
+    beta = copy.deepcopy(data["teams"][0])
+    beta["team_id"] = "team_beta"
+    beta["team_name"] = "Beta Squad"
+    beta["services_applications"][0]["service_name"] = "billing"
+    beta["services_applications"][0]["runtime_components"] = ["billing-api", "billing-api-worker"]
+    data["teams"].append(beta)
+    return data
+
+
+@pytest.fixture
+def data_file(tmp_path, data):
+    """
+    Fixture providing the path to a data file holding the data.
+    """
+    data_file = tmp_path / "wow_data.json"
+    data_file.write_text(json.dumps(data))
+    return data_file
+
+
+@pytest.fixture
+def store(data_file):
+    """
+    Fixture providing a store with the data file loaded, served by the app.
+    """
+    store = CatalogStore(str(data_file))
+    store.load()
+    app.state.catalog_store = store
+    yield store
+    del app.state.catalog_store
+
+
+@pytest.fixture
+def http_client(store):
+    """
+    Fixture providing an HTTP client calling the app in-process.
+    """
+    with TestClient(app) as http_client:
+        yield http_client
+
+
+@pytest.fixture
+def clock():
+    """
+    Fixture providing a clock for the client cache.
+    """
+    return FakeClock()
+
+
+@pytest.fixture
+def client(http_client, clock):
+    """
+    Fixture providing a WOW client of the app, with a 10 second TTL.
+    """
+    return WowClient(http_client=http_client, ttl=10.0, clock=clock)
+
+
+def _reload(store, data_file, data, team_name):
+    data["teams"][0]["team_name"] = team_name
+    data_file.write_text(json.dumps(data))
+    assert store.reload() is True
+
+
+class TestConditionalRequests:
+    """
+    Tests for the version validators of catalog responses.
+    """
+
+    def test_etag_and_not_modified(self, http_client, store, data_file, data):
+        """
+        Test that responses carry the catalog version and tag, and a matching If-None-Match gets 304.
+        """
+        first = http_client.get("/teams/team_alpha")
+        etag = first.headers["etag"]
+        assert (first.headers["x-catalog-version"], first.headers["x-catalog-epoch"]) == ("1", store.epoch)
+
+        not_modified = http_client.get("/services/billing", headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+        assert not_modified.headers["etag"] == etag
+        assert not_modified.content == b""
+
+        _reload(store, data_file, data, "Renamed")
+        changed = http_client.get("/teams/team_alpha", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert changed.json()["team_name"] == "Renamed"
+
+    @pytest.mark.parametrize("path, status", [("/teams/nope", 404), ("/services/nope", 404),
+                                              ("/query?entity=teams&q=(", 400), ("/teams?limit=0", 422)])
+    @pytest.mark.parametrize("if_none_match", ["current", "*"])
+    def test_errors_are_not_turned_into_not_modified(self, http_client, path, status, if_none_match):
+        """
+        Test that a conditional GET of a missing resource or with an invalid query gets its error, not 304.
+        """
+        etag = http_client.get("/teams/team_alpha").headers["etag"]
+        headers = {"If-None-Match": etag if if_none_match == "current" else "*"}
+        assert http_client.get(path, headers=headers).status_code == status
+
+    def test_any_tag_matches_existing_resources(self, http_client):
+        """
+        Test that If-None-Match: * gets 304 for a resource that exists, with the validators but no body.
+        """
+        response = http_client.get("/teams/team_alpha", headers={"If-None-Match": "*"})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["x-catalog-version"] == "1"
+        assert "content-type" not in response.headers and "content-length" not in response.headers
+
+    def test_other_routes_are_not_tagged(self, http_client):
+        """
+        Test that only catalog reads carry validators.
+        """
+        assert "etag" not in http_client.get("/catalog/status").headers
+        assert "etag" not in http_client.get("/teams/unknown").headers
+        assert "etag" not in http_client.get("/teamsX").headers
+
+
+class TestWowClient:
+    """
+    Tests for the cached API client, against the app in-process.
+    """
+
+    def test_fresh_responses_are_served_from_cache(self, client, clock):
+        """
+        Test that a response is reused within the TTL, then revalidated with a 304.
+        """
+        team = client.get_team("team_alpha")
+        assert client.get_team("team_alpha") is team
+        assert client.cache.stats()["hits"] == 1
+
+        clock.now = 11.0
+        assert client.get_team("team_alpha") is team
+        assert client.cache.stats()["revalidations"] == 1
+        assert client.get_team("team_alpha") is team
+        assert client.cache.stats()["hits"] == 2
+
+    def test_newer_version_invalidates_entries(self, client, store, data_file, data):
+        """
+        Test that a response from a newer catalog version makes older entries stale within the TTL.
+        """
+        assert client.get_team("team_alpha")["team_name"] == "Alpha Squad"
+        _reload(store, data_file, data, "Renamed")
+
+        assert client.get_service("billing")["service_name"] == "billing"
+        assert client.cache.version == 2
+        assert client.get_team("team_alpha")["team_name"] == "Renamed"
+        assert client.cache.stats()["misses"] == 3
+
+    def test_restarted_server_starts_versions_over(self, client, store, data_file, data):
+        """
+        Test that after a restart, when versions go back to 1 with a new epoch, entries are fresh again within the TTL.
+        """
+        _reload(store, data_file, data, "Renamed")
+        assert client.get_team("team_alpha")["team_name"] == "Renamed"
+        assert (client.cache.version, client.cache.epoch) == (2, store.epoch)
+
+        restarted = CatalogStore(str(data_file))
+        restarted.load()
+        app.state.catalog_store = restarted
+        assert client.get_service("billing")["service_name"] == "billing"
+        assert (client.cache.version, client.cache.epoch) == (1, restarted.epoch)
+        assert client.get_service("billing")["service_name"] == "billing"
+        assert client.cache.stats()["hits"] == 1
+
+        # Entries of another epoch are only bounded by the TTL, those of older versions of the epoch are stale
+        _reload(restarted, data_file, data, "Renamed again")
+        assert client.get_team("team_alpha")["team_name"] == "Renamed"
+        assert client.get_runtime_component("billing-api")["team_id"] == "team_beta"
+        assert client.cache.version == 2
+        misses = client.cache.stats()["misses"]
+        assert client.get_service("billing")["service_name"] == "billing"
+        assert client.cache.stats()["misses"] == misses + 1
+
+    def test_version_going_backwards_without_epoch(self, clock):
+        """
+        Test that without epochs, a lower version than seen so far starts the versions over.
+        """
+        cache = LocalCache(ttl=10.0, clock=clock)
+        cache.put("/teams/", [], None, 5)
+        entry = cache.put("/services/", [], None, 1)
+        assert cache.version == 1 and cache.is_fresh(entry)
+        cache.observe_version(2)
+        assert not cache.is_fresh(entry)
+
+    def test_lookups_mirror_the_api(self, client):
+        """
+        Test the endpoint methods, including not found and error answers.
+        """
+        assert client.get_teams(business_segment="Internet Banking Division")[1]["team_id"] == "team_beta"
+        assert [service["service_name"] for service in client.get_services(team_id="team_beta")] == ["billing"]
+        assert len(client.get_runtime_components(service_name="billing")) == 2
+        assert client.get_runtime_component("billing-api")["team_id"] == "team_beta"
+        assert client.resolve_instance("billing-api-worker-5d8")["component_name"] == "billing-api-worker"
+        assert client.search("billing")["services"][0]["service_name"] == "billing"
+        assert client.get_facets(["tech_stack"], team_id="team_beta")["facets"] == {"tech_stack": {"Java": 1}}
+        assert client.get_teams_batch(["team_beta", "nope"])["not_found"] == ["nope"]
+        status = client.get_catalog_status()
+        assert status["version"] == 1
+        assert client.get_changes(1, status["epoch"])["resync_required"] is False
+        assert client.get_changes(1, "other")["resync_required"] is True
+
+        assert client.get_team("nope") is None
+        assert client.resolve_instance("unknown-1") is None
+        with pytest.raises(WowApiError) as error:
+            client.get_changes(-1, status["epoch"])
+        assert error.value.status_code == 422
+
+    def test_prefetch_answers_locally(self, client, http_client, clock, store, data_file, data):
+        """
+        Test that after prefetching, lookups are answered locally exactly as the API answers them.
+        """
+        assert client.prefetch_all() == 2
+        requests = client.cache.stats()["misses"]
+
+        keys = {
+            "team": ["team_alpha", "team_beta", "nope"],
+            "service": ["mortgage-processing", "billing", "nope"],
+            "runtime_component": ["mortgage-processing-backend", "billing-api", "billing-api-worker", "nope"],
+        }
+        paths = {"team": "/teams/", "service": "/services/", "runtime_component": "/runtime-components/"}
+        for kind, names in keys.items():
+            for name in names:
+                response = http_client.get(paths[kind] + name)
+                expected = response.json() if response.status_code == 200 else None
+                assert getattr(client, f"get_{kind}")(name) == expected
+        batch = http_client.post("/runtime-components:resolve", json={"instances": ["billing-api-1", "x"]}).json()
+        assert client.resolve_instances(["billing-api-1", "x"]) == batch
+        assert client.cache.stats()["misses"] == requests
+
+        _reload(store, data_file, data, "Renamed")
+        clock.now = 11.0
+        assert client.get_team("team_alpha")["team_name"] == "Renamed"
+        assert client.get_service("mortgage-processing")["team_name"] == "Renamed"
@@ -0,0 +1,8 @@
+"""
+Python client of the WOW API, with an in-process cache.
+"""
+from wow_client.cache import CacheEntry, LocalCache
+from wow_client.catalog import LocalCatalog
+from wow_client.client import WowApiError, WowClient
+
+__all__ = ["CacheEntry", "LocalCache", "LocalCatalog", "WowApiError", "WowClient"]
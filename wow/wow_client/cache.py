@@ -0,0 +1,129 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, NamedTuple, Optional
+
+
+class CacheEntry(NamedTuple):
+    """
+    A response body kept by the client, with what is needed to revalidate it.
+    """
+    body: Any
+    etag: Optional[str]
+    # Catalog version the body was read from, and its epoch, from the X-Catalog-Version and X-Catalog-Epoch headers
+    version: Optional[int]
+    epoch: Optional[str]
+    # Clock time of the last response that confirmed the body
+    validated_at: float
+
+
+class LocalCache:
+    """
+    In-process cache of API responses, keyed by request path and query.
+
+    An entry is fresh for ``ttl`` seconds after the server last confirmed
+    it, and only while no response from a newer catalog version has been
+    seen: as soon as one is, every entry read from an older version has to
+    be revalidated before it is used again. Versions are counted by each
+    server process and only ordered within an epoch, so a response of
+    another epoch (another worker process, or a restarted server) starts
+    the version over, and entries of other epochs are bounded by the TTL
+    alone. Without epochs, a version going backwards starts it over the
+    same way. Stale entries are kept, so that
+    they can be revalidated with a conditional request and reused if the
+    server answers 304 Not Modified. The least recently used entries are
+    evicted beyond ``max_entries``.
+    """
+    def __init__(self,
+                 ttl: float = 30.0,
+                 max_entries: int = 10000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        # Newest catalog version seen in a response of the latest epoch seen
+        self.version: Optional[int] = None
+        self.epoch: Optional[str] = None
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Get the entry for a key, fresh or not.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """
+        Check whether an entry can be used without asking the server.
+        """
+        if self.clock() - entry.validated_at >= self.ttl:
+            return False
+        version, epoch = self.version, self.epoch
+        if version is None or entry.version is None or entry.epoch != epoch:
+            return True
+        return entry.version >= version
+
+    def put(self, key: str, body: Any, etag: Optional[str], version: Optional[int],
+            epoch: Optional[str] = None) -> CacheEntry:
+        """
+        Store a response body that was just received.
+        """
+        self.observe_version(version, epoch)
+        entry = CacheEntry(body, etag, version, epoch, self.clock())
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def revalidated(self, key: str, entry: CacheEntry, version: Optional[int],
+                    epoch: Optional[str] = None) -> CacheEntry:
+        """
+        Mark an entry as confirmed by a 304 response, read from the given catalog version.
+        """
+        if version is None:
+            version, epoch = entry.version, entry.epoch
+        return self.put(key, entry.body, entry.etag, version, epoch)
+
+    def observe_version(self, version: Optional[int], epoch: Optional[str] = None) -> None:
+        """
+        Record the catalog version of a response, invalidating entries read from older versions of its epoch.
+        """
+        if version is None:
+            return
+        with self._lock:
+            # Responses of one epoch may arrive out of order, but without one a lower version means a restart
+            if self.version is None or epoch != self.epoch or (epoch is None and version < self.version):
+                self.version, self.epoch = version, epoch
+            elif version > self.version:
+                self.version = version
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Get the cache counters.
+        """
+        return {
+            "version": self.version,
+            "epoch": self.epoch,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "revalidations": self.revalidations,
+            "misses": self.misses,
+        }
@@ -0,0 +1,71 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+# Team fields copied onto services and runtime components, as the API does
+TEAM_CONTEXT_FIELDS = ("team_id", "team_name", "business_segment")
+
+
+class LocalCatalog:
+    """
+    Lookups over a full copy of the catalog, answering like the API endpoints.
+
+    Built from the response of ``GET /teams``. Where a key occurs more than
+    once, the first occurrence is returned, as the server does.
+    """
+    def __init__(self, teams: List[Dict[str, Any]]):
+        self.teams = teams
+        self.team_by_id: Dict[str, Dict[str, Any]] = {}
+        self.service_by_name: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+        self.component_by_name: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+        for team in teams:
+            self.team_by_id.setdefault(team["team_id"], team)
+            for service in team["services_applications"]:
+                self.service_by_name.setdefault(service["service_name"], (team, service))
+                for component_name in service["runtime_components"]:
+                    self.component_by_name.setdefault(component_name, (team, service))
+
+    def get_team(self, team_id: str) -> Optional[Dict[str, Any]]:
+        return self.team_by_id.get(team_id)
+
+    def get_service(self, service_name: str) -> Optional[Dict[str, Any]]:
+        found = self.service_by_name.get(service_name)
+        if found is None:
+            return None
+        team, service = found
+        service_with_context = service.copy()
+        for name in TEAM_CONTEXT_FIELDS:
+            service_with_context[name] = team[name]
+        return service_with_context
+
+    def get_runtime_component(self, component_name: str) -> Optional[Dict[str, Any]]:
+        found = self.component_by_name.get(component_name)
+        if found is None:
+            return None
+        team, service = found
+        return self._component(component_name, team, service)
+
+    @staticmethod
+    def _component(component_name: str, team: Dict[str, Any], service: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "component_name": component_name,
+            "service_name": service["service_name"],
+            "team_id": team["team_id"],
+            "team_name": team["team_name"],
+            "business_segment": team["business_segment"],
+            "tech_stack": service["tech_stack"],
+            "business_criticality": service["business_criticality"]
+        }
+
+    def resolve_instance(self, instance: str) -> Optional[Dict[str, Any]]:
+        """
+        Resolve an instance name to the runtime component with the longest name that is a prefix of it.
+        """
+        for length in range(len(instance), 0, -1):
+            component_name = instance[:length]
+            if component_name in self.component_by_name:
+                team, service = self.component_by_name[component_name]
+                return {
+                    "instance": instance,
+                    **self._component(component_name, team, service),
+                    "contact_channels": team["team_api"]["contact_channels"]
+                }
+        return None
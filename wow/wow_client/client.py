@@ -0,0 +1,265 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import quote, urlencode
+
+import httpx
+
+from wow_client.cache import LocalCache
+from wow_client.catalog import LocalCatalog
+
+# Response headers carrying the catalog version a response was read from, and the epoch qualifying it
+CATALOG_VERSION_HEADER = "X-Catalog-Version"
+CATALOG_EPOCH_HEADER = "X-Catalog-Epoch"
+
+# Default of the value returned on 404, to raise instead
+_RAISE = object()
+
+
+class WowApiError(Exception):
+    """
+    Raised when the API answers a request with an error status.
+    """
+    def __init__(self, status_code: int, detail: Any):
+        self.status_code = status_code
+        self.detail = detail
+        super().__init__(f"WOW API error {status_code}: {detail}")
+
+
+class WowClient:
+    """
+    Client of the WOW API, with one method per endpoint and an in-process cache.
+
+    GET responses are kept in a ``LocalCache``: while fresh they are
+    returned without a request, and once stale they are revalidated with
+    ``If-None-Match``, so an unchanged catalog costs a 304 without a body.
+    Single lookups return None where the API answers 404.
+
+    After ``prefetch_all``, point and batch lookups of teams, services and
+    runtime components, and instance resolution, are answered locally from
+    a full copy of the catalog, which is revalidated the same way.
+
+    Args:
+        base_url: URL of the API.
+        ttl: Seconds a response is used without asking the server.
+        max_entries: Maximum number of cached responses.
+        http_client: Client to send requests with, instead of one created
+            for ``base_url``; e.g. ``fastapi.testclient.TestClient(app)`` to
+            call the application in-process.
+        timeout: Request timeout in seconds, for the client created for ``base_url``.
+        clock: Monotonic clock the cache ages entries with.
+    """
+    def __init__(self,
+                 base_url: str = "http://localhost:8000",
+                 ttl: float = 30.0,
+                 max_entries: int = 10000,
+                 http_client: Optional[httpx.Client] = None,
+                 timeout: float = 10.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self._owns_http_client = http_client is None
+        self._http = http_client if http_client is not None else httpx.Client(base_url=base_url, timeout=timeout)
+        self.cache = LocalCache(ttl=ttl, max_entries=max_entries, clock=clock)
+        self._prefetched = False
+        self._catalog: Optional[LocalCatalog] = None
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        if self._owns_http_client:
+            self._http.close()
+
+    def __enter__(self) -> "WowClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # Teams
+
+    def get_teams(self,
+                  business_segment: Optional[str] = None,
+                  value_stream_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self._get("/teams/", {"business_segment": business_segment, "value_stream_name": value_stream_name})
+
+    def get_team(self, team_id: str) -> Optional[Dict[str, Any]]:
+        catalog = self._local_catalog()
+        if catalog is not None:
+            return catalog.get_team(team_id)
+        return self._get(f"/teams/{quote(team_id, safe='')}", not_found=None)
+
+    def get_teams_batch(self, team_ids: List[str]) -> Dict[str, List[Any]]:
+        catalog = self._local_catalog()
+        if catalog is not None:
+            return _batch(team_ids, catalog.get_team)
+        return self._post("/teams:batch", {"team_ids": team_ids})
+
+    # Services
+
+    def get_services(self,
+                     team_id: Optional[str] = None,
+                     team_name: Optional[str] = None,
+                     business_segment: Optional[str] = None,
+                     value_stream_name: Optional[str] = None,
+                     sla: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self._get("/services/", {
+            "team_id": team_id,
+            "team_name": team_name,
+            "business_segment": business_segment,
+            "value_stream_name": value_stream_name,
+            "sla": sla,
+        })
+
+    def get_service(self, service_name: str) -> Optional[Dict[str, Any]]:
+        catalog = self._local_catalog()
+        if catalog is not None:
+            return catalog.get_service(service_name)
+        return self._get(f"/services/{quote(service_name, safe='')}", not_found=None)
+
+    def get_services_batch(self, service_names: List[str]) -> Dict[str, List[Any]]:
+        catalog = self._local_catalog()
+        if catalog is not None:
+            return _batch(service_names, catalog.get_service)
+        return self._post("/services:batch", {"service_names": service_names})
+
+    # Runtime components
+
+    def get_runtime_components(self,
+                               component_name: Optional[str] = None,
+                               service_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self._get("/runtime-components/", {"component_name": component_name, "service_name": service_name})
+
+    def get_runtime_component(self, component_name: str) -> Optional[Dict[str, Any]]:
+        catalog = self._local_catalog()
+        if catalog is not None:
+            return catalog.get_runtime_component(component_name)
+        return self._get(f"/runtime-components/{quote(component_name, safe='')}", not_found=None)
+
+    def get_runtime_components_batch(self, component_names: List[str]) -> Dict[str, List[Any]]:
+        catalog = self._local_catalog()
+        if catalog is not None:
+            return _batch(component_names, catalog.get_runtime_component)
+        return self._post("/runtime-components:batch", {"component_names": component_names})
+
+    def resolve_instance(self, instance: str) -> Optional[Dict[str, Any]]:
+        catalog = self._local_catalog()
+        if catalog is not None:
+            return catalog.resolve_instance(instance)
+        return self._get("/runtime-components/resolve", {"instance": instance}, not_found=None)
+
+    def resolve_instances(self, instances: List[str]) -> Dict[str, List[Any]]:
+        catalog = self._local_catalog()
+        if catalog is not None:
+            return _batch(instances, catalog.resolve_instance)
+        return self._post("/runtime-components:resolve", {"instances": instances})
+
+    # Search, facets, queries, catalog state and changes
+
+    def search(self,
+               query: str,
+               fuzzy: bool = False,
+               max_distance: Optional[int] = None,
+               ranked: bool = False,
+               limit: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+        return self._get("/search/", {
+            "query": query,
+            "fuzzy": "true" if fuzzy else None,
+            "max_distance": max_distance,
+            "ranked": "true" if ranked else None,
+            "limit": limit,
+        })
+
+    def get_facets(self, dims: List[str], entity: str = "services", **filters: Optional[str]) -> Dict[str, Any]:
+        return self._get("/facets/", {"dims": ",".join(dims), "entity": entity, **filters})
+
+    def query(self, q: str, entity: str = "services", limit: Optional[int] = None) -> Dict[str, Any]:
+        return self._get("/query/", {"q": q, "entity": entity, "limit": limit})
+
+    def get_catalog_status(self) -> Dict[str, Any]:
+        return self._request("GET", "/catalog/status").json()
+
+    def get_changes(self, since: int, epoch: Optional[str]) -> Dict[str, Any]:
+        return self._request("GET", "/changes/", params={"since": since, "epoch": epoch}).json()
+
+    # Local catalog
+
+    def prefetch_all(self) -> int:
+        """
+        Load the whole catalog in one request and answer lookups from it from now on.
+
+        Returns:
+            The number of teams loaded.
+        """
+        self._prefetched = True
+        return len(self._load_catalog().teams)
+
+    def _local_catalog(self) -> Optional[LocalCatalog]:
+        if not self._prefetched:
+            return None
+        return self._load_catalog()
+
+    def _load_catalog(self) -> LocalCatalog:
+        teams = self._get("/teams/")
+        with self._lock:
+            # Rebuilt only when the server sent a new body
+            if self._catalog is None or self._catalog.teams is not teams:
+                self._catalog = LocalCatalog(teams)
+            return self._catalog
+
+    # Requests
+
+    def _get(self, path: str, params: Optional[Dict[str, Any]] = None, not_found: Any = _RAISE) -> Any:
+        params = {name: value for name, value in (params or {}).items() if value is not None}
+        key = f"{path}?{urlencode(sorted(params.items()))}" if params else path
+        cache = self.cache
+        entry = cache.get(key)
+        if entry is not None and cache.is_fresh(entry):
+            cache.hits += 1
+            return entry.body
+
+        headers = {"If-None-Match": entry.etag} if entry is not None and entry.etag else None
+        response = self._http.get(path, params=params, headers=headers)
+        version, epoch = _version(response), response.headers.get(CATALOG_EPOCH_HEADER)
+        if response.status_code == 304 and entry is not None:
+            cache.revalidations += 1
+            return cache.revalidated(key, entry, version, epoch).body
+        cache.misses += 1
+        if response.status_code == 404 and not_found is not _RAISE:
+            cache.observe_version(version, epoch)
+            return not_found
+        _raise_for_status(response)
+        return cache.put(key, response.json(), response.headers.get("etag"), version, epoch).body
+
+    def _post(self, path: str, body: Dict[str, Any]) -> Any:
+        return self._request("POST", path, json=body).json()
+
+    def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        response = self._http.request(method, path, **kwargs)
+        _raise_for_status(response)
+        return response
+
+
+def _version(response: httpx.Response) -> Optional[int]:
+    version = response.headers.get(CATALOG_VERSION_HEADER)
+    return int(version) if version is not None else None
+
+
+def _raise_for_status(response: httpx.Response) -> None:
+    if response.status_code < 400:
+        return
+    try:
+        body = response.json()
+    except ValueError:
+        body = response.text
+    detail = body.get("detail", body) if isinstance(body, dict) else body
+    raise WowApiError(response.status_code, detail)
+
+
+def _batch(keys: List[str], lookup: Callable[[str], Optional[Dict[str, Any]]]) -> Dict[str, List[Any]]:
+    # Each distinct key once, in request order, as the batch endpoints answer
+    found, not_found = [], []
+    for key in dict.fromkeys(keys):
+        record = lookup(key)
+        if record is None:
+            not_found.append(key)
+        else:
+            found.append(record)
+    return {"found": found, "not_found": not_found}